@@ -0,0 +1,648 @@
+"""
+Module offers small benchmarks for the db layer
+
+Usage: python benchmark.py [--rows N] [--calls N] [--db path] [--series-runs N]
+
+If no db is given, a temporary db with a lot of WorkUnitEntry rows
+is created, seeded with the current db version and removed afterwards
+"""
+
+import argparse
+import gc
+import os
+import random
+import sqlite3
+import tempfile
+import time as clock
+import tracemalloc
+import types
+from datetime import date, datetime, timedelta
+from datetime import time as clock_time
+
+import version
+import prefetcher
+import globalcontext
+import testdata
+import dbobj.dbwrapper as dbwrapper
+from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.identitymap import ScheduleEntryDict
+from dbobj.statements import Statements
+
+WINDOW_STMT = """SELECT WorkUnitEntryId, SubjectId, UnitType, StartTime, EndTime, TimeDiff
+                 FROM WorkUnitEntry
+                 WHERE StartDate >= {0} AND StartDate <= {1}"""
+
+DAY_STMT = """SELECT SUM(TimeDiff) AS TimeDiff
+              FROM WorkUnitEntry
+              WHERE StartDate = {0}
+                AND UnitType = {1}"""
+
+# summary over the raw rows, as done before DailyWorkRollup
+RAW_SUBJECT_STMT = """SELECT SubjectId, COALESCE(SUM(TimeDiff), 0) / 3600.0 TimeDiff
+                      FROM WorkUnitEntry
+                      WHERE StartDate >= ? AND StartDate <= ?
+                        AND UnitType IN (?, ?)
+                      GROUP BY SubjectId
+                      ORDER BY SubjectId"""
+
+# the same summary over DailyWorkRollup
+ROLLUP_SUBJECT_STMT = """SELECT SubjectId, COALESCE(SUM(Seconds), 0) / 3600.0 TimeDiff
+                         FROM DailyWorkRollup
+                         WHERE Date >= ? AND Date <= ?
+                           AND UnitType IN (?, ?)
+                         GROUP BY SubjectId
+                         ORDER BY SubjectId"""
+
+def create_large_db(db_name, row_count):
+
+    """seed a new db and fill it with row_count WorkUnitEntry rows"""
+
+    db_obj = dbwrapper.DB(db_name)
+    db_obj.seed(version.VERSION, 0.99)
+    db_obj.init()
+
+    rnd = random.Random(1)
+    start = date(2015, 1, 1)
+    rows = list()
+    for i in range(0, row_count):
+        day = start + timedelta(days=i//8)
+        hour = 5 + (i%8)*2
+        rows.append((\
+            0, rnd.randint(1, 20), 0, rnd.randint(0, 3), 5,\
+                hour*100, HF.date_2_db(day), hour*100 + 45, HF.date_2_db(day),\
+                    2700, 2, ""))
+
+    with db_obj.db_conn.writer() as connection:
+        connection.executemany("""INSERT INTO WorkUnitEntry
+                                  (TypeId, SubjectId, ScheduleEntryId, UnitType, StartOffset,
+                                   StartTime, StartDate, EndTime, EndDate, TimeDiff,
+                                   State, Description)
+                                  VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+
+    return db_obj, start, start + timedelta(days=row_count//8)
+
+def bench(name, calls, func):
+
+    """run func calls times and print the time per call"""
+
+    begin = clock.perf_counter()
+    for i in range(0, calls):
+        func(i)
+    total = clock.perf_counter() - begin
+    print("{0:<34} {1:>10.1f} us/call".format(name, total / calls * 1e6))
+    return total / calls
+
+def bench_connections(db_obj, first_date, last_date, calls):
+
+    """compare opening a connection per call with the pooled connections"""
+
+    db_name = db_obj.db_name
+    span = (last_date - first_date).days - 7
+
+    def window(i):
+        s_date = first_date + timedelta(days=(i*37)%span)
+        return HF.date_2_db(s_date), HF.date_2_db(s_date + timedelta(days=6))
+
+    def connect_only(i): # pylint: disable=unused-argument
+        connection = sqlite3.connect(db_name)
+        connection.close()
+
+    def connect_per_call(i):
+        connection = sqlite3.connect(db_name)
+        cursor = connection.cursor()
+        cursor.execute(WINDOW_STMT.format(*window(i)))
+        cursor.fetchall()
+        connection.close()
+
+    def pooled_reader(i):
+        with db_obj.db_conn.reader() as connection:
+            cursor = connection.cursor()
+            cursor.execute(WINDOW_STMT.format(*window(i)))
+            cursor.fetchall()
+
+    def pooled_loader(i):
+        s_date = first_date + timedelta(days=(i*37)%span)
+        dbwrapper.WorkDayTimeUnits.get_time_unit_list(\
+            dict(), s_date, s_date + timedelta(days=6), "%d.%m.%Y", db_obj.db_conn)
+
+    print("connections ({0} calls, 7 day window)".format(calls))
+    per_call = bench("sqlite3.connect + close", calls, connect_only)
+    per_query = bench("connect per call + query", calls, connect_per_call)
+    pooled = bench("pooled reader + query", calls, pooled_reader)
+    bench("pooled WorkDayTimeUnits loader", calls, pooled_loader)
+    print("connect overhead per call: {0:.1f} us, speedup {1:.2f}x".format(\
+        per_call*1e6, per_query / pooled))
+
+def bench_statements(db_obj, first_date, last_date, calls):
+
+    """compare formatted sql with bound parameters and show the statement counters"""
+
+    span = (last_date - first_date).days - 7
+
+    def window(i):
+        s_date = first_date + timedelta(days=(i*37)%span)
+        return s_date, s_date + timedelta(days=6)
+
+    def formatted(i):
+        s_date = HF.date_2_db(window(i)[0])
+        with db_obj.db_conn.reader() as connection:
+            cursor = connection.cursor()
+            cursor.execute(DAY_STMT.format(s_date, i%4))
+            cursor.fetchall()
+
+    def bound(i):
+        s_date = HF.date_2_db(window(i)[0])
+        with db_obj.db_conn.reader() as connection:
+            cursor = connection.cursor()
+            cursor.execute(DAY_STMT.format("?", "?"), (s_date, i%4))
+            cursor.fetchall()
+
+    def reload_path(i):
+        s_date, e_date = window(i)
+        dbwrapper.WorkDayTimeUnits.get_time_unit_list(\
+            dict(), s_date, e_date, "%d.%m.%Y", db_obj.db_conn)
+        dbwrapper.WorkDayTimePercentage.get_work_day_time_percentage(\
+            dict(), s_date, e_date, db_obj.db_conn)
+        dbwrapper.WorkTotalTimePercentage.get_work_total_time_percentage(\
+            s_date, e_date, db_obj.db_conn)
+
+    print("statements ({0} calls, single day sum)".format(calls))
+    per_format = bench("formatted sql", calls, formatted)
+    per_bound = bench("bound parameters", calls, bound)
+    print("bound parameter speedup {0:.2f}x".format(per_format / per_bound))
+
+    db_obj.db_conn.reset_statement_stats()
+    bench("reload path (3 loaders)", calls, reload_path)
+    stats = db_obj.db_conn.get_statement_stats()
+    for name in sorted(stats):
+        print("  {0:<48} hits {1:>7} misses {2:>3}".format(name, stats[name][0], stats[name][1]))
+
+def bench_rollup(db_obj, first_date, last_date, calls):
+
+    """compare summaries over the raw WorkUnitEntry rows with DailyWorkRollup"""
+
+    for days in (7, 31, 365):
+        span = max((last_date - first_date).days - days, 1)
+
+        def window(i, days=days, span=span):
+            s_date = first_date + timedelta(days=(i*37)%span)
+            return HF.date_2_db(s_date), HF.date_2_db(s_date + timedelta(days=days - 1))
+
+        def raw(i, window=window):
+            with db_obj.db_conn.reader() as connection:
+                cursor = connection.cursor()
+                cursor.execute(RAW_SUBJECT_STMT, window(i) +\
+                    (dbwrapper.UnitTypes.WORK_TIME, dbwrapper.UnitTypes.SCHOOL_TIME))
+                cursor.fetchall()
+
+        def rollup(i, window=window):
+            with db_obj.db_conn.reader() as connection:
+                cursor = connection.cursor()
+                cursor.execute(ROLLUP_SUBJECT_STMT, window(i) +\
+                    (dbwrapper.UnitTypes.WORK_TIME, dbwrapper.UnitTypes.SCHOOL_TIME))
+                cursor.fetchall()
+
+        print("subject summary ({0} calls, {1} day window)".format(calls, days))
+        per_raw = bench("raw WorkUnitEntry rows", calls, raw)
+        per_rollup = bench("DailyWorkRollup", calls, rollup)
+        print("rollup speedup {0:.2f}x".format(per_raw / per_rollup))
+
+def bench_window_cache(db_obj, first_date, last_date, calls):
+
+    """flip between two weeks with and without the window cache"""
+
+    db_conn = db_obj.db_conn
+    cache = db_conn.window_cache
+    middle = first_date + timedelta(days=(last_date - first_date).days//2)
+
+    def flip(i):
+        s_date = middle + timedelta(days=7*(i%2))
+        e_date = s_date + timedelta(days=6)
+        dbwrapper.ScheduleEntry.reload_from_db(dict(), s_date, e_date, db_conn)
+        dbwrapper.WorkDayTimeUnits.get_time_unit_list(\
+            dict(), s_date, e_date, "%d.%m.%Y", db_conn)
+        dbwrapper.SubjectWorkUnit.reload_from_db(dict(), s_date, e_date, db_conn)
+        dbwrapper.WorkDaySubjectTimePercentage.get_work_day_subject_time_percentage(\
+            dict(), s_date, e_date, db_conn)
+        dbwrapper.WorkTotalTimePercentage.get_work_total_time_percentage(\
+            s_date, e_date, db_conn)
+
+    max_entries = cache.max_entries
+    print("window cache ({0} calls, flip between two weeks)".format(calls))
+    cache.max_entries = 0
+    uncached = bench("without cache", calls, flip)
+    cache.max_entries = max_entries
+    cached = bench("with cache", calls, flip)
+    print("window cache speedup {0:.2f}x {1}".format(uncached / cached, cache.get_stats()))
+
+def bench_prefetch(db_obj, first_date, last_date, calls):
+
+    """step week by week with and without the background prefetch"""
+
+    db_conn = db_obj.db_conn
+    span = max((last_date - first_date).days//7 - 2, 1)
+    context = types.SimpleNamespace(db_conn=db_conn, date_format="%d.%m.%Y",\
+        start_date=first_date, end_date=first_date + timedelta(days=6))
+    window_prefetcher = prefetcher.WindowPrefetcher(context)
+
+    def show(i, prefetch):
+        # the user looks at the shown week for a while before the next step
+        window_prefetcher.wait()
+        context.start_date = first_date + timedelta(days=7*(i%span + 1))
+        context.end_date = context.start_date + timedelta(days=6)
+        begin = clock.perf_counter()
+        dbwrapper.ScheduleEntry.reload_from_db(\
+            dict(), context.start_date, context.end_date, db_conn)
+        dbwrapper.WorkDayTimeUnits.get_time_unit_list(\
+            dict(), context.start_date, context.end_date, context.date_format, db_conn)
+        dbwrapper.SubjectWorkUnit.reload_from_db(\
+            dict(), context.start_date, context.end_date, db_conn)
+        dbwrapper.WorkTotalTimePercentage.get_work_total_time_percentage(\
+            context.start_date, context.end_date, db_conn)
+        shown = clock.perf_counter() - begin
+        if prefetch:
+            window_prefetcher.prefetch()
+        return shown
+
+    print("next week ({0} steps)".format(calls))
+    for prefetch in (False, True):
+        with db_conn.window_cache.lock:
+            db_conn.window_cache.clear()
+        total = 0
+        for i in range(0, calls):
+            total = total + show(i, prefetch)
+        print("{0:<34} {1:>10.1f} us/step".format(\
+            "with prefetch" if prefetch else "without prefetch", total / calls * 1e6))
+    window_prefetcher.stop()
+    print("prefetched windows {0}, cancelled {1}".format(\
+        window_prefetcher.loaded, window_prefetcher.cancelled))
+
+def bench_write_behind(db_obj, calls):
+
+    """time a todo list action on the calling (gui) thread with and without the writer thread"""
+
+    db_conn = db_obj.db_conn
+    todo_list_items = dict()
+    for i in range(0, 100):
+        dbwrapper.TodoListItem.to_db(dbwrapper.TodoListItem.new(\
+            i, 0, "task {0}".format(i), date(2030, 1, 1)), todo_list_items, db_conn)
+    items = list(todo_list_items.values())
+
+    print("todo list action ({0} actions)".format(calls))
+    for enabled in (False, True):
+        db_conn.write_behind.enabled = enabled
+        session = dbwrapper.Session(db_conn)
+        begin = clock.perf_counter()
+        for i in range(0, calls):
+            items[i%len(items)].task_complete = i%2
+            with session:
+                session.update(dbwrapper.TodoListItem.update_by_db_id, items[i%len(items)])
+                session.update(dbwrapper.TodoListItem.update_all_positions, todo_list_items)
+        caller = clock.perf_counter() - begin
+        db_conn.write_behind.wait()
+        total = clock.perf_counter() - begin
+        print("{0:<34} {1:>10.1f} us/action on the caller, {2:.1f} us/action written".format(\
+            "writer thread" if enabled else "synchronous", caller / calls * 1e6,\
+                total / calls * 1e6))
+    db_conn.write_behind.enabled = False
+
+def bench_todo_positions(db_obj, calls, items=1000):
+
+    """time moving one todo item with dense and with sparse positions"""
+
+    db_conn = db_obj.db_conn
+    todo_list_items = dict()
+    for i in range(0, items):
+        dbwrapper.TodoListItem.to_db(dbwrapper.TodoListItem.new(\
+            i*dbwrapper.TodoListItem.POSITION_GAP, 0, "task {0}".format(i),\
+                date(2030, 1, 1)), todo_list_items, db_conn)
+    order = sorted(todo_list_items.values(), key=lambda obj: obj.position)
+
+    def move(i):
+        # move the last item to a place in the list
+        obj = order.pop()
+        index = (i*7919)%len(order)
+        order.insert(index, obj)
+        return obj, index
+
+    def dense(i):
+        move(i)
+        for position, obj in enumerate(order):
+            obj.position = position
+        dbwrapper.TodoListItem.update_all_positions(todo_list_items, db_conn)
+
+    renumbered = [0]
+    def sparse(i):
+        obj, index = move(i)
+        before = order[index-1] if index > 0 else None
+        position = dbwrapper.TodoListItem.position_between(before, order[index+1])
+        if position is None:
+            renumbered[0] = renumbered[0] + 1
+            dbwrapper.TodoListItem.renumber(order)
+            dbwrapper.TodoListItem.update_all_positions(todo_list_items, db_conn)
+            return
+        obj.position = position
+        dbwrapper.TodoListItem.update_position(obj, db_conn)
+
+    print("todo item move ({0} items)".format(items))
+    old = bench("dense positions", calls, dense)
+    dbwrapper.TodoListItem.renumber(order)
+    dbwrapper.TodoListItem.update_all_positions(todo_list_items, db_conn)
+    new = bench("sparse positions", calls, sparse)
+    print("  speedup {0:.2f}x, renumbered {1} times".format(old / new, renumbered[0]))
+
+def decode_time_units(rows, date_format):
+
+    """decode time unit rows with the per row conversions used before RowDecoder"""
+
+    obj_dict = dict()
+    last_date = 0
+    current_date_value = 0
+    c_list = None
+    for row in rows:
+        if row[8] != last_date:
+            last_date = row[8]
+            current_date_value = HF.date_2_python_date(row[8])
+            c_list = list()
+            obj_dict[current_date_value.strftime(date_format)] = c_list
+
+        start_datetime = (datetime.combine(current_date_value, HF.time_2_python_time(row[3])) +\
+            timedelta(hours=row[7]))
+        end_datetime = (datetime.combine(current_date_value, HF.time_2_python_time(row[4])) +\
+            timedelta(hours=row[7]))
+        c_list.append(dbwrapper.WorkDayTimeUnits.new(row[0], row[1], row[2],\
+            start_datetime.time(), end_datetime.time(), row[5], row[6], row[7],\
+                start_datetime.date(), current_date_value, row[9]))
+    return obj_dict
+
+def bench_decoding(db_obj, first_date, last_date, calls):
+
+    """decode the time units of one year with the former conversions and with RowDecoder"""
+
+    db_conn = db_obj.db_conn
+    date_format = "%d.%m.%Y"
+    s_date = first_date
+    e_date = min(last_date, first_date + timedelta(days=364))
+
+    with db_conn.reader() as connection:
+        rows = connection.execute(Statements.get("WorkDayTimeUnits.get_time_unit_list"),\
+            (HF.date_2_db(s_date), HF.date_2_db(e_date))).fetchall()
+
+    def loader(i):
+        dbwrapper.WorkDayTimeUnits.get_time_unit_list(\
+            dict(), s_date, e_date, date_format, db_conn)
+
+    # with the cached rows the loader only decodes
+    loader(0)
+    print("row decoding ({0} calls, {1} rows)".format(calls, len(rows)))
+    former = bench("decode, per row conversions", calls,\
+        lambda i: decode_time_units(rows, date_format))
+    decoded = bench("decode, RowDecoder", calls, loader)
+    db_conn.window_cache.enabled = False
+    loaded = bench("load and decode, RowDecoder", calls, loader)
+    db_conn.window_cache.enabled = True
+    print("  {0:.0f} rows/s before, {1:.0f} rows/s after, speedup {2:.2f}x".format(\
+        len(rows) / former, len(rows) / decoded, former / decoded))
+    print("  loader with query {0:.0f} rows/s".format(len(rows) / loaded))
+
+class DictRecord():
+
+    """
+    Class is a dict backed copy of a record, like the dbobj classes were
+    before they got __slots__
+    """
+
+    def __init__(self, obj):
+        for name in type(obj).__slots__:
+            setattr(self, name, getattr(obj, name))
+
+def slotted_copy(obj):
+
+    """return a copy of a slotted record"""
+
+    copy = object.__new__(type(obj))
+    for name in type(obj).__slots__:
+        setattr(copy, name, getattr(obj, name))
+    return copy
+
+def traced(func):
+
+    """return (bytes allocated by func that are still alive, result of func)"""
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, result
+
+def bench_memory(temp_dir):
+
+    """resident size of the records of a semester window, dict backed and slotted"""
+
+    db_obj = dbwrapper.DB(os.path.join(temp_dir, "memory.db"))
+    db_obj.seed(version.VERSION, 0.99)
+    db_obj.init()
+    context = globalcontext.GlobalContext()
+    context.db_conn = db_obj.db_conn
+    test = testdata.TestData(context)
+    test.generate_test_data(1)
+    db_conn = db_obj.db_conn
+
+    s_date = test.start_date
+    e_date = s_date + timedelta(days=7*testdata.SEMESTER_WEEKS - 1)
+    s_date_val = HF.date_2_db(s_date)
+    e_date_val = HF.date_2_db(e_date)
+
+    def load_window():
+        schedule_entries = dict()
+        dbwrapper.ScheduleEntry.reload_from_db(schedule_entries, s_date, e_date, db_conn)
+        time_units = dict()
+        dbwrapper.WorkDayTimeUnits.get_time_unit_list(\
+            time_units, s_date, e_date, "%d.%m.%Y", db_conn)
+        subject_work_units = dict()
+        dbwrapper.SubjectWorkUnit.reload_from_db(subject_work_units, s_date, e_date, db_conn)
+        percentages = dict()
+        dbwrapper.WorkDaySubjectTimePercentage.get_work_day_subject_time_percentage(\
+            percentages, s_date, e_date, db_conn)
+        todo_list_items = dict()
+        dbwrapper.TodoListItem.reload_from_db(todo_list_items, db_conn)
+        return (schedule_entries, time_units, subject_work_units, percentages, todo_list_items)
+
+    db_conn.window_cache.enabled = False
+    window_size, window = traced(load_window)
+
+    records = dict()
+    records["ScheduleEntry"] = list(window[0].values())
+    records["ScheduleSeries"] = [i.series_obj for i in records["ScheduleEntry"]]
+    records["WorkDayTimeUnits"] = [i for units in window[1].values() for i in units]
+    records["SubjectWorkUnit"] = list(window[2].values())
+    records["WorkDaySubjectTimePercentage"] = list(window[3].values())
+    records["TodoListItem"] = list(window[4].values())
+    records["WorkUnitEntry"] = [i for i in context.work_unit_entries.values()\
+        if s_date_val <= HF.date_2_db(i.start_date) <= e_date_val]
+
+    print("memory of a {0} day window (tracemalloc)".format((e_date - s_date).days + 1))
+    print("{0:<30} {1:>7} {2:>12} {3:>12} {4:>8}".format(\
+        "records", "count", "dict bytes", "slots bytes", "ratio"))
+    total_dict = 0
+    total_slots = 0
+    for name, objs in records.items():
+        dict_size = traced(lambda objs=objs: [DictRecord(i) for i in objs])[0]
+        slots_size = traced(lambda objs=objs: [slotted_copy(i) for i in objs])[0]
+        total_dict = total_dict + dict_size
+        total_slots = total_slots + slots_size
+        print("{0:<30} {1:>7} {2:>12} {3:>12} {4:>7.2f}x".format(\
+            name, len(objs), dict_size, slots_size, dict_size / max(slots_size, 1)))
+    print("{0:<30} {1:>7} {2:>12} {3:>12} {4:>7.2f}x".format(\
+        "all records", "", total_dict, total_slots, total_dict / max(total_slots, 1)))
+    print("  loaded window incl. values {0} bytes".format(window_size))
+
+    db_obj.close()
+
+def bench_identity(temp_dir, calls):
+
+    """series objects of a loaded year and the lookup of the entries of one series"""
+
+    db_obj = dbwrapper.DB(os.path.join(temp_dir, "identity.db"))
+    db_obj.seed(version.VERSION, 0.99)
+    db_obj.init()
+    context = globalcontext.GlobalContext()
+    context.db_conn = db_obj.db_conn
+    test = testdata.TestData(context)
+    test.generate_test_data(1)
+    db_conn = db_obj.db_conn
+    db_conn.window_cache.enabled = False
+
+    plain = dict()
+    dbwrapper.ScheduleEntry.reload_from_db(plain, test.start_date, test.end_date, db_conn)
+    indexed = ScheduleEntryDict()
+    dbwrapper.ScheduleEntry.reload_from_db(indexed, test.start_date, test.end_date, db_conn)
+    series_ids = sorted(indexed.by_series.keys())
+
+    print("identity map ({0} entries of {1} series)".format(len(indexed), len(series_ids)))
+    print("  series objects: {0} shared, {1} before (one per entry)".format(\
+        len(set(id(i.series_obj) for i in indexed.values())), len(indexed)))
+    old = bench("  entries of one series, scan", calls, lambda i: [\
+        j for j in plain.items()\
+            if j[1].series_obj.schedule_series_id == series_ids[i%len(series_ids)]])
+    new = bench("  entries of one series, index", calls,\
+        lambda i: indexed.entries_of(series_ids[i%len(series_ids)]))
+    print("  speedup {0:.2f}x".format(old / new))
+
+    db_obj.close()
+
+def bench_series(db_obj, years_list, repeat):
+
+    """create weekly series row by row, with the bulk series engine and as virtual series"""
+
+    insert_stmt = """INSERT INTO ScheduleEntry
+                            (ScheduleSeriesId, StartOffset,
+                             StartTime, EndTime, AtDate, Description)
+                     VALUES (?, ?, ?, ?, ?, ?)"""
+
+    def row_by_row(schedule_obj):
+        # the former engine: one INSERT and one object per week
+        series_obj = schedule_obj.series_obj
+        with db_obj.db_conn.writer() as connection:
+            cursor = connection.cursor()
+            dbwrapper.ScheduleSeries.to_db(series_obj, db_obj.db_conn)
+            c_date = series_obj.start_date
+            obj_list = []
+            while c_date <= series_obj.end_date:
+                cursor.execute(insert_stmt, (series_obj.schedule_series_id, 5, 400, 500,\
+                    HF.date_2_db(c_date), schedule_obj.description))
+                obj_list.append(schedule_obj.extended_copy(\
+                    cursor.lastrowid, series_obj.copy(), c_date, schedule_obj.description))
+                c_date = c_date + timedelta(days=7)
+        return obj_list
+
+    def bulk(schedule_obj):
+        obj_dict = dict()
+        window_start = schedule_obj.series_obj.start_date
+        dbwrapper.ScheduleEntry.series_to_db(schedule_obj, obj_dict, db_obj.db_conn,\
+            window_start, window_start + timedelta(days=6))
+        return obj_dict
+
+    def new_entry(years, is_virtual=0):
+        start = date(2030, 1, 7)
+        series_obj = dbwrapper.ScheduleSeries.new(\
+            1, 1, start, start + timedelta(days=365*years), "series", is_virtual)
+        return dbwrapper.ScheduleEntry.new(series_obj, 5, clock_time(9, 0), clock_time(10, 0),\
+            start, "series")
+
+    def clear():
+        # every variant starts with the same (empty) schedule tables
+        with db_obj.db_conn.writer() as connection:
+            connection.execute("DELETE FROM ScheduleEntry")
+            connection.execute("DELETE FROM ScheduleSeries")
+            connection.execute("DELETE FROM ScheduleSeriesException")
+
+    def reload_window(i):
+        s_date = date(2030, 1, 7) + timedelta(days=(i*37)%3000)
+        dbwrapper.ScheduleEntry.reload_from_db(\
+            dict(), s_date, s_date + timedelta(days=6), db_obj.db_conn)
+
+    print("weekly series ({0} runs, 7 day window)".format(repeat))
+    for years in years_list:
+        clear()
+        old = bench("row by row, {0:>2} years".format(years), repeat,\
+            lambda i: row_by_row(new_entry(years)))
+        clear()
+        new = bench("bulk engine, {0:>2} years".format(years), repeat,\
+            lambda i: bulk(new_entry(years)))
+        stored = bench("  reload 7 day window", repeat, reload_window)
+        clear()
+        virtual = bench("virtual series, {0:>2} years".format(years), repeat,\
+            lambda i: bulk(new_entry(years, 1)))
+        expanded = bench("  reload 7 day window", repeat, reload_window)
+        print("  {0} rows per series, speedup {1:.2f}x (bulk) {2:.2f}x (virtual)".format(\
+            len(range(0, 365*years + 1, 7)), old / new, old / virtual))
+        print("  reload stored / virtual: {0:.2f}x".format(stored / expanded))
+
+def main():
+
+    """parse arguments and run the benchmarks"""
+
+    parser = argparse.ArgumentParser(description="scheduler db benchmarks")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--db", default=None, help="use an existing db instead")
+    parser.add_argument("--series-runs", type=int, default=20)
+    args = parser.parse_args()
+
+    temp_dir = None
+    if args.db is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        db_obj, first_date, last_date = create_large_db(\
+            os.path.join(temp_dir.name, "bench.db"), args.rows)
+    else:
+        db_obj = dbwrapper.DB(args.db)
+        with db_obj.db_conn.reader() as connection:
+            row = connection.execute(\
+                "SELECT MIN(StartDate), MAX(StartDate) FROM WorkUnitEntry").fetchone()
+        first_date = HF.date_2_python_date(row[0] or 20200101)
+        last_date = max(HF.date_2_python_date(row[1] or 20200101),\
+            first_date + timedelta(days=14))
+
+    bench_connections(db_obj, first_date, last_date, args.calls)
+    bench_statements(db_obj, first_date, last_date, args.calls)
+    bench_rollup(db_obj, first_date, last_date, args.calls)
+    bench_window_cache(db_obj, first_date, last_date, args.calls)
+    bench_prefetch(db_obj, first_date, last_date, args.calls)
+    bench_decoding(db_obj, first_date, last_date, max(args.calls//10, 1))
+    if args.db is None:
+        # writes into the db, so only done on the temporary one
+        bench_series(db_obj, (1, 5, 20), args.series_runs)
+        bench_write_behind(db_obj, args.calls)
+        bench_todo_positions(db_obj, args.calls)
+        bench_memory(temp_dir.name)
+        bench_identity(temp_dir.name, args.calls)
+
+    db_obj.close()
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
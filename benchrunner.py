@@ -0,0 +1,458 @@
+"""
+Module runs the benchmark suite over generated test data and writes the
+results to a json file, so regressions can be compared between commits
+
+Usage: python benchrunner.py [--years N] [--seed N] [--repeat N] [--out path]
+                             [--compare path] [--no-gui]
+
+A temporary db is seeded with the current db version and filled by
+testdata.TestData. Timed are
+  - every migration step of DB.seed on a fresh db
+  - the generation of the test data
+  - every dbobj loader and aggregator for 7, 31 and 365 day windows
+  - the rebuild of ScheduleCanvas and EntryCanvas for the same windows,
+    offscreen (QT_QPA_PLATFORM=offscreen) unless another platform is set
+  - the frames of a selection dragged over the ScheduleCanvas, with and
+    without the pixmap cached grid layers
+  - the lookup of the rects overlapping a selection on the ScheduleCanvas,
+    with the day interval index and with a scan of all rects
+  - the frames of the schedule scrolled downwards and to the right (the
+    entry canvas follows), together with the items every canvas visited
+    and drew per paint event
+  - the planed times of all subjects of one day edited in one event loop
+    turn, with and without the coalescing of the Communicator, together
+    with the change signals emitted and delivered per edited day
+
+The window cache is switched off, every call reads the db. All times are
+in seconds, every measurement has the min, median and mean of the runs.
+With --compare, the medians are compared with an older result file.
+"""
+
+import os
+# has to be set before the first Qt import
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# pylint: disable=wrong-import-position
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time as clock
+from datetime import datetime, timedelta
+
+import version
+import globalcontext
+import testdata
+import dbobj.dbwrapper as dbwrapper
+
+DAY_COUNTS = (7, 31, 365)
+
+# mouse moves of one dragged selection
+DRAG_FRAMES = 20
+# selections looked up per window
+HIT_TESTS = 200
+# scroll steps of the schedule per window and their size in pixels
+SCROLL_FRAMES = 20
+SCROLL_STEP = 20
+
+# loaders that read one window
+WINDOW_LOADERS = [\
+    ("ScheduleEntry.reload_from_db", lambda c, s, e:\
+        dbwrapper.ScheduleEntry.reload_from_db(dict(), s, e, c.db_conn)),\
+    ("ScheduleSeriesException.reload_from_db", lambda c, s, e:\
+        dbwrapper.ScheduleSeriesException.reload_from_db(dict(), s, e, c.db_conn)),\
+    ("SubjectWorkUnit.reload_from_db", lambda c, s, e:\
+        dbwrapper.SubjectWorkUnit.reload_from_db(dict(), s, e, c.db_conn)),\
+    ("WorkUnitEntry.reload_from_db", lambda c, s, e:\
+        dbwrapper.WorkUnitEntry.reload_from_db(dict(), s, e, c.db_conn)),\
+    ("WorkDayTimeUnits.get_time_unit_list", lambda c, s, e:\
+        dbwrapper.WorkDayTimeUnits.get_time_unit_list(dict(), s, e, c.date_format, c.db_conn)),\
+    ("WindowStats.get", lambda c, s, e:\
+        dbwrapper.WindowStats.get(s, e, c.db_conn)),\
+    ("DailyWorkRollup.get_day_totals", lambda c, s, e:\
+        dbwrapper.DailyWorkRollup.get_day_totals(s, e, c.db_conn)),\
+    ("WorkDaySubjectTimePercentage.get_work_day_subject_time_percentage", lambda c, s, e:\
+        dbwrapper.WorkDaySubjectTimePercentage.get_work_day_subject_time_percentage(\
+            dict(), s, e, c.db_conn)),\
+    ("WorkDayTimePercentage.get_work_day_time_percentage", lambda c, s, e:\
+        dbwrapper.WorkDayTimePercentage.get_work_day_time_percentage(dict(), s, e, c.db_conn)),\
+    ("WorkTotalTimePercentage.get_work_total_time_percentage", lambda c, s, e:\
+        dbwrapper.WorkTotalTimePercentage.get_work_total_time_percentage(s, e, c.db_conn)),\
+    ("WorkSubjectTimePercentage.get_work_subject_time_percentage", lambda c, s, e:\
+        dbwrapper.WorkSubjectTimePercentage.get_work_subject_time_percentage(s, e, c.db_conn)),\
+    ("Summary.totals_for_workday", lambda c, s, e:\
+        [dbwrapper.Summary.totals_for_workday(s + timedelta(days=i), c.db_conn)\
+            for i in range(0, (e - s).days + 1)])]
+
+# loaders that read a whole table
+TABLE_LOADERS = [\
+    ("Subject.reload_from_db", lambda c:\
+        dbwrapper.Subject.reload_from_db(\
+            dict(), dbwrapper.SubjectTypes.SUBJECT_TYPE, 1, c.db_conn)),\
+    ("SubjectType.reload_from_db", lambda c:\
+        dbwrapper.SubjectType.reload_from_db(dict(), c.db_conn)),\
+    ("TodoListItem.reload_from_db", lambda c:\
+        dbwrapper.TodoListItem.reload_from_db(dict(), c.db_conn)),\
+    ("Config.reload_from_db", lambda c:\
+        dbwrapper.Config.reload_from_db(dict(), c.db_conn))]
+
+def stats(times):
+
+    """return min, median and mean of a list of times"""
+
+    return {\
+        "min": min(times),\
+            "median": statistics.median(times),\
+                "mean": statistics.mean(times),\
+                    "runs": len(times)}
+
+def timed(repeat, func):
+
+    """run func(i) repeat times and return the stats of the times"""
+
+    times = list()
+    for i in range(0, repeat):
+        begin = clock.perf_counter()
+        func(i)
+        times.append(clock.perf_counter() - begin)
+    return stats(times)
+
+def windows(test, day_count, count):
+
+    """return count windows of day_count days spread over the generated data"""
+
+    last_start = test.end_date - timedelta(days=day_count - 1)
+    span = max((last_start - test.start_date).days, 0)
+    result = list()
+    for i in range(0, count):
+        start_date = test.start_date + timedelta(days=span*i//max(count - 1, 1))
+        result.append((start_date, start_date + timedelta(days=day_count - 1)))
+    return result
+
+def git_commit():
+
+    """return the current commit or None if it can't be found"""
+
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,\
+            check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def bench_migrations(temp_dir, repeat):
+
+    """seed repeat fresh dbs and time every migration step"""
+
+    times = dict()
+    for i in range(0, repeat):
+        db_obj = dbwrapper.DB(os.path.join(temp_dir, "migration{0}.db".format(i)))
+        db_obj.seed(version.VERSION, 0.99)
+        for db_version, seconds in db_obj.migration_times.items():
+            times.setdefault(db_version, list()).append(seconds)
+        db_obj.close()
+
+    return dict((db_version, stats(values)) for db_version, values in times.items())
+
+def generate(db_name, years, seed):
+
+    """seed a new db and fill it with test data, return db_obj, context, test and result"""
+
+    db_obj = dbwrapper.DB(db_name)
+    db_obj.seed(version.VERSION, 0.99)
+    db_obj.init()
+
+    context = globalcontext.GlobalContext()
+    context.db_file_name = db_name
+    context.db_conn = db_obj.db_conn
+    context.session = dbwrapper.Session(db_obj.db_conn)
+    context.db_version = version.VERSION
+
+    test = testdata.TestData(context, seed)
+    begin = clock.perf_counter()
+    test.generate_test_data(years)
+    seconds = clock.perf_counter() - begin
+
+    rows = dict()
+    with db_obj.db_conn.reader() as connection:
+        for table in ("Subject", "ScheduleSeries", "ScheduleEntry", "SubjectWorkUnit",\
+            "TodoListItem", "WorkUnitEntry", "DailyWorkRollup"):
+            rows[table] = connection.execute("SELECT COUNT(*) FROM " + table).fetchone()[0]
+
+    return db_obj, context, test, {"seconds": seconds, "rows": rows,\
+        "first_date": test.start_date.isoformat(), "last_date": test.end_date.isoformat()}
+
+def bench_loaders(context, test, repeat):
+
+    """time all loaders, the window loaders for every day count"""
+
+    result = dict()
+    for day_count in DAY_COUNTS:
+        window_list = windows(test, day_count, repeat)
+        result[str(day_count)] = dict(\
+            (name, timed(repeat, lambda i, load=load: load(context, *window_list[i])))\
+                for name, load in WINDOW_LOADERS)
+
+    result["table"] = dict(\
+        (name, timed(repeat, lambda i, load=load: load(context)))\
+            for name, load in TABLE_LOADERS)
+    return result
+
+def bench_gui(context, test, repeat):
+
+    """time the rebuild of the schedule and the entry canvas offscreen"""
+
+    # pylint: disable=import-outside-toplevel
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QMouseEvent
+    from PyQt6.QtCore import Qt, QEvent, QPointF, QRect
+    from helpers.pixmaplayer import PixmapLayer
+    import communicator
+    import timer
+    import schedulecanvas
+    import entrycanvas
+    import timescanvas
+    import subjectcanvas
+
+    dbwrapper.SubjectType.reload_from_db(context.subject_types, context.db_conn)
+    dbwrapper.Subject.reload_from_db(\
+        context.subjects, dbwrapper.SubjectTypes.SUBJECT_TYPE, 1, context.db_conn)
+    study = dict()
+    dbwrapper.Subject.reload_from_db(\
+        study, dbwrapper.SubjectTypes.STUDY_TYPE, 1, context.db_conn)
+    context.study_subject = list(study.values())[0]
+    for i in context.subject_types.items():
+        if i[1].name == "F":
+            context.free_work_subject_type_key = i[0]
+            break
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    comm = communicator.Communicator()
+    widget = timer.Timer(comm, context)
+    widget.show()
+    app.processEvents()
+
+    schedule_canvas = widget.main_config_window.findChild(schedulecanvas.ScheduleCanvas)
+    entry_canvas = widget.main_config_window.findChild(entrycanvas.EntryCanvas)
+    counted_canvases = [schedule_canvas, entry_canvas,\
+        widget.main_config_window.findChild(timescanvas.TimesCanvas),\
+            widget.main_config_window.findChild(subjectcanvas.SubjectCanvas)]
+
+    def show(window):
+        context.start_date, context.end_date = window
+        context.day_count = (context.end_date - context.start_date).days + 1
+        comm.SIGNAL_DATES_CHANGED.emit()
+        app.processEvents()
+
+    def rebuild(canvas):
+        canvas.update_canvas()
+        app.processEvents()
+
+    def mouse_event(event_type, y_coord):
+        point = QPointF(schedule_canvas.context.box_width/2, y_coord)
+        return QMouseEvent(event_type, point, schedule_canvas.mapToGlobal(point),\
+            Qt.MouseButton.LeftButton, Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+
+    def drag_frame(i):
+        # one mouse move of a selection from the first row downwards and its repaint
+        top = context.top_offset + context.box_height/2
+        if i%DRAG_FRAMES == 0:
+            schedule_canvas.mousePressEvent(mouse_event(QEvent.Type.MouseButtonPress, top))
+            app.processEvents()
+        schedule_canvas.mouseMoveEvent(mouse_event(QEvent.Type.MouseMove,\
+            top + (i%DRAG_FRAMES + 1)*context.box_height))
+        app.processEvents()
+
+    def drag(enabled):
+        PixmapLayer.enabled = enabled
+        times = timed(DRAG_FRAMES*repeat, drag_frame)
+        PixmapLayer.enabled = True
+        schedule_canvas.clicked_at = False
+        schedule_canvas.select_rect = None
+        return times
+
+    def selection(i):
+        # one hour on one of the displayed days
+        return QRect((i*7919)%context.day_count*context.box_width,\
+            context.top_offset + (i*104729)%(24*60)*context.minute_height,\
+                context.box_width, 60*context.minute_height)
+
+    def overlapping_scan(rect):
+        return ([i for i in schedule_canvas.schedule_rects.values() if i.intersects(rect)],\
+            [i for i in schedule_canvas.work_unit_display.work_unit_rects.values()\
+                if i.intersects(rect)])
+
+    def scroll_frame(i):
+        # one step of the schedule downwards and to the right and its repaint
+        schedule_canvas.parent.verticalScrollBar().setValue(i%SCROLL_FRAMES*SCROLL_STEP)
+        schedule_canvas.parent.horizontalScrollBar().setValue(i%SCROLL_FRAMES*SCROLL_STEP)
+        app.processEvents()
+
+    def column_edit(i):
+        # the planed times of all subjects of one day, changed in one turn
+        edits[0] = edits[0] + 1
+        for row in range(0, len(entry_canvas.subject_entry_communicator.subject_boxes)):
+            entry_canvas.focus_entry((row, i%context.day_count))
+            entry_canvas.editor.setText("{0:.1f}".format(1 + edits[0]%8*0.5))
+            entry_canvas.focus_out_handler()
+        app.processEvents()
+
+    def column_edits(coalescing):
+        communicator.Communicator.coalescing = coalescing
+        emitted, delivered = comm.emitted, comm.delivered
+        times = timed(repeat, column_edit)
+        communicator.Communicator.coalescing = True
+        return times, {\
+            "emitted_per_action": (comm.emitted - emitted)/repeat,\
+                "delivered_per_action": (comm.delivered - delivered)/repeat}
+
+    def scroll():
+        before = [i.paint_counter.get_stats() for i in counted_canvases]
+        times = timed(SCROLL_FRAMES*repeat, scroll_frame)
+        schedule_canvas.parent.verticalScrollBar().setValue(0)
+        schedule_canvas.parent.horizontalScrollBar().setValue(0)
+        app.processEvents()
+
+        counts = dict()
+        for canvas, old in zip(counted_canvases, before):
+            new = canvas.paint_counter.get_stats()
+            paints = max(new["paints"] - old["paints"], 1)
+            counts[type(canvas).__name__] = {\
+                "paints": new["paints"] - old["paints"],\
+                    "visited_per_paint": (new["total_visited"] - old["total_visited"])/paints,\
+                        "drawn_per_paint": (new["total_drawn"] - old["total_drawn"])/paints}
+        return times, counts
+
+    edits = [0]
+    result = dict()
+    for day_count in DAY_COUNTS:
+        window_list = windows(test, day_count, repeat)
+        result[str(day_count)] = {\
+            "dates_changed": timed(repeat, lambda i: show(window_list[i])),\
+                "ScheduleCanvas.update_canvas": timed(repeat, lambda i: rebuild(schedule_canvas)),\
+                    "EntryCanvas.update_canvas": timed(repeat, lambda i: rebuild(entry_canvas)),\
+                        "drag_frame": drag(True),\
+                            "drag_frame_without_layers": drag(False),\
+                                "overlapping_rects": timed(HIT_TESTS, lambda i:\
+                                    schedule_canvas.get_overlapping_rects(selection(i))),\
+                                        "overlapping_rects_scan": timed(HIT_TESTS, lambda i:\
+                                            overlapping_scan(selection(i)))}
+        result[str(day_count)]["scroll_frame"], result[str(day_count)]["scroll_paints"] =\
+            scroll()
+        result[str(day_count)]["column_edit"], result[str(day_count)]["column_edit_signals"] =\
+            column_edits(True)
+        result[str(day_count)]["column_edit_direct"],\
+            result[str(day_count)]["column_edit_direct_signals"] = column_edits(False)
+
+    widget.close()
+    app.processEvents()
+    return result
+
+def medians(results, prefix=""):
+
+    """return a flat dict path -> median of all measurements in results"""
+
+    flat = dict()
+    for key, value in results.items():
+        if isinstance(value, dict) and "median" in value:
+            flat[prefix + key] = value["median"]
+        elif isinstance(value, dict):
+            flat.update(medians(value, prefix + key + "/"))
+    return flat
+
+def paint_counts(results, prefix=""):
+
+    """return a flat dict path -> items visited and drawn per paint in results"""
+
+    flat = dict()
+    for key, value in results.items():
+        if isinstance(value, dict) and "visited_per_paint" in value:
+            flat[prefix + key] = (value["visited_per_paint"], value["drawn_per_paint"])
+        elif isinstance(value, dict):
+            flat.update(paint_counts(value, prefix + key + "/"))
+    return flat
+
+def signal_counts(results, prefix=""):
+
+    """return a flat dict path -> signals emitted and delivered per action in results"""
+
+    flat = dict()
+    for key, value in results.items():
+        if isinstance(value, dict) and "emitted_per_action" in value:
+            flat[prefix + key] = (value["emitted_per_action"], value["delivered_per_action"])
+        elif isinstance(value, dict):
+            flat.update(signal_counts(value, prefix + key + "/"))
+    return flat
+
+def compare(results, file_name):
+
+    """print the change of every median compared with an older result file"""
+
+    with open(file_name, "r") as e_file:
+        old = json.load(e_file)
+
+    old_medians = medians(old)
+    new_medians = medians(results)
+    print("compared with {0} ({1})".format(file_name, old.get("commit")))
+    for key in sorted(new_medians.keys()):
+        if key in old_medians and old_medians[key] > 0:
+            print("{0:<90} {1:>7.2f}x".format(key, new_medians[key] / old_medians[key]))
+
+def main():
+
+    """parse arguments, run all benchmarks and write the results"""
+
+    parser = argparse.ArgumentParser(description="scheduler benchmark suite")
+    parser.add_argument("--years", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="benchmark.json")
+    parser.add_argument("--compare", default=None, help="older result file")
+    parser.add_argument("--no-gui", action="store_true")
+    args = parser.parse_args()
+
+    results = {\
+        "commit": git_commit(),\
+            "created": datetime.now().isoformat(timespec="seconds"),\
+                "db_version": version.VERSION,\
+                    "python": platform.python_version(),\
+                        "sqlite": sqlite3.sqlite_version,\
+                            "parameters": vars(args)}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print("migrations...")
+        results["migrations"] = bench_migrations(temp_dir, args.repeat)
+
+        print("generating {0} years of test data...".format(args.years))
+        db_obj, context, test, results["generate"] = generate(\
+            os.path.join(temp_dir, "benchrunner.db"), args.years, args.seed)
+        context.db_conn.window_cache.enabled = False
+
+        try:
+            print("loaders...")
+            results["loaders"] = bench_loaders(context, test, args.repeat)
+            if not args.no_gui:
+                print("gui...")
+                results["gui"] = bench_gui(context, test, args.repeat)
+        finally:
+            db_obj.close()
+
+    with open(args.out, "w") as e_file:
+        json.dump(results, e_file, indent=2, sort_keys=True)
+
+    for key, value in sorted(medians(results).items()):
+        print("{0:<90} {1:>12.6f} s".format(key, value))
+    for key, value in sorted(paint_counts(results).items()):
+        print("{0:<70} {1:>10.1f} visited {2:>8.1f} drawn".format(key, *value))
+    for key, value in sorted(signal_counts(results).items()):
+        print("{0:<70} {1:>10.1f} emitted {2:>6.1f} delivered".format(key, *value))
+    print("results written to " + args.out)
+
+    if args.compare is not None:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
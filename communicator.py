@@ -1,18 +1,35 @@
 """
 Module contains class with a lot of signals that can be used for
 intercomponent communication
+
+One edit of the entry canvas or one booking emits a cascade of change
+signals (entry -> foot bar, subject summary -> total summary, schedule
+redraw), every receiver recomputed and repainted for every one of them.
+Receivers can connect through the coalescing bus of the Communicator
+instead, it merges the changes of one event loop turn per receiver and
+key and delivers them once at the end of the turn.
 """
 
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtCore import QObject, pyqtSignal, QDate
+from PyQt6.QtCore import Qt, QObject, pyqtSignal, pyqtSlot, QDate
 
 class Communicator(QObject):
 
     """
     Class represents an interface for communication between
     the different GUI parts
+
+    Signals connected with coalesce carry changes: an optional key as
+    first argument and values that can be summed up (deltas or old and
+    new value). All emits of one event loop turn with the same slot and
+    key are merged into one call, so a slot sees the sum of the changes.
+    The pending changes are dropped when the dates change, the receivers
+    load everything again anyway.
     """
 
+    # switched off by the benchmarks to count the signals without merging
+    coalescing = True
+
     SIGNAL_ENTRY_RESIZED = pyqtSignal()
     SIGNAL_SCHEDULE_RESIZED = pyqtSignal()
     SIGNAL_PARENT_RESIZED = pyqtSignal()
@@ -38,7 +55,7 @@ class Communicator(QObject):
     SIGNAL_ITEMLIST_CLEAN = pyqtSignal()
     SIGNAL_LISTITEM_ADDED = pyqtSignal(str, QDate)
     SIGNAL_LISTITEM_UPDATE = pyqtSignal(int)
-    SIGNAL_ITEMLIST_REFRESH_POSITION = pyqtSignal()
+    SIGNAL_ITEMLIST_REFRESH_POSITION = pyqtSignal(QWidget)
 
     SIGNAL_TIMER_ENABLE_DATE_BUTTON = pyqtSignal()
 
@@ -64,3 +81,133 @@ class Communicator(QObject):
     SIGNAL_TOTAL_WORK_CHANGED = pyqtSignal(float, float)
 
     SIGNAL_SCROLLBAR_CHANGE_REQUIRED = pyqtSignal(int, QWidget)
+
+    # carries a function from another thread to the gui thread
+    SIGNAL_DISPATCH = pyqtSignal(object)
+
+    # delivers the coalesced changes at the end of the event loop turn
+    SIGNAL_FLUSH = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.SIGNAL_DISPATCH.connect(self.dispatched)
+        self.SIGNAL_FLUSH.connect(self.flush, Qt.ConnectionType.QueuedConnection)
+        # connected first, so it runs before the receivers reload
+        self.SIGNAL_DATES_CHANGED.connect(self.discard)
+
+        # (slot, key) -> [keyed, summed values] in the order of the first emit
+        self.pending = dict()
+        self.flush_posted = False
+
+        self.emitted = 0
+        self.delivered = 0
+        self.discarded = 0
+        self.flushes = 0
+        # emitted and delivered signals of the last flush (one user action)
+        self.last_emitted = 0
+        self.last_delivered = 0
+        self.flushed_emitted = 0
+
+    def dispatch(self, function):
+
+        """call function on the gui thread, may be used by any thread"""
+
+        self.SIGNAL_DISPATCH.emit(function)
+
+    @pyqtSlot(object)
+    def dispatched(self, function):
+
+        """gui thread side of dispatch"""
+
+        function()
+
+    def coalesce(self, signal, slot, keyed=True):
+
+        """
+        connect slot to signal through the coalescing bus, if keyed the
+        first argument of the signal is the key the changes are merged by
+        """
+
+        signal.connect(lambda *args: self.post(slot, keyed, args))
+
+    def post(self, slot, keyed, args):
+
+        """add the change args of one emit for slot to the pending changes"""
+
+        self.emitted = self.emitted + 1
+        key = None
+        values = args
+        if keyed:
+            key = args[0]
+            values = args[1:]
+
+        if not Communicator.coalescing:
+            self.__deliver(slot, keyed, key, values)
+            self.flushed_emitted = self.emitted
+            return
+
+        pending = self.pending.get((slot, key))
+        if pending is None:
+            self.pending[(slot, key)] = [keyed, list(values)]
+        else:
+            pending[1] = [a + b for a, b in zip(pending[1], values)]
+
+        if not self.flush_posted:
+            self.flush_posted = True
+            self.SIGNAL_FLUSH.emit()
+
+    @pyqtSlot()
+    def flush(self):
+
+        """
+        deliver all pending changes, the changes the slots emit themselves
+        are delivered in the same flush
+        """
+
+        delivered = self.delivered
+        try:
+            while self.pending:
+                pending = self.pending
+                self.pending = dict()
+                for (slot, key), (keyed, values) in pending.items():
+                    self.__deliver(slot, keyed, key, values)
+        finally:
+            self.flush_posted = False
+
+        self.flushes = self.flushes + 1
+        self.last_emitted = self.emitted - self.flushed_emitted
+        self.last_delivered = self.delivered - delivered
+        self.flushed_emitted = self.emitted
+
+    @pyqtSlot()
+    def discard(self):
+
+        """drop the pending changes, the dates changed"""
+
+        self.discarded = self.discarded + len(self.pending)
+        self.pending.clear()
+
+    def __deliver(self, slot, keyed, key, values):
+
+        """
+        call slot with the merged change
+        (don't use outside of Communicator)
+        """
+
+        self.delivered = self.delivered + 1
+        if keyed:
+            slot(key, *values)
+        else:
+            slot(*values)
+
+    def get_stats(self):
+
+        """return dict with the counters of the coalescing bus"""
+
+        return {\
+            "emitted": self.emitted,\
+                "delivered": self.delivered,\
+                    "discarded": self.discarded,\
+                        "flushes": self.flushes,\
+                            "last_emitted": self.last_emitted,\
+                                "last_delivered": self.last_delivered}
@@ -10,6 +10,8 @@ class Config():
     Class represents one configuration set
     """
 
+    __slots__ = ("config_id", "name", "description", "type_id", "value")
+
     def __init__(self, name, description, type_id, value):
         self.config_id = None
         self.name = name
@@ -17,9 +19,6 @@ class Config():
         self.type_id = type_id
         self.value = value
 
-    def __del__(self):
-        pass
-
     def key(self):
 
         """return uniform key for config entry"""
@@ -54,111 +53,83 @@ class Config():
         return Config(name, description, type_id, value)
 
     @staticmethod
-    def to_db(obj, obj_dict, db_name):
+    def to_db(obj, obj_dict, db_conn):
 
         """store object to db"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""INSERT INTO Config
-                              (Name, Description, TypeId, Value)
-                       VALUES ('{0}', '{1}', {2}, '{3}')""".format(\
-                           obj.name,\
-                               obj.description,\
-                                   obj.type_id,\
-                                       obj.value))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("Config.to_db " + str(Config.__class__) + " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Config.to_db", (\
+                    obj.name,\
+                        obj.description,\
+                            obj.type_id,\
+                                obj.value))
+            except sqlite3.Error as error:
+                print("Config.to_db " + str(Config.__class__) + " error:", error.args[0])
+                raise
 
         # add object to dict containing all subjects
         obj.config_id = cursor.lastrowid
         obj_dict[obj.key()] = obj
 
     @staticmethod
-    def update_by_db_id(obj, db_name):
+    def update_by_db_id(obj, db_conn):
 
         """update object using db id"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""UPDATE Config SET
-                              Name = '{0}',
-                              Description = '{1}',
-                              TypeId = {2},
-                              Value = '{3}'
-                       WHERE ConfigId = {4}""".format(\
-                           obj.name,\
-                               obj.description,\
-                                   obj.type_id,\
-                                       obj.value,\
-                                           obj.config_id))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("Config.update_by_db_id " + str(Config.__class__) +\
-                " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Config.update_by_db_id", (\
+                    obj.name,\
+                        obj.description,\
+                            obj.type_id,\
+                                obj.value,\
+                                    obj.config_id))
+            except sqlite3.Error as error:
+                print("Config.update_by_db_id " + str(Config.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def reload_from_db(obj_dict, db_name):
+    def reload_from_db(obj_dict, db_conn):
 
         """load all objects of this type from db"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""SELECT ConfigId, Name, Description, TypeId, Value
-                              FROM Config 
-                              ORDER BY ConfigId""")
-            rows = cursor.fetchall()
-            obj_dict.clear()
-            for row in rows:
-                obj = Config.new(\
-                    row[1],\
-                        row[2],\
-                            row[3],\
-                                row[4])
-
-                obj.config_id = row[0]
-                obj_dict[obj.key()] = obj
-        except sqlite3.Error as error:
-            connection.close()
-            print("Config.reload_from_db " + str(Config.__class__) + " error:", error.args[0])
-            raise
-
-        connection.close()
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Config.reload_from_db")
+                rows = cursor.fetchall()
+                obj_dict.clear()
+                for row in rows:
+                    obj = Config.new(\
+                        row[1],\
+                            row[2],\
+                                row[3],\
+                                    row[4])
+
+                    obj.config_id = row[0]
+                    obj_dict[obj.key()] = obj
+            except sqlite3.Error as error:
+                print("Config.reload_from_db " + str(Config.__class__) + " error:", error.args[0])
+                raise
 
     @staticmethod
-    def delete_by_db_id(obj, obj_dict, db_name):
+    def delete_by_db_id(obj, obj_dict, db_conn):
 
         """delete obj from db and from corresponding obj_dict"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""DELETE FROM Config WHERE ConfigId = {0}""".format(\
-                obj.work_unit_entry_id))
-
-            del obj_dict[obj.key()]
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("Config.delete_by_db_id " + str(Config.__class__) + " error:", error.args[0])
-            raise
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Config.delete_by_db_id", (obj.config_id,))
 
-        connection.commit()
-        connection.close()
+                del obj_dict[obj.key()]
+            except sqlite3.Error as error:
+                print("Config.delete_by_db_id " + str(Config.__class__) + " error:", error.args[0])
+                raise
 
     @staticmethod
     def compare(obj1, obj2):
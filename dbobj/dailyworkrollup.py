@@ -0,0 +1,144 @@
+"""
+Module contains definition of DailyWorkRollup
+"""
+
+import sqlite3
+
+from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.rowdecoder import RowDecoder
+
+class DailyWorkRollup():
+
+    """
+    Class represents the daily totals of WorkUnitEntry per (Date, SubjectId, UnitType)
+
+    The table is maintained by triggers on WorkUnitEntry, so the summaries
+    only read one row per day, subject and unit type instead of every entry
+    """
+
+    # tables the day totals are read from
+    TABLES = ("DailyWorkRollup",)
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def seed(db_connection):
+
+        """create rollup table and the triggers that keep it up to date"""
+
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("""CREATE TABLE DailyWorkRollup
+                        (Date integer,
+                        SubjectId integer,
+                        UnitType integer,
+                        Seconds integer DEFAULT 0,
+                        Count integer DEFAULT 0,
+                        PRIMARY KEY (Date, SubjectId, UnitType)) WITHOUT ROWID""")
+
+            cursor.execute("""CREATE TRIGGER DailyWorkRollup_Insert_T
+                        AFTER INSERT ON WorkUnitEntry
+                        BEGIN
+                          INSERT INTO DailyWorkRollup (Date, SubjectId, UnitType, Seconds, Count)
+                          VALUES (NEW.StartDate, NEW.SubjectId, NEW.UnitType,
+                                  COALESCE(NEW.TimeDiff, 0), 1)
+                          ON CONFLICT (Date, SubjectId, UnitType) DO UPDATE SET
+                            Seconds = Seconds + excluded.Seconds,
+                            Count = Count + 1;
+                        END""")
+
+            cursor.execute("""CREATE TRIGGER DailyWorkRollup_Delete_T
+                        AFTER DELETE ON WorkUnitEntry
+                        BEGIN
+                          UPDATE DailyWorkRollup SET
+                            Seconds = Seconds - COALESCE(OLD.TimeDiff, 0),
+                            Count = Count - 1
+                          WHERE Date = OLD.StartDate
+                            AND SubjectId = OLD.SubjectId
+                            AND UnitType = OLD.UnitType;
+                          DELETE FROM DailyWorkRollup
+                          WHERE Date = OLD.StartDate
+                            AND SubjectId = OLD.SubjectId
+                            AND UnitType = OLD.UnitType
+                            AND Count <= 0;
+                        END""")
+
+            cursor.execute("""CREATE TRIGGER DailyWorkRollup_Update_T
+                        AFTER UPDATE OF StartDate, SubjectId, UnitType, TimeDiff ON WorkUnitEntry
+                        BEGIN
+                          UPDATE DailyWorkRollup SET
+                            Seconds = Seconds - COALESCE(OLD.TimeDiff, 0),
+                            Count = Count - 1
+                          WHERE Date = OLD.StartDate
+                            AND SubjectId = OLD.SubjectId
+                            AND UnitType = OLD.UnitType;
+                          DELETE FROM DailyWorkRollup
+                          WHERE Date = OLD.StartDate
+                            AND SubjectId = OLD.SubjectId
+                            AND UnitType = OLD.UnitType
+                            AND Count <= 0;
+                          INSERT INTO DailyWorkRollup (Date, SubjectId, UnitType, Seconds, Count)
+                          VALUES (NEW.StartDate, NEW.SubjectId, NEW.UnitType,
+                                  COALESCE(NEW.TimeDiff, 0), 1)
+                          ON CONFLICT (Date, SubjectId, UnitType) DO UPDATE SET
+                            Seconds = Seconds + excluded.Seconds,
+                            Count = Count + 1;
+                        END""")
+        except sqlite3.Error as error:
+            print("DailyWorkRollup.Seeding " + str(DailyWorkRollup.__class__) +\
+                " error:", error.args[0])
+            raise
+
+    @staticmethod
+    def backfill(db_connection):
+
+        """fill the rollup table from all existing WorkUnitEntry rows"""
+
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("DELETE FROM DailyWorkRollup")
+            cursor.execute("""INSERT INTO DailyWorkRollup
+                                (Date, SubjectId, UnitType, Seconds, Count)
+                              SELECT StartDate, SubjectId, UnitType,
+                                     COALESCE(SUM(TimeDiff), 0), COUNT(*)
+                              FROM WorkUnitEntry
+                              GROUP BY StartDate, SubjectId, UnitType""")
+        except sqlite3.Error as error:
+            print("DailyWorkRollup.backfill " + str(DailyWorkRollup.__class__) +\
+                " error:", error.args[0])
+            raise
+
+    @staticmethod
+    def get_day_totals(start_date, end_date, db_conn):
+
+        """
+        return dict at_date -> {unit_type: seconds} of the window,
+        load it only if necessary
+        """
+
+        return db_conn.window_cache.get("DailyWorkRollup.day_totals", DailyWorkRollup.TABLES,\
+            start_date, end_date,\
+                lambda: DailyWorkRollup.load_day_totals(start_date, end_date, db_conn))
+
+    @staticmethod
+    def load_day_totals(start_date, end_date, db_conn):
+
+        """load the seconds per day and unit type of the window from db"""
+
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "DailyWorkRollup.day_totals",\
+                    (HF.date_2_db(start_date), HF.date_2_db(end_date)))
+                rows = cursor.fetchall()
+            except sqlite3.Error as error:
+                print("DailyWorkRollup.load_day_totals " + str(DailyWorkRollup.__class__) +\
+                    " error:", error.args[0])
+                raise
+
+        day_totals = dict()
+        for row in rows:
+            unit_totals = day_totals.setdefault(RowDecoder.DATES[row[0]], dict())
+            unit_totals[row[1]] = unit_totals.get(row[1], 0) + row[2]
+        return day_totals
@@ -0,0 +1,286 @@
+"""
+Module offers a shared connection manager for the sqlite db
+
+One persistent writer connection and a small pool of read-only
+connections are kept open for the lifetime of the application, so
+the dbobj classes borrow a connection instead of opening a new one
+for every call
+
+Statements of the registry in dbobj.statements are executed through
+execute/executemany, which count per statement how often it was
+prepared (miss) and how often the prepared statement of the connection
+was reused (hit)
+
+The window_cache keeps the results of the window loaders, the writer
+tells it after every commit which dates were changed
+
+The write_behind runs the writes of the gui on its own thread once it's
+enabled, writers of other threads wait for its queued writes, readers don't
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dbobj.statements import Statements
+from dbobj.windowcache import WindowCache
+from dbobj.writebehind import WriteBehind
+
+class DBConnection():
+
+    """
+    Class represents the connections to one sqlite db file
+    """
+
+    def __init__(self, db_name, reader_count=2, cache_size=-8000, mmap_size=67108864):
+        self.db_name = db_name
+        self.reader_count = reader_count
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+
+        self.write_connection = None
+        self.write_lock = threading.RLock()
+        self.write_depth = 0
+        self.write_owner = None
+        # counts the commits of the writer connection
+        self.write_generation = 0
+
+        self.readers = list()
+        self.reader_lock = threading.Lock()
+        self.reader_slots = threading.Semaphore(reader_count)
+        self.reader_total = 0
+        # read-only connections that belong to one (worker) thread
+        self.local = threading.local()
+        # read-only connection that only reads PRAGMA data_version, it never
+        # waits for the writer
+        self.version_connection = None
+        self.version_lock = threading.Lock()
+
+        # statement name -> [hits, misses] and connection -> prepared names
+        self.statement_lock = threading.Lock()
+        self.statement_stats = dict()
+        self.prepared = dict()
+
+        self.window_cache = WindowCache(self)
+        self.write_behind = WriteBehind(self)
+
+    def apply_pragmas(self, connection, writer):
+
+        """configure a freshly opened connection (done once per connection)"""
+
+        cursor = connection.cursor()
+        if writer:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size={0}".format(int(self.cache_size)))
+        cursor.execute("PRAGMA mmap_size={0}".format(int(self.mmap_size)))
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    def open_writer(self):
+
+        """open the writer connection if it does not exist yet"""
+
+        if self.write_connection is None:
+            connection = sqlite3.connect(self.db_name, check_same_thread=False,\
+                cached_statements=Statements.cache_size())
+            self.apply_pragmas(connection, True)
+            self.write_connection = connection
+        return self.write_connection
+
+    def open_reader(self):
+
+        """open a new read-only connection"""
+
+        connection = sqlite3.connect(\
+            "file:" + self.db_name + "?mode=ro", uri=True, check_same_thread=False,\
+                cached_statements=Statements.cache_size())
+        self.apply_pragmas(connection, False)
+        return connection
+
+    @contextmanager
+    def writer(self):
+
+        """
+        borrow the writer connection
+        nested usage joins the outer transaction, only the outermost
+        block commits (or rolls back if an exception leaves it)
+        other threads than the writer thread write after its queued writes,
+        the gui submits its writes to write_behind, so it never waits here
+        """
+
+        if self.write_owner != threading.get_ident():
+            self.write_behind.wait()
+
+        with self.write_lock:
+            connection = self.open_writer()
+            self.write_depth = self.write_depth + 1
+            self.write_owner = threading.get_ident()
+            try:
+                yield connection
+            except BaseException:
+                self.write_depth = self.write_depth - 1
+                if self.write_depth == 0:
+                    self.write_owner = None
+                    connection.rollback()
+                raise
+            self.write_depth = self.write_depth - 1
+            if self.write_depth == 0:
+                self.write_owner = None
+                changes = self.window_cache.collect(connection)
+                connection.commit()
+                self.write_generation = self.write_generation + 1
+                self.window_cache.committed(changes, self.write_generation)
+
+    @contextmanager
+    def reader(self):
+
+        """
+        borrow a read-only connection from the pool
+        inside a writer block the writer connection is used so that
+        uncommitted changes stay visible to the caller, a thread with an
+        attached reader uses its own connection
+        the queued writes of the writer thread aren't waited for, the
+        write_behind calls drained once they're written
+        """
+
+        if self.write_owner == threading.get_ident():
+            yield self.write_connection
+            return
+
+        self.write_behind.read_ahead()
+
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            try:
+                yield connection
+            finally:
+                if connection.in_transaction:
+                    connection.rollback()
+            return
+
+        self.reader_slots.acquire()
+        with self.reader_lock:
+            connection = self.readers.pop() if self.readers else None
+        try:
+            if connection is None:
+                connection = self.open_reader()
+                self.reader_total = self.reader_total + 1
+            yield connection
+        finally:
+            if connection is not None:
+                if connection.in_transaction:
+                    connection.rollback()
+                with self.reader_lock:
+                    self.readers.append(connection)
+            self.reader_slots.release()
+
+    def attach_reader(self):
+
+        """
+        open a read-only connection that is used by every reader() call of the
+        calling thread, so a worker thread never takes a connection of the pool
+        """
+
+        if getattr(self.local, "connection", None) is None:
+            self.local.connection = self.open_reader()
+
+    def detach_reader(self):
+
+        """close the read-only connection of the calling thread"""
+
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            self.local.connection = None
+            with self.statement_lock:
+                self.prepared.pop(id(connection), None)
+            connection.close()
+
+    def get_data_version(self):
+
+        """
+        return a value that changes with every commit of the writer connection
+        and with every commit of other processes to the db file
+
+        neither the write_lock nor the queued writes are waited for, the
+        writer thread holds the write_lock while sqlite waits for a locked
+        db file, so the gui would freeze
+        """
+
+        write_generation = self.write_generation
+        with self.version_lock:
+            if self.version_connection is None:
+                self.version_connection = self.open_reader()
+            row = self.version_connection.execute("PRAGMA data_version").fetchone()
+        return (write_generation, row[0])
+
+    def count_statement(self, connection, name):
+
+        """count one hit or miss of statement name on connection"""
+
+        with self.statement_lock:
+            prepared = self.prepared.setdefault(id(connection), set())
+            stats = self.statement_stats.setdefault(name, [0, 0])
+            if name in prepared:
+                stats[0] = stats[0] + 1
+            else:
+                stats[1] = stats[1] + 1
+                prepared.add(name)
+
+    def execute(self, cursor, name, params=()):
+
+        """execute registered statement name with bound params on cursor"""
+
+        self.count_statement(cursor.connection, name)
+        return cursor.execute(Statements.get(name), params)
+
+    def executemany(self, cursor, name, param_list):
+
+        """execute registered statement name once for every entry of param_list"""
+
+        self.count_statement(cursor.connection, name)
+        return cursor.executemany(Statements.get(name), param_list)
+
+    def get_statement_stats(self):
+
+        """return dict with statement name -> (hits, misses)"""
+
+        with self.statement_lock:
+            return {name: tuple(stats) for name, stats in self.statement_stats.items()}
+
+    def reset_statement_stats(self):
+
+        """reset the counters, prepared statements stay valid"""
+
+        with self.statement_lock:
+            self.statement_stats.clear()
+
+    def close(self):
+
+        """write the queued writes, checkpoint the write ahead log and close all connections"""
+
+        self.write_behind.stop()
+
+        with self.reader_lock:
+            for i in self.readers:
+                self.prepared.pop(id(i), None)
+                i.close()
+            self.readers.clear()
+            self.reader_total = 0
+
+        with self.version_lock:
+            if self.version_connection is not None:
+                self.version_connection.close()
+                self.version_connection = None
+
+        with self.write_lock:
+            if self.write_connection is not None:
+                self.write_connection.commit()
+                try:
+                    self.write_connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                except sqlite3.Error as error:
+                    print("DBConnection.close " + str(DBConnection.__class__) +\
+                        " error:", error.args[0])
+                self.prepared.pop(id(self.write_connection), None)
+                self.write_connection.close()
+                self.write_connection = None
+                self.window_cache.reset()
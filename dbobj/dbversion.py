@@ -3,6 +3,7 @@ Module contains definitions for DBVersion
 """
 
 import sqlite3
+from dbobj.statements import Statements
 
 class DBVersion():
 
@@ -10,14 +11,13 @@ class DBVersion():
     Class represents the Attributes of the DB, like version
     """
 
+    __slots__ = ("db_version_id", "description", "value")
+
     def __init__(self, description, value):
         self.db_version_id = None
         self.description = description
         self.value = value
 
-    def __del__(self):
-        pass
-
     @staticmethod
     def seed(db_connection): # pylint: disable=invalid-name
 
@@ -44,30 +44,23 @@ class DBVersion():
         return DBVersion(description, value)
 
     @staticmethod
-    def create_new_version(description, value, db_name):
+    def create_new_version(description, value, db_conn):
 
         """
         Create new version of db
         value and description are taken from version.py
         """
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""INSERT INTO DBVersion
-                              (Description, Value)
-                       VALUES ('{0}', {1})""".format(\
-                           description,\
-                               value))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("DBVersion.create_new_version " +\
-                str(DBVersion.__class__) + " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "DBVersion.create_new_version", (\
+                    description,\
+                        value))
+            except sqlite3.Error as error:
+                print("DBVersion.create_new_version " +\
+                    str(DBVersion.__class__) + " error:", error.args[0])
+                raise
 
     @staticmethod
     def create_new_version_extern_conn(description, value, connection):
@@ -79,43 +72,36 @@ class DBVersion():
 
         cursor = connection.cursor()
         try:
-            cursor.execute("""INSERT INTO DBVersion
-                              (Description, Value)
-                       VALUES ('{0}', {1})""".format(\
-                           description,\
-                               value))
+            cursor.execute(Statements.get("DBVersion.create_new_version"), (\
+                description,\
+                    value))
         except sqlite3.Error as error:
             print("DBVersion.create_new_version_extern_conn " +\
                 str(DBVersion.__class__) + " error:", error.args[0])
             raise
 
     @staticmethod
-    def get_current_version(db_name):
+    def get_current_version(db_conn):
 
         """Get current version of the data base"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
         obj = DBVersion.new("init", 0.0)
-        try:
-            cursor.execute("""SELECT DbVersionId,Description, Value
-                              FROM DBVersion 
-                              ORDER BY DbVersionId desc
-                              LIMIT 1""")
-
-            rows = cursor.fetchall()
-            if rows:
-                row = rows[0]
-                obj = DBVersion.new(\
-                    row[1],\
-                        row[2])
-
-                obj.db_version_id = row[0]
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("DBVersion.reload_from_db " + str(DBVersion.__class__) + " error:", error.args[0])
-            raise
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "DBVersion.get_current_version")
+
+                rows = cursor.fetchall()
+                if rows:
+                    row = rows[0]
+                    obj = DBVersion.new(\
+                        row[1],\
+                            row[2])
+
+                    obj.db_version_id = row[0]
+            except sqlite3.Error as error:
+                print("DBVersion.reload_from_db " + str(DBVersion.__class__) +\
+                    " error:", error.args[0])
+                raise
 
-        connection.close()
         return obj
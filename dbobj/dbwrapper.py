@@ -4,17 +4,20 @@ Module provides interface to db and corresponding
 class entities for data tables
 """
 
-import sqlite3
 import os
 import shutil
+import time as clock
 from datetime import datetime, timedelta
 
+from dbobj.dbconnection import DBConnection
 from dbobj.dbversion import DBVersion
 from dbobj.config import Config
 from dbobj.subjectworkunit import SubjectWorkUnit
 from dbobj.workunitentry import WorkUnitEntry
 from dbobj.scheduleseries import ScheduleSeries
 from dbobj.scheduleentry import ScheduleEntry
+from dbobj.scheduleseriesexception import ScheduleSeriesException
+from dbobj.dailyworkrollup import DailyWorkRollup
 from dbobj.subjecttype import SubjectType
 from dbobj.subject import Subject
 from dbobj.todolistitem import TodoListItem
@@ -29,8 +32,11 @@ from dbobj.workdaytimepercentage import WorkDayTimePercentage
 from dbobj.worktotaltimepercentage import WorkTotalTimePercentage
 from dbobj.worksubjecttimepercentage import WorkSubjectTimePercentage
 from dbobj.summary import Summary
+from dbobj.windowstats import WindowStats
+from dbobj.session import Session
 from dbobj.unittypes import UnitTypes
 from dbobj.subjecttypes import SubjectTypes
+from dbobj.scheduleexceptiontypes import ScheduleExceptionTypes
 
 # TODO: write tests for update_by_db_id
 
@@ -43,17 +49,27 @@ class DB():
 
     def __init__(self, db_name):
         self.db_name = db_name
+        # shared connections, handed to the rest of the application
+        # through the GlobalContext
+        self.db_conn = DBConnection(db_name)
+        # seconds every migration step of the last seed took, by version
+        self.migration_times = dict()
+        self.step_begin = None
 
     def init(self):
 
         """insert initial data into db"""
 
         print("initializing content...")
-        connection = sqlite3.connect(self.db_name)
-        Subject.init(connection)
-        SubjectType.init(connection)
-        connection.commit()
-        connection.close()
+        with self.db_conn.writer() as connection:
+            Subject.init(connection)
+            SubjectType.init(connection)
+
+    def close(self):
+
+        """close all db connections"""
+
+        self.db_conn.close()
 
     def seed(self, software_version, db_version):
 
@@ -63,7 +79,32 @@ class DB():
             return False
 
         diff = 0.01
-        connection = sqlite3.connect(self.db_name)
+        with self.db_conn.writer() as connection:
+            self.__migrate(connection, software_version, db_version, diff)
+
+        with open("./VERSION.INFO", "w") as e_file:
+            e_file.write(str(software_version))
+
+        return True
+
+    def __create_version(self, description, value, db_conn):
+
+        """
+        store the new db version and the time its migration step took
+        (don't use outside of DB)
+        """
+
+        DBVersion.create_new_version(description, value, db_conn)
+        now = clock.perf_counter()
+        self.migration_times["%.2f" % value] = now - self.step_begin
+        self.step_begin = now
+
+    def __migrate(self, connection, software_version, db_version, diff):
+
+        """run all migrations between db_version and software_version"""
+
+        self.migration_times = dict()
+        self.step_begin = clock.perf_counter()
         while software_version >= db_version:
             # Version 1.0
             # do all seedings from the start and change db version on the fly
@@ -76,76 +117,78 @@ class DB():
                 WorkUnitEntry.seed(connection)
                 SubjectWorkUnit.seed(connection)
 
-                DBVersion.create_new_version(\
+                self.__create_version(\
                     "Initial seed",\
                         db_version + diff,\
-                            self.db_name)
+                            self.db_conn)
                 db_version = db_version + diff
 
                 # initial migrations for 1.01
                 Config.seed(connection)
 
-                DBVersion.create_new_version(\
+                self.__create_version(\
                     "Create Config table",\
                         db_version + diff,\
-                            self.db_name)
+                            self.db_conn)
                 db_version = db_version + diff
 
                 # initial migrations for 1.02
                 TodoListItem.seed(connection)
 
-                DBVersion.create_new_version(\
+                self.__create_version(\
                     "Create TodoListItem",\
                         db_version + diff,\
-                            self.db_name)
+                            self.db_conn)
                 db_version = db_version + diff
 
                 # initial migrations for 1.03
-                DBVersion.create_new_version(\
+                self.__create_version(\
                     "Remove scheduled entries",\
                         db_version + diff,\
-                            self.db_name)
+                            self.db_conn)
                 db_version = db_version + diff
 
                 # initial migrations for 1.04
-                DBVersion.create_new_version(\
+                self.__create_version(\
                     "Add active flag for Subjects",\
                         db_version + diff,\
-                            self.db_name)
+                            self.db_conn)
                 db_version = db_version + diff
 
                 # initial migrations for 1.05
-                DBVersion.create_new_version(\
+                self.__create_version(\
                     "Add SubjectType",\
                         db_version + diff,\
-                            self.db_name)
+                            self.db_conn)
                 db_version = db_version + diff
 
             # Version 1.01
             if db_version == 1.01 - diff:
                 Config.seed(connection)
 
-                DBVersion.create_new_version(\
+                self.__create_version(\
                     "Create Config table",\
                         db_version + diff,\
-                            self.db_name)
+                            self.db_conn)
 
             # Version 1.02
             if db_version == 1.02 - diff:
                 TodoListItem.seed(connection)
 
-                DBVersion.create_new_version(\
+                self.__create_version(\
                     "Create TodoListItem",\
                         db_version + diff,\
-                            self.db_name)
+                            self.db_conn)
 
             if db_version == 1.03 - diff:
 
+                # the db runs in wal mode, move everything into the db file first
+                connection.execute("PRAGMA wal_checkpoint(FULL)")
                 shutil.copyfile("data.db", "data.db.old")
                 try:
                     stmt_check = """SELECT name FROM sqlite_master
                                     WHERE type IN ('table', 'index')
-                                      AND name IN ('{0}', '{1}', '{2}', '{3}', '{4}', '{5}')"""
+                                      AND name IN (?, ?, ?, ?, ?, ?)"""
 
                     stmt_schedule_1 = "ALTER TABLE ScheduleEntry RENAME TO ScheduleEntryOld"
                     stmt_schedule_2 = "DROP INDEX ScheduleEntry_SeriesId_I"
@@ -155,7 +198,7 @@ class DB():
                     stmt_series_3 = "DROP INDEX ScheduleSeries_EndDate_I"
                     cursor = connection.cursor()
 
-                    cursor.execute(stmt_check.format(\
+                    cursor.execute(stmt_check, (\
                         "ScheduleEntry",\
                             "ScheduleSeries",\
                                 "ScheduleEntry_SeriesId_I",\
@@ -231,15 +274,15 @@ class DB():
                                 series_obj, start_offset, start_time, end_time,\
                                     start_date, end_date)
                         obj_dict = dict()
-                        schedule_obj.series_to_db(schedule_obj, obj_dict, self.db_name)
+                        ScheduleEntry.series_to_db(schedule_obj, obj_dict, self.db_conn)
 
                     print(" Complete")
 
                     print("Create new DB version... ")
-                    DBVersion.create_new_version(\
+                    self.__create_version(\
                         "Remove scheduled entries",\
                             db_version + diff,\
-                                self.db_name)
+                                self.db_conn)
                     print(" Complete",)
 
                     print("Create new indices... ")
@@ -274,7 +317,6 @@ class DB():
                 except:
                     # something went wrong
                     connection.commit()
-                    connection.close()
                     raise Exception(\
                         """
                         ********************************
@@ -301,14 +343,12 @@ class DB():
                     cursor.execute(stmt4)
                     cursor.execute(stmt5)
 
-                    DBVersion.create_new_version(\
+                    self.__create_version(\
                     "Add active flag for Subjects",\
                         db_version + diff,\
-                            self.db_name)
+                            self.db_conn)
                 except:
                     # something went wrong
-                    connection.rollback()
-                    connection.close()
                     raise Exception(\
                         """
                         ********************************
@@ -330,10 +370,10 @@ class DB():
 
                 cursor = connection.cursor()
                 try:
-                    DBVersion.create_new_version(\
+                    self.__create_version(\
                     "Add SubjectType",\
                         db_version + diff,\
-                            self.db_name)
+                            self.db_conn)
 
                     cursor.execute(stmt1)
                     cursor.execute(stmt2)
@@ -344,8 +384,6 @@ class DB():
                     cursor.execute(stmt7)
                     cursor.execute(stmt8)
                 except:
-                    connection.rollback()
-                    connection.close()
                     raise Exception(\
                         """
                         ********************************
@@ -360,13 +398,11 @@ class DB():
 
                 cursor = connection.cursor()
                 try:
-                    DBVersion.create_new_version_extern_conn(\
+                    self.__create_version(\
                         "Add ScheduleEntry WorkUnitEntry connection",\
                             db_version + diff,\
-                                connection)
+                                self.db_conn)
                 except:
-                    connection.rollback()
-                    connection.close()
                     raise Exception(\
                         """
                         ********************************
@@ -374,12 +410,103 @@ class DB():
                         ********************************
                         """)
 
-            db_version = db_version + diff
+            if db_version == 1.07 - diff:
 
-        connection.commit()
-        connection.close()
+                # existing series keep their ScheduleEntry rows, only new series
+                # can store just their rule
+                stmt1 = "ALTER TABLE ScheduleSeries ADD IsVirtual integer DEFAULT 0"
+                stmt2 = "ALTER TABLE ScheduleSeries ADD DayOfWeek integer"
+                stmt3 = "ALTER TABLE ScheduleSeries ADD StartOffset integer"
+                stmt4 = "ALTER TABLE ScheduleSeries ADD StartTime integer"
+                stmt5 = "ALTER TABLE ScheduleSeries ADD EndTime integer"
+                stmt6 = "ALTER TABLE ScheduleSeries ADD EntryDescription text"
+                stmt7 = "CREATE INDEX ScheduleSeries_IsVirtual_I ON ScheduleSeries (IsVirtual)"
 
-        with open("./VERSION.INFO", "w") as e_file:
-            e_file.write(str(software_version))
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(stmt1)
+                    cursor.execute(stmt2)
+                    cursor.execute(stmt3)
+                    cursor.execute(stmt4)
+                    cursor.execute(stmt5)
+                    cursor.execute(stmt6)
+                    cursor.execute(stmt7)
 
-        return True
+                    ScheduleSeriesException.seed(connection)
+
+                    self.__create_version(\
+                        "Add virtual ScheduleSeries",\
+                            db_version + diff,\
+                                self.db_conn)
+                except:
+                    raise Exception(\
+                        """
+                        ********************************
+                        Migration to version 1.07 failed
+                        ********************************
+                        """)
+
+            if db_version == 1.08 - diff:
+
+                # summaries read the daily totals instead of every WorkUnitEntry
+                try:
+                    DailyWorkRollup.seed(connection)
+                    DailyWorkRollup.backfill(connection)
+
+                    self.__create_version(\
+                        "Add DailyWorkRollup",\
+                            db_version + diff,\
+                                self.db_conn)
+                except:
+                    raise Exception(\
+                        """
+                        ********************************
+                        Migration to version 1.08 failed
+                        ********************************
+                        """)
+
+            if db_version == 1.09 - diff:
+
+                # composite indexes in the order the window loaders sort by, the
+                # single column indexes they replace are a prefix of them or unused
+                stmt1 = "DROP INDEX IF EXISTS WorkUnitEntry_StartDate_I"
+                stmt2 = "DROP INDEX IF EXISTS WorkUnitEntry_EndDate_I"
+                stmt3 = "DROP INDEX IF EXISTS ScheduleEntry_SeriesId_I"
+                stmt4 = "DROP INDEX IF EXISTS SubjectWorkUnit_AtDate_I"
+                stmt5 = "DROP INDEX IF EXISTS ScheduleSeries_DateIndex_I"
+                stmt6 = "DROP INDEX IF EXISTS ScheduleSeries_EndDate_I"
+                stmt7 = """CREATE INDEX WorkUnitEntry_StartDate_StartTime_I
+                           ON WorkUnitEntry (StartDate, StartTime)"""
+                stmt8 = """CREATE INDEX WorkUnitEntry_EndDate_StartDate_I
+                           ON WorkUnitEntry (EndDate, StartDate)"""
+                stmt9 = """CREATE INDEX ScheduleEntry_SeriesId_AtDate_I
+                           ON ScheduleEntry (ScheduleSeriesId, AtDate)"""
+                stmt10 = """CREATE INDEX SubjectWorkUnit_AtDate_SubjectId_I
+                            ON SubjectWorkUnit (AtDate, SubjectId)"""
+
+                cursor = connection.cursor()
+                try:
+                    cursor.execute(stmt1)
+                    cursor.execute(stmt2)
+                    cursor.execute(stmt3)
+                    cursor.execute(stmt4)
+                    cursor.execute(stmt5)
+                    cursor.execute(stmt6)
+                    cursor.execute(stmt7)
+                    cursor.execute(stmt8)
+                    cursor.execute(stmt9)
+                    cursor.execute(stmt10)
+
+                    self.__create_version(\
+                        "Add composite indexes",\
+                            db_version + diff,\
+                                self.db_conn)
+                except:
+                    raise Exception(\
+                        """
+                        ********************************
+                        Migration to version 1.09 failed
+                        ********************************
+                        """)
+
+            db_version = db_version + diff
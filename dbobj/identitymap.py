@@ -0,0 +1,136 @@
+"""
+Module contains definition of IdentityMap and the session dicts using it
+
+Every reload of a loader used to create new objects for rows that were
+loaded before, so the ui could hold several objects for the same row.
+The session dicts keep one object per db id instead, a reloaded row
+refreshes the object that is already known.
+"""
+
+class IdentityMap(dict):
+
+    """
+    Class maps the key of a record to the one object representing it
+    """
+
+    def share(self, obj):
+
+        """
+        return the known object with the key of obj, it gets the values of
+        obj, obj itself becomes the known object if there is none yet
+        """
+
+        key = obj.key()
+        known = self.get(key)
+        if known is None:
+            self[key] = obj
+            return obj
+
+        if known is not obj:
+            for name in type(obj).__slots__:
+                setattr(known, name, getattr(obj, name))
+        return known
+
+class RecordDict(dict):
+
+    """
+    Class represents a dict of loaded records like context.subjects
+
+    Objects that are stored are exchanged with the known object of the
+    same key, so reloading the dict keeps the objects referenced by the ui.
+    Only item assignment, del and pop keep the identity map in sync, clear
+    keeps the known objects for the next reload.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.identity_map = IdentityMap()
+
+    def __setitem__(self, key, obj):
+        super().__setitem__(key, self.identity_map.share(obj))
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.identity_map.pop(key, None)
+
+    def pop(self, key, *default):
+
+        """remove key and forget its object"""
+
+        self.identity_map.pop(key, None)
+        return super().pop(key, *default)
+
+class ScheduleEntryDict(dict):
+
+    """
+    Class represents the loaded ScheduleEntry objects by key
+
+    All entries of a series share one ScheduleSeries object, series keeps
+    it by ScheduleSeriesId over reloads. by_series is the reverse index
+    ScheduleSeriesId -> {key: entry} of the loaded entries, so a change of
+    a series only touches the entries of that series.
+
+    If the series_obj of a stored entry is replaced, the entry has to be
+    stored again to move it in the index.
+    Only item assignment, del, pop and clear keep the index in sync.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.series = IdentityMap()
+        self.by_series = dict()
+        # key -> ScheduleSeriesId the entry is indexed with
+        self.series_ids = dict()
+
+    def __setitem__(self, key, obj):
+        self.__unindex(key)
+        obj.series_obj = self.series.share(obj.series_obj)
+        super().__setitem__(key, obj)
+
+        series_id = obj.series_obj.schedule_series_id
+        self.series_ids[key] = series_id
+        entries = self.by_series.get(series_id)
+        if entries is None:
+            entries = dict()
+            self.by_series[series_id] = entries
+        entries[key] = obj
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.__unindex(key)
+
+    def __unindex(self, key):
+
+        """
+        remove key from the reverse index
+        (don't use outside of ScheduleEntryDict)
+        """
+
+        series_id = self.series_ids.pop(key, None)
+        if series_id is None:
+            return
+        entries = self.by_series[series_id]
+        del entries[key]
+        if not entries:
+            del self.by_series[series_id]
+
+    def pop(self, key, *default):
+
+        """remove key from the dict and the index"""
+
+        self.__unindex(key)
+        return super().pop(key, *default)
+
+    def clear(self):
+
+        """remove all entries, the shared series objects are kept"""
+
+        super().clear()
+        self.by_series.clear()
+        self.series_ids.clear()
+
+    def entries_of(self, series_id):
+
+        """return the list of (key, entry) of the loaded entries of one series"""
+
+        return list(self.by_series.get(series_id, dict()).items())
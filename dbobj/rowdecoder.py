@@ -0,0 +1,148 @@
+"""
+Module contains definition of RowDecoder
+
+The loaders turn the integer dates (YYYYMMDD) and times (HHMM) of the db
+rows into python objects. The same few hundred values are decoded over
+and over, so every value is only converted once and then looked up.
+"""
+
+from datetime import datetime, timedelta
+from dbobj.helperfunctions import HelperFunctions as HF
+
+class DateTable(dict):
+
+    """
+    Class maps db date integers to python dates, a value is converted
+    the first time it's looked up, so the table covers the dates in use
+    """
+
+    def __missing__(self, date_value):
+        value = HF.date_2_python_date(date_value)
+        self[date_value] = value
+        return value
+
+class TimeTable(dict):
+
+    """
+    Class maps db time integers to python times, filled with all times
+    of a day when it's created
+    """
+
+    def __init__(self):
+        super().__init__()
+        for hour in range(0, 24):
+            for minute in range(0, 60):
+                self[hour*100 + minute] = HF.time_2_python_time(hour*100 + minute)
+
+    def __missing__(self, time_value):
+        # not a valid time, raises like the conversion would
+        return HF.time_2_python_time(time_value)
+
+class ShiftTable(dict):
+
+    """
+    Class maps db time integers of one start_offset to
+    (shifted python time, days the date moves), the same result as
+    (datetime.combine(day, time) + timedelta(hours=start_offset))
+    """
+
+    def __init__(self, start_offset, times):
+        super().__init__()
+        day = datetime(2000, 1, 2)
+        for time_value, value in times.items():
+            shifted = datetime.combine(day, value) + timedelta(hours=start_offset)
+            self[time_value] = (shifted.time(), (shifted - day).days)
+
+    def __missing__(self, time_value):
+        return (HF.time_2_python_time(time_value), 0)
+
+class OffsetTable(dict):
+
+    """
+    Class maps a start_offset to its ShiftTable, created on first use
+    """
+
+    def __init__(self, times):
+        super().__init__()
+        self.times = times
+
+    def __missing__(self, start_offset):
+        value = ShiftTable(start_offset, self.times)
+        self[start_offset] = value
+        return value
+
+class DateStringTable(dict):
+
+    """
+    Class maps db date integers to their string in one date format
+    """
+
+    def __init__(self, date_format, dates):
+        super().__init__()
+        self.date_format = date_format
+        self.dates = dates
+
+    def __missing__(self, date_value):
+        value = self.dates[date_value].strftime(self.date_format)
+        self[date_value] = value
+        return value
+
+class FormatTable(dict):
+
+    """
+    Class maps a date format to its DateStringTable, created on first use
+    """
+
+    def __init__(self, dates):
+        super().__init__()
+        self.dates = dates
+
+    def __missing__(self, date_format):
+        value = DateStringTable(date_format, self.dates)
+        self[date_format] = value
+        return value
+
+class RowDecoder():
+
+    """
+    Class holds the shared decoding tables
+
+    Loaders bind the tables to locals and index them per row:
+        DATES[20191001] -> date(2019, 10, 1)
+        TIMES[1412] -> time(14, 12)
+        SHIFTED_TIMES[start_offset][time_value] -> (time, day delta)
+        DATE_STRINGS[date_format][date_value] -> formatted date
+    """
+
+    DATES = DateTable()
+    TIMES = TimeTable()
+    SHIFTED_TIMES = OffsetTable(TIMES)
+    DATE_STRINGS = FormatTable(DATES)
+
+    @staticmethod
+    def date(date_value):
+
+        """transform a db date integer to a python date"""
+
+        return RowDecoder.DATES[date_value]
+
+    @staticmethod
+    def time(time_value):
+
+        """transform a db time integer to a python time"""
+
+        return RowDecoder.TIMES[time_value]
+
+    @staticmethod
+    def shifted_time(time_value, start_offset):
+
+        """transform a db time integer to the python time start_offset hours later"""
+
+        return RowDecoder.SHIFTED_TIMES[start_offset][time_value][0]
+
+    @staticmethod
+    def date_string(date_value, date_format):
+
+        """transform a db date integer to a string in date_format"""
+
+        return RowDecoder.DATE_STRINGS[date_format][date_value]
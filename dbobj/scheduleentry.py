@@ -5,7 +5,11 @@ Module contains definition of ScheduleEntry
 from datetime import datetime, timedelta
 import sqlite3
 from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.identitymap import ScheduleEntryDict
+from dbobj.rowdecoder import RowDecoder
 from dbobj.scheduleseries import ScheduleSeries
+from dbobj.scheduleseriesexception import ScheduleSeriesException
+from dbobj.scheduleexceptiontypes import ScheduleExceptionTypes
 
 class ScheduleEntry():
 
@@ -24,8 +28,22 @@ class ScheduleEntry():
     between bounding dates [start_date] and [end_date].
 
     description may contain anything the user likes.
+
+    If the series_obj is virtual, the entry is one occurrence of the rule
+    stored in the series. It only gets a schedule_entry_id (the negative
+    ScheduleSeriesExceptionId) once something is stored for that single
+    occurrence, like a booking or an own description.
+
+    All loaded entries of a series share one series_obj, a change of the
+    series_obj applies to all of them.
     """
 
+    __slots__ = ("schedule_entry_id", "series_obj", "start_offset", "start_time", "end_time",\
+        "at_date", "description")
+
+    # tables the entries of a window are read from
+    TABLES = ("ScheduleEntry", "ScheduleSeries", "ScheduleSeriesException")
+
     def __init__(self, series_obj, start_offset,\
         start_time, end_time, at_date, description):
 
@@ -37,14 +55,14 @@ class ScheduleEntry():
         self.at_date = at_date
         self.description = description
 
-    def __del__(self):
-        pass
-
     def key(self):
 
         """return uniform schedule entry key"""
 
         # don't change this without changing the remove_series_by_db_id
+        if self.series_obj.is_virtual:
+            # occurrences of virtual series may not have an id yet
+            return (self.series_obj.schedule_series_id, self.at_date)
         return self.schedule_entry_id
 
     def extended_copy(self, schedule_entry_id, series_obj, at_date, description):
@@ -101,11 +119,17 @@ class ScheduleEntry():
             start_time, end_time, at_date, description)
 
     @staticmethod
-    def __create_entry_series(schedule_obj, series_id, start_date, end_date, cursor):
+    def __create_entry_series(schedule_obj, series_id, start_date, end_date,\
+        window_start, window_end, cursor, db_conn):
 
         """
         Create schedule entry series
         (don't use outside of ScheduleEntry)
+
+        All weekly entries are inserted by one INSERT ... SELECT, objects are
+        only created for the entries within window_start and window_end
+        (everything if no window is given), the rest is loaded by
+        reload_from_db once it is displayed
         """
 
         c_date = start_date
@@ -118,43 +142,122 @@ class ScheduleEntry():
         if c_at_date < c_date:
             c_at_date = c_at_date + timedelta(hours=168)
 
+        if c_at_date > end_date:
+            return []
+
         start_offset = schedule_obj.start_offset
-        start_time = schedule_obj.start_time
-        end_time = schedule_obj.end_time
         description = schedule_obj.description
 
-        start_time = HF.time_2_db((datetime.combine(c_date, start_time) -\
+        start_time = HF.time_2_db((datetime.combine(c_date, schedule_obj.start_time) -\
             timedelta(hours=start_offset)).time())
-        end_time = HF.time_2_db((datetime.combine(c_date, end_time) -\
+        end_time = HF.time_2_db((datetime.combine(c_date, schedule_obj.end_time) -\
             timedelta(hours=start_offset)).time())
 
+        db_conn.execute(cursor, "ScheduleEntry.create_entry_series", {\
+            "first_date": c_at_date.isoformat(),\
+                "last_date": end_date.isoformat(),\
+                    "series_id": series_id,\
+                        "start_offset": start_offset,\
+                            "start_time": start_time,\
+                                "end_time": end_time,\
+                                    "description": description})
+
+        if window_start is not None:
+            c_at_date = max(c_at_date, window_start)
+        if window_end is not None:
+            end_date = min(end_date, window_end)
+        if c_at_date > end_date:
+            return []
+
+        db_conn.execute(cursor, "ScheduleEntry.load_created", (\
+            series_id,\
+                HF.date_2_db(c_at_date),\
+                    HF.date_2_db(end_date)))
+
+        # use an intermediate list in case of an exception
         obj_list = []
-        while c_at_date <= end_date:
-
-            cursor.execute("""INSERT INTO ScheduleEntry
-                            (ScheduleSeriesId, StartOffset,
-                            StartTime, EndTime, AtDate, Description)
-                            VALUES ({0}, {1}, {2}, {3}, {4}, '{5}')""".format(\
-                                series_id,\
-                                    start_offset,\
-                                        start_time,\
-                                            end_time,\
-                                                HF.date_2_db(c_at_date),\
-                                                    HF.escape_quote(description)))
-
-            # use an intermediate list in case of an exception
+        for row in cursor.fetchall():
             obj_list.append(\
                 schedule_obj.extended_copy(\
-                    cursor.lastrowid, schedule_obj.series_obj.copy(),\
+                    row[0], schedule_obj.series_obj,\
+                        RowDecoder.DATES[row[1]], description))
+
+        return obj_list
+
+    @staticmethod
+    def __expand_virtual_series(schedule_obj, day_of_week, exception_dict,\
+        window_start, window_end):
+
+        """
+        Create the occurrences of a virtual series within window_start and window_end
+        (don't use outside of ScheduleEntry)
+
+        schedule_obj is used as template for all occurrences and exception_dict
+        contains the ScheduleSeriesException objects of the window
+        """
+
+        series_obj = schedule_obj.series_obj
+        c_date = series_obj.start_date
+        end_date = series_obj.end_date
+        if window_start is not None:
+            c_date = max(c_date, window_start)
+        if window_end is not None:
+            end_date = min(end_date, window_end)
+
+        c_date = c_date + timedelta(days=(day_of_week - c_date.weekday()) % 7)
+
+        obj_list = []
+        while c_date <= end_date:
+            exception_obj = exception_dict.get((series_obj.schedule_series_id, c_date))
+            if exception_obj is None:
+                obj_list.append(schedule_obj.extended_copy(\
+                    None, series_obj, c_date, schedule_obj.description))
+            elif exception_obj.exception_type == ScheduleExceptionTypes.OVERRIDE:
+                description = schedule_obj.description
+                if exception_obj.description is not None:
+                    description = exception_obj.description
+                obj_list.append(schedule_obj.extended_copy(\
+                    -exception_obj.schedule_series_exception_id, series_obj,\
                         c_date, description))
 
-            c_date = c_date + timedelta(hours=168)
-            c_at_date = c_at_date + timedelta(hours=168)
+            c_date = c_date + timedelta(days=7)
 
         return obj_list
 
     @staticmethod
-    def series_to_db(schedule_obj, obj_dict, db_name):
+    def __db_times(obj):
+
+        """
+        return start_time and end_time of obj shifted by the start_offset
+        (don't use outside of ScheduleEntry)
+        """
+
+        start_time = (datetime.combine(obj.at_date, obj.start_time) -\
+            timedelta(hours=obj.start_offset)).time()
+        end_time = (datetime.combine(obj.at_date, obj.end_time) -\
+            timedelta(hours=obj.start_offset)).time()
+
+        return HF.time_2_db(start_time), HF.time_2_db(end_time)
+
+    @staticmethod
+    def __series_entries(obj_dict, series_id):
+
+        """
+        return the list of (key, entry) of the entries of one series in obj_dict
+        (don't use outside of ScheduleEntry)
+
+        A ScheduleEntryDict knows them, other dicts are scanned
+        """
+
+        if isinstance(obj_dict, ScheduleEntryDict):
+            items = obj_dict.entries_of(series_id)
+        else:
+            items = list(obj_dict.items())
+
+        return [i for i in items if i[1].series_obj.schedule_series_id == series_id]
+
+    @staticmethod
+    def series_to_db(schedule_obj, obj_dict, db_conn, window_start=None, window_end=None):
 
         """
         Store object to db
@@ -164,41 +267,54 @@ class ScheduleEntry():
         Descriptions for single entries may be updated using the
         update_by_db_id method
 
-        The connected series_obj is not shared between all schedule_obj of
+        The connected series_obj is shared between all schedule_obj of
         the same series
-        """
-
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        obj_list = []
-        try:
-            # store one single ScheduleSeries, take id and add it to every
-            # subsequent ScheduleEntry
-            ScheduleSeries.to_db(schedule_obj.series_obj, connection)
-
-            c_date = schedule_obj.series_obj.start_date
-            end_date = schedule_obj.series_obj.end_date
 
-            obj_list = ScheduleEntry.__create_entry_series(\
-                schedule_obj, schedule_obj.series_obj.series_id,\
-                    c_date, end_date, cursor)
+        Only entries within window_start and window_end are added to obj_dict
 
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("ScheduleEntry.series_to_db " +\
-                str(ScheduleEntry.__class__) + " error:", error.args[0])
-            raise
+        A virtual series only stores its rule, no ScheduleEntry rows
+        """
 
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            obj_list = []
+            try:
+                # store one single ScheduleSeries, take id and add it to every
+                # subsequent ScheduleEntry
+                ScheduleSeries.to_db(schedule_obj.series_obj, db_conn)
+
+                if schedule_obj.series_obj.is_virtual:
+                    start_time, end_time = ScheduleEntry.__db_times(schedule_obj)
+                    db_conn.execute(cursor, "ScheduleSeries.set_rule", (\
+                        schedule_obj.at_date.weekday(),\
+                            schedule_obj.start_offset,\
+                                start_time,\
+                                    end_time,\
+                                        schedule_obj.description,\
+                                            schedule_obj.series_obj.schedule_series_id))
+
+                    obj_list = ScheduleEntry.__expand_virtual_series(\
+                        schedule_obj, schedule_obj.at_date.weekday(), dict(),\
+                            window_start, window_end)
+                else:
+                    c_date = schedule_obj.series_obj.start_date
+                    end_date = schedule_obj.series_obj.end_date
+
+                    obj_list = ScheduleEntry.__create_entry_series(\
+                        schedule_obj, schedule_obj.series_obj.schedule_series_id,\
+                            c_date, end_date, window_start, window_end, cursor, db_conn)
+
+            except sqlite3.Error as error:
+                print("ScheduleEntry.series_to_db " +\
+                    str(ScheduleEntry.__class__) + " error:", error.args[0])
+                raise
 
         # add object to dict containing all subjects
         for obj in obj_list:
             obj_dict[obj.key()] = obj
 
     @staticmethod
-    def update_entry_by_db_id(obj, db_name):
+    def update_entry_by_db_id(obj, db_conn, obj_dict=None):
 
         """
         Update schedule entry db object using db id
@@ -209,267 +325,380 @@ class ScheduleEntry():
           1. create a series
           2. change start_time and end_time for some single days
           3. change description for some single days
-        """
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            start_time = (datetime.combine(obj.at_date, obj.start_time) -\
-                timedelta(hours=obj.start_offset)).time()
-            end_time = (datetime.combine(obj.at_date, obj.end_time) -\
-                timedelta(hours=obj.start_offset)).time()
-
-            cursor.execute("""UPDATE ScheduleEntry SET
-                              StartOffset = {0},
-                              StartTime = {1},
-                              EndTime = {2},
-                              AtDate = {3},
-                              Description = '{4}'
-                       WHERE ScheduleEntryId = {5}""".format(\
-                           obj.start_offset,\
-                               HF.time_2_db(start_time),\
-                                   HF.time_2_db(end_time),\
-                                       HF.date_2_db(obj.at_date),\
-                                           HF.escape_quote(obj.description),\
-                                               obj.schedule_entry_id))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("ScheduleEntry.update_entry_by_db_id " + str(ScheduleEntry.__class__) +\
-                " error:", error.args[0])
-            raise
+        An occurrence of a virtual series is detached from the series first,
+        it's moved to its new key in obj_dict if one is given
+        """
 
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                if obj.series_obj.is_virtual:
+                    ScheduleEntry.remove_entry_from_series_by_db_id(obj, db_conn, obj_dict)
+
+                start_time = (datetime.combine(obj.at_date, obj.start_time) -\
+                    timedelta(hours=obj.start_offset)).time()
+                end_time = (datetime.combine(obj.at_date, obj.end_time) -\
+                    timedelta(hours=obj.start_offset)).time()
+
+                db_conn.execute(cursor, "ScheduleEntry.update_entry_by_db_id", (\
+                    obj.start_offset,\
+                        HF.time_2_db(start_time),\
+                            HF.time_2_db(end_time),\
+                                HF.date_2_db(obj.at_date),\
+                                    obj.description,\
+                                        obj.schedule_entry_id))
+            except sqlite3.Error as error:
+                print("ScheduleEntry.update_entry_by_db_id " + str(ScheduleEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def update_series_by_series_id(obj, obj_dict, db_name):
+    def update_series_by_series_id(obj, obj_dict, db_conn, window_start=None, window_end=None):
 
         """
         Update a series by changing subject, type, description
         or start_date and end_date
 
         If start_date or end_date have been changed remove entries
-        outside of the new range or add new entries
+        outside of the new range or add new entries, only new entries
+        within window_start and window_end are added to obj_dict
         """
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        series_obj = obj.series_obj
-        new_obj_list = []
-        try:
-            start_date = HF.date_2_db(series_obj.start_date)
-            end_date = HF.date_2_db(series_obj.end_date)
-
-            cursor.execute("""SELECT StartDate, EndDate
-                              FROM ScheduleSeries
-                              WHERE ScheduleSeriesId = {0}""".format(\
-                                  series_obj.schedule_series_id))
-            rows = cursor.fetchall()
-
-            old_start_date = rows[0][0]
-            old_end_date = rows[0][1]
-
-            cursor.execute("""UPDATE ScheduleSeries SET
-                              TypeId = {0},
-                              SubjectId = {1},
-                              StartDate = {2},
-                              EndDate = {3},
-                              Description = '{4}'
-                              WHERE ScheduleSeriesId = {5}""".format(\
-                                  series_obj.type_id,\
-                                      series_obj.subject_id,\
-                                          start_date,\
-                                              end_date,\
-                                                  HF.escape_quote(series_obj.description),\
-                                                      series_obj.schedule_series_id))
-
-            cursor.execute("""UPDATE ScheduleEntry SET
-                              Description = '{0}'
-                       WHERE ScheduleEntryId = {1}""".format(\
-                           HF.escape_quote(obj.description),\
-                               obj.schedule_entry_id))
-
-            if old_start_date < start_date:
-                # remove entries that are outside of the series span now
-                cursor.execute("""DELETE FROM ScheduleEntry
-                                WHERE ScheduleSeriesId = {0}
-                                    AND AtDate < {1}""".format(\
-                                        series_obj.schedule_series_id,\
-                                            start_date))
-                keys = list(obj_dict.keys())
-                for i in keys:
-                    if obj_dict[i].at_date < series_obj.start_date:
-                        del obj_dict[i]
-
-            elif old_start_date > start_date:
-                # create new entries to fill the new series span
-                new_end_date = HF.date_2_python_date(old_start_date) -\
-                    timedelta(hours=24)
-
-                new_schedule_obj = ScheduleEntry.new(\
-                    series_obj,\
-                        obj.start_offset,\
-                            obj.start_time,\
-                                obj.end_time,\
-                                    obj.at_date,\
-                                        "")
-
-                new_obj_list.extend(\
-                    ScheduleEntry.__create_entry_series(\
-                        new_schedule_obj, series_obj.schedule_series_id, \
-                            series_obj.start_date, new_end_date, cursor))
-
-            if old_end_date > end_date:
-                # remove entries that are outside of the series span now
-                cursor.execute("""DELETE FROM ScheduleEntry
-                                WHERE ScheduleSeriesId = {0}
-                                    AND AtDate > {1}""".format(\
-                                        series_obj.schedule_series_id,\
-                                            end_date))
-                keys = list(obj_dict.keys())
-                for i in keys:
-                    if obj_dict[i].at_date > series_obj.end_date:
-                        del obj_dict[i]
-
-            elif old_end_date < end_date:
-                # create new entries to fill the new series span
-                new_start_date = HF.date_2_python_date(old_end_date) +\
-                    timedelta(hours=24)
-
-                new_schedule_obj = ScheduleEntry.new(\
+        if obj.series_obj.is_virtual:
+            ScheduleEntry.__update_virtual_series(\
+                obj, obj_dict, db_conn, window_start, window_end)
+            return
+
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            series_obj = obj.series_obj
+            new_obj_list = []
+            try:
+                start_date = HF.date_2_db(series_obj.start_date)
+                end_date = HF.date_2_db(series_obj.end_date)
+
+                db_conn.execute(cursor, "ScheduleSeries.load_dates", (\
+                    series_obj.schedule_series_id,))
+                rows = cursor.fetchall()
+
+                old_start_date = rows[0][0]
+                old_end_date = rows[0][1]
+
+                db_conn.execute(cursor, "ScheduleSeries.update_by_db_id", (\
+                    series_obj.type_id,\
+                        series_obj.subject_id,\
+                            start_date,\
+                                end_date,\
+                                    series_obj.description,\
+                                        series_obj.schedule_series_id))
+
+                db_conn.execute(cursor, "ScheduleEntry.update_description", (\
+                    obj.description,\
+                        obj.schedule_entry_id))
+
+                if old_start_date < start_date:
+                    # remove entries that are outside of the series span now
+                    db_conn.execute(cursor, "ScheduleEntry.delete_before", (\
+                        series_obj.schedule_series_id,\
+                            start_date))
+                    for key, entry in ScheduleEntry.__series_entries(\
+                        obj_dict, series_obj.schedule_series_id):
+                        if entry.at_date < series_obj.start_date:
+                            del obj_dict[key]
+
+                elif old_start_date > start_date:
+                    # create new entries to fill the new series span
+                    new_end_date = HF.date_2_python_date(old_start_date) -\
+                        timedelta(hours=24)
+
+                    new_schedule_obj = ScheduleEntry.new(\
+                        series_obj,\
+                            obj.start_offset,\
+                                obj.start_time,\
+                                    obj.end_time,\
+                                        obj.at_date,\
+                                            "")
+
+                    new_obj_list.extend(\
+                        ScheduleEntry.__create_entry_series(\
+                            new_schedule_obj, series_obj.schedule_series_id, \
+                                series_obj.start_date, new_end_date,\
+                                    window_start, window_end, cursor, db_conn))
+
+                if old_end_date > end_date:
+                    # remove entries that are outside of the series span now
+                    db_conn.execute(cursor, "ScheduleEntry.delete_after", (\
+                        series_obj.schedule_series_id,\
+                            end_date))
+                    for key, entry in ScheduleEntry.__series_entries(\
+                        obj_dict, series_obj.schedule_series_id):
+                        if entry.at_date > series_obj.end_date:
+                            del obj_dict[key]
+
+                elif old_end_date < end_date:
+                    # create new entries to fill the new series span
+                    new_start_date = HF.date_2_python_date(old_end_date) +\
+                        timedelta(hours=24)
+
+                    new_schedule_obj = ScheduleEntry.new(\
+                        series_obj,\
+                            obj.start_offset,\
+                                obj.start_time,\
+                                    obj.end_time,\
+                                        obj.at_date,\
+                                            "")
+
+                    new_obj_list.extend(\
+                        ScheduleEntry.__create_entry_series(\
+                            new_schedule_obj, series_obj.schedule_series_id, \
+                                new_start_date, series_obj.end_date,\
+                                    window_start, window_end, cursor, db_conn))
+
+            except sqlite3.Error as error:
+                print("ScheduleEntry.update_series_by_series_id " + str(ScheduleEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
+
+        # add object to dict containing all subjects
+        for s_obj in new_obj_list:
+            obj_dict[s_obj.key()] = s_obj
+
+    @staticmethod
+    def __update_virtual_series(obj, obj_dict, db_conn, window_start, window_end):
+
+        """
+        Update a virtual series (don't use outside of ScheduleEntry)
+
+        Only the rule of the series and the exception of obj are written,
+        the occurrences of the series in obj_dict are created again
+
+        Other than for stored series, start_time and end_time of obj apply
+        to every occurrence of the series
+        """
+
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            series_obj = obj.series_obj
+            series_id = series_obj.schedule_series_id
+            new_obj_list = []
+            try:
+                db_conn.execute(cursor, "ScheduleSeries.load_rule", (series_id,))
+                entry_description = cursor.fetchall()[0][2]
+
+                db_conn.execute(cursor, "ScheduleSeries.update_by_db_id", (\
+                    series_obj.type_id,\
+                        series_obj.subject_id,\
+                            HF.date_2_db(series_obj.start_date),\
+                                HF.date_2_db(series_obj.end_date),\
+                                    series_obj.description,\
+                                        series_id))
+
+                start_time, end_time = ScheduleEntry.__db_times(obj)
+                db_conn.execute(cursor, "ScheduleSeries.update_rule_times", (\
+                    obj.start_offset,\
+                        start_time,\
+                            end_time,\
+                                series_id))
+
+                # the description of one occurrence is stored as exception
+                description = obj.description
+                if description == entry_description:
+                    description = None
+
+                if obj.schedule_entry_id is not None:
+                    db_conn.execute(cursor, "ScheduleSeriesException.update_by_db_id", (\
+                        ScheduleExceptionTypes.OVERRIDE,\
+                            description,\
+                                0,\
+                                    -obj.schedule_entry_id))
+                elif description is not None:
+                    ScheduleSeriesException.to_db(ScheduleSeriesException.new(\
+                        series_id, obj.at_date, ScheduleExceptionTypes.OVERRIDE,\
+                            description, 0), db_conn)
+
+                # detached occurrences are stored entries now, their exceptions
+                # must stay in case the series grows again
+                db_conn.execute(cursor, "ScheduleSeriesException.delete_outside", (\
+                    series_id,\
+                        HF.date_2_db(series_obj.start_date),\
+                            HF.date_2_db(series_obj.end_date),\
+                                ScheduleExceptionTypes.DETACHED))
+
+                load_start = series_obj.start_date if window_start is None else window_start
+                load_end = series_obj.end_date if window_end is None else window_end
+                exception_dict = dict()
+                ScheduleSeriesException.reload_from_db(\
+                    exception_dict, load_start, load_end, db_conn)
+
+                template_obj = ScheduleEntry.new(\
                     series_obj,\
                         obj.start_offset,\
                             obj.start_time,\
                                 obj.end_time,\
                                     obj.at_date,\
-                                        "")
+                                        entry_description)
 
-                new_obj_list.extend(\
-                    ScheduleEntry.__create_entry_series(\
-                        new_schedule_obj, series_obj.schedule_series_id, \
-                            new_start_date, series_obj.end_date, cursor))
+                new_obj_list = ScheduleEntry.__expand_virtual_series(\
+                    template_obj, obj.at_date.weekday(), exception_dict,\
+                        window_start, window_end)
 
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("ScheduleEntry.update_series_by_series_id " + str(ScheduleEntry.__class__) +\
-                " error:", error.args[0])
-            raise
+            except sqlite3.Error as error:
+                print("ScheduleEntry.update_series_by_series_id " + str(ScheduleEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
 
-        connection.commit()
-        connection.close()
+        for key, _ in ScheduleEntry.__series_entries(obj_dict, series_id):
+            del obj_dict[key]
 
-        # add object to dict containing all subjects
         for s_obj in new_obj_list:
             obj_dict[s_obj.key()] = s_obj
 
     @staticmethod
-    def reload_from_db(obj_dict, start_date, end_date, db_name):
+    def __load_rows(start_date, end_date, db_conn):
 
         """
-        Load everything that has at_date within start_date and end_date
-
-        The connected series_obj is not shared between all schedule_obj of
-        the same series
+        return (entry rows, virtual series rows, exception dict) of the window
+        (don't use outside of ScheduleEntry)
         """
 
         start_date_val = HF.date_2_db(start_date)
         end_date_val = HF.date_2_db(end_date)
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            # for unscheduled StartDate and EndDate mark the outer boundaries
-            # presented by the calendar and the unit needs to be within it
-            cursor.execute("""SELECT sen.ScheduleEntryId,
-                                     sen.StartOffset,
-                                     sen.StartTime,
-                                     sen.EndTime,
-                                     sen.AtDate,
-                                     sen.Description AS Description1,
-                                     sse.ScheduleSeriesId,
-                                     sse.TypeId,
-                                     sse.SubjectId,
-                                     sse.StartDate,
-                                     sse.EndDate,
-                                     sse.Description AS Description2
-                              FROM ScheduleEntry sen
-                              INNER JOIN ScheduleSeries sse
-                                      ON sse.ScheduleSeriesId = sen.ScheduleSeriesId
-                              WHERE sen.AtDate >= {0} AND sen.AtDate <= {1}
-                              ORDER BY ScheduleEntryId""".format(\
-                                  start_date_val,\
-                                      end_date_val))
-
-            rows = cursor.fetchall()
-            obj_dict.clear()
-
-            for row in rows:
-                start_time = HF.time_2_python_time(row[2])
-                end_time = HF.time_2_python_time(row[3])
-                at_date = HF.date_2_python_date(row[4])
-
-                start_time = (datetime.combine(start_date, start_time) +\
-                    timedelta(hours=row[1])).time()
-                end_time = (datetime.combine(end_date, end_time) +\
-                    timedelta(hours=row[1])).time()
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                # for unscheduled StartDate and EndDate mark the outer boundaries
+                # presented by the calendar and the unit needs to be within it
+                db_conn.execute(cursor, "ScheduleEntry.reload_from_db", (\
+                    start_date_val,\
+                        end_date_val))
+                rows = cursor.fetchall()
+
+                db_conn.execute(cursor, "ScheduleSeries.load_virtual", (\
+                    end_date_val,\
+                        start_date_val))
+                virtual_rows = cursor.fetchall()
+            except sqlite3.Error as error:
+                print("ScheduleEntry.reload_from_db " + str(ScheduleEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
+
+        exception_dict = dict()
+        if virtual_rows:
+            ScheduleSeriesException.reload_from_db(exception_dict, start_date, end_date, db_conn)
+
+        return rows, virtual_rows, exception_dict
+
+    @staticmethod
+    def reload_from_db(obj_dict, start_date, end_date, db_conn):
+
+        """
+        Load everything that has at_date within start_date and end_date
+
+        The connected series_obj is shared between all schedule_obj of
+        the same series, a ScheduleEntryDict keeps it over reloads
 
+        Occurrences of virtual series are created for the window only
+        """
+
+        rows, virtual_rows, exception_dict = db_conn.window_cache.get(\
+            "ScheduleEntry.reload_from_db", ScheduleEntry.TABLES, start_date, end_date,\
+                lambda: ScheduleEntry.__load_rows(start_date, end_date, db_conn))
+
+        obj_dict.clear()
+
+        dates = RowDecoder.DATES
+        shifted_times = RowDecoder.SHIFTED_TIMES
+        # one series_obj per series, all its rows carry the same values
+        series_objs = dict()
+
+        for row in rows:
+            shifts = shifted_times[row[1]]
+
+            sse_obj = series_objs.get(row[6])
+            if sse_obj is None:
                 sse_obj = ScheduleSeries.new(\
                     row[7],\
                         row[8],\
-                            HF.date_2_python_date(row[9]),\
-                                HF.date_2_python_date(row[10]),\
+                            dates[row[9]],\
+                                dates[row[10]],\
                                     row[11])
                 sse_obj.schedule_series_id = row[6]
+                series_objs[row[6]] = sse_obj
+
+            sen_obj = ScheduleEntry.new(\
+                sse_obj,\
+                    row[1],\
+                        shifts[row[2]][0],\
+                            shifts[row[3]][0],\
+                                dates[row[4]],\
+                                    row[5])
+            sen_obj.schedule_entry_id = row[0]
+
+            obj_dict[sen_obj.key()] = sen_obj
+
+        for row in virtual_rows:
+            sse_obj = ScheduleSeries.new(\
+                row[1],\
+                    row[2],\
+                        dates[row[3]],\
+                            dates[row[4]],\
+                                row[5],\
+                                    1)
+            sse_obj.schedule_series_id = row[0]
+
+            shifts = shifted_times[row[7]]
+
+            template_obj = ScheduleEntry.new(\
+                sse_obj,\
+                    row[7],\
+                        shifts[row[8]][0],\
+                            shifts[row[9]][0],\
+                                sse_obj.start_date,\
+                                    row[10])
 
-                sen_obj = ScheduleEntry.new(\
-                    sse_obj,\
-                        row[1],\
-                            start_time,\
-                                end_time,\
-                                    at_date,\
-                                        row[5])
-                sen_obj.schedule_entry_id = row[0]
-
+            for sen_obj in ScheduleEntry.__expand_virtual_series(\
+                template_obj, row[6], exception_dict, start_date, end_date):
                 obj_dict[sen_obj.key()] = sen_obj
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("ScheduleEntry.reload_from_db " + str(ScheduleEntry.__class__) +\
-                " error:", error.args[0])
-            raise
-        connection.close()
 
     @staticmethod
-    def delete_entry_by_db_id(obj, obj_dict, db_name):
+    def delete_entry_by_db_id(obj, obj_dict, db_conn):
 
         """
         Delete schedule_obj from db and from corresponding obj_dict
 
         Don't delete the connected series_obj, allow for single days to be
         deleted in a series
-        """
-
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""DELETE FROM ScheduleEntry WHERE ScheduleEntryId = {0}""".format(\
-                obj.schedule_entry_id))
 
-            del obj_dict[obj.key()]
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("ScheduleEntry.delete_entry_by_db_id " + str(ScheduleEntry.__class__) +\
-                " error:", error.args[0])
-            raise
+        For virtual series the occurrence is marked as deleted
+        """
 
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                if not obj.series_obj.is_virtual:
+                    db_conn.execute(cursor, "ScheduleEntry.delete_entry_by_db_id", (\
+                        obj.schedule_entry_id,))
+                elif obj.schedule_entry_id is not None:
+                    db_conn.execute(cursor, "ScheduleSeriesException.update_by_db_id", (\
+                        ScheduleExceptionTypes.DELETED,\
+                            None,\
+                                0,\
+                                    -obj.schedule_entry_id))
+                else:
+                    ScheduleSeriesException.to_db(ScheduleSeriesException.new(\
+                        obj.series_obj.schedule_series_id, obj.at_date,\
+                            ScheduleExceptionTypes.DELETED, None, 0), db_conn)
+
+                del obj_dict[obj.key()]
+            except sqlite3.Error as error:
+                print("ScheduleEntry.delete_entry_by_db_id " + str(ScheduleEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def delete_series_by_db_id(obj, obj_dict, db_name):
+    def delete_series_by_db_id(obj, obj_dict, db_conn):
 
         """
         Delete one whole data series
@@ -477,33 +706,26 @@ class ScheduleEntry():
         Delete schedule_obj and series_obj
         """
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        series_id = obj.series_obj.schedule_series_id
-        try:
-            cursor.execute("""DELETE FROM ScheduleEntry WHERE ScheduleSeriesId = {0}""".format(\
-                series_id))
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            series_id = obj.series_obj.schedule_series_id
+            try:
+                db_conn.execute(cursor, "ScheduleEntry.delete_by_series_id", (series_id,))
 
-            cursor.execute("""DELETE FROM ScheduleSeries WHERE ScheduleSeriesId = {0}""".format(\
-                series_id))
+                db_conn.execute(cursor, "ScheduleSeriesException.delete_by_series_id", (series_id,))
 
-            key_list = list(obj_dict.keys())
-            for i in key_list:
-                if obj_dict[i].series_obj.schedule_series_id == series_id:
-                    del obj_dict[i]
+                db_conn.execute(cursor, "ScheduleSeries.delete_by_db_id", (series_id,))
 
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("ScheduleEntry.delete_series_by_db_id " + str(ScheduleEntry.__class__) +\
-                " error:", error.args[0])
-            raise
+                for key, _ in ScheduleEntry.__series_entries(obj_dict, series_id):
+                    del obj_dict[key]
 
-        connection.commit()
-        connection.close()
+            except sqlite3.Error as error:
+                print("ScheduleEntry.delete_series_by_db_id " + str(ScheduleEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def remove_series_by_db_id(obj, obj_dict, db_name):
+    def remove_series_by_db_id(obj, obj_dict, db_conn):
 
         """
         Remove one series by setting single days to every entry of
@@ -512,93 +734,231 @@ class ScheduleEntry():
         Deletes series_obj but keeps all schedule_obj
         """
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        series_id = obj.series_obj.schedule_series_id
-        change_list = []
-        try:
-            cursor.execute("""SELECT
-                                ScheduleEntryId,
-                                AtDate
-                              FROM ScheduleEntry
-                              WHERE ScheduleSeriesId = {0}
-                              ORDER BY AtDate ASC""".format(\
-                                  series_id))
-
-            rows = cursor.fetchall()
-            for row in rows:
-                se_date = HF.date_2_python_date(row[1])
-                series_obj = ScheduleSeries.new(\
-                    obj.series_obj.type_id,\
-                        obj.series_obj.subject_id,\
-                            se_date,\
+        if obj.series_obj.is_virtual:
+            ScheduleEntry.__remove_virtual_series(obj, obj_dict, db_conn)
+            return
+
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            series_id = obj.series_obj.schedule_series_id
+            change_list = []
+            try:
+                db_conn.execute(cursor, "ScheduleEntry.load_by_series_id", (series_id,))
+
+                rows = cursor.fetchall()
+                for row in rows:
+                    se_date = RowDecoder.DATES[row[1]]
+                    series_obj = ScheduleSeries.new(\
+                        obj.series_obj.type_id,\
+                            obj.series_obj.subject_id,\
                                 se_date,\
-                                    obj.series_obj.description)
+                                    se_date,\
+                                        obj.series_obj.description)
 
-                ScheduleSeries.to_db(series_obj, connection)
+                    ScheduleSeries.to_db(series_obj, db_conn)
 
-                cursor.execute("""UPDATE ScheduleEntry SET ScheduleSeriesId = {0}
-                                  WHERE ScheduleEntryId = {1}""".format(\
-                                      series_obj.schedule_series_id, row[0]))
+                    db_conn.execute(cursor, "ScheduleEntry.set_series_id", (\
+                        series_obj.schedule_series_id, row[0]))
 
-                change_list.append((row[0], series_obj))
+                    change_list.append((row[0], series_obj))
 
-            cursor.execute("""DELETE FROM ScheduleSeries WHERE ScheduleSeriesId = {0}""".format(\
-                series_id))
+                db_conn.execute(cursor, "ScheduleSeries.delete_by_db_id", (series_id,))
 
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("ScheduleEntry.remove_series_by_db_id " + str(ScheduleEntry.__class__) +\
-                " error:", error.args[0])
-            raise
+            except sqlite3.Error as error:
+                print("ScheduleEntry.remove_series_by_db_id " + str(ScheduleEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
+
+        # obj_dict only contains the displayed entries of the series, they
+        # are stored again to move them to their new series
+        for i in change_list:
+            entry = obj_dict.get(i[0])
+            if entry is not None:
+                entry.series_obj = i[1]
+                obj_dict[i[0]] = entry
+
+    @staticmethod
+    def __remove_virtual_series(obj, obj_dict, db_conn):
 
-        connection.commit()
-        connection.close()
+        """
+        Remove one virtual series by storing every remaining occurrence
+        as single day entry (don't use outside of ScheduleEntry)
+        """
+
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            series_obj = obj.series_obj
+            series_id = series_obj.schedule_series_id
+            change_list = []
+            try:
+                exception_dict = dict()
+                ScheduleSeriesException.reload_from_db(\
+                    exception_dict, series_obj.start_date, series_obj.end_date, db_conn)
+
+                db_conn.execute(cursor, "ScheduleSeries.load_rule", (series_id,))
+                entry_description = cursor.fetchall()[0][2]
+
+                template_obj = ScheduleEntry.new(\
+                    series_obj,\
+                        obj.start_offset,\
+                            obj.start_time,\
+                                obj.end_time,\
+                                    obj.at_date,\
+                                        entry_description)
 
-        for obj in change_list:
-            obj_dict[obj[0]].series_obj = obj[1]
+                for sen_obj in ScheduleEntry.__expand_virtual_series(\
+                    template_obj, obj.at_date.weekday(), exception_dict, None, None):
+                    old_key = sen_obj.key()
+                    ScheduleEntry.__detach_occurrence(sen_obj, cursor, db_conn)
+                    change_list.append((old_key, sen_obj))
+
+                db_conn.execute(cursor, "ScheduleSeriesException.delete_by_series_id", (series_id,))
+
+                db_conn.execute(cursor, "ScheduleSeries.delete_by_db_id", (series_id,))
+
+            except sqlite3.Error as error:
+                print("ScheduleEntry.remove_series_by_db_id " + str(ScheduleEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
+
+        # obj_dict only contains the displayed entries of the series
+        for i in change_list:
+            if i[0] in obj_dict:
+                del obj_dict[i[0]]
+                obj_dict[i[1].key()] = i[1]
 
     @staticmethod
-    def remove_entry_from_series_by_db_id(obj, db_name):
+    def __detach_occurrence(obj, cursor, db_conn):
+
+        """
+        Store one occurrence of a virtual series as entry with an own
+        single day series (don't use outside of ScheduleEntry)
+
+        Bookings of the occurrence are moved to the new entry
+        """
+
+        series_obj = ScheduleSeries.new(\
+            obj.series_obj.type_id,\
+                obj.series_obj.subject_id,\
+                    obj.at_date,\
+                        obj.at_date,\
+                            obj.series_obj.description)
+
+        ScheduleSeries.to_db(series_obj, db_conn)
+
+        sen_obj = ScheduleEntry.__create_entry_series(\
+            obj, series_obj.schedule_series_id, obj.at_date, obj.at_date,\
+                None, None, cursor, db_conn)[0]
+
+        if obj.schedule_entry_id is None:
+            ScheduleSeriesException.to_db(ScheduleSeriesException.new(\
+                obj.series_obj.schedule_series_id, obj.at_date,\
+                    ScheduleExceptionTypes.DETACHED, None, sen_obj.schedule_entry_id), db_conn)
+        else:
+            db_conn.execute(cursor, "ScheduleSeriesException.update_by_db_id", (\
+                ScheduleExceptionTypes.DETACHED,\
+                    None,\
+                        sen_obj.schedule_entry_id,\
+                            -obj.schedule_entry_id))
+
+            db_conn.execute(cursor, "WorkUnitEntry.move_bookings", (\
+                sen_obj.schedule_entry_id,\
+                    obj.schedule_entry_id))
+
+        obj.schedule_entry_id = sen_obj.schedule_entry_id
+        obj.series_obj = series_obj
+
+    @staticmethod
+    def remove_entry_from_series_by_db_id(obj, db_conn, obj_dict=None):
 
         """
         Remove the series_obj from one entry and create a new series_obj
         for that entry with just one day
 
         Leave the series untouched except for that
+
+        An occurrence of a virtual series is stored as entry, obj gets
+        the new schedule_entry_id and with it a new key
+
+        If obj_dict is given, obj is stored there again under its new key
+        and with its new series_obj
         """
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        series_obj = None
-        try:
-            series_obj = ScheduleSeries.new(\
-                obj.series_obj.type_id,\
-                    obj.series_obj.subject_id,\
-                        obj.at_date,\
+        old_key = obj.key()
+        if obj.series_obj.is_virtual:
+            with db_conn.writer() as connection:
+                cursor = connection.cursor()
+                try:
+                    ScheduleEntry.__detach_occurrence(obj, cursor, db_conn)
+                except sqlite3.Error as error:
+                    print("ScheduleEntry.remove_entry_from_series_by_db_id " +\
+                        str(ScheduleEntry.__class__) +\
+                        " error:", error.args[0])
+                    raise
+            ScheduleEntry.__store_again(obj, old_key, obj_dict)
+            return
+
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            series_obj = None
+            try:
+                series_obj = ScheduleSeries.new(\
+                    obj.series_obj.type_id,\
+                        obj.series_obj.subject_id,\
                             obj.at_date,\
-                                obj.series_obj.description)
-
-            ScheduleSeries.to_db(series_obj, connection)
+                                obj.at_date,\
+                                    obj.series_obj.description)
 
-            cursor.execute("""UPDATE ScheduleEntry SET ScheduleSeriesId = {0}
-                                WHERE ScheduleEntryId = {1}""".format(\
-                                    series_obj.schedule_series_id,\
-                                        obj.schedule_entry_id))
+                ScheduleSeries.to_db(series_obj, db_conn)
 
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("ScheduleEntry.remove_entry_from_series_by_db_id " +\
-                str(ScheduleEntry.__class__) +\
-                " error:", error.args[0])
-            raise
+                db_conn.execute(cursor, "ScheduleEntry.set_series_id", (\
+                    series_obj.schedule_series_id,\
+                        obj.schedule_entry_id))
 
-        connection.commit()
-        connection.close()
+            except sqlite3.Error as error:
+                print("ScheduleEntry.remove_entry_from_series_by_db_id " +\
+                    str(ScheduleEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
 
         obj.series_obj = series_obj
+        ScheduleEntry.__store_again(obj, old_key, obj_dict)
+
+    @staticmethod
+    def __store_again(obj, old_key, obj_dict):
+
+        """
+        store obj in obj_dict again after its key or series_obj changed
+        (don't use outside of ScheduleEntry)
+        """
+
+        if obj_dict is None or old_key not in obj_dict:
+            return
+        del obj_dict[old_key]
+        obj_dict[obj.key()] = obj
+
+    @staticmethod
+    def occurrence_to_db(obj, db_conn):
+
+        """
+        Make sure obj has a schedule_entry_id that can be used for bookings
+
+        Entries of stored series have one already, for an occurrence of a
+        virtual series an exception without own description is stored
+        """
+
+        if obj.schedule_entry_id is not None:
+            return
+
+        exception_obj = ScheduleSeriesException.new(\
+            obj.series_obj.schedule_series_id,\
+                obj.at_date,\
+                    ScheduleExceptionTypes.OVERRIDE,\
+                        None,\
+                            0)
+
+        ScheduleSeriesException.to_db(exception_obj, db_conn)
+        obj.schedule_entry_id = -exception_obj.schedule_series_exception_id
 
     @staticmethod
     def compare(obj1, obj2):
@@ -606,10 +966,9 @@ class ScheduleEntry():
         """compare two ScheduleEntry objects"""
 
         return obj1.schedule_entry_id == obj2.schedule_entry_id and\
-            obj1.serial_id == obj2.serial_id and\
-                obj1.start_offset == obj2.start_offset and\
-                    obj1.start_time == obj2.start_time and\
-                        obj1.end_time == obj2.end_time and\
-                            obj1.at_date == obj2.at_date and\
-                                obj1.description == obj2.description and\
-                                    ScheduleSeries.compare(obj1.series_obj, obj2.series_obj)
+            obj1.start_offset == obj2.start_offset and\
+                obj1.start_time == obj2.start_time and\
+                    obj1.end_time == obj2.end_time and\
+                        obj1.at_date == obj2.at_date and\
+                            obj1.description == obj2.description and\
+                                ScheduleSeries.compare(obj1.series_obj, obj2.series_obj)
@@ -0,0 +1,18 @@
+"""
+Module contains definition of ScheduleExceptionTypes
+"""
+
+class ScheduleExceptionTypes():
+
+    """
+    Class defines the types of exceptions for single occurrences
+    of a virtual schedule series
+    """
+
+    # occurrence stays in the series, but has an own id for bookings
+    # and optionally an own description
+    OVERRIDE = 0
+    # occurrence was moved to a stored ScheduleEntry with an own series
+    DETACHED = 1
+    # occurrence was deleted
+    DELETED = 2
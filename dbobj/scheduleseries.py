@@ -10,18 +10,22 @@ class ScheduleSeries():
 
     """
     Class represents one series object
+
+    If is_virtual = 1 the series only stores its rule (day of week, times)
+    and the ScheduleEntry occurrences are created when they are loaded
     """
 
-    def __init__(self, type_id, subject_id, start_date, end_date, description):
+    __slots__ = ("schedule_series_id", "type_id", "subject_id", "start_date", "end_date",\
+        "description", "is_virtual")
+
+    def __init__(self, type_id, subject_id, start_date, end_date, description, is_virtual=0):
         self.schedule_series_id = None
         self.type_id = type_id
         self.subject_id = subject_id
         self.start_date = start_date
         self.end_date = end_date
         self.description = description
-
-    def __del__(self):
-        pass
+        self.is_virtual = is_virtual
 
     def key(self):
 
@@ -34,7 +38,7 @@ class ScheduleSeries():
         """return a copy of this object"""
 
         obj = ScheduleSeries(self.type_id, self.subject_id,\
-            self.start_date, self.end_date, self.description)
+            self.start_date, self.end_date, self.description, self.is_virtual)
         obj.schedule_series_id = self.schedule_series_id
         return obj
 
@@ -68,92 +72,75 @@ class ScheduleSeries():
             raise
 
     @staticmethod
-    def new(type_id, subject_id, start_date, end_date, description):
+    def new(type_id, subject_id, start_date, end_date, description, is_virtual=0):
 
         """Create a new instance"""
 
-        return ScheduleSeries(type_id, subject_id, start_date, end_date, description)
+        return ScheduleSeries(type_id, subject_id, start_date, end_date, description, is_virtual)
 
     @staticmethod
-    def to_db(obj, db_connection):
+    def to_db(obj, db_conn):
 
         """
         store object to db
         has no obj_dict because it's stored in a ScheduleEntry
-        it also has a db_connection in order to be faster and force correct usage
-        a little bit better
+        it is always called inside of the writer block of a ScheduleEntry
+        method, so it joins the transaction of that method
         """
 
-        cursor = db_connection.cursor()
-        try:
-            cursor.execute("""INSERT INTO ScheduleSeries
-                              (TypeId, SubjectId, StartDate, EndDate, Description)
-                       VALUES ({0}, {1}, {2}, {3}, '{4}')""".format(\
-                           obj.type_id,\
-                               obj.subject_id,\
-                                   HF.date_2_db(obj.start_date),\
-                                       HF.date_2_db(obj.end_date),\
-                                           HF.escape_quote(obj.description)))
-        except sqlite3.Error as error:
-            print("ScheduleSeries.to_db " +\
-                str(ScheduleSeries.__class__) + " error:", error.args[0])
-            raise
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "ScheduleSeries.to_db", (\
+                    obj.type_id,\
+                        obj.subject_id,\
+                            HF.date_2_db(obj.start_date),\
+                                HF.date_2_db(obj.end_date),\
+                                    obj.description))
+            except sqlite3.Error as error:
+                print("ScheduleSeries.to_db " +\
+                    str(ScheduleSeries.__class__) + " error:", error.args[0])
+                raise
 
         # add object to dict containing all subjects
-        obj.series_id = cursor.lastrowid
+        obj.schedule_series_id = cursor.lastrowid
 
     @staticmethod
-    def update_by_db_id(obj, db_name):
+    def update_by_db_id(obj, db_conn):
 
         """update db object using db id"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""UPDATE ScheduleSeries SET
-                                     TypeId = {0},
-                                     SubjectId = {1},
-                                     StartDate = {2},
-                                     EndDate = {3},
-                                     Description = '{4}'
-                              WHERE ScheduleSeriesId = {5}""".format(\
-                                  obj.type_id,\
-                                      obj.subject_id,\
-                                          HF.date_2_db(obj.start_date),\
-                                              HF.date_2_db(obj.end_date),\
-                                                  HF.escape_quote(obj.description),\
-                                                      obj.schedule_series_id))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("ScheduleSeries.update_by_db_id " + str(ScheduleSeries.__class__) +\
-                " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "ScheduleSeries.update_by_db_id", (\
+                    obj.type_id,\
+                        obj.subject_id,\
+                            HF.date_2_db(obj.start_date),\
+                                HF.date_2_db(obj.end_date),\
+                                    obj.description,\
+                                        obj.schedule_series_id))
+            except sqlite3.Error as error:
+                print("ScheduleSeries.update_by_db_id " + str(ScheduleSeries.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def delete_by_db_id(obj, obj_dict, db_name):
+    def delete_by_db_id(obj, obj_dict, db_conn):
 
         """delete obj from db and from corresponding obj_dict"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""DELETE FROM ScheduleSeries WHERE ScheduleSeriesId = {0}""".format(\
-                obj.subject_series_id))
-
-            del obj_dict[obj.key()]
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("ScheduleSeries.delete_by_db_id " + str(ScheduleSeries.__class__) +\
-                " error:", error.args[0])
-            raise
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "ScheduleSeries.delete_by_db_id", (\
+                    obj.schedule_series_id,))
 
-        connection.commit()
-        connection.close()
+                del obj_dict[obj.key()]
+            except sqlite3.Error as error:
+                print("ScheduleSeries.delete_by_db_id " + str(ScheduleSeries.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
     def compare(obj1, obj2):
@@ -165,4 +152,5 @@ class ScheduleSeries():
                 obj1.subject_id == obj2.subject_id and\
                     obj1.start_date == obj2.start_date and\
                         obj1.end_date == obj2.end_date and\
-                            obj1.description == obj2.description
+                            obj1.description == obj2.description and\
+                                obj1.is_virtual == obj2.is_virtual
@@ -0,0 +1,151 @@
+"""
+Module contains definition of ScheduleSeriesException
+"""
+
+import sqlite3
+from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.rowdecoder import RowDecoder
+
+class ScheduleSeriesException():
+
+    """
+    Class represents one exception of a virtual ScheduleSeries at one at_date
+
+    Occurrences of a virtual series are not stored, everything that differs
+    from the rule of the series (own description, bookings, detached or
+    deleted occurrences) is stored as exception
+    """
+
+    __slots__ = ("schedule_series_exception_id", "schedule_series_id", "at_date",\
+        "exception_type", "description", "schedule_entry_id")
+
+    def __init__(self, schedule_series_id, at_date, exception_type,\
+        description, schedule_entry_id):
+        self.schedule_series_exception_id = None
+        self.schedule_series_id = schedule_series_id
+        self.at_date = at_date
+        self.exception_type = exception_type
+        self.description = description
+        self.schedule_entry_id = schedule_entry_id
+
+    def key(self):
+
+        """return uniform key for exception, there is only one per occurrence"""
+
+        return (self.schedule_series_id, self.at_date)
+
+    @staticmethod
+    def seed(db_connection):
+
+        """create object table in database"""
+
+        cursor = db_connection.cursor()
+        try:
+            cursor.execute("""CREATE TABLE ScheduleSeriesException
+                        (ScheduleSeriesExceptionId integer PRIMARY KEY autoincrement,
+                        ScheduleSeriesId integer,
+                        AtDate integer,
+                        ExceptionType integer,
+                        Description text,
+                        ScheduleEntryId integer DEFAULT 0,
+                        CreatedTS DEFAULT CURRENT_TIMESTAMP,
+                        ModifiedTS DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (ScheduleSeriesId) REFERENCES ScheduleSeries(ScheduleSeriesId),
+                        UNIQUE(ScheduleSeriesId, AtDate))""")
+
+            cursor.execute(\
+                "CREATE INDEX ScheduleSeriesException_AtDate_I ON ScheduleSeriesException (AtDate)")
+        except sqlite3.Error as error:
+            print("ScheduleSeriesException.Seeding " + str(ScheduleSeriesException.__class__) +\
+                " error:", error.args[0])
+            raise
+
+    @staticmethod
+    def new(schedule_series_id, at_date, exception_type, description, schedule_entry_id):
+
+        """Create a new instance"""
+
+        return ScheduleSeriesException(\
+            schedule_series_id, at_date, exception_type, description, schedule_entry_id)
+
+    @staticmethod
+    def to_db(obj, db_conn):
+
+        """
+        store object to db
+        has no obj_dict because it's only used by ScheduleEntry
+        """
+
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "ScheduleSeriesException.to_db", (\
+                    obj.schedule_series_id,\
+                        HF.date_2_db(obj.at_date),\
+                            obj.exception_type,\
+                                obj.description,\
+                                    obj.schedule_entry_id))
+            except sqlite3.Error as error:
+                print("ScheduleSeriesException.to_db " +\
+                    str(ScheduleSeriesException.__class__) + " error:", error.args[0])
+                raise
+
+        obj.schedule_series_exception_id = cursor.lastrowid
+
+    @staticmethod
+    def update_by_db_id(obj, db_conn):
+
+        """update object using db id"""
+
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "ScheduleSeriesException.update_by_db_id", (\
+                    obj.exception_type,\
+                        obj.description,\
+                            obj.schedule_entry_id,\
+                                obj.schedule_series_exception_id))
+            except sqlite3.Error as error:
+                print("ScheduleSeriesException.update_by_db_id " +\
+                    str(ScheduleSeriesException.__class__) + " error:", error.args[0])
+                raise
+
+    @staticmethod
+    def reload_from_db(obj_dict, start_date, end_date, db_conn):
+
+        """load all exceptions of virtual series with at_date within start_date and end_date"""
+
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "ScheduleSeriesException.reload_from_db", (\
+                    HF.date_2_db(start_date),\
+                        HF.date_2_db(end_date)))
+
+                rows = cursor.fetchall()
+                obj_dict.clear()
+                for row in rows:
+                    obj = ScheduleSeriesException.new(\
+                        row[1],\
+                            RowDecoder.DATES[row[2]],\
+                                row[3],\
+                                    row[4],\
+                                        row[5])
+                    obj.schedule_series_exception_id = row[0]
+                    obj_dict[obj.key()] = obj
+            except sqlite3.Error as error:
+                print("ScheduleSeriesException.reload_from_db " +\
+                    str(ScheduleSeriesException.__class__) + " error:", error.args[0])
+                raise
+
+    @staticmethod
+    def compare(obj1, obj2):
+
+        """compare two ScheduleSeriesException objects"""
+
+        return obj1.schedule_series_exception_id == obj2.schedule_series_exception_id and\
+            obj1.schedule_series_id == obj2.schedule_series_id and\
+                obj1.at_date == obj2.at_date and\
+                    obj1.exception_type == obj2.exception_type and\
+                        obj1.description == obj2.description and\
+                            obj1.schedule_entry_id == obj2.schedule_entry_id
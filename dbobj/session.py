@@ -0,0 +1,336 @@
+"""
+Module contains definition of Session
+
+One user action often calls several dbobj functions in a row, every one
+of them committed its own transaction. A Session collects them instead
+and writes them in one transaction.
+"""
+
+class Session():
+
+    """
+    Class represents the unit of work of the ui
+
+    The dbobj functions that store, update or delete an object are
+    registered with add, update and delete instead of being called:
+        session.add(TodoListItem.to_db, obj, obj_dict)
+    They're called later as function(obj, *args, db_conn=db_conn, **kwargs)
+    in the order they were registered.
+
+    The outermost "with session:" block flushes when it's left, all
+    operations are written in one transaction and afterwards every
+    registered notification is called once. If the block or one of the
+    operations raises, nothing is written and the operations are dropped.
+
+    The transaction is a command of db_conn.write_behind, if that is
+    enabled flush returns before it's written. The notifications are
+    then handed to dispatch, which has to call them on the gui thread.
+
+    The dicts of the gui must not change on the writer thread. Every dict
+    argument of a queued operation is replaced by a copy, the changes the
+    operation makes to the copy are done to the dict of the gui right
+    before the notifications. Following flushes change the same copy as
+    long as the earlier ones aren't written, so they see each other.
+
+    new, dirty and deleted map id(obj) -> obj of the pending operations.
+    An update of a new object is dropped (it's stored with its state at
+    flush), an object that is deleted before it was stored isn't written
+    at all and an object that is updated twice by the same function is
+    only written once.
+    """
+
+    NEW = 0
+    DIRTY = 1
+    DELETED = 2
+
+    def __init__(self, db_conn, dispatch=None):
+        self.db_conn = db_conn
+        self.dispatch = dispatch
+
+        # [kind, function, obj, args, kwargs] in registration order
+        self.operations = list()
+        self.new = dict()
+        self.dirty = dict()
+        self.deleted = dict()
+        # (function, args) called once after the next flush
+        self.notifications = list()
+        self.depth = 0
+        # id(obj_dict) -> [obj_dict, copy, flush count] of the dicts that
+        # queued flushes change
+        self.stages = dict()
+
+        self.flushes = 0
+        self.written = 0
+        self.dropped = 0
+
+    def __enter__(self):
+        self.depth = self.depth + 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.depth = self.depth - 1
+        if self.depth == 0:
+            if exc_type is None:
+                self.flush()
+            else:
+                self.discard()
+        return False
+
+    def add(self, function, obj, *args, **kwargs):
+
+        """register obj as new, function stores it"""
+
+        self.new[id(obj)] = obj
+        self.operations.append([Session.NEW, function, obj, args, kwargs])
+        self.__flush_outside()
+
+    def update(self, function, obj, *args, **kwargs):
+
+        """register obj as dirty, function writes its changes"""
+
+        if id(obj) in self.new:
+            self.dropped = self.dropped + 1
+            return
+
+        self.__remove(lambda i: i[0] == Session.DIRTY and i[1] == function and i[2] is obj)
+        self.dirty[id(obj)] = obj
+        self.operations.append([Session.DIRTY, function, obj, args, kwargs])
+        self.__flush_outside()
+
+    def delete(self, function, obj, *args, **kwargs):
+
+        """register obj as deleted, function deletes it"""
+
+        if id(obj) in self.new:
+            # never stored, forget everything about it
+            self.__remove(lambda i: i[2] is obj)
+            del self.new[id(obj)]
+            self.dirty.pop(id(obj), None)
+            return
+
+        self.__remove(lambda i: i[0] == Session.DIRTY and i[2] is obj)
+        self.dirty.pop(id(obj), None)
+        self.deleted[id(obj)] = obj
+        self.operations.append([Session.DELETED, function, obj, args, kwargs])
+        self.__flush_outside()
+
+    def notify(self, function, *args):
+
+        """call function(*args) once after the next flush"""
+
+        if (function, args) not in self.notifications:
+            self.notifications.append((function, args))
+        self.__flush_outside()
+
+    def flush(self):
+
+        """
+        write all pending operations in one transaction, then notify,
+        return the future of the transaction (None if there was nothing)
+        """
+
+        operations = self.__take()
+        notifications = self.notifications
+        self.notifications = list()
+        if not operations and not notifications:
+            return None
+
+        stages = list()
+        if self.db_conn.write_behind.queues():
+            operations = [self.__stage(i, stages) for i in operations]
+
+        future = self.db_conn.write_behind.submit(self.__write, operations, stages)
+        future.add_done_callback(lambda done: self.__written(done, stages, notifications))
+        if future.done():
+            # written right away, raise like the dbobj function would
+            future.result()
+        return future
+
+    def discard(self):
+
+        """drop all pending operations and notifications"""
+
+        self.dropped = self.dropped + len(self.operations)
+        self.operations = list()
+        self.new.clear()
+        self.dirty.clear()
+        self.deleted.clear()
+        self.notifications = list()
+
+    def pending(self):
+
+        """return the number of pending operations"""
+
+        return len(self.operations)
+
+    def __take(self):
+
+        """
+        return the pending operations and forget them
+        (don't use outside of Session)
+        """
+
+        operations = self.operations
+        self.operations = list()
+        self.new.clear()
+        self.dirty.clear()
+        self.deleted.clear()
+        return operations
+
+    def __stage(self, operation, stages):
+
+        """
+        return operation with the copies of its dict arguments, the stages
+        of the dicts are added to stages (called on the gui thread)
+        (don't use outside of Session)
+        """
+
+        kind, function, obj, args, kwargs = operation
+        return [kind, function, self.__staged(obj, stages),\
+            tuple(self.__staged(i, stages) for i in args),\
+                dict((key, self.__staged(value, stages)) for key, value in kwargs.items())]
+
+    def __staged(self, value, stages):
+
+        """
+        return the copy of value the writer thread works on if it's a dict
+        (don't use outside of Session)
+        """
+
+        if not isinstance(value, dict):
+            return value
+
+        stage = self.stages.get(id(value))
+        if stage is None:
+            stage = [value, Session.__copy(value), 0]
+            self.stages[id(value)] = stage
+        if not any(i is stage for i in stages):
+            stage[2] = stage[2] + 1
+            stages.append(stage)
+        return stage[1]
+
+    @staticmethod
+    def __copy(obj_dict, kind=None):
+
+        """
+        return a copy of obj_dict of class kind (the class of obj_dict if
+        None), lists are copied too
+        (don't use outside of Session)
+        """
+
+        copy = type(obj_dict)() if kind is None else kind()
+        for key, value in obj_dict.items():
+            copy[key] = list(value) if isinstance(value, list) else value
+        return copy
+
+    @staticmethod
+    def __changes(before, obj_dict):
+
+        """
+        return (stored, removed), the (key, value) that are new or changed
+        and the keys that are gone in obj_dict since the copy before
+        (don't use outside of Session)
+        """
+
+        stored = list()
+        for key, value in obj_dict.items():
+            if key not in before:
+                stored.append((key, value))
+            elif isinstance(value, list):
+                if value != before[key]:
+                    stored.append((key, value))
+            elif value is not before[key]:
+                stored.append((key, value))
+
+        removed = [key for key in before if key not in obj_dict]
+        return (stored, removed)
+
+    def __write(self, operations, stages):
+
+        """
+        call operations in one transaction, return the changes of the
+        copies in stages (on the writer thread)
+        (don't use outside of Session)
+        """
+
+        if not operations:
+            return None
+
+        befores = [Session.__copy(i[1], dict) for i in stages]
+        try:
+            with self.db_conn.writer():
+                for _, function, obj, args, kwargs in operations:
+                    function(obj, *args, db_conn=self.db_conn, **kwargs)
+        except BaseException:
+            # nothing was written, the copies are what they were before
+            for stage, before in zip(stages, befores):
+                stage[1].clear()
+                for key, value in before.items():
+                    stage[1][key] = value
+            raise
+
+        self.written = self.written + len(operations)
+        self.flushes = self.flushes + 1
+        return [Session.__changes(before, stage[1]) for stage, before in zip(stages, befores)]
+
+    def __apply(self, stages, changes):
+
+        """
+        do the changes of a written flush to the dicts of the gui (called
+        on the gui thread), changes is None if nothing was written
+        (don't use outside of Session)
+        """
+
+        for index, stage in enumerate(stages):
+            if changes is not None:
+                stored, removed = changes[index]
+                for key in removed:
+                    stage[0].pop(key, None)
+                for key, value in stored:
+                    stage[0][key] = list(value) if isinstance(value, list) else value
+
+            stage[2] = stage[2] - 1
+            if stage[2] == 0:
+                del self.stages[id(stage[0])]
+
+    def __written(self, future, stages, notifications):
+
+        """
+        do the changes to the dicts and call the notifications of a flush
+        once its transaction is done, on the writer thread they're handed
+        to dispatch
+        (don't use outside of Session)
+        """
+
+        if future.exception() is not None:
+            self.dropped = self.dropped + len(notifications)
+            calls = [(self.__apply, (stages, None))]
+        else:
+            calls = [(self.__apply, (stages, future.result()))] + notifications
+
+        for function, args in calls:
+            if self.dispatch is not None and self.db_conn.write_behind.is_worker():
+                self.dispatch(lambda function=function, args=args: function(*args))
+            else:
+                function(*args)
+
+    def __remove(self, match):
+
+        """
+        remove the pending operations match is true for
+        (don't use outside of Session)
+        """
+
+        count = len(self.operations)
+        self.operations = [i for i in self.operations if not match(i)]
+        self.dropped = self.dropped + count - len(self.operations)
+
+    def __flush_outside(self):
+
+        """
+        used outside of a with block the session writes immediately
+        (don't use outside of Session)
+        """
+
+        if self.depth == 0:
+            self.flush()
@@ -0,0 +1,458 @@
+"""
+Module contains the central registry of all sql statements
+used by the dbobj classes
+
+Every statement uses bound parameters, so the sql text of a statement
+never changes between calls and sqlite can reuse the prepared statement
+of each connection instead of parsing and planing it again
+"""
+
+class Statements():
+
+    """
+    Class holds all registered statements by name
+    """
+
+    registry = dict()
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def register(name, sql):
+
+        """register sql under name, every name can only be used once"""
+
+        if name in Statements.registry:
+            raise ValueError("Statement " + name + " is already registered")
+        Statements.registry[name] = sql
+        return name
+
+    @staticmethod
+    def get(name):
+
+        """return sql of registered statement"""
+
+        return Statements.registry[name]
+
+    @staticmethod
+    def cache_size():
+
+        """
+        size of the statement cache of each connection
+        keeps every registered statement plus the default of sqlite3
+        for the one time statements used by seed and migrations
+        """
+
+        return len(Statements.registry) + 128
+
+# Config
+Statements.register("Config.to_db",\
+    """INSERT INTO Config
+              (Name, Description, TypeId, Value)
+       VALUES (?, ?, ?, ?)""")
+
+Statements.register("Config.update_by_db_id",\
+    """UPDATE Config SET
+              Name = ?,
+              Description = ?,
+              TypeId = ?,
+              Value = ?
+       WHERE ConfigId = ?""")
+
+Statements.register("Config.reload_from_db",\
+    """SELECT ConfigId, Name, Description, TypeId, Value
+       FROM Config
+       ORDER BY ConfigId""")
+
+Statements.register("Config.delete_by_db_id",\
+    """DELETE FROM Config WHERE ConfigId = ?""")
+
+# DBVersion
+Statements.register("DBVersion.create_new_version",\
+    """INSERT INTO DBVersion
+              (Description, Value)
+       VALUES (?, ?)""")
+
+Statements.register("DBVersion.get_current_version",\
+    """SELECT DbVersionId, Description, Value
+       FROM DBVersion
+       ORDER BY DbVersionId desc
+       LIMIT 1""")
+
+# Subject
+Statements.register("Subject.to_db",\
+    """INSERT INTO Subject
+              (Name, Description, Color, StartDate, EndDate, Active, SubjectType)
+       VALUES (?, ?, ?, ?, ?, ?, ?)""")
+
+Statements.register("Subject.update_by_db_id",\
+    """UPDATE Subject set
+              Name = :name,
+              Description = :description,
+              Color = :color,
+              StartDate = :start_date,
+              EndDate = :end_date,
+              Active = :active,
+              SubjectType = :subject_type
+       WHERE SubjectId = :subject_id""")
+
+Statements.register("Subject.reload_from_db",\
+    """SELECT SubjectId, Name, Description, Color,
+              StartDate, EndDate, Active, SubjectType
+       FROM Subject
+       WHERE SubjectType = ? AND Active = ?
+       ORDER BY SubjectId""")
+
+Statements.register("Subject.delete_by_db_id",\
+    """DELETE FROM Subject WHERE SubjectId = ?""")
+
+# SubjectType
+Statements.register("SubjectType.to_db",\
+    """INSERT INTO SubjectType
+              (Name, Description)
+       VALUES (?, ?)""")
+
+Statements.register("SubjectType.update_by_db_id",\
+    """UPDATE SubjectType SET
+              Name = ?,
+              Description = ?
+       WHERE SubjectTypeId = ?""")
+
+Statements.register("SubjectType.reload_from_db",\
+    """SELECT SubjectTypeId, Name, Description
+       FROM SubjectType ORDER BY SubjectTypeId""")
+
+Statements.register("SubjectType.delete_by_db_id",\
+    """DELETE FROM SubjectType WHERE SubjectTypeId = ?""")
+
+# SubjectWorkUnit
+Statements.register("SubjectWorkUnit.to_db",\
+    """INSERT INTO SubjectWorkUnit
+              (SubjectId, WorkTime, AtDate, Description)
+       VALUES (?, ?, ?, ?)""")
+
+Statements.register("SubjectWorkUnit.update_by_db_id",\
+    """UPDATE SubjectWorkUnit SET
+              SubjectId = ?,
+              WorkTime = ?,
+              AtDate = ?,
+              Description = ?
+       WHERE SubjectWorkUnitId = ?""")
+
+Statements.register("SubjectWorkUnit.reload_from_db",\
+    """SELECT SubjectWorkUnitId, SubjectId,
+              WorkTime, AtDate, Description
+       FROM SubjectWorkUnit WHERE AtDate >= ?
+                              AND AtDate <= ?
+       ORDER BY AtDate, SubjectId, SubjectWorkUnitId""")
+
+Statements.register("SubjectWorkUnit.delete_by_db_id",\
+    """DELETE FROM SubjectWorkUnit WHERE SubjectWorkUnitId = ?""")
+
+# Summary
+# all sums over WorkUnitEntry.TimeDiff read the trigger maintained DailyWorkRollup
+Statements.register("Summary.total_time_for_subject_and_workday",\
+    """SELECT SUM(Seconds) AS TimeDiff
+       FROM DailyWorkRollup
+       WHERE Date = ?
+         AND SubjectId = ?
+         AND UnitType = ?""")
+
+Statements.register("Summary.total_time_for_workday",\
+    """SELECT SUM(Seconds) AS TimeDiff
+       FROM DailyWorkRollup
+       WHERE Date = ?
+         AND UnitType = ?""")
+
+Statements.register("Summary.totals_for_workday",\
+    """SELECT SubjectId, UnitType, Seconds
+       FROM DailyWorkRollup
+       WHERE Date = ?""")
+
+# DailyWorkRollup
+# no GROUP BY (UnitType isn't next to Date in the key), the few rows per day
+# are summed up by the caller in index order
+Statements.register("DailyWorkRollup.day_totals",\
+    """SELECT Date, UnitType, Seconds
+       FROM DailyWorkRollup
+       WHERE Date >= ? AND Date <= ?""")
+
+# TodoListItem
+Statements.register("TodoListItem.to_db",\
+    """INSERT INTO TodoListItem
+              (Position, TaskComplete, TaskDescription, DeadlineDate)
+       VALUES (?, ?, ?, ?)""")
+
+Statements.register("TodoListItem.update_by_db_id",\
+    """UPDATE TodoListItem set
+              Position = ?,
+              TaskComplete = ?,
+              TaskDescription = ?,
+              DeadlineDate = ?
+       WHERE TodoListItemId = ?""")
+
+# also used by update_all_positions for every item
+Statements.register("TodoListItem.update_position",\
+    """UPDATE TodoListItem SET Position = ?
+       WHERE TodoListItemId = ?""")
+
+Statements.register("TodoListItem.reload_from_db",\
+    """SELECT TodoListItemId, Position, TaskComplete,
+              TaskDescription, DeadlineDate
+       FROM TodoListItem
+       ORDER BY Position asc""")
+
+Statements.register("TodoListItem.delete_all_completed",\
+    """DELETE FROM TodoListItem WHERE TaskComplete = 1""")
+
+# WorkUnitEntry
+Statements.register("WorkUnitEntry.to_db",\
+    """INSERT INTO WorkUnitEntry
+              (TypeId, SubjectId, ScheduleEntryId, UnitType, StartOffset,
+               StartTime, StartDate, EndTime, EndDate, TimeDiff,
+               State, Description)
+       VALUES (:type_id, :subject_id, :schedule_entry_id, :unit_type, :start_offset,
+               :start_time, :start_date, :end_time, :end_date, :time_diff,
+               :state, :description)""")
+
+Statements.register("WorkUnitEntry.update_by_db_id",\
+    """UPDATE WorkUnitEntry SET
+              TypeId = :type_id,
+              SubjectId = :subject_id,
+              ScheduleEntryId = :schedule_entry_id,
+              UnitType = :unit_type,
+              StartOffset = :start_offset,
+              StartTime = :start_time,
+              StartDate = :start_date,
+              EndTime = :end_time,
+              EndDate = :end_date,
+              TimeDiff = :time_diff,
+              State = :state,
+              Description = :description
+       WHERE WorkUnitEntryId = :work_unit_entry_id""")
+
+Statements.register("WorkUnitEntry.reload_from_db",\
+    """SELECT WorkUnitEntryId, TypeId, SubjectId, ScheduleEntryId, UnitType,
+              StartOffset, StartTime, StartDate, EndTime, EndDate, TimeDiff,
+              State, Description
+       FROM WorkUnitEntry WHERE StartDate <= ?
+                            AND EndDate >= ?
+       ORDER BY EndDate, StartDate, WorkUnitEntryId""")
+
+Statements.register("WorkUnitEntry.load_entry_from_db",\
+    """SELECT WorkUnitEntryId, TypeId, SubjectId, ScheduleEntryId,
+              UnitType, StartOffset, StartTime, StartDate, EndTime, EndDate,
+              TimeDiff, State, Description
+       FROM WorkUnitEntry
+       WHERE ScheduleEntryId = ?
+       LIMIT 1""")
+
+Statements.register("WorkUnitEntry.delete_by_db_id",\
+    """DELETE FROM WorkUnitEntry WHERE WorkUnitEntryId = ?""")
+
+Statements.register("WorkUnitEntry.move_bookings",\
+    """UPDATE WorkUnitEntry SET ScheduleEntryId = ?
+       WHERE ScheduleEntryId = ?""")
+
+# WorkDayTimeUnits
+Statements.register("WorkDayTimeUnits.get_time_unit_list",\
+    """SELECT WorkUnitEntryId, SubjectId, UnitType, StartTime, EndTime,
+              TimeDiff/60 AS TimeDiffMin, TimeDiff AS TimeDiffSec,
+              StartOffset, StartDate, Description
+       FROM WorkUnitEntry
+       WHERE StartDate >= ? AND StartDate <= ?
+       ORDER BY StartDate ASC, StartTime ASC""")
+
+# WindowStats
+# one row per (day, subject) of worked seconds (Kind 0) and planed hours
+# (Kind 1) and one row per subject (Kind 2), no ORDER BY, every part is
+# read in index order
+Statements.register("WindowStats.load",\
+    """SELECT 0 AS Kind, Date AS AtDate, SubjectId, SUM(Seconds) AS Value
+       FROM DailyWorkRollup
+       WHERE Date >= :start_date AND Date <= :end_date
+         AND UnitType IN (:work_time, :school_time)
+       GROUP BY Date, SubjectId
+       UNION ALL
+       SELECT 1 AS Kind, AtDate, SubjectId, SUM(WorkTime) AS Value
+       FROM SubjectWorkUnit
+       WHERE AtDate >= :start_date AND AtDate <= :end_date
+       GROUP BY AtDate, SubjectId
+       UNION ALL
+       SELECT 2 AS Kind, NULL AS AtDate, SubjectId, NULL AS Value
+       FROM Subject
+       WHERE SubjectType = :subject_type""")
+
+# ScheduleSeries
+Statements.register("ScheduleSeries.to_db",\
+    """INSERT INTO ScheduleSeries
+              (TypeId, SubjectId, StartDate, EndDate, Description)
+       VALUES (?, ?, ?, ?, ?)""")
+
+Statements.register("ScheduleSeries.update_by_db_id",\
+    """UPDATE ScheduleSeries SET
+              TypeId = ?,
+              SubjectId = ?,
+              StartDate = ?,
+              EndDate = ?,
+              Description = ?
+       WHERE ScheduleSeriesId = ?""")
+
+Statements.register("ScheduleSeries.load_dates",\
+    """SELECT StartDate, EndDate
+       FROM ScheduleSeries
+       WHERE ScheduleSeriesId = ?""")
+
+Statements.register("ScheduleSeries.delete_by_db_id",\
+    """DELETE FROM ScheduleSeries WHERE ScheduleSeriesId = ?""")
+
+Statements.register("ScheduleSeries.set_rule",\
+    """UPDATE ScheduleSeries SET
+              IsVirtual = 1,
+              DayOfWeek = ?,
+              StartOffset = ?,
+              StartTime = ?,
+              EndTime = ?,
+              EntryDescription = ?
+       WHERE ScheduleSeriesId = ?""")
+
+Statements.register("ScheduleSeries.update_rule_times",\
+    """UPDATE ScheduleSeries SET
+              StartOffset = ?,
+              StartTime = ?,
+              EndTime = ?
+       WHERE ScheduleSeriesId = ?""")
+
+Statements.register("ScheduleSeries.load_rule",\
+    """SELECT StartDate, EndDate, EntryDescription
+       FROM ScheduleSeries
+       WHERE ScheduleSeriesId = ?""")
+
+Statements.register("ScheduleSeries.load_virtual",\
+    """SELECT ScheduleSeriesId, TypeId, SubjectId, StartDate, EndDate, Description,
+              DayOfWeek, StartOffset, StartTime, EndTime, EntryDescription
+       FROM ScheduleSeries
+       WHERE IsVirtual = 1
+         AND StartDate <= ? AND EndDate >= ?
+       ORDER BY ScheduleSeriesId""")
+
+# ScheduleSeriesException
+Statements.register("ScheduleSeriesException.to_db",\
+    """INSERT INTO ScheduleSeriesException
+              (ScheduleSeriesId, AtDate, ExceptionType, Description, ScheduleEntryId)
+       VALUES (?, ?, ?, ?, ?)""")
+
+Statements.register("ScheduleSeriesException.update_by_db_id",\
+    """UPDATE ScheduleSeriesException SET
+              ExceptionType = ?,
+              Description = ?,
+              ScheduleEntryId = ?
+       WHERE ScheduleSeriesExceptionId = ?""")
+
+Statements.register("ScheduleSeriesException.reload_from_db",\
+    """SELECT sex.ScheduleSeriesExceptionId,
+              sex.ScheduleSeriesId,
+              sex.AtDate,
+              sex.ExceptionType,
+              sex.Description,
+              sex.ScheduleEntryId
+       FROM ScheduleSeriesException sex
+       INNER JOIN ScheduleSeries sse
+               ON sse.ScheduleSeriesId = sex.ScheduleSeriesId
+       WHERE sse.IsVirtual = 1
+         AND sex.AtDate >= ? AND sex.AtDate <= ?""")
+
+Statements.register("ScheduleSeriesException.delete_by_series_id",\
+    """DELETE FROM ScheduleSeriesException WHERE ScheduleSeriesId = ?""")
+
+Statements.register("ScheduleSeriesException.delete_outside",\
+    """DELETE FROM ScheduleSeriesException
+       WHERE ScheduleSeriesId = ?
+         AND (AtDate < ? OR AtDate > ?)
+         AND ExceptionType <> ?""")
+
+# ScheduleEntry
+# starts with INSERT (and not WITH), otherwise sqlite3 does not open
+# the implicit transaction for it
+Statements.register("ScheduleEntry.create_entry_series",\
+    """INSERT INTO ScheduleEntry
+              (ScheduleSeriesId, StartOffset,
+               StartTime, EndTime, AtDate, Description)
+       WITH RECURSIVE SeriesDates(AtDate) AS (
+         SELECT date(:first_date)
+         UNION ALL
+         SELECT date(AtDate, '+7 days') FROM SeriesDates
+         WHERE date(AtDate, '+7 days') <= date(:last_date)
+       )
+       SELECT :series_id, :start_offset, :start_time, :end_time,
+              CAST(strftime('%Y%m%d', AtDate) AS integer), :description
+       FROM SeriesDates""")
+
+Statements.register("ScheduleEntry.load_created",\
+    """SELECT ScheduleEntryId, AtDate
+       FROM ScheduleEntry
+       WHERE ScheduleSeriesId = ?
+         AND AtDate >= ? AND AtDate <= ?
+       ORDER BY AtDate""")
+
+Statements.register("ScheduleEntry.update_entry_by_db_id",\
+    """UPDATE ScheduleEntry SET
+              StartOffset = ?,
+              StartTime = ?,
+              EndTime = ?,
+              AtDate = ?,
+              Description = ?
+       WHERE ScheduleEntryId = ?""")
+
+Statements.register("ScheduleEntry.update_description",\
+    """UPDATE ScheduleEntry SET
+              Description = ?
+       WHERE ScheduleEntryId = ?""")
+
+Statements.register("ScheduleEntry.delete_before",\
+    """DELETE FROM ScheduleEntry
+       WHERE ScheduleSeriesId = ?
+         AND AtDate < ?""")
+
+Statements.register("ScheduleEntry.delete_after",\
+    """DELETE FROM ScheduleEntry
+       WHERE ScheduleSeriesId = ?
+         AND AtDate > ?""")
+
+Statements.register("ScheduleEntry.reload_from_db",\
+    """SELECT sen.ScheduleEntryId,
+              sen.StartOffset,
+              sen.StartTime,
+              sen.EndTime,
+              sen.AtDate,
+              sen.Description AS Description1,
+              sse.ScheduleSeriesId,
+              sse.TypeId,
+              sse.SubjectId,
+              sse.StartDate,
+              sse.EndDate,
+              sse.Description AS Description2
+       FROM ScheduleEntry sen
+       INNER JOIN ScheduleSeries sse
+               ON sse.ScheduleSeriesId = sen.ScheduleSeriesId
+       WHERE sen.AtDate >= ? AND sen.AtDate <= ?
+       ORDER BY sen.AtDate, sen.ScheduleEntryId""")
+
+Statements.register("ScheduleEntry.delete_entry_by_db_id",\
+    """DELETE FROM ScheduleEntry WHERE ScheduleEntryId = ?""")
+
+Statements.register("ScheduleEntry.delete_by_series_id",\
+    """DELETE FROM ScheduleEntry WHERE ScheduleSeriesId = ?""")
+
+Statements.register("ScheduleEntry.load_by_series_id",\
+    """SELECT
+         ScheduleEntryId,
+         AtDate
+       FROM ScheduleEntry
+       WHERE ScheduleSeriesId = ?
+       ORDER BY AtDate ASC""")
+
+Statements.register("ScheduleEntry.set_series_id",\
+    """UPDATE ScheduleEntry SET ScheduleSeriesId = ?
+       WHERE ScheduleEntryId = ?""")
@@ -5,7 +5,9 @@ Module contains definition of Subject
 import sqlite3
 from datetime import date
 from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.rowdecoder import RowDecoder
 from dbobj.subjecttypes import SubjectTypes
+from dbobj.statements import Statements
 
 class Subject():
 
@@ -13,6 +15,9 @@ class Subject():
     Class represents one subject and all it's properties
     """
 
+    __slots__ = ("subject_id", "name", "description", "color", "start_date", "end_date",\
+        "active", "subject_type")
+
     def __init__(self, name, description, color, start_date, end_date, active, subject_type):
         self.subject_id = None
         self.name = name
@@ -23,9 +28,6 @@ class Subject():
         self.active = active
         self.subject_type = subject_type
 
-    def __del__(self):
-        pass
-
     def key(self):
 
         """return uniform key for subject dictionary"""
@@ -71,16 +73,14 @@ class Subject():
 
         cursor = db_connection.cursor()
         try:
-            cursor.execute("""INSERT INTO Subject
-                              (Name, Description, Color, StartDate, EndDate, Active, SubjectType)
-                              VALUES ('{0}', '{1}', '{2}', {3}, {4}, {5}, {6})""".format(\
-                                  "Study",\
-                                      "Study",\
-                                          "64,224,208,150",\
-                                              HF.date_2_db(date(2000, 1, 1)),\
-                                                  HF.date_2_db(date(3000, 12, 31)),\
-                                                      1,\
-                                                          SubjectTypes.STUDY_TYPE))
+            cursor.execute(Statements.get("Subject.to_db"), (\
+                "Study",\
+                    "Study",\
+                        "64,224,208,150",\
+                            HF.date_2_db(date(2000, 1, 1)),\
+                                HF.date_2_db(date(3000, 12, 31)),\
+                                    1,\
+                                        SubjectTypes.STUDY_TYPE))
         except sqlite3.Error as error:
             print("Subject.init " + str(Subject.__class__) + " error: ", error.args[0])
             raise
@@ -93,72 +93,52 @@ class Subject():
         return Subject(name, description, color, start_date, end_date, active, subject_type)
 
     @staticmethod
-    def to_db(obj, obj_dict, db_name):
+    def to_db(obj, obj_dict, db_conn):
 
         """store object to db"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""INSERT INTO Subject
-                              (Name, Description, Color, StartDate, EndDate, Active, SubjectType)
-                       VALUES ('{0}', '{1}', '{2}', {3}, {4}, {5}, {6})""".format(\
-                           HF.escape_quote(obj.name),\
-                               HF.escape_quote(obj.description),\
-                                   HF.color_2_db_string(obj.color),\
-                                       HF.date_2_db(obj.start_date),\
-                                           HF.date_2_db(obj.end_date),\
-                                               1,\
-                                                   SubjectTypes.SUBJECT_TYPE))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("Subject.to_db " + str(Subject.__class__) + " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Subject.to_db", (\
+                    obj.name,\
+                        obj.description,\
+                            HF.color_2_db_string(obj.color),\
+                                HF.date_2_db(obj.start_date),\
+                                    HF.date_2_db(obj.end_date),\
+                                        1,\
+                                            SubjectTypes.SUBJECT_TYPE))
+            except sqlite3.Error as error:
+                print("Subject.to_db " + str(Subject.__class__) + " error:", error.args[0])
+                raise
 
         # add object to dict containing all subjects
         obj.subject_id = cursor.lastrowid
         obj_dict[obj.key()] = obj
 
     @staticmethod
-    def update_by_db_id(obj, db_name):
+    def update_by_db_id(obj, db_conn):
 
         """update existing object using db id"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""UPDATE Subject set
-                              Name = '{0}',
-                              Description = '{1}',
-                              Color = '{2}',
-                              StartDate = {3},
-                              EndDate = {4},
-                              Active = {5},
-                              SubjectType = {6}
-                       WHERE SubjectId = {7}""".format(\
-                           HF.escape_quote(obj.name),\
-                               HF.escape_quote(obj.description),\
-                                   HF.color_2_db_string(obj.color),\
-                                       HF.date_2_db(obj.start_date),\
-                                           HF.date_2_db(obj.end_date),\
-                                               obj.active,\
-                                                   obj.subject_type,\
-                                                       obj.subject_id))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("Subject.update_by_db_id " + str(Subject.__class__) + " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Subject.update_by_db_id", {\
+                    "name": obj.name,\
+                        "description": obj.description,\
+                            "color": HF.color_2_db_string(obj.color),\
+                                "start_date": HF.date_2_db(obj.start_date),\
+                                    "end_date": HF.date_2_db(obj.end_date),\
+                                        "active": obj.active,\
+                                            "subject_type": obj.subject_type,\
+                                                "subject_id": obj.subject_id})
+            except sqlite3.Error as error:
+                print("Subject.update_by_db_id " + str(Subject.__class__) + " error:", error.args[0])
+                raise
 
     @staticmethod
-    def reload_from_db(obj_dict, subject_type, active, db_name):
+    def reload_from_db(obj_dict, subject_type, active, db_conn):
 
         """load all objects of this type from db"""
 
@@ -167,60 +147,45 @@ class Subject():
         # start_date_val = HF.date_2_db(start_date)
         # end_date_val = HF.date_2_db(end_date)
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""SELECT SubjectId, Name, Description, Color,
-                                     StartDate, EndDate, Active, SubjectType
-                              FROM Subject
-                              WHERE SubjectType = {0} AND Active = {1}
-                              ORDER BY SubjectId""".format(\
-                                  subject_type,\
-                                      active\
-                                          ))
-
-            rows = cursor.fetchall()
-            obj_dict.clear()
-            for row in rows:
-                obj = Subject.new(\
-                    row[1],\
-                        row[2],\
-                            HF.color_db_string_2_q_color(row[3]),\
-                                HF.date_2_python_date(row[4]),\
-                                    HF.date_2_python_date(row[5]),\
-                                        row[6],\
-                                            row[7])
-
-                obj.subject_id = row[0]
-                obj_dict[obj.key()] = obj
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("Subject.reload_from_db " + str(Subject.__class__) + " error:", error.args[0])
-            raise
-
-        connection.close()
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Subject.reload_from_db", (\
+                    subject_type,\
+                        active))
+
+                rows = cursor.fetchall()
+                obj_dict.clear()
+                for row in rows:
+                    obj = Subject.new(\
+                        row[1],\
+                            row[2],\
+                                HF.color_db_string_2_q_color(row[3]),\
+                                    RowDecoder.DATES[row[4]],\
+                                        RowDecoder.DATES[row[5]],\
+                                            row[6],\
+                                                row[7])
+
+                    obj.subject_id = row[0]
+                    obj_dict[obj.key()] = obj
+            except sqlite3.Error as error:
+                print("Subject.reload_from_db " + str(Subject.__class__) + " error:", error.args[0])
+                raise
 
     @staticmethod
-    def delete_by_db_id(obj, obj_dict, db_name):
+    def delete_by_db_id(obj, obj_dict, db_conn):
 
         """delete obj from db and from corresponding obj_dict"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""DELETE FROM Subject WHERE SubjectId = {0}""".format(\
-                obj.subject_id))
-
-            del obj_dict[obj.key()]
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("Subject.delete_by_db_id " + str(Subject.__class__) + " error:", error.args[0])
-            raise
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Subject.delete_by_db_id", (obj.subject_id,))
 
-        connection.commit()
-        connection.close()
+                del obj_dict[obj.key()]
+            except sqlite3.Error as error:
+                print("Subject.delete_by_db_id " + str(Subject.__class__) + " error:", error.args[0])
+                raise
 
     @staticmethod
     def compare(obj1, obj2):
@@ -3,7 +3,7 @@ Module contains definition of SubjectType
 """
 
 import sqlite3
-from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.statements import Statements
 
 class SubjectType():
 
@@ -12,14 +12,13 @@ class SubjectType():
     and all it's properties
     """
 
+    __slots__ = ("subject_type_id", "name", "description")
+
     def __init__(self, name, description):
         self.subject_type_id = None
         self.name = name
         self.description = description
 
-    def __del__(self):
-        pass
-
     def key(self):
 
         """return uniform key for subject type"""
@@ -50,21 +49,11 @@ class SubjectType():
 
         cursor = db_connection.cursor()
         try:
-            cursor.execute("""INSERT INTO SubjectType
-                              (Name, Description)
-                       VALUES ('{0}', '{1}')""".format("V", "Lecture"))
-
-            cursor.execute("""INSERT INTO SubjectType
-                              (Name, Description)
-                       VALUES ('{0}', '{1}')""".format("U", "Exercise"))
-
-            cursor.execute("""INSERT INTO SubjectType
-                              (Name, Description)
-                       VALUES ('{0}', '{1}')""".format("C", "Coffee"))
-
-            cursor.execute("""INSERT INTO SubjectType
-                              (Name, Description)
-                       VALUES ('{0}', '{1}')""".format("F", "Free Work"))
+            cursor.executemany(Statements.get("SubjectType.to_db"), [\
+                ("V", "Lecture"),\
+                    ("U", "Exercise"),\
+                        ("C", "Coffee"),\
+                            ("F", "Free Work")])
 
         except sqlite3.Error as error:
             print("SubjectType.init " + str(SubjectType.__class__) + " error: ", error.args[0])
@@ -78,106 +67,80 @@ class SubjectType():
         return SubjectType(name, description)
 
     @staticmethod
-    def to_db(obj, obj_dict, db_name):
+    def to_db(obj, obj_dict, db_conn):
 
         """store object to db"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""INSERT INTO SubjectType
-                              (Name, Description)
-                       VALUES ('{0}', '{1}')""".format(\
-                           HF.escape_quote(obj.name),\
-                               HF.escape_quote(obj.description)))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("SubjectType.to_db " + str(SubjectType.__class__) + " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "SubjectType.to_db", (\
+                    obj.name,\
+                        obj.description))
+            except sqlite3.Error as error:
+                print("SubjectType.to_db " + str(SubjectType.__class__) + " error:", error.args[0])
+                raise
 
         # add object to dict containing all subjects
         obj.subject_type_id = cursor.lastrowid
         obj_dict[obj.key()] = obj
 
     @staticmethod
-    def update_by_db_id(obj, db_name):
+    def update_by_db_id(obj, db_conn):
 
         """update object using db id"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""UPDATE SubjectType SET
-                              Name = '{0}',
-                              Description = '{1}'
-                              WHERE SubjectTypeId = {2}""".format(\
-                           HF.escape_quote(obj.name),\
-                               HF.escape_quote(obj.description),\
-                                   obj.subject_type_id))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("SubjectType.update_by_db_id " + str(SubjectType.__class__) +\
-                " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "SubjectType.update_by_db_id", (\
+                    obj.name,\
+                        obj.description,\
+                            obj.subject_type_id))
+            except sqlite3.Error as error:
+                print("SubjectType.update_by_db_id " + str(SubjectType.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def reload_from_db(obj_dict, db_name):
+    def reload_from_db(obj_dict, db_conn):
 
         """reload all subject types from db"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""SELECT SubjectTypeId, Name, Description
-                              FROM SubjectType ORDER BY SubjectTypeId""")
-
-            rows = cursor.fetchall()
-            obj_dict.clear()
-            for row in rows:
-                obj = SubjectType.new(\
-                    row[1],\
-                        row[2])
-                obj.subject_type_id = row[0]
-                obj_dict[obj.key()] = obj
-
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("SubjectType.reload_from_db " + str(SubjectType.__class__) +\
-                " error:", error.args[0])
-            raise
-
-        connection.close()
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "SubjectType.reload_from_db")
+
+                rows = cursor.fetchall()
+                obj_dict.clear()
+                for row in rows:
+                    obj = SubjectType.new(\
+                        row[1],\
+                            row[2])
+                    obj.subject_type_id = row[0]
+                    obj_dict[obj.key()] = obj
+
+            except sqlite3.Error as error:
+                print("SubjectType.reload_from_db " + str(SubjectType.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def delete_by_db_id(obj, obj_dict, db_name):
+    def delete_by_db_id(obj, obj_dict, db_conn):
 
         """delete obj from db and from corresponding obj_dict"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""DELETE FROM SubjectType WHERE SubjectTypeId = {0}""".format(\
-                obj.subject_type_id))
-
-            del obj_dict[obj.key()]
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("SubjectType.delete_by_db_id " + str(SubjectType.__class__) +\
-                " error:", error.args[0])
-            raise
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "SubjectType.delete_by_db_id", (obj.subject_type_id,))
 
-        connection.commit()
-        connection.close()
+                del obj_dict[obj.key()]
+            except sqlite3.Error as error:
+                print("SubjectType.delete_by_db_id " + str(SubjectType.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
     def compare(obj1, obj2):
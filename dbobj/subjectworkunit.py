@@ -4,6 +4,7 @@ Module contains definition of SubjectWorkUnit
 
 import sqlite3
 from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.rowdecoder import RowDecoder
 
 class SubjectWorkUnit():
 
@@ -11,6 +12,12 @@ class SubjectWorkUnit():
     Class represents one (Subject, Date) planed work unit in hours
     """
 
+    __slots__ = ("subject_work_unit_id", "subject_id", "work_time", "at_date", "description",\
+        "start_date", "date_index")
+
+    # tables the work units of a window are read from
+    TABLES = ("SubjectWorkUnit",)
+
     def __init__(self, subject_id, work_time, start_date, at_date, description):
 
         self.subject_work_unit_id = None
@@ -25,9 +32,6 @@ class SubjectWorkUnit():
         # index of at_date with respect to start_date
         self.date_index = (self.at_date - start_date).days
 
-    def __del__(self):
-        pass
-
     def key(self):
 
         """return uniform key for work unit entry"""
@@ -73,29 +77,22 @@ class SubjectWorkUnit():
         return SubjectWorkUnit(subject_id, work_time, start_date, at_date, description)
 
     @staticmethod
-    def to_db(obj, obj_dict, db_name):
+    def to_db(obj, obj_dict, db_conn):
 
         """store object to db"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""INSERT INTO SubjectWorkUnit
-                              (SubjectId, WorkTime, AtDate, Description)
-                       VALUES ({0}, {1}, {2}, '{3}')""".format(\
-                           obj.subject_id,\
-                               obj.work_time,\
-                                   HF.date_2_db(obj.at_date),\
-                                       HF.escape_quote(obj.description)))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("SubjectWorkUnit.to_db " + str(SubjectWorkUnit.__class__) +\
-                " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "SubjectWorkUnit.to_db", (\
+                    obj.subject_id,\
+                        obj.work_time,\
+                            HF.date_2_db(obj.at_date),\
+                                obj.description))
+            except sqlite3.Error as error:
+                print("SubjectWorkUnit.to_db " + str(SubjectWorkUnit.__class__) +\
+                    " error:", error.args[0])
+                raise
 
         # add object to dict containing all subjects
         obj.subject_work_unit_id = cursor.lastrowid
@@ -103,95 +100,82 @@ class SubjectWorkUnit():
         obj_dict[obj.key()] = obj
 
     @staticmethod
-    def update_by_db_id(obj, db_name):
+    def update_by_db_id(obj, db_conn):
 
         """update object by db id"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""UPDATE SubjectWorkUnit SET
-                              SubjectId = {0},
-                              WorkTime = {1},
-                              AtDate = {2},
-                              Description = '{3}'
-                       WHERE SubjectWorkUnitId = {4}""".format(\
-                               obj.subject_id,\
-                                   obj.work_time,\
-                                       HF.date_2_db(obj.at_date),\
-                                           HF.escape_quote(obj.description),\
-                                               obj.subject_work_unit_id))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("SubjectWorkUnit.update_by_db_id " + str(SubjectWorkUnit.__class__) +\
-                " error:", error.args[0])
-            raise
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "SubjectWorkUnit.update_by_db_id", (\
+                    obj.subject_id,\
+                        obj.work_time,\
+                            HF.date_2_db(obj.at_date),\
+                                obj.description,\
+                                    obj.subject_work_unit_id))
+            except sqlite3.Error as error:
+                print("SubjectWorkUnit.update_by_db_id " + str(SubjectWorkUnit.__class__) +\
+                    " error:", error.args[0])
+                raise
 
-        connection.commit()
-        connection.close()
+    @staticmethod
+    def __load_rows(start_date, end_date, db_conn):
+
+        """
+        return the rows of all objects within start_date and end_date
+        (don't use outside of SubjectWorkUnit)
+        """
+
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "SubjectWorkUnit.reload_from_db", (\
+                    HF.date_2_db(start_date),\
+                        HF.date_2_db(end_date)))
+                return cursor.fetchall()
+            except sqlite3.Error as error:
+                print("SubjectWorkUnit.reload_from_db " + str(SubjectWorkUnit.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def reload_from_db(obj_dict, start_date, end_date, db_name):
+    def reload_from_db(obj_dict, start_date, end_date, db_conn):
 
         """load all objects of this type from db"""
 
-        start_date_val = HF.date_2_db(start_date)
-        end_date_val = HF.date_2_db(end_date)
+        rows = db_conn.window_cache.get("SubjectWorkUnit.reload_from_db",\
+            SubjectWorkUnit.TABLES, start_date, end_date,\
+                lambda: SubjectWorkUnit.__load_rows(start_date, end_date, db_conn))
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""SELECT SubjectWorkUnitId, SubjectId,
-                                    WorkTime, AtDate, Description
-                              FROM SubjectWorkUnit WHERE AtDate >= {0}
-                                             AND AtDate <= {1}
-                              ORDER BY SubjectWorkUnitId""".format(\
-                                                 start_date_val,\
-                                                     end_date_val))
-            rows = cursor.fetchall()
-            obj_dict.clear()
-            for row in rows:
-                obj = SubjectWorkUnit.new(\
-                    row[1],\
-                        row[2],\
-                            start_date,\
-                                HF.date_2_python_date(row[3]),\
-                                    row[4])
-
-                obj.subject_work_unit_id = row[0]
-
-                obj_dict[obj.key()] = obj
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("SubjectWorkUnit.reload_from_db " + str(SubjectWorkUnit.__class__) +\
-                " error:", error.args[0])
-            raise
+        obj_dict.clear()
+        for row in rows:
+            obj = SubjectWorkUnit.new(\
+                row[1],\
+                    row[2],\
+                        start_date,\
+                            RowDecoder.DATES[row[3]],\
+                                row[4])
+
+            obj.subject_work_unit_id = row[0]
 
-        connection.close()
+            obj_dict[obj.key()] = obj
 
     @staticmethod
-    def delete_by_db_id(obj, obj_dict, db_name):
+    def delete_by_db_id(obj, obj_dict, db_conn):
 
         """delete obj from db and from corresponding obj_dict"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""DELETE FROM SubjectWorkUnit WHERE SubjectWorkUnitId = {0}""".format(\
-                obj.subject_work_unit_id))
-
-            del obj_dict[obj.key()]
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("SubjectWorkUnit.delete_by_db_id " + str(SubjectWorkUnit.__class__) +\
-                " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "SubjectWorkUnit.delete_by_db_id", (\
+                    obj.subject_work_unit_id,))
+
+                del obj_dict[obj.key()]
+            except sqlite3.Error as error:
+                print("SubjectWorkUnit.delete_by_db_id " + str(SubjectWorkUnit.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
     def compare(obj1, obj2):
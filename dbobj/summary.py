@@ -10,107 +10,113 @@ class Summary():
 
     """
     Class offers method to get summary times in seconds
+
+    The times are read from the DailyWorkRollup table
     """
 
     def __init__(self):
         pass
 
     @staticmethod
-    def total_work_for_subject_and_workday(work_day, subject_id, db_name):
+    def total_work_for_subject_and_workday(work_day, subject_id, db_conn):
 
         """get total worktime for subject and workday"""
 
         return Summary.total_time_for_subject_and_workday(\
-            HF.date_2_db(work_day), subject_id, UnitTypes.WORK_TIME, db_name)
+            HF.date_2_db(work_day), subject_id, UnitTypes.WORK_TIME, db_conn)
 
     @staticmethod
-    def total_break_for_subject_and_workday(work_day, subject_id, db_name):
+    def total_break_for_subject_and_workday(work_day, subject_id, db_conn):
 
         """get total breaktime for subject and workday"""
 
         return Summary.total_time_for_subject_and_workday(\
-            HF.date_2_db(work_day), subject_id, UnitTypes.BREAK_TIME, db_name)
+            HF.date_2_db(work_day), subject_id, UnitTypes.BREAK_TIME, db_conn)
 
     @staticmethod
-    def total_work_for_workday(work_day, db_name):
+    def total_work_for_workday(work_day, db_conn):
 
         """get total worktime for subject and workday"""
 
         return Summary.total_time_for_workday(\
-            HF.date_2_db(work_day), UnitTypes.WORK_TIME, db_name)
+            HF.date_2_db(work_day), UnitTypes.WORK_TIME, db_conn)
 
     @staticmethod
-    def total_break_for_workday(work_day, db_name):
+    def total_break_for_workday(work_day, db_conn):
 
         """get total breaktime for subject and workday"""
 
         return Summary.total_time_for_workday(\
-            HF.date_2_db(work_day), UnitTypes.BREAK_TIME, db_name)
+            HF.date_2_db(work_day), UnitTypes.BREAK_TIME, db_conn)
 
     @staticmethod
-    def total_coffee_for_workday(work_day, db_name):
+    def total_coffee_for_workday(work_day, db_conn):
 
         """get total coffee time for subject and workday"""
 
         return Summary.total_time_for_workday(\
-            HF.date_2_db(work_day), UnitTypes.COFFEE_TIME, db_name)
+            HF.date_2_db(work_day), UnitTypes.COFFEE_TIME, db_conn)
 
     @staticmethod
-    def total_time_for_subject_and_workday(work_day, subject_id, unit_type, db_name):
+    def total_time_for_subject_and_workday(work_day, subject_id, unit_type, db_conn):
 
         """get total worktime for subject and unit time and workday"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""SELECT SUM(TimeDiff) AS TimeDiff
-                              FROM WorkUnitEntry
-                              WHERE StartDate = {0}
-                                AND SubjectId = {1}
-                                AND UnitType = {2}""".format(\
-                                    str(work_day), str(subject_id), str(unit_type)))
-            rows = cursor.fetchall()
-            result = rows[0][0]
-
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("Summary.total_time_for_subject " +\
-                str(Summary.__class__) + " error:", error.args[0])
-            connection.close()
-            raise
-
-        connection.close()
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Summary.total_time_for_subject_and_workday", (\
+                    work_day, subject_id, unit_type))
+                rows = cursor.fetchall()
+                result = rows[0][0]
+
+            except sqlite3.Error as error:
+                print("Summary.total_time_for_subject " +\
+                    str(Summary.__class__) + " error:", error.args[0])
+                raise
 
         if result is None:
             return 0
         return int(result)
 
     @staticmethod
-    def total_time_for_workday(work_day, unit_type, db_name):
+    def totals_for_workday(work_day, db_conn):
+
+        """get dict with (subject_id, unit_type) -> total time for workday"""
+
+        totals = dict()
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Summary.totals_for_workday", (\
+                    HF.date_2_db(work_day),))
+                for row in cursor.fetchall():
+                    totals[(row[0], row[1])] = int(row[2])
+
+            except sqlite3.Error as error:
+                print("Summary.totals_for_workday " +\
+                    str(Summary.__class__) + " error:", error.args[0])
+                raise
+
+        return totals
+
+    @staticmethod
+    def total_time_for_workday(work_day, unit_type, db_conn):
 
         """get total worktime and unit time and workday"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""SELECT SUM(TimeDiff) AS TimeDiff
-                              FROM WorkUnitEntry
-                              WHERE StartDate = {0}
-                                AND UnitType = {1}""".format(\
-                                    str(work_day), str(unit_type)))
-            rows = cursor.fetchall()
-            result = rows[0][0]
-
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("Summary.total_time_for_workday " +\
-                str(Summary.__class__) + " error:", error.args[0])
-            connection.close()
-            raise
-
-        connection.close()
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "Summary.total_time_for_workday", (\
+                    work_day, unit_type))
+                rows = cursor.fetchall()
+                result = rows[0][0]
+
+            except sqlite3.Error as error:
+                print("Summary.total_time_for_workday " +\
+                    str(Summary.__class__) + " error:", error.args[0])
+                raise
 
         if result is None:
             return 0
@@ -4,13 +4,24 @@ Module defines TodoListItem
 
 import sqlite3
 from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.rowdecoder import RowDecoder
 
 class TodoListItem():
 
     """
     Class represents one TodoListItem
+
+    The positions are sparse, neighbours are POSITION_GAP apart. An item
+    that is added or moved gets a position between its new neighbours, so
+    only its own row is written. Only if there's no free position left
+    between them, all items are renumbered.
     """
 
+    POSITION_GAP = 1024
+
+    __slots__ = ("todo_list_item_id", "position", "task_complete", "task_description",\
+        "deadline_date")
+
     def __init__(self, position, task_complete, task_description, deadline_date):
         self.todo_list_item_id = None
         self.position = position
@@ -18,9 +29,6 @@ class TodoListItem():
         self.task_description = task_description
         self.deadline_date = deadline_date
 
-    def __del__(self):
-        pass
-
     def key(self):
 
         """return uniform todo list item key"""
@@ -58,148 +66,149 @@ class TodoListItem():
         return TodoListItem(position, task_complete, task_description, deadline_date)
 
     @staticmethod
-    def to_db(obj, obj_dict, db_name):
+    def to_db(obj, obj_dict, db_conn):
 
         """store object to db"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""INSERT INTO TodoListItem
-                              (Position, TaskComplete, TaskDescription, DeadlineDate)
-                       VALUES ({0}, {1}, '{2}', {3})""".format(\
-                           obj.position,\
-                               obj.task_complete,\
-                                   HF.escape_quote(obj.task_description),\
-                                       HF.date_2_db(obj.deadline_date)))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("TodoListItem.to_db " + str(TodoListItem.__class__) + " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "TodoListItem.to_db", (\
+                    obj.position,\
+                        obj.task_complete,\
+                            obj.task_description,\
+                                HF.date_2_db(obj.deadline_date)))
+            except sqlite3.Error as error:
+                print("TodoListItem.to_db " + str(TodoListItem.__class__) + " error:", error.args[0])
+                raise
 
         # add object to dict containing all subjects
         obj.todo_list_item_id = cursor.lastrowid
         obj_dict[obj.key()] = obj
 
     @staticmethod
-    def update_by_db_id(obj, db_name):
+    def update_by_db_id(obj, db_conn):
 
         """update existing object using db id"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""UPDATE TodoListItem set
-                              Position = {0},
-                              TaskComplete = {1},
-                              TaskDescription = '{2}',
-                              DeadlineDate = {3}
-                       WHERE TodoListItemId = {4}""".format(\
-                           obj.position,\
-                               obj.task_complete,\
-                                   HF.escape_quote(obj.task_description),\
-                                       HF.date_2_db(obj.deadline_date),\
-                                           obj.todo_list_item_id))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("TodoListItem.update_by_db_id " +\
-                str(TodoListItem.__class__) + " error:", error.args[0])
-            raise
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "TodoListItem.update_by_db_id", (\
+                    obj.position,\
+                        obj.task_complete,\
+                            obj.task_description,\
+                                HF.date_2_db(obj.deadline_date),\
+                                    obj.todo_list_item_id))
+            except sqlite3.Error as error:
+                print("TodoListItem.update_by_db_id " +\
+                    str(TodoListItem.__class__) + " error:", error.args[0])
+                raise
+
+    @staticmethod
+    def update_position(obj, db_conn):
 
-        connection.commit()
-        connection.close()
+        """update position field of one existing object using db id"""
+
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "TodoListItem.update_position", (\
+                    obj.position,\
+                        obj.todo_list_item_id))
+            except sqlite3.Error as error:
+                print("TodoListItem.update_position " +\
+                    str(TodoListItem.__class__) + " error:", error.args[0])
+                raise
 
     @staticmethod
-    def update_all_positions(obj_dict, db_name):
+    def update_all_positions(obj_dict, db_conn):
 
         """update position field of all current db entries"""
 
-        prototype =\
-            """
-            UPDATE TodoListItem SET Position = {0}
-            WHERE TodoListItemId = {1}
-            """
-
-        stmt_list = []
+        param_list = []
         for i in obj_dict.values():
-            stmt_list.append(prototype.format(i.position, i.todo_list_item_id))
-
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            for i in stmt_list:
-                cursor.execute(i)
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("TodoListItem.update_all_positions " + str(TodoListItem.__class__) +\
-                " error:", error.args[0])
-            raise
+            param_list.append((i.position, i.todo_list_item_id))
 
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.executemany(cursor, "TodoListItem.update_position", param_list)
+            except sqlite3.Error as error:
+                print("TodoListItem.update_all_positions " + str(TodoListItem.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def reload_from_db(obj_dict, db_name):
+    def reload_from_db(obj_dict, db_conn):
 
         """load all objects of this type from db"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""SELECT TodoListItemId, Position, TaskComplete,
-                                        TaskDescription, DeadlineDate
-                            FROM TodoListItem
-                            ORDER BY Position asc""")
-
-            rows = cursor.fetchall()
-            obj_dict.clear()
-            for row in rows:
-                obj = TodoListItem.new(\
-                    row[1],\
-                        row[2],\
-                            row[3],\
-                                HF.date_2_python_date(row[4]))
-
-                obj.todo_list_item_id = row[0]
-                obj_dict[obj.key()] = obj
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("TodoListItem.reload_from_db " + str(TodoListItem.__class__) +\
-                " error:", error.args[0])
-            raise
-
-        connection.close()
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "TodoListItem.reload_from_db")
+
+                rows = cursor.fetchall()
+                obj_dict.clear()
+                for row in rows:
+                    obj = TodoListItem.new(\
+                        row[1],\
+                            row[2],\
+                                row[3],\
+                                    RowDecoder.DATES[row[4]])
+
+                    obj.todo_list_item_id = row[0]
+                    obj_dict[obj.key()] = obj
+            except sqlite3.Error as error:
+                print("TodoListItem.reload_from_db " + str(TodoListItem.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def delete_all_completed(obj_dict, db_name):
+    def delete_all_completed(obj_dict, db_conn):
 
         """delete obj from db and from corresponding obj_dict"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""DELETE FROM TodoListItem WHERE TaskComplete = 1""")
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "TodoListItem.delete_all_completed")
 
-            val_list = list(obj_dict.values())
-            for i in val_list:
-                if i.task_complete:
-                    del obj_dict[i.key()]
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("TodoListItem.delete_all_completed " + str(TodoListItem.__class__) +\
-                " error:", error.args[0])
-            raise
+                val_list = list(obj_dict.values())
+                for i in val_list:
+                    if i.task_complete:
+                        del obj_dict[i.key()]
+            except sqlite3.Error as error:
+                print("TodoListItem.delete_all_completed " + str(TodoListItem.__class__) +\
+                    " error:", error.args[0])
+                raise
+
+    @staticmethod
+    def position_between(before, after):
+
+        """
+        return a free position between the objects before and after
+        (None at the top or the bottom of the list), None if there is none
+        """
+
+        if before is None and after is None:
+            return 0
+        if before is None:
+            return after.position - TodoListItem.POSITION_GAP
+        if after is None:
+            return before.position + TodoListItem.POSITION_GAP
+        if after.position - before.position < 2:
+            return None
+        return (before.position + after.position) // 2
+
+    @staticmethod
+    def renumber(obj_list):
+
+        """give the objects in obj_list evenly spread positions in list order"""
 
-        connection.commit()
-        connection.close()
+        for i, obj in enumerate(obj_list):
+            obj.position = i*TodoListItem.POSITION_GAP
 
     @staticmethod
     def compare(obj1, obj2):
@@ -0,0 +1,279 @@
+"""
+Module contains definition of WindowCache
+
+The cache keeps the results of the window loaders (ScheduleEntry,
+WorkDayTimeUnits, SubjectWorkUnit, WindowStats) per (loader, start_date,
+end_date), so paging back to a window that was just shown doesn't
+query the db again.
+
+Writes are tracked by temporary triggers on the writer connection, they
+record the dates of every changed row. When the writer commits, only
+the cached windows that overlap these dates are dropped. Commits of
+other processes can't be tracked, they clear the whole cache.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from dbobj.helperfunctions import HelperFunctions as HF
+
+# table -> (first date column, last date column) of the rows
+# None means that a change affects all windows, moved single entries
+# can lie outside of the dates of their ScheduleSeries
+TRACKED_TABLES = {\
+    "WorkUnitEntry": ("StartDate", "EndDate"),\
+        "DailyWorkRollup": ("Date", "Date"),\
+            "SubjectWorkUnit": ("AtDate", "AtDate"),\
+                "ScheduleEntry": ("AtDate", "AtDate"),\
+                    "ScheduleSeriesException": ("AtDate", "AtDate"),\
+                        "ScheduleSeries": (None, None),\
+                            "Subject": (None, None)}
+
+FIRST_DATE = 0
+LAST_DATE = 99991231
+
+def approximate_size(value):
+
+    """return the approximate size of value in bytes including all its content"""
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size = size + approximate_size(key) + approximate_size(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            size = size + approximate_size(item)
+    elif hasattr(value, "__dict__"):
+        size = size + approximate_size(value.__dict__)
+    elif hasattr(type(value), "__slots__"):
+        for name in type(value).__slots__:
+            size = size + approximate_size(getattr(value, name, None))
+    return size
+
+class WindowCacheEntry():
+
+    """
+    Class represents one cached loader result
+    """
+
+    __slots__ = ("value", "size", "tables", "start_date_val", "end_date_val")
+
+    def __init__(self, value, size, tables, start_date_val, end_date_val):
+        self.value = value
+        self.size = size
+        self.tables = tables
+        self.start_date_val = start_date_val
+        self.end_date_val = end_date_val
+
+    def overlaps(self, table, first_date_val, last_date_val):
+
+        """true if a change of table between the two dates affects this entry"""
+
+        return table in self.tables and\
+            first_date_val <= self.end_date_val and\
+                last_date_val >= self.start_date_val
+
+class WindowCache():
+
+    """
+    Class represents a bounded LRU cache of window loader results
+
+    It's owned by the DBConnection and evicts the least recently used
+    entries if there are more than max_entries or if all entries together
+    need more than max_bytes
+    """
+
+    def __init__(self, db_conn, max_entries=64, max_bytes=16*1024*1024):
+        self.db_conn = db_conn
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # switched off by the benchmarks to time the loaders themselves
+        self.enabled = True
+
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        # data version of the db the cached entries belong to
+        self.data_version = None
+        # triggers exist on the current writer connection
+        self.installed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def install(self):
+
+        """create the change table and its triggers on the writer connection"""
+
+        if self.installed:
+            return
+
+        with self.db_conn.write_lock:
+            connection = self.db_conn.open_writer()
+            cursor = connection.cursor()
+            # no unique key, the conflict handling of the statement that fires
+            # the trigger (like the upsert of DailyWorkRollup) would be used
+            cursor.execute("""CREATE TEMP TABLE IF NOT EXISTS WindowCacheChange
+                              (TableName text,
+                               FirstDate integer,
+                               LastDate integer)""")
+
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            existing = set(row[0] for row in cursor.fetchall())
+
+            for table, columns in TRACKED_TABLES.items():
+                if table not in existing:
+                    continue
+                for event, rows in (("INSERT", ("NEW",)),\
+                    ("UPDATE", ("OLD", "NEW")), ("DELETE", ("OLD",))):
+                    inserts = ""
+                    for row in rows:
+                        first_date = str(FIRST_DATE)
+                        last_date = str(LAST_DATE)
+                        if columns[0] is not None:
+                            first_date = "COALESCE({0}.{1}, {2})".format(row, columns[0], FIRST_DATE)
+                            last_date = "COALESCE({0}.{1}, {2})".format(row, columns[1], LAST_DATE)
+                        inserts = inserts + """INSERT INTO WindowCacheChange
+                                               VALUES ('{0}', {1}, {2});
+                                            """.format(table, first_date, last_date)
+
+                    cursor.execute("""CREATE TEMP TRIGGER IF NOT EXISTS WindowCache_{0}_{1}_T
+                                      AFTER {2} ON main.{0}
+                                      BEGIN
+                                        {3}
+                                      END""".format(table, event.capitalize(), event, inserts))
+            self.installed = True
+
+    def collect(self, connection):
+
+        """
+        return all recorded changes of the running transaction and remove them
+        (only used by DBConnection right before the commit)
+        """
+
+        if not self.installed:
+            return None
+
+        cursor = connection.cursor()
+        cursor.execute("""SELECT DISTINCT TableName, FirstDate, LastDate
+                          FROM WindowCacheChange""")
+        changes = cursor.fetchall()
+        if changes:
+            cursor.execute("DELETE FROM WindowCacheChange")
+        return changes
+
+    def committed(self, changes, write_generation):
+
+        """
+        drop all entries that overlap the committed changes
+        (only used by DBConnection right after the commit)
+        """
+
+        with self.lock:
+            if changes is None or self.data_version is None or\
+                self.data_version[0] != write_generation - 1:
+                return
+
+            for change in changes:
+                for key in [key for key, entry in self.entries.items()\
+                    if entry.overlaps(change[0], change[1], change[2])]:
+                    self.remove(key)
+                    self.invalidations = self.invalidations + 1
+
+            # the own commit changed the data_version of the reader connection
+            # too, a commit of another process right in between isn't seen
+            self.data_version = self.db_conn.get_data_version()
+
+    def get(self, name, tables, start_date, end_date, load):
+
+        """
+        return the result of loader name for the window start_date, end_date
+
+        load is only called if the window isn't cached, tables are the tables
+        the result is read from
+        """
+
+        # uncommitted changes of the own transaction must not be cached,
+        # a cached window doesn't contain the queued writes of the writer
+        # thread yet and a load now doesn't either, it isn't cached and the
+        # window is loaded again once they're written
+        if not self.enabled or self.db_conn.write_owner == threading.get_ident() or\
+            self.db_conn.write_behind.pending():
+            return load()
+
+        key = (name, start_date, end_date)
+        data_version = self.db_conn.get_data_version()
+        with self.lock:
+            if data_version != self.data_version:
+                self.clear()
+                self.data_version = data_version
+
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits = self.hits + 1
+                return entry.value
+            self.misses = self.misses + 1
+
+        self.install()
+        value = load()
+
+        # something was committed while loading, the result may be outdated
+        if self.db_conn.get_data_version() != data_version:
+            return value
+
+        size = approximate_size(value)
+        with self.lock:
+            if self.data_version != data_version or size > self.max_bytes:
+                return value
+
+            if key in self.entries:
+                self.remove(key)
+            self.entries[key] = WindowCacheEntry(value, size, tables,\
+                HF.date_2_db(start_date), HF.date_2_db(end_date))
+            self.total_bytes = self.total_bytes + size
+
+            while self.entries and (len(self.entries) > self.max_entries or\
+                self.total_bytes > self.max_bytes):
+                self.remove(next(iter(self.entries)))
+                self.evictions = self.evictions + 1
+
+        return value
+
+    def remove(self, key):
+
+        """remove one entry (lock has to be held by the caller)"""
+
+        entry = self.entries.pop(key)
+        self.total_bytes = self.total_bytes - entry.size
+
+    def clear(self):
+
+        """remove all entries (lock has to be held by the caller)"""
+
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def reset(self):
+
+        """forget everything, the writer connection was closed"""
+
+        with self.lock:
+            self.clear()
+            self.data_version = None
+            self.installed = False
+
+    def get_stats(self):
+
+        """return dict with the counters and the current size of the cache"""
+
+        with self.lock:
+            return {\
+                "hits": self.hits,\
+                    "misses": self.misses,\
+                        "evictions": self.evictions,\
+                            "invalidations": self.invalidations,\
+                                "entries": len(self.entries),\
+                                    "bytes": self.total_bytes}
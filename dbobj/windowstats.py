@@ -0,0 +1,100 @@
+"""
+Module contains definition of WindowStats
+"""
+
+import sqlite3
+
+from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.rowdecoder import RowDecoder
+from dbobj.unittypes import UnitTypes
+from dbobj.subjecttypes import SubjectTypes
+
+class WindowStats():
+
+    """
+    Class represents a snapshot of all worked and planed times of one
+    window (start_date, end_date)
+
+    The snapshot is loaded by one query and shared by all percentage
+    classes, it's kept in the window cache of the db connection until
+    the window is changed in the db.
+    Worked time is in seconds, planed time (SubjectWorkUnit.WorkTime)
+    in hours.
+    """
+
+    __slots__ = ("start_date", "end_date", "day_seconds", "day_subject_seconds",\
+        "subject_seconds", "total_seconds", "day_work_time", "day_subject_work_time",\
+        "subject_work_time", "total_work_time", "subjects")
+
+    # tables the snapshot is read from
+    TABLES = ("DailyWorkRollup", "SubjectWorkUnit", "Subject")
+
+    def __init__(self, start_date, end_date):
+        self.start_date = start_date
+        self.end_date = end_date
+
+        # recorded and booked time (WORK_TIME and SCHOOL_TIME)
+        self.day_seconds = dict() # at_date -> seconds
+        self.day_subject_seconds = dict() # (subject_id, at_date) -> seconds
+        self.subject_seconds = dict() # subject_id -> seconds
+        self.total_seconds = 0
+
+        # planed time
+        self.day_work_time = dict() # at_date -> hours
+        self.day_subject_work_time = dict() # (subject_id, at_date) -> hours
+        self.subject_work_time = dict() # subject_id -> hours
+        self.total_work_time = 0
+
+        # all subjects of type SUBJECT_TYPE
+        self.subjects = list()
+
+    @staticmethod
+    def get(start_date, end_date, db_conn):
+
+        """return the snapshot for the window, load it only if necessary"""
+
+        return db_conn.window_cache.get("WindowStats.load", WindowStats.TABLES,\
+            start_date, end_date, lambda: WindowStats.load(start_date, end_date, db_conn))
+
+    @staticmethod
+    def load(start_date, end_date, db_conn):
+
+        """load one snapshot from db"""
+
+        obj = WindowStats(start_date, end_date)
+        start_date_val = HF.date_2_db(start_date)
+        end_date_val = HF.date_2_db(end_date)
+
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "WindowStats.load", {\
+                    "start_date": start_date_val,\
+                        "end_date": end_date_val,\
+                            "work_time": UnitTypes.WORK_TIME,\
+                                "school_time": UnitTypes.SCHOOL_TIME,\
+                                    "subject_type": SubjectTypes.SUBJECT_TYPE})
+                rows = cursor.fetchall()
+            except sqlite3.Error as error:
+                print("WindowStats.load " + str(WindowStats.__class__) +\
+                    " error:", error.args[0])
+                raise
+
+        for row in rows:
+            if row[0] == 0:
+                at_date = RowDecoder.DATES[row[1]]
+                obj.day_seconds[at_date] = obj.day_seconds.get(at_date, 0) + row[3]
+                obj.day_subject_seconds[(row[2], at_date)] = row[3]
+                obj.subject_seconds[row[2]] = obj.subject_seconds.get(row[2], 0) + row[3]
+                obj.total_seconds = obj.total_seconds + row[3]
+            elif row[0] == 1:
+                at_date = RowDecoder.DATES[row[1]]
+                obj.day_work_time[at_date] = obj.day_work_time.get(at_date, 0) + row[3]
+                obj.day_subject_work_time[(row[2], at_date)] = row[3]
+                obj.subject_work_time[row[2]] = obj.subject_work_time.get(row[2], 0) + row[3]
+                obj.total_work_time = obj.total_work_time + row[3]
+            else:
+                obj.subjects.append(row[2])
+
+        obj.subjects.sort()
+        return obj
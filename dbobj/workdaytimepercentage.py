@@ -3,10 +3,7 @@ Module contains definition of
 WorkDayTimePercentage
 """
 
-import sqlite3
-
-from dbobj.helperfunctions import HelperFunctions as HF
-from dbobj.unittypes import UnitTypes
+from dbobj.windowstats import WindowStats
 
 class WorkDayTimePercentage():
 
@@ -14,6 +11,9 @@ class WorkDayTimePercentage():
     Class offers methodes to get percentage of planed vs worked time
     """
 
+    __slots__ = ("at_date", "time_diff", "work_time", "work_percent", "total_time_diff",\
+        "date_index")
+
     def __init__(self, start_date, at_date, time_diff, work_time,\
         work_percent, total_time_diff):
 
@@ -41,96 +41,28 @@ class WorkDayTimePercentage():
             start_date, at_date, time_diff, work_time, work_percent, total_time_diff)
 
     @staticmethod
-    def get_work_day_time_percentage(obj_dict, from_work_day, to_work_day, db_name):
+    def get_work_day_time_percentage(obj_dict, from_work_day, to_work_day, db_conn):
 
         """get list with ordered time units for given work day"""
 
-        from_work_day_value = HF.date_2_db(from_work_day)
-        to_work_day_value = HF.date_2_db(to_work_day)
-
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            obj_dict.clear()
-            cursor.execute("""
-                           SELECT StartDate, SUM(TimeDiff) / 3600.0 TimeDiff
-                           FROM WorkUnitEntry
-                           WHERE StartDate >= {0} AND StartDate <= {1} AND UnitType IN ({2}, {3})
-                           GROUP BY StartDate
-                           ORDER BY StartDate
-                           """.format(\
-                               from_work_day_value,\
-                                   to_work_day_value,\
-                                       UnitTypes.WORK_TIME,\
-                                              UnitTypes.SCHOOL_TIME))
-
-            rows = cursor.fetchall()
-            for row in rows:
-                start_date = HF.date_2_python_date(row[0])
-                entry = WorkDayTimePercentage.new(\
-                    from_work_day, start_date, row[1], 0, 0, 0)
-                obj_dict[entry.key()] = entry
-
-            cursor.execute("""
-                           SELECT AtDate, SUM(WorkTime) WorkTime
-                           FROM SubjectWorkUnit
-                           WHERE AtDate >= {0} AND AtDate <= {1}
-                           GROUP BY AtDate
-                           ORDER BY AtDate
-                           """.format(\
-                               from_work_day_value,\
-                                   to_work_day_value))
-
-            rows = cursor.fetchall()
-            for row in rows:
-                at_date = HF.date_2_python_date(row[0])
-                date_index = (at_date - from_work_day).days
-                if date_index in obj_dict.keys():
-                    entry = obj_dict[date_index]
-                    entry.work_time = row[1]
-                else:
-                    obj_dict[date_index] = WorkDayTimePercentage.new(\
-                        from_work_day, at_date, 0, row[1], 0, 0)
-
-            # collect the totals, every entry should already have something
-            # in obj_dict
-            cursor.execute("""
-                           SELECT StartDate, SUM(TimeDiff) / 3600.0 TimeDiff
-                           FROM WorkUnitEntry
-                           WHERE StartDate >= {0} AND StartDate <= {1}
-                             AND UnitType IN ({2}, {3})
-                           GROUP BY StartDate
-                           ORDER BY StartDate
-                           """.format(\
-                               from_work_day_value,\
-                                   to_work_day_value,\
-                                       UnitTypes.WORK_TIME,\
-                                           UnitTypes.SCHOOL_TIME))
-
-            rows = cursor.fetchall()
-            for row in rows:
-                at_date = HF.date_2_python_date(row[0])
-                date_index = (at_date - from_work_day).days
-                if date_index in obj_dict.keys():
-                    entry = obj_dict[date_index]
-                    entry.total_time_diff = row[1]
-                else:
-                    obj_dict[date_index] = WorkDayTimePercentage.new(\
-                        from_work_day, at_date, 0, 0, 0, row[1])
-
-            for i in obj_dict.values():
-                entry = obj_dict[i.date_index]
-                if entry.work_time == 0:
-                    entry.work_percent = 100
-                else:
-                    entry.work_percent = min(100.0, 100.0 / entry.work_time * entry.time_diff)
-
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("WorkDaySubjectTimePercentage.get_work_day_time_percentage " +\
-                str(WorkDayTimePercentage.__class__) + " error:", error.args[0])
-            connection.close()
-            raise
-
-        connection.close()
+        stats = WindowStats.get(from_work_day, to_work_day, db_conn)
+
+        obj_dict.clear()
+        for at_date, seconds in stats.day_seconds.items():
+            entry = WorkDayTimePercentage.new(\
+                from_work_day, at_date, seconds / 3600.0, 0, 0, seconds / 3600.0)
+            obj_dict[entry.key()] = entry
+
+        for at_date, work_time in stats.day_work_time.items():
+            date_index = (at_date - from_work_day).days
+            if date_index in obj_dict.keys():
+                obj_dict[date_index].work_time = work_time
+            else:
+                obj_dict[date_index] = WorkDayTimePercentage.new(\
+                    from_work_day, at_date, 0, work_time, 0, 0)
+
+        for entry in obj_dict.values():
+            if entry.work_time == 0:
+                entry.work_percent = 100
+            else:
+                entry.work_percent = min(100.0, 100.0 / entry.work_time * entry.time_diff)
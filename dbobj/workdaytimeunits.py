@@ -2,9 +2,10 @@
 Module contains definition of WorkDayTimeUnits
 """
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 import sqlite3
 from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.rowdecoder import RowDecoder
 
 class WorkDayTimeUnits():
 
@@ -13,6 +14,13 @@ class WorkDayTimeUnits():
     display them
     """
 
+    __slots__ = ("work_unit_entry_id", "subject_id", "unit_type", "start_time", "end_time",\
+        "time_diff_min", "time_diff_sec", "start_offset", "start_date", "load_date",\
+        "description")
+
+    # tables the time units are read from
+    TABLES = ("WorkUnitEntry",)
+
     def __init__(self, work_unit_entry_id, subject_id, unit_type, start_time, end_time,\
         time_diff_min, time_diff_sec, start_offset, start_date, load_date, description):
 
@@ -38,69 +46,68 @@ class WorkDayTimeUnits():
             time_diff_min, time_diff_sec, start_offset, start_date, load_date, description)
 
     @staticmethod
-    def get_time_unit_list(obj_dict, from_work_day, to_work_day, date_format, db_name):
+    def __load_rows(from_work_day, to_work_day, db_conn):
+
+        """
+        return the rows of all time units between the two work days
+        (don't use outside of WorkDayTimeUnits)
+        """
+
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "WorkDayTimeUnits.get_time_unit_list", (\
+                    HF.date_2_db(from_work_day), HF.date_2_db(to_work_day)))
+
+                return cursor.fetchall()
+            except sqlite3.Error as error:
+                print("WorkDayTimeUnits.get_time_unit_list " +\
+                    str(WorkDayTimeUnits.__class__) + " error:", error.args[0])
+                raise
+
+    @staticmethod
+    def get_time_unit_list(obj_dict, from_work_day, to_work_day, date_format, db_conn):
 
         """get list with ordered time units for given work day"""
 
-        from_work_day_value = HF.date_2_db(from_work_day)
-        to_work_day_value = HF.date_2_db(to_work_day)
-
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""SELECT WorkUnitEntryId, SubjectId, UnitType, StartTime, EndTime,
-                                     TimeDiff/60 AS TimeDiffMin, TimeDiff AS TimeDiffSec,
-                                     StartOffset, StartDate, Description
-                              FROM WorkUnitEntry
-                              WHERE StartDate >= {0} AND StartDate <= {1}
-                              ORDER BY StartDate ASC, StartTime ASC;""".format(\
-                                  from_work_day_value, to_work_day_value))
-
-            rows = cursor.fetchall()
-
-            last_date = 0
-            current_date_value = 0
-            current_date_str = "00.00.00"
-
-            obj_dict.clear()
-            c_list = None
-
-            for row in rows:
-
-                current_date = row[8]
-                if current_date != last_date:
-                    last_date = current_date
-                    current_date_value = HF.date_2_python_date(current_date)
-                    current_date_str = current_date_value.strftime(date_format)
-                    obj_dict[current_date_str] = list()
-                    c_list = obj_dict[current_date_str]
-
-                start_time = HF.time_2_python_time(row[3])
-                end_time = HF.time_2_python_time(row[4])
-                start_datetime = (datetime.combine(current_date_value, start_time) +\
-                    timedelta(hours=row[7]))
-                end_datetime = (datetime.combine(current_date_value, end_time) +\
-                    timedelta(hours=row[7]))
-
-                c_list.append(WorkDayTimeUnits.new(\
-                    row[0],\
-                        row[1],\
-                            row[2],\
-                                start_datetime.time(),\
-                                    end_datetime.time(),\
-                                        row[5],\
-                                            row[6],\
-                                                row[7],\
-                                                    start_datetime.date(),\
-                                                        current_date_value,\
-                                                            row[9]))
-
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("WorkDayTimeUnits.get_time_unit_list " +\
-                str(WorkDayTimeUnits.__class__) + " error:", error.args[0])
-            connection.close()
-            raise
-
-        connection.close()
+        rows = db_conn.window_cache.get("WorkDayTimeUnits.get_time_unit_list",\
+            WorkDayTimeUnits.TABLES, from_work_day, to_work_day,\
+                lambda: WorkDayTimeUnits.__load_rows(from_work_day, to_work_day, db_conn))
+
+        last_date = 0
+        current_date_value = 0
+
+        obj_dict.clear()
+        c_list = None
+
+        dates = RowDecoder.DATES
+        date_strings = RowDecoder.DATE_STRINGS[date_format]
+        shifted_times = RowDecoder.SHIFTED_TIMES
+
+        for row in rows:
+
+            current_date = row[8]
+            if current_date != last_date:
+                last_date = current_date
+                current_date_value = dates[current_date]
+                c_list = list()
+                obj_dict[date_strings[current_date]] = c_list
+
+            shifts = shifted_times[row[7]]
+            start_time, start_days = shifts[row[3]]
+            start_date = current_date_value
+            if start_days:
+                start_date = start_date + timedelta(days=start_days)
+
+            c_list.append(WorkDayTimeUnits.new(\
+                row[0],\
+                    row[1],\
+                        row[2],\
+                            start_time,\
+                                shifts[row[4]][0],\
+                                    row[5],\
+                                        row[6],\
+                                            row[7],\
+                                                start_date,\
+                                                    current_date_value,\
+                                                        row[9]))
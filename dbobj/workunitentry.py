@@ -5,6 +5,8 @@ Module contains definition of WorkUnitEntry
 from datetime import datetime, timedelta, time
 import sqlite3
 from dbobj.helperfunctions import HelperFunctions as HF
+from dbobj.rowdecoder import RowDecoder
+from dbobj.scheduleentry import ScheduleEntry
 
 class WorkUnitEntry():
 
@@ -13,6 +15,10 @@ class WorkUnitEntry():
     worked time unit with from-to times and subject
     """
 
+    __slots__ = ("work_unit_entry_id", "type_id", "subject_id", "schedule_entry_id",\
+        "unit_type", "start_offset", "start_time", "start_date", "end_time", "end_date",\
+        "time_diff", "state", "description")
+
     def __init__(self, type_id, subject_id, schedule_entry_id, unit_type, start_offset,\
         start_time, start_date, end_time, end_date, state, description):
 
@@ -31,9 +37,6 @@ class WorkUnitEntry():
         self.state = state
         self.description = description
 
-    def __del__(self):
-        pass
-
     def key(self):
 
         """return uniform key for work unit entry"""
@@ -83,285 +86,208 @@ class WorkUnitEntry():
                 end_date, state, description)
 
     @staticmethod
-    def to_db(obj, obj_dict, db_name):
+    def to_db(obj, obj_dict, db_conn):
 
         """store object to db"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            start_datetime = (datetime.combine(obj.start_date, obj.start_time) -\
-                timedelta(hours=obj.start_offset))
-            end_datetime = (datetime.combine(obj.end_date, obj.end_time) -\
-                timedelta(hours=obj.start_offset))
-            time_diff = (end_datetime - start_datetime).seconds
-
-            # if we are crazy and work over the 5am threshhold, we need to separate
-            # work entries in order to have them separated nicely on the schedule display
-            if start_datetime.date() != end_datetime.date():
-                cursor.execute("""INSERT INTO WorkUnitEntry
-                                 (TypeId, SubjectId, ScheduleEntryId, UnitType, StartOffset,
-                                  StartTime, StartDate, EndTime, EndDate, TimeDiff,
-                                  State, Description)
-                    VALUES ({0}, {1}, {2}, {3}, {4}, {5}, {6},
-                            {7}, {8}, {9}, {10}, '{11}')""".format(\
-                        obj.type_id,\
-                            obj.subject_id,\
-                                obj.schedule_entry_id,\
-                                    obj.unit_type,\
-                                        obj.start_offset,\
-                                            HF.time_2_db(start_datetime.time()),\
-                                                HF.date_2_db(start_datetime.date()),\
-                                                    HF.time_2_db(time(23, 39)),\
-                                                        HF.date_2_db(start_datetime.date()),\
-                                                            time_diff,\
-                                                                obj.state,\
-                                                                    HF.escape_quote(obj.description)))
-                cursor.execute("""INSERT INTO WorkUnitEntry
-                                (TypeId, SubjectId, ScheduleEntryId, UnitType, StartOffset,
-                                StartTime, StartDate, EndTime, EndDate, TimeDiff,
-                                State, Description)
-                    VALUES ({0}, {1}, {2}, {3}, {4}, {5}, {6},
-                            {7}, {8}, {9}, {10}, '{11}')""".format(\
-                        obj.type_id,\
-                            obj.subject_id,\
-                                obj.schedule_entry_id,\
-                                    obj.unit_type,\
-                                        obj.start_offset,\
-                                            HF.time_2_db(time(0, 0)),\
-                                                HF.date_2_db(end_datetime.date()),\
-                                                    HF.time_2_db(end_datetime.time()),\
-                                                        HF.date_2_db(end_datetime.date()),\
-                                                            time_diff,\
-                                                                obj.state,\
-                                                                    HF.escape_quote(obj.description)))
-            else:
-                cursor.execute("""INSERT INTO WorkUnitEntry
-                                (TypeId, SubjectId, ScheduleEntryId, UnitType, StartOffset,
-                                StartTime, StartDate, EndTime, EndDate, TimeDiff,
-                                State, Description)
-                    VALUES ({0}, {1}, {2}, {3}, {4}, {5}, {6},
-                            {7}, {8}, {9}, {10}, '{11}')""".format(\
-                        obj.type_id,\
-                            obj.subject_id,\
-                                obj.schedule_entry_id,\
-                                    obj.unit_type,\
-                                        obj.start_offset,\
-                                            HF.time_2_db(start_datetime.time()),\
-                                                HF.date_2_db(start_datetime.date()),\
-                                                    HF.time_2_db(end_datetime.time()),\
-                                                        HF.date_2_db(end_datetime.date()),\
-                                                            time_diff,\
-                                                                obj.state,\
-                                                                    HF.escape_quote(obj.description)))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("WorkUnitEntry.to_db " + str(WorkUnitEntry.__class__) + " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                start_datetime = (datetime.combine(obj.start_date, obj.start_time) -\
+                    timedelta(hours=obj.start_offset))
+                end_datetime = (datetime.combine(obj.end_date, obj.end_time) -\
+                    timedelta(hours=obj.start_offset))
+                time_diff = (end_datetime - start_datetime).seconds
+
+                params = {\
+                    "type_id": obj.type_id,\
+                        "subject_id": obj.subject_id,\
+                            "schedule_entry_id": obj.schedule_entry_id,\
+                                "unit_type": obj.unit_type,\
+                                    "start_offset": obj.start_offset,\
+                                        "start_time": HF.time_2_db(start_datetime.time()),\
+                                            "start_date": HF.date_2_db(start_datetime.date()),\
+                                                "end_time": HF.time_2_db(end_datetime.time()),\
+                                                    "end_date": HF.date_2_db(end_datetime.date()),\
+                                                        "time_diff": time_diff,\
+                                                            "state": obj.state,\
+                                                                "description": obj.description}
+
+                # if we are crazy and work over the 5am threshhold, we need to separate
+                # work entries in order to have them separated nicely on the schedule display
+                if start_datetime.date() != end_datetime.date():
+                    db_conn.execute(cursor, "WorkUnitEntry.to_db", dict(params,\
+                        end_time=HF.time_2_db(time(23, 39)),\
+                            end_date=HF.date_2_db(start_datetime.date())))
+                    db_conn.execute(cursor, "WorkUnitEntry.to_db", dict(params,\
+                        start_time=HF.time_2_db(time(0, 0)),\
+                            start_date=HF.date_2_db(end_datetime.date())))
+                else:
+                    db_conn.execute(cursor, "WorkUnitEntry.to_db", params)
+            except sqlite3.Error as error:
+                print("WorkUnitEntry.to_db " + str(WorkUnitEntry.__class__) + " error:", error.args[0])
+                raise
 
         # add object to dict containing all subjects
         obj.work_unit_entry_id = cursor.lastrowid
         obj_dict[obj.key()] = obj
 
     @staticmethod
-    def update_by_db_id(obj, db_name):
+    def booking_to_db(obj, schedule_obj, obj_dict, db_conn):
 
-        """update object by db id"""
+        """
+        store obj as booking of schedule_obj, an occurrence of a virtual
+        series gets its schedule_entry_id first (in the same transaction)
+        """
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            start_datetime = (datetime.combine(obj.start_date, obj.start_time) -\
-                timedelta(hours=obj.start_offset))
-            end_datetime = (datetime.combine(obj.end_date, obj.end_time) -\
-                timedelta(hours=obj.start_offset))
-            time_diff = (end_datetime - start_datetime).seconds
-
-            cursor.execute("""UPDATE WorkUnitEntry SET
-                              TypeId = {0},
-                              SubjectId = {1},
-                              ScheduleEntryId = {2},
-                              UnitType = {3},
-                              StartOffset = {4},
-                              StartTime = {5},
-                              StartDate = {6},
-                              EndTime = {7},
-                              EndDate = {8},
-                              TimeDiff = {9},
-                              State = {10},
-                              Description = '{11}'
-                       WHERE WorkUnitEntryId = {12}""".format(\
-                           obj.type_id,\
-                               obj.subject_id,\
-                                   obj.schedule_entry_id,\
-                                    obj.unit_type,\
-                                        obj.start_offset,\
-                                               HF.time_2_db(start_datetime.time()),\
-                                                   HF.date_2_db(start_datetime.date()),\
-                                                       HF.time_2_db(end_datetime.time()),\
-                                                           HF.date_2_db(end_datetime.date()),\
-                                                               time_diff,\
-                                                                   obj.state,\
-                                                                       HF.escape_quote(obj.description),\
-                                                                           obj.work_unit_entry_id))
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("WorkUnitEntry.update_by_db_id " + str(WorkUnitEntry.__class__) +\
-                " error:", error.args[0])
-            raise
+        with db_conn.writer():
+            ScheduleEntry.occurrence_to_db(schedule_obj, db_conn)
+            obj.schedule_entry_id = schedule_obj.schedule_entry_id
+            WorkUnitEntry.to_db(obj, obj_dict, db_conn)
 
-        connection.commit()
-        connection.close()
+    @staticmethod
+    def update_by_db_id(obj, db_conn):
+
+        """update object by db id"""
+
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                start_datetime = (datetime.combine(obj.start_date, obj.start_time) -\
+                    timedelta(hours=obj.start_offset))
+                end_datetime = (datetime.combine(obj.end_date, obj.end_time) -\
+                    timedelta(hours=obj.start_offset))
+                time_diff = (end_datetime - start_datetime).seconds
+
+                db_conn.execute(cursor, "WorkUnitEntry.update_by_db_id", {\
+                    "type_id": obj.type_id,\
+                        "subject_id": obj.subject_id,\
+                            "schedule_entry_id": obj.schedule_entry_id,\
+                                "unit_type": obj.unit_type,\
+                                    "start_offset": obj.start_offset,\
+                                        "start_time": HF.time_2_db(start_datetime.time()),\
+                                            "start_date": HF.date_2_db(start_datetime.date()),\
+                                                "end_time": HF.time_2_db(end_datetime.time()),\
+                                                    "end_date": HF.date_2_db(end_datetime.date()),\
+                                                        "time_diff": time_diff,\
+                                                            "state": obj.state,\
+                                                                "description": obj.description,\
+                                                                    "work_unit_entry_id":\
+                                                                        obj.work_unit_entry_id})
+            except sqlite3.Error as error:
+                print("WorkUnitEntry.update_by_db_id " + str(WorkUnitEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def reload_from_db(obj_dict, start_date, end_date, db_name):
+    def reload_from_db(obj_dict, start_date, end_date, db_conn):
 
         """load all objects of this type from db"""
 
         start_date_val = HF.date_2_db(start_date)
         end_date_val = HF.date_2_db(end_date)
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""SELECT WorkUnitEntryId, TypeId, SubjectId, ScheduleEntryId, UnitType,
-                              StartOffset, StartTime, StartDate, EndTime, EndDate, TimeDiff,
-                              State, Description
-                              FROM WorkUnitEntry WHERE StartDate <= {0}
-                                             AND EndDate >= {1}
-                              ORDER BY WorkUnitEntryId""".format(\
-                                                 start_date_val,\
-                                                     end_date_val))
-            rows = cursor.fetchall()
-            obj_dict.clear()
-            for row in rows:
-                start_time = HF.time_2_python_time(row[5])
-                start_date = HF.date_2_python_date(row[6])
-                end_time = HF.time_2_python_time(row[7])
-                end_date = HF.date_2_python_date(row[8])
-
-                start_time = (datetime.combine(start_date, start_time) +\
-                    timedelta(hours=row[4])).time()
-                end_time = (datetime.combine(end_date, end_time) +\
-                    timedelta(hours=row[4])).time()
-
-                obj = WorkUnitEntry.new(\
-                    row[1],\
-                        row[2],\
-                            row[3],\
-                                row[4],\
-                                    row[5],\
-                                        start_time,\
-                                            start_date,\
-                                                end_time,\
-                                                    end_date,\
-                                                        row[11],\
-                                                            row[12])
-
-                obj.work_unit_entry_id = row[0]
-                # takes the old value and overrides the new one on purpose!
-                obj.time_diff = row[10]
-                obj_dict[obj.key()] = obj
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("WorkUnitEntry.reload_from_db " + str(WorkUnitEntry.__class__) +\
-                " error:", error.args[0])
-            raise
-
-        connection.close()
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "WorkUnitEntry.reload_from_db", (\
+                    start_date_val,\
+                        end_date_val))
+                rows = cursor.fetchall()
+                obj_dict.clear()
+                dates = RowDecoder.DATES
+                shifted_times = RowDecoder.SHIFTED_TIMES
+                for row in rows:
+                    shifts = shifted_times[row[5]]
+
+                    obj = WorkUnitEntry.new(\
+                        row[1],\
+                            row[2],\
+                                row[3],\
+                                    row[4],\
+                                        row[5],\
+                                            shifts[row[6]][0],\
+                                                dates[row[7]],\
+                                                    shifts[row[8]][0],\
+                                                        dates[row[9]],\
+                                                            row[11],\
+                                                                row[12])
+
+                    obj.work_unit_entry_id = row[0]
+                    # takes the old value and overrides the new one on purpose!
+                    obj.time_diff = row[10]
+                    obj_dict[obj.key()] = obj
+            except sqlite3.Error as error:
+                print("WorkUnitEntry.reload_from_db " + str(WorkUnitEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
-    def load_entry_from_db(obj_properties, db_name):
+    def load_entry_from_db(obj_properties, db_conn):
 
         """load single object of this type from db"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        obj = None
-        try:
-            cursor.execute("""SELECT WorkUnitEntryId, TypeId, SubjectId, ScheduleEntryId,
-                              UnitType, StartOffset, StartTime, StartDate, EndTime, EndDate,
-                              TimeDiff, State, Description
-                              FROM WorkUnitEntry
-                              WHERE ScheduleEntryId = {0}
-                              LIMIT 1""".format(obj_properties.schedule_entry_id))
-
-            rows = cursor.fetchall()
-            for row in rows:
-                start_time = HF.time_2_python_time(row[6])
-                start_date = HF.date_2_python_date(row[7])
-                end_time = HF.time_2_python_time(row[8])
-                end_date = HF.date_2_python_date(row[9])
-
-                start_time = (datetime.combine(start_date, start_time) +\
-                    timedelta(hours=row[5])).time()
-                end_time = (datetime.combine(end_date, end_time) +\
-                    timedelta(hours=row[5])).time()
-
-                obj = WorkUnitEntry.new(\
-                    row[1],\
-                        row[2],\
-                            row[3],\
-                                row[4],\
-                                    row[5],\
-                                        start_time,\
-                                            start_date,\
-                                                end_time,\
-                                                    end_date,\
-                                                        row[11],\
-                                                            row[12])
-
-                obj.work_unit_entry_id = row[0]
-                # takes the old value and overrides the new one on purpose!
-                obj.time_diff = row[10]
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("WorkUnitEntry.load_entry_from_db " + str(WorkUnitEntry.__class__) +\
-                " error:", error.args[0])
-            raise
+        with db_conn.reader() as connection:
+            cursor = connection.cursor()
+            obj = None
+            try:
+                db_conn.execute(cursor, "WorkUnitEntry.load_entry_from_db", (\
+                    obj_properties.schedule_entry_id,))
+
+                rows = cursor.fetchall()
+                for row in rows:
+                    shifts = RowDecoder.SHIFTED_TIMES[row[5]]
+
+                    obj = WorkUnitEntry.new(\
+                        row[1],\
+                            row[2],\
+                                row[3],\
+                                    row[4],\
+                                        row[5],\
+                                            shifts[row[6]][0],\
+                                                RowDecoder.DATES[row[7]],\
+                                                    shifts[row[8]][0],\
+                                                        RowDecoder.DATES[row[9]],\
+                                                            row[11],\
+                                                                row[12])
+
+                    obj.work_unit_entry_id = row[0]
+                    # takes the old value and overrides the new one on purpose!
+                    obj.time_diff = row[10]
+            except sqlite3.Error as error:
+                print("WorkUnitEntry.load_entry_from_db " + str(WorkUnitEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
 
-        connection.close()
         return obj
 
     @staticmethod
-    def delete_by_db_id(obj, obj_dict, date_format, db_name):
+    def delete_by_db_id(obj, obj_dict, date_format, db_conn):
 
         """delete obj from db and from corresponding obj_dict"""
 
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""DELETE FROM WorkUnitEntry WHERE WorkUnitEntryId = {0}""".format(\
-                obj.work_unit_entry_id))
-
-            date_key = obj.start_date.strftime(date_format)
-            if date_key in obj_dict.keys():
-                obj_list = obj_dict[date_key]
-                index = 0
-                for i in obj_list:
-                    if i.work_unit_entry_id == obj.work_unit_entry_id:
-                        del obj_list[index]
-                        break
-                    index = index + 1
-
-                if not obj_list:
-                    del obj_dict[date_key]
-        except sqlite3.Error as error:
-            connection.rollback()
-            connection.close()
-            print("WorkUnitEntry.delete_by_db_id " + str(WorkUnitEntry.__class__) +\
-                " error:", error.args[0])
-            raise
-
-        connection.commit()
-        connection.close()
+        with db_conn.writer() as connection:
+            cursor = connection.cursor()
+            try:
+                db_conn.execute(cursor, "WorkUnitEntry.delete_by_db_id", (\
+                    obj.work_unit_entry_id,))
+
+                date_key = obj.start_date.strftime(date_format)
+                if date_key in obj_dict.keys():
+                    obj_list = obj_dict[date_key]
+                    index = 0
+                    for i in obj_list:
+                        if i.work_unit_entry_id == obj.work_unit_entry_id:
+                            del obj_list[index]
+                            break
+                        index = index + 1
+
+                    if not obj_list:
+                        del obj_dict[date_key]
+            except sqlite3.Error as error:
+                print("WorkUnitEntry.delete_by_db_id " + str(WorkUnitEntry.__class__) +\
+                    " error:", error.args[0])
+                raise
 
     @staticmethod
     def compare(obj1, obj2):
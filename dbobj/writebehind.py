@@ -0,0 +1,200 @@
+"""
+Module contains definition of WriteBehind
+
+The writes of the gui (Session flushes, the running WorkUnitEntry of
+the timer) are handed to one writer thread, so a slow disk or a locked
+db file doesn't freeze the gui. The commands run in the order they were
+submitted, every one returns a concurrent.futures.Future.
+
+Writes of other threads wait until the queued writes are done, so the
+order of the writes is kept. Reads don't wait, a loader of the gui would
+freeze with the writer thread on a locked db file. A read that ran while
+writes were queued doesn't contain them, once they're written drained is
+called, the gui hands it to the Communicator and loads its windows again.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+class WriteBehind():
+
+    """
+    Class represents the writer thread of one DBConnection
+
+    As long as it's not enabled, submit runs the command right away on
+    the calling thread. The thread is started with the first command.
+
+    The commands must not change the dicts of the gui, Session hands them
+    copies and does the changes on the gui thread once they're written.
+    """
+
+    def __init__(self, db_conn):
+        self.db_conn = db_conn
+        self.enabled = False
+        # called on the writer thread once the queue is empty after a read
+        # of another thread missed queued writes
+        self.drained = None
+
+        self.condition = threading.Condition()
+        # (future, function, args, kwargs) in submit order
+        self.commands = deque()
+        self.thread = None
+        self.busy = False
+        self.stopped = False
+        # a read of another thread ran while commands were queued
+        self.read_ahead_pending = False
+
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.waits = 0
+        self.reads_ahead = 0
+
+    def is_worker(self):
+
+        """true if called by the writer thread"""
+
+        thread = self.thread
+        return thread is not None and thread.ident == threading.get_ident()
+
+    def submit(self, function, *args, **kwargs):
+
+        """
+        run function(*args, **kwargs) on the writer thread after all
+        commands submitted before, return a future with its result
+        """
+
+        future = Future()
+        with self.condition:
+            self.submitted = self.submitted + 1
+            queued = self.enabled and not self.stopped and not self.is_worker()
+            if queued:
+                self.commands.append((future, function, args, kwargs))
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self.run, name="WriteBehind",\
+                        daemon=True)
+                    self.thread.start()
+                self.condition.notify_all()
+
+        if not queued:
+            self.execute(future, function, args, kwargs)
+        return future
+
+    def queues(self):
+
+        """true if submit hands a command of the calling thread to the writer thread"""
+
+        with self.condition:
+            return self.enabled and not self.stopped and not self.is_worker()
+
+    def pending(self):
+
+        """return the number of commands that are not done yet"""
+
+        with self.condition:
+            return len(self.commands) + int(self.busy)
+
+    def read_ahead(self):
+
+        """
+        called by a reader of another thread that doesn't wait for the
+        queued writes, drained is called once they're written
+        """
+
+        if self.is_worker():
+            return
+
+        with self.condition:
+            if self.commands or self.busy:
+                self.reads_ahead = self.reads_ahead + 1
+                self.read_ahead_pending = True
+
+    def wait(self, timeout=None):
+
+        """wait until all submitted commands are done, return False on timeout"""
+
+        if self.thread is None or self.is_worker():
+            return True
+
+        with self.condition:
+            if not self.commands and not self.busy:
+                return True
+            self.waits = self.waits + 1
+            return self.condition.wait_for(\
+                lambda: not self.commands and not self.busy, timeout)
+
+    def stop(self):
+
+        """write everything that is queued and end the writer thread"""
+
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+            thread = self.thread
+
+        if thread is not None and not self.is_worker():
+            thread.join()
+
+    def run(self):
+
+        """writer thread, runs one command after the other"""
+
+        while True:
+            drained = None
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+                if not self.commands and self.read_ahead_pending:
+                    self.read_ahead_pending = False
+                    drained = self.drained
+
+            if drained is not None:
+                drained()
+
+            with self.condition:
+                while not self.commands and not self.stopped:
+                    self.condition.wait()
+                if not self.commands:
+                    return
+                future, function, args, kwargs = self.commands.popleft()
+                self.busy = True
+
+            self.execute(future, function, args, kwargs)
+
+    def execute(self, future, function, args, kwargs):
+
+        """run one command and set the result of its future"""
+
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            result = function(*args, **kwargs)
+        except Exception as error: # pylint: disable=broad-except
+            with self.condition:
+                self.failed = self.failed + 1
+            if self.is_worker():
+                # nobody may wait for the future, the dbobj functions
+                # only printed the sqlite errors
+                print("WriteBehind.execute " + str(WriteBehind.__class__) +\
+                    " error:", repr(error))
+            future.set_exception(error)
+            return
+
+        with self.condition:
+            self.written = self.written + 1
+        future.set_result(result)
+
+    def get_stats(self):
+
+        """return dict with the counters of the writer thread"""
+
+        with self.condition:
+            return {\
+                "submitted": self.submitted,\
+                    "written": self.written,\
+                        "failed": self.failed,\
+                            "waits": self.waits,\
+                                "reads_ahead": self.reads_ahead,\
+                                    "pending": len(self.commands) + int(self.busy)}
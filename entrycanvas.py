@@ -5,39 +5,39 @@ be entered
 """
 
 import random
+from bisect import bisect_left, bisect_right
 from datetime import timedelta
-from PyQt6.QtWidgets import QWidget, QLineEdit, QLabel, QHBoxLayout
+from PyQt6.QtWidgets import QWidget, QLineEdit
 from PyQt6.QtGui import QPainter, QBrush, QPalette, QFont
-from PyQt6.QtCore import Qt, pyqtSlot
+from PyQt6.QtCore import Qt, QRect, pyqtSlot
 import dbobj.dbwrapper as dbwrapper
 from dbobj.helperfunctions import HelperFunctions as HF
 
 from helpers.entrycanvasgrid import EntryCanvasGrid
 from helpers.entrycanvasvalues import EntryCanvasValues
+from helpers.paintcounter import PaintCounter
+from helpers.pixmaplayer import get_canvas_rect
 
-class GridEntry(QWidget):
+class GridEntry(QRect):
 
     """
     Class represents one field on the entry grid
+
+    The fields are painted by the EntryCanvas, only the focused one is
+    covered by its EntryEditor.
     """
 
-    def __init__(self, parent, x_coord, y_coord, width, height,\
+    def __init__(self, x_coord, y_coord, width, height,\
         index_tupel, entry, percentage, subject, at_date,\
             entry_work_gradient, communicator, context):
 
-        super().__init__(parent=parent)
         self.context = context
-        self.parent = parent
         self.subject = subject
         self.at_date = at_date
         self.communicator = communicator
         self.index_tupel = index_tupel
         self.entry_work_gradient = entry_work_gradient
 
-        self.layout = QHBoxLayout()
-        self.layout.setContentsMargins(0, 0, 0, 0)
-        self.layout.setSpacing(0)
-
         self.entry = entry
         self.percentage = percentage
 
@@ -45,58 +45,18 @@ class GridEntry(QWidget):
 
         self.entry_values = None
         self.calculate_times()
-        self.entry_label = QLabel(self.entry_values.work_balance, font=context.font, parent=self)
-        self.entry_edit = QLineEdit(self.entry_values.work_time, font=context.font, parent=self)
-
-        background_color = None
-        background_color = self.entry_values.gradient_color
-        self.total_label = QLabel(self.entry_values.total_time, font=context.font, parent=self)
-        font = self.total_label.font()
-        font.setBold(True)
-        self.total_label.setFont(font)
-
-        self.label_layout = QHBoxLayout()
-        self.label_layout.setContentsMargins(0, 0, 0, 0)
-        self.label_layout.setSpacing(0)
-
-        self.label_font_size = 8
-        self.total_label.setStyleSheet("padding-left: 5px;")
-        self.total_label.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
-        self.entry_label.setStyleSheet("padding-right: 2px;")
-        self.entry_label.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight)
-        self.label_layout.addWidget(self.total_label)
-        self.label_layout.addWidget(self.entry_label)
-        self.layout.addLayout(self.label_layout)
-
-        self.entry_edit.setStyleSheet("border: 2px solid black; background-color: white")
-        self.entry_edit.setFixedSize(0, 0)
-        self.entry_edit.setAlignment(Qt.AlignmentFlag.AlignRight)
-        self.layout.addWidget(self.entry_edit)
-
-        self.setLayout(self.layout)
-
-        self.base_x_coord = x_coord + self.context.box_border_width
-        self.base_y_coord = y_coord + self.context.box_border_width
-        self.base_width = width - 2*self.context.box_border_width
-        self.base_height = height - 2*self.context.box_border_width
-
-        self.x_coord = 0
-        self.y_coord = 0
-        self.width = 0
-        self.height = 0
-        self.set_coordinates()
-
-        self.setFixedSize(self.width, self.height)
-        self.move(self.x_coord, self.y_coord)
-
-        palette = QPalette()
-        palette.setColor(QPalette.ColorRole.Window, background_color)
-        self.setAutoFillBackground(True)
-        self.setPalette(palette)
 
-        self.communicator.SIGNAL_PARENT_RESIZED.connect(self.scale)
+        super().__init__(\
+            x_coord + self.context.box_border_width,\
+                y_coord + self.context.box_border_width,\
+                    width - 2*self.context.box_border_width,\
+                        height - 2*self.context.box_border_width)
 
-        self.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
+        half = int(self.width()/2)
+        self.total_rect = QRect(self.x() + self.context.box_text_margin, self.y(),\
+            half - self.context.box_text_margin, self.height())
+        self.balance_rect = QRect(self.x() + half, self.y(),\
+            self.width() - half - 2, self.height())
 
     def __del__(self):
         pass
@@ -107,21 +67,6 @@ class GridEntry(QWidget):
 
         return round(seconds / 3600.0, 2)
 
-    def set_coordinates(self):
-
-        """set class variables including current global scale"""
-
-        scale = self.context.scale
-        self.x_coord = int(self.base_x_coord*scale)
-        self.y_coord = int(self.base_y_coord*scale)
-        self.width = int(self.base_width*scale)
-        self.height = int(self.base_height*scale)
-        if self.entry_edit.width() != 0:
-            self.entry_edit.setFixedSize(self.width, self.height)
-        else:
-            self.entry_label.setFixedSize(int(self.width/2), self.height)
-            self.total_label.setFixedSize(int(self.width/2), self.height)
-
     def calculate_times(self):
 
         """
@@ -161,50 +106,28 @@ class GridEntry(QWidget):
                         work_percent,\
                             background_color)
 
-    def change_gradient(self):
+    def paint(self, painter, brush, normal_font, total_font):
 
-        """update color gradient depending on registered planed work"""
+        """paint the field with its total time and work balance"""
 
-        # (total_time, work_balance, work_percent)
-        self.calculate_times()
-        background_color = self.entry_values.gradient_color
-        self.total_label.setText(self.entry_values.total_time)
-        self.entry_label.setText(self.entry_values.work_balance)
+        brush.setColor(self.entry_values.gradient_color)
+        painter.fillRect(self, brush)
 
-        palette = QPalette()
-        palette.setColor(QPalette.ColorRole.Window, background_color)
-        self.setAutoFillBackground(True)
-        self.setPalette(palette)
+        if self.entry_values.total_time != "":
+            painter.setFont(total_font)
+            painter.drawText(self.total_rect,\
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,\
+                    self.entry_values.total_time)
 
-        self.update()
+        if self.entry_values.work_balance != "":
+            painter.setFont(normal_font)
+            painter.drawText(self.balance_rect,\
+                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,\
+                    self.entry_values.work_balance)
 
-    @pyqtSlot()
-    def scale(self):
+    def set_work_time(self, text):
 
-        """scale and move current field according to current scale"""
-
-        self.set_coordinates()
-        self.setFixedSize(self.width, self.height)
-        self.move(self.x_coord, self.y_coord)
-        QFont()
-        new_font_total =\
-            QFont("MS Shell Dlg 2", int(self.label_font_size*self.context.scale), 10, False)
-        new_font_entry =\
-            QFont("MS Shell Dlg 2", int(self.label_font_size*self.context.scale))
-
-        self.total_label.setFont(new_font_total)
-        self.entry_label.setFont(new_font_entry)
-        self.entry_edit.setFont(new_font_entry)
-        self.focusOutEvent(None)
-
-    def focus_out_handler(self):
-
-        """pseudo handler to remove focus from a cell"""
-
-        text = self.entry_edit.text()
-        self.entry_label.setFixedSize(int(self.width/2), self.height)
-        self.total_label.setFixedSize(int(self.width/2), self.height)
-        self.entry_edit.setFixedSize(0, 0)
+        """store text of the editor as planed work time of the field"""
 
         if self.entry_values.work_time != text:
             if text != "":
@@ -215,14 +138,14 @@ class GridEntry(QWidget):
                                 self.context.start_of_week,\
                                     self.at_date,\
                                         "")
-                    dbwrapper.SubjectWorkUnit.to_db(\
-                        self.entry,\
-                            self.context.subject_work_units,\
-                                self.context.db_file_name)
+                    self.context.session.add(\
+                        dbwrapper.SubjectWorkUnit.to_db,\
+                            self.entry,\
+                                self.context.subject_work_units)
 
                     if self.percentage is not None:
                         self.percentage.update_percent(float(text))
-                    self.change_gradient()
+                    self.calculate_times()
 
                     self.communicator.SIGNAL_ENTRY_WORK_PLAN_CHANGED.emit(\
                         self.index_tupel[1], 0.0, float(text))
@@ -234,29 +157,30 @@ class GridEntry(QWidget):
 
                     if self.percentage is not None:
                         self.percentage.update_percent(float(text))
-                    self.change_gradient()
+                    self.calculate_times()
 
                     self.communicator.SIGNAL_ENTRY_WORK_PLAN_CHANGED.emit(\
                         self.index_tupel[1], old_work_time, float(text))
                     self.communicator.SIGNAL_SUBJECT_WORK_PLAN_CHANGED.emit(\
                         self.subject.subject_id, old_work_time, float(text))
 
-                    dbwrapper.SubjectWorkUnit.update_by_db_id(self.entry,\
-                        self.context.db_file_name)
+                    self.context.session.update(\
+                        dbwrapper.SubjectWorkUnit.update_by_db_id,\
+                            self.entry)
             else:
                 if self.entry is None:
                     pass # do nothing
                 else:
                     old_work_time = self.entry.work_time
-                    dbwrapper.SubjectWorkUnit.delete_by_db_id(\
-                        self.entry,\
-                            self.context.subject_work_units,\
-                                self.context.db_file_name)
+                    self.context.session.delete(\
+                        dbwrapper.SubjectWorkUnit.delete_by_db_id,\
+                            self.entry,\
+                                self.context.subject_work_units)
                     self.entry = None
 
                     if self.percentage is not None:
                         self.percentage.update_percent(0.0)
-                    self.change_gradient()
+                    self.calculate_times()
 
                     self.communicator.SIGNAL_ENTRY_WORK_PLAN_CHANGED.emit(\
                         self.index_tupel[1], old_work_time, 0.0)
@@ -264,24 +188,37 @@ class GridEntry(QWidget):
                         self.subject.subject_id, old_work_time, 0.0)
 
         self.calculate_times()
-        self.entry_label.setText(self.entry_values.work_balance)
 
-    def focusInEvent(self, event): # pylint: disable=invalid-name, unused-argument
+class EntryEditor(QLineEdit):
 
-        """field has lost focus event handler"""
+    """
+    Class represents the one line edit of the entry canvas, it's moved
+    to the focused field
+    """
 
-        # if something was selected before, remove focus from that
-        if self.parent.last_index_tupel != (-1, -1):
-            self.parent.entry_boxes[self.parent.last_index_tupel].focus_out_handler()
-
-        self.entry_edit.setFocus()
-        self.entry_edit.setText(self.entry_values.work_time)
-        self.entry_label.setFixedSize(0, 0)
-        self.total_label.setFixedSize(0, 0)
-        self.entry_edit.setFixedSize(self.width, self.height)
-        self.entry_edit.selectAll()
-        self.parent.last_index_tupel = self.index_tupel
-        self.parent.focusInEvent(event)
+    def __init__(self, context, parent):
+        super().__init__(parent=parent)
+        self.context = context
+        self.parent = parent
+
+        self.setStyleSheet("border: 2px solid black; background-color: white")
+        self.setAlignment(Qt.AlignmentFlag.AlignRight)
+        self.hide()
+
+    def place(self, grid_entry):
+
+        """move the editor over grid_entry according to the current scale"""
+
+        scale = self.context.scale
+        self.setGeometry(\
+            int(grid_entry.x()*scale),\
+                int(grid_entry.y()*scale),\
+                    int(grid_entry.width()*scale),\
+                        int(grid_entry.height()*scale))
+
+        font = QFont(self.context.font)
+        font.setPointSizeF(self.context.font.pointSizeF()*scale)
+        self.setFont(font)
 
     def keyPressEvent(self, event): # pylint: disable=invalid-name
 
@@ -294,12 +231,12 @@ class GridEntry(QWidget):
             super().keyPressEvent(event)
             return
         if key in return_keys:
-            self.focus_out_handler()
+            self.parent.focus_out_handler()
             self.parent.keyPressEvent(event)
             return
         if key == Qt.Key.Key_Alt:
             self.parent.keyPressEvent(event)
-        self.entry_edit.keyPressEvent(event)
+        super().keyPressEvent(event)
 
 class EntryCanvas(QWidget):
 
@@ -307,6 +244,11 @@ class EntryCanvas(QWidget):
     Class represents one canvas with a grid where
     each field is editable except for the first column
     which shows subjects
+
+    The fields aren't widgets, the canvas paints the ones inside the
+    exposed area and moves its one EntryEditor to the focused field.
+    The GridEntry of a field is only created when it's needed the first
+    time, so a window of hundreds of subjects and days stays cheap.
     """
 
     def __init__(self, entry_work_gradient, subject_entry_communicator,\
@@ -333,12 +275,15 @@ class EntryCanvas(QWidget):
         # self.setFocusPolicy(Qt.FocusPolicy.WheelFocus)
 
         self.select_rect = None
+        # (subject_index, date_index) -> GridEntry, see get_entry
         self.entry_boxes = self.init_entry_boxes()
+        # y of the first row of every subject and the bottom of the last one
+        self.row_tops = list()
         self.grid = None
-        self.linked_scrollbars = list()
-        self.linked_vertical_scrollbars = list()
+        self.paint_counter = PaintCounter()
         self.grid_height = 0
         self.last_index_tupel = (-1, -1)
+        self.editor = EntryEditor(self.context, self)
 
         self.subject_index_mapping = dict()
         self.date_index_mapping = dict()
@@ -348,9 +293,6 @@ class EntryCanvas(QWidget):
         self.create_subject_grid()
         self.resize_canvas()
 
-        self.v_scroll_value = self.parent.verticalScrollBar().value()
-        self.h_scroll_value = self.parent.horizontalScrollBar().value()
-
     def init_entry_boxes(self):
 
         """return empty dict to init entry_boxes"""
@@ -365,12 +307,8 @@ class EntryCanvas(QWidget):
 
         """update entire canvas using new context data"""
 
-        children = self.findChildren(QWidget)
-        for i in children:
-            i.setParent(None)
-
-        for i in self.entry_boxes.values():
-            i.setParent(None)
+        self.editor.hide()
+        self.last_index_tupel = (-1, -1)
 
         self.entry_boxes = self.init_entry_boxes()
         self.grid = None
@@ -390,7 +328,7 @@ class EntryCanvas(QWidget):
         key = (subject_index, date_index)
 
         # this one must be there
-        entry = self.entry_boxes[key]
+        entry = self.get_entry(key)
 
         old_time_diff = 0
         new_time_diff = time_diff
@@ -413,7 +351,7 @@ class EntryCanvas(QWidget):
             entry.percentage.update_percent(entry.percentage.work_time)
 
         entry.calculate_times()
-        entry.change_gradient()
+        self.update_entry(entry)
 
         self.communicator.SIGNAL_ENTRY_TOTAL_WORK_CHANGED.emit(date_index, time_diff)
         self.communicator.SIGNAL_SUBJECT_TOTAL_WORK_CHANGED.emit(\
@@ -429,7 +367,7 @@ class EntryCanvas(QWidget):
         key = (subject_index, date_index)
 
         # this one must be there
-        entry = self.entry_boxes[key]
+        entry = self.get_entry(key)
 
         old_time_diff = 0
         new_time_diff = time_diff
@@ -458,7 +396,7 @@ class EntryCanvas(QWidget):
             entry.percentage.update_percent(entry.percentage.work_time)
 
         entry.calculate_times()
-        entry.change_gradient()
+        self.update_entry(entry)
 
         self.communicator.SIGNAL_ENTRY_WORK_TIME_CHANGED.emit(\
             date_index, time_diff)
@@ -492,6 +430,9 @@ class EntryCanvas(QWidget):
         height = self.grid_height + self.context.top_offset + self.context.scroll_bar_offset
         self.setFixedSize(int(width*self.context.scale), int(height*self.context.scale))
 
+        if self.last_index_tupel != (-1, -1):
+            self.editor.place(self.get_entry(self.last_index_tupel))
+
     def create_subject_grid(self):
 
         """
@@ -518,14 +459,14 @@ class EntryCanvas(QWidget):
             self.context.subject_work_units,\
                 self.context.start_date,\
                     self.context.end_date,\
-                        self.context.db_file_name)
+                        self.context.db_conn)
 
         # load grid subject work percentages from db
         dbwrapper.WorkDaySubjectTimePercentage.get_work_day_subject_time_percentage(\
             self.context.subject_work_percentage,\
                 self.context.start_date,\
                     self.context.end_date,\
-                        self.context.db_file_name)
+                        self.context.db_conn)
 
         y_coord = start_y
         self.grid.add_horizontal_line(y_coord)
@@ -541,78 +482,102 @@ class EntryCanvas(QWidget):
             self.subject_index_mapping[i.subject.subject_id] = subject_index
             subject_index = subject_index + 1
 
-        date_index = 0
-        subject_index = 0
+        self.row_tops = [y_coord]
         for i in self.subject_entry_communicator.subject_boxes:
-            date_index = 0
-            for x_coord in range(start_x, width, interval_x):
-                entry_obj = None
-                percentage_obj = None
-                key = (i.subject.subject_id, date_index)
-                if key in self.context.subject_work_units:
-                    entry_obj = self.context.subject_work_units[key]
-                if key in self.context.subject_work_percentage:
-                    percentage_obj = self.context.subject_work_percentage[key]
-
-                c_date = s_date + timedelta(days=date_index)
-                entry = GridEntry(self, x_coord, y_coord,\
-                    self.context.box_width, i.get_height(),\
-                        (subject_index, date_index),\
-                            entry_obj,\
-                                percentage_obj,\
-                                    i.subject,\
-                                        c_date,\
-                                            self.entry_work_gradient,\
-                                                self.communicator,\
-                                                    self.context)
-                entry.show()
-                self.entry_boxes[(subject_index, date_index)] = entry
-                date_index = date_index + 1
-            subject_index = subject_index + 1
-            date_index = 0
-
             y_coord = y_coord + i.get_height()
+            self.row_tops.append(y_coord)
             self.grid.add_horizontal_line(y_coord)
 
-    def link_scroll_bar(self, scroll_bar):
-
-        """link a scrollbar to the one of this windows parent"""
-
-        self.linked_scrollbars.append(scroll_bar)
+    def get_entry(self, key):
 
-    def link_vertical_scroll_bar(self, scroll_bar):
+        """
+        return the GridEntry of key (subject_index, date_index), it's
+        created the first time it's needed, None if key is outside the grid
+        """
 
-        """link a scrollbar to the one of this windows parent"""
+        entry = self.entry_boxes.get(key)
+        if entry is not None:
+            return entry
+
+        subject_index, date_index = key
+        subject_boxes = self.subject_entry_communicator.subject_boxes
+        if not (0 <= subject_index < len(subject_boxes) and\
+            0 <= date_index < self.context.day_count):
+            return None
+
+        subject = subject_boxes[subject_index].subject
+        c_key = (subject.subject_id, date_index)
+        entry = GridEntry(\
+            date_index*self.context.box_width,\
+                self.row_tops[subject_index],\
+                    self.context.box_width,\
+                        self.row_tops[subject_index + 1] - self.row_tops[subject_index],\
+                            key,\
+                                self.context.subject_work_units.get(c_key),\
+                                    self.context.subject_work_percentage.get(c_key),\
+                                        subject,\
+                                            self.context.start_date + timedelta(days=date_index),\
+                                                self.entry_work_gradient,\
+                                                    self.communicator,\
+                                                        self.context)
+        self.entry_boxes[key] = entry
+        return entry
+
+    def get_key_at(self, x_coord, y_coord):
+
+        """return the key of the field at the canvas coords, None if there is none"""
+
+        subject_index = bisect_right(self.row_tops, y_coord) - 1
+        if subject_index < 0 or subject_index >= len(self.row_tops) - 1 or x_coord < 0:
+            return None
+        date_index = x_coord//self.context.box_width
+        if date_index >= self.context.day_count:
+            return None
+        return (subject_index, date_index)
+
+    def update_entry(self, grid_entry):
+
+        """repaint the area of grid_entry"""
 
-        self.linked_vertical_scrollbars.append(scroll_bar)
+        scale = self.context.scale
+        self.update(QRect(\
+            int(grid_entry.x()*scale) - 1,\
+                int(grid_entry.y()*scale) - 1,\
+                    int(grid_entry.width()*scale) + 2,\
+                        int(grid_entry.height()*scale) + 2))
 
-    def paintEvent(self, event): # pylint: disable=invalid-name, unused-argument
+    def paintEvent(self, event): # pylint: disable=invalid-name
 
         """paint the entry canvas"""
 
         try:
-            hval = self.parent.horizontalScrollBar().value()
-            for i in self.linked_scrollbars:
-                i.setValue(hval)
-
-            vval = self.parent.verticalScrollBar().value()
-            for i in self.linked_vertical_scrollbars:
-                i.setValue(vval)
-
             painter = QPainter(self)
             painter.scale(self.context.scale, self.context.scale)
-            painter.setPen(Qt.GlobalColor.white)
+            painter.setPen(Qt.GlobalColor.black)
             brush = QBrush(Qt.GlobalColor.white)
 
-            self.grid.paint(painter, brush)
+            self.paint_counter.begin()
+            exposed = get_canvas_rect(painter, event.rect())
+            first_row = max(0, bisect_right(self.row_tops, exposed.top()) - 1)
+            last_row = min(len(self.row_tops) - 1, bisect_left(self.row_tops, exposed.bottom()))
+            first_day = max(0, exposed.left()//self.context.box_width)
+            last_day = min(self.context.day_count, exposed.right()//self.context.box_width + 1)
+
+            normal_font = QFont(self.context.font)
+            total_font = QFont(self.context.font)
+            total_font.setBold(True)
+            for subject_index in range(first_row, last_row):
+                for date_index in range(first_day, last_day):
+                    self.get_entry((subject_index, date_index)).paint(\
+                        painter, brush, normal_font, total_font)
+            fields = max(0, last_row - first_row)*max(0, last_day - first_day)
+            self.paint_counter.count(fields, fields)
 
-            res = painter.end()
+            painter.setPen(Qt.GlobalColor.white)
+            blits = self.grid.paint(painter, brush, event.rect())
+            self.paint_counter.count(blits, blits)
 
-            if self.v_scroll_value != vval or self.h_scroll_value != hval:
-                self.update()
-                
-            self.v_scroll_value = vval
-            self.h_scroll_value = hval
+            res = painter.end()
         except:
             print("weird exception 1")
 
@@ -683,13 +648,51 @@ class EntryCanvas(QWidget):
         else:
             super().keyPressEvent(event)
 
+    def mousePressEvent(self, event): # pylint: disable=invalid-name
+
+        """mouse press event handler, focus the clicked field"""
+
+        key = self.get_key_at(\
+            int(event.position().x()/self.context.scale),\
+                int(event.position().y()/self.context.scale))
+        if key is not None:
+            self.focus_entry(key)
+
+    def focus_entry(self, key):
+
+        """move the editor to the field of key and focus it"""
+
+        # if something was selected before, remove focus from that
+        if self.last_index_tupel != (-1, -1):
+            self.focus_out_handler()
+
+        n_entry = self.get_entry(key)
+        self.editor.place(n_entry)
+        self.editor.setText(n_entry.entry_values.work_time)
+        self.editor.show()
+        self.editor.setFocus()
+        self.editor.selectAll()
+        self.last_index_tupel = key
+
+    def focus_out_handler(self):
+
+        """store the text of the editor in its field and hide it"""
+
+        if self.last_index_tupel == (-1, -1) or self.editor.isHidden():
+            return
+
+        self.editor.hide()
+        n_entry = self.get_entry(self.last_index_tupel)
+        n_entry.set_work_time(self.editor.text())
+        self.update_entry(n_entry)
+
     def focus_next_entry(self, new_key):
 
         """get entry to focus on"""
 
-        if new_key in self.entry_boxes.keys():
-            n_entry = self.entry_boxes[new_key]
-            n_entry.focusInEvent(None)
+        n_entry = self.get_entry(new_key)
+        if n_entry is not None:
+            self.focus_entry(new_key)
 
             v_scroll = self.parent.verticalScrollBar()
             h_scroll = self.parent.horizontalScrollBar()
@@ -699,10 +702,10 @@ class EntryCanvas(QWidget):
             min_x_val = h_scroll.value()
             max_x_val = h_scroll.value() + self.parent.width() - self.context.scroll_bar_offset
 
-            requested_min_x = n_entry.pos().x()
-            requested_max_x = n_entry.pos().x() + n_entry.width
-            requested_min_y = n_entry.pos().y()
-            requested_max_y = n_entry.pos().y() + n_entry.height
+            requested_min_x = self.editor.x()
+            requested_max_x = self.editor.x() + self.editor.width()
+            requested_min_y = self.editor.y()
+            requested_max_y = self.editor.y() + self.editor.height()
 
             # move left
             if requested_min_x < min_x_val:
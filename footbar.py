@@ -8,6 +8,8 @@ from PyQt6.QtCore import Qt, QRect, pyqtSlot
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtGui import QPainter, QBrush, QPalette
 
+from helpers.pixmaplayer import get_canvas_rect
+
 from dbobj.workdaytimepercentage import WorkDayTimePercentage
 
 class FootBarRect(QRect):
@@ -25,10 +27,12 @@ class FootBarRect(QRect):
         self.entry_work_gradient = entry_work_gradient
         self.communicator = communicator
 
-    def paint(self, painter, brush):
+    def paint(self, painter, brush, area=None):
 
-        """paints the head bar"""
+        """paints the days of the foot bar that intersect area (all for None)"""
 
+        if area is None:
+            area = self
         painter.setPen(Qt.GlobalColor.black)
         brush.setColor(self.context.head_bar_color)
 
@@ -38,12 +42,14 @@ class FootBarRect(QRect):
         y_coord = 0
 
         b_width = self.context.box_border_width
-        len_list = len(self.day_summaries)
+        first = max(0, (area.left() - x_coord)//width)
+        last = min(len(self.day_summaries), (area.right() - x_coord)//width + 1)
+        x_coord = x_coord + first*width
 
         normal_font = painter.font()
         total_font = painter.font()
         total_font.setBold(True)
-        for i in range(0, len_list):
+        for i in range(first, last):
             rect1 = QRect(x_coord, y_coord + b_width,\
                 width - b_width, height - 2*b_width)
 
@@ -145,9 +151,13 @@ class FootBar(QWidget):
         self.communicator.SIGNAL_DATES_CHANGED.connect(self.update_canvas)
         self.communicator.SIGNAL_REDRAW_FOOT_BAR.connect(self.update_canvas)
 
-        self.communicator.SIGNAL_ENTRY_WORK_PLAN_CHANGED.connect(self.update_day_summary)
-        self.communicator.SIGNAL_ENTRY_TOTAL_WORK_CHANGED.connect(self.update_day_total)
-        self.communicator.SIGNAL_ENTRY_WORK_TIME_CHANGED.connect(self.update_day_work_time)
+        # merged per day index
+        self.communicator.coalesce(\
+            self.communicator.SIGNAL_ENTRY_WORK_PLAN_CHANGED, self.update_day_summary)
+        self.communicator.coalesce(\
+            self.communicator.SIGNAL_ENTRY_TOTAL_WORK_CHANGED, self.update_day_total)
+        self.communicator.coalesce(\
+            self.communicator.SIGNAL_ENTRY_WORK_TIME_CHANGED, self.update_day_work_time)
 
         self.update_canvas()
 
@@ -218,16 +228,16 @@ class FootBar(QWidget):
 
         self.total_work_time = total
 
-    def paintEvent(self, event): # pylint: disable=invalid-name, unused-argument
+    def paintEvent(self, event): # pylint: disable=invalid-name
 
-        """paint the whole head bar"""
+        """paint the exposed part of the foot bar"""
 
         painter = QPainter(self)
         painter.scale(self.context.scale, self.context.scale)
         painter.setPen(Qt.GlobalColor.black)
         brush = QBrush(Qt.GlobalColor.blue)
 
-        self.foot_bar_rect.paint(painter, brush)
+        self.foot_bar_rect.paint(painter, brush, get_canvas_rect(painter, event.rect()))
         self.foot_bar_total.paint(painter, brush)
 
     def get_width(self):
@@ -253,7 +263,7 @@ class FootBar(QWidget):
             self.context.work_day_summaries,\
                 self.context.start_date,\
                     self.context.end_date,\
-                        self.context.db_file_name)
+                        self.context.db_conn)
 
         self.day_summaries.clear()
         day_count = self.context.day_count
@@ -7,12 +7,18 @@ from datetime import datetime, timedelta
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor
 from PyQt6.QtGui import QFont
+from dbobj.identitymap import RecordDict, ScheduleEntryDict
 
 class GlobalContext:
     """
     Class contains context for whole canvas
     """
 
+    # level of detail of the schedule, see detail_level
+    DAY_LEVEL = 0
+    WEEK_LEVEL = 1
+    MONTH_LEVEL = 2
+
     def __init__(self):
 
         # scale of canvas display
@@ -61,6 +67,13 @@ class GlobalContext:
         self.start_date = self.start_of_week
         self.end_date = self.start_of_week + timedelta(days=6) # monday + 6 = sunday
 
+        # above week_level_day_count displayed days the schedule shows the daily
+        # totals instead of the single work units, the head bar the weeks and the
+        # grid the hours, above month_level_day_count the head bar shows the
+        # months and the grid only the days
+        self.week_level_day_count = 31
+        self.month_level_day_count = 92
+
         # height of one minute in pixel
         self.minute_height = 1
 
@@ -143,10 +156,10 @@ class GlobalContext:
         self.b_part = [0, 0, 0, 50, 0]
 
         # db fields
-        self.subjects = dict() # use name as key
-        self.schedule_entries = dict() # use (dow, start_hour, start_minute, end_hour, end_minute) as key
+        self.subjects = RecordDict() # use name as key
+        self.schedule_entries = ScheduleEntryDict() # use (dow, start_hour, start_minute, end_hour, end_minute) as key
         self.work_unit_entries = dict() # use (day, month, year, start_hour, start_minute, end_hour, end_minute) as key
-        self.subject_types = dict() # use id as key
+        self.subject_types = RecordDict() # use id as key
         self.subject_work_units = dict()
         self.subject_work_percentage = dict()
         self.work_day_time_units = dict() # recorded time units, contains list of units for every recorded day
@@ -158,8 +171,11 @@ class GlobalContext:
 
         # db file name
         self.db_file_name = "load from version.py"
+        self.db_conn = None # shared dbobj.dbconnection.DBConnection, load from version.py
+        self.session = None # dbobj.session.Session of the ui, writes through db_conn
         self.db_version = "load from version.py"
         self.db_description = "load from version.py"
+        self.virtual_series = True # new schedule series only store their rule
 
         # datepicker styles
         self.date_picker_style =\
@@ -247,3 +263,13 @@ class GlobalContext:
             min_height=min_height,\
             min_s_width=min_scrollbar_width)\
             .replace("[","{").replace("]","}")
+
+    def detail_level(self):
+
+        """return the level of detail of the schedule for the current day_count"""
+
+        if self.day_count > self.month_level_day_count:
+            return GlobalContext.MONTH_LEVEL
+        if self.day_count > self.week_level_day_count:
+            return GlobalContext.WEEK_LEVEL
+        return GlobalContext.DAY_LEVEL
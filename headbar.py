@@ -7,11 +7,15 @@ from datetime import timedelta, datetime
 from PyQt6.QtCore import Qt, QRect, pyqtSlot
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtGui import QPainter, QBrush
+from helpers.pixmaplayer import PixmapLayer
 
 class HeadBarRect(QRect):
 
     """
     Class represents head bar for calendar
+
+    Above the day level (see GlobalContext.detail_level) the head bar shows
+    one label per week or month that spans the columns of its days.
     """
 
     def __init__(self, x_coord, y_coord, width, height, context):
@@ -19,9 +23,13 @@ class HeadBarRect(QRect):
         self.context = context
         self.context.date_list = list()
         self.day_names = list()
+        # [first day index, last day index, label] of the weeks or months
+        self.groups = list()
+        self.current_group = None
 
         current_day = datetime.today().date()
         self.current_day_index = 0
+        detail_level = self.context.detail_level()
 
         for i in range(0, self.context.day_count):
             c_date = self.context.start_date + timedelta(days=i)
@@ -30,13 +38,31 @@ class HeadBarRect(QRect):
             self.day_names.append((c_date.strftime("%a"), c_date.weekday()))
             self.context.date_list.append(c_date.strftime("%d.%m.%Y"))
 
-    def paint(self, painter, brush):
+            if detail_level == self.context.WEEK_LEVEL:
+                label = "Week {0} / {1}".format(c_date.isocalendar()[1], c_date.strftime("%d.%m.%Y"))
+                new_group = c_date.weekday() == 0
+            elif detail_level == self.context.MONTH_LEVEL:
+                label = c_date.strftime("%B %Y")
+                new_group = c_date.day == 1
+            else:
+                continue
+
+            if new_group or not self.groups:
+                self.groups.append([i, i, label])
+            else:
+                self.groups[-1][1] = i
+            if c_date == current_day:
+                self.current_group = self.groups[-1]
+
+    def paint(self, painter, brush, area=None):
 
-        """paints the head bar"""
+        """paints the days of the head bar that intersect area (all for None)"""
 
+        if area is None:
+            area = self
         painter.setPen(Qt.GlobalColor.black)
         brush.setColor(self.context.canvas_background_color)
-        painter.fillRect(self, brush)
+        painter.fillRect(self.intersected(area), brush)
 
         height = self.context.head_bar_height
         width = self.context.box_width
@@ -44,13 +70,18 @@ class HeadBarRect(QRect):
         y_coord = 0
 
         b_width = self.context.box_border_width
+        if self.groups:
+            self.__paint_groups(painter, brush, area, x_coord, y_coord, width, height)
+            return
+
         date_list = self.context.date_list
         day_names = self.day_names
-        len_list = len(date_list)
+        first = max(0, (area.left() - x_coord)//width)
+        last = min(len(date_list), (area.right() - x_coord)//width + 1)
 
         current_day_index = self.current_day_index
-        for i in range(0, len_list):
-            rect = QRect(x_coord + b_width, y_coord + b_width,\
+        for i in range(first, last):
+            rect = QRect(x_coord + i*width + b_width, y_coord + b_width,\
                 width - 2*b_width, height - 2*b_width)
 
             if i == current_day_index:
@@ -62,7 +93,31 @@ class HeadBarRect(QRect):
 
             painter.fillRect(rect, brush)
             painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, day_names[i][0] + " / " + date_list[i])
-            x_coord = x_coord + width
+
+    def __paint_groups(self, painter, brush, area, x_coord, y_coord, width, height):
+
+        """
+        paints the weeks or months of the head bar that intersect area
+        (don't use outside of HeadBarRect)
+        """
+
+        b_width = self.context.box_border_width
+        for group in self.groups:
+            first, last, label = group
+            rect = QRect(x_coord + first*width + b_width, y_coord + b_width,\
+                (last - first + 1)*width - 2*b_width, height - 2*b_width)
+            if not rect.intersects(area):
+                continue
+
+            if group is self.current_group:
+                brush.setColor(self.context.head_bar_color_currend_day)
+            else:
+                brush.setColor(self.context.head_bar_color)
+
+            # a month is wider than the window, so the label starts at its left
+            painter.fillRect(rect, brush)
+            painter.drawText(rect.adjusted(self.context.box_text_margin, 0, 0, 0),\
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, label)
 
 class HeadBar(QWidget):
 
@@ -82,17 +137,20 @@ class HeadBar(QWidget):
         self.communicator.SIGNAL_DATES_CHANGED.connect(self.update_canvas)
 
         self.head_bar_rect = HeadBarRect(0, 0, self.get_width(), self.height(), self.context)
+        self.layer = PixmapLayer()
 
-    def paintEvent(self, event): # pylint: disable=invalid-name, unused-argument
+    def paintEvent(self, event): # pylint: disable=invalid-name
 
-        """paint the whole head bar"""
+        """paint the whole head bar, blits the cached one"""
 
         painter = QPainter(self)
         painter.scale(self.context.scale, self.context.scale)
         painter.setPen(Qt.GlobalColor.black)
         brush = QBrush(Qt.GlobalColor.blue)
 
-        self.head_bar_rect.paint(painter, brush)
+        self.layer.paint(painter, self.head_bar_rect,\
+            lambda layer_painter, area: self.head_bar_rect.paint(layer_painter, brush, area),\
+                event.rect())
 
     def get_width(self):
 
@@ -115,6 +173,7 @@ class HeadBar(QWidget):
 
         self.head_bar_rect = None
         self.head_bar_rect = HeadBarRect(0, 0, self.get_width(), self.height(), self.context)
+        self.layer.invalidate()
         self.resize_canvas()
         self.update()
 
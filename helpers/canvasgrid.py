@@ -6,14 +6,19 @@ schedulecanvas
 """
 
 from PyQt6.QtCore import QRect
+from helpers.pixmaplayer import PixmapLayer
 
 class CanvasGrid():
 
     """
     Class represents the grid that can be edited
+
+    Every major_interval-th horizontal line is painted darker, None means
+    every hour (context.hour_interval rows).
     """
 
-    def __init__(self, width, height, startx, starty, intervalx, intervaly, context):
+    def __init__(self, width, height, startx, starty, intervalx, intervaly, context,\
+        major_interval=None):
         self.height = height
         self.width = width
         self.startx = startx
@@ -21,6 +26,9 @@ class CanvasGrid():
         self.intervalx = intervalx
         self.intervaly = intervaly
         self.context = context
+        self.major_interval = major_interval
+        if self.major_interval is None:
+            self.major_interval = self.context.hour_interval
 
         self.v_grid = []
         for x_coord in range(self.startx, int(self.width + self.intervalx/2), self.intervalx):
@@ -40,7 +48,12 @@ class CanvasGrid():
                             2*self.context.box_border_width\
                                 ))
 
-        self.context.grid_height = (len(self.h_grid)-1)*self.context.box_height
+        self.context.grid_height = (len(self.h_grid)-1)*self.intervaly
+
+        self.bounds = QRect()
+        for i in self.v_grid + self.h_grid:
+            self.bounds = self.bounds.united(i)
+        self.layer = PixmapLayer()
 
     def __del__(self):
         pass
@@ -51,19 +64,52 @@ class CanvasGrid():
 
         return self.height
 
-    def paint(self, painter, brush):
+    def paint(self, painter, brush, exposed=None):
+
+        """
+        Paint methode, blits the cached lines,
+        return the number of blitted tiles
+        """
+
+        return self.layer.paint(painter, self.bounds,\
+            lambda layer_painter, area: self.paint_lines(layer_painter, brush, area), exposed)
+
+    def paint_lines(self, painter, brush, area=None):
 
-        """Paint methode"""
+        """
+        paint the lines of the grid that intersect area (all for None),
+        return the number of painted lines
+        """
+
+        v_range = range(len(self.v_grid))
+        h_range = range(len(self.h_grid))
+        if area is not None:
+            v_range = self.__get_line_range(self.v_grid, self.startx, self.intervalx,\
+                area.left(), area.right())
+            h_range = self.__get_line_range(self.h_grid, self.starty, self.intervaly,\
+                area.top(), area.bottom())
 
         brush.setColor(self.context.canvas_grid_color1)
-        for i in self.v_grid:
-            painter.fillRect(i, brush)
-        height = 0
-        for i in self.h_grid:
-            if height%self.context.hour_interval == 0:
+        for i in v_range:
+            painter.fillRect(self.v_grid[i], brush)
+        for i in h_range:
+            if i%self.major_interval == 0:
                 brush.setColor(self.context.canvas_grid_color2)
-                painter.fillRect(i, brush)
+                painter.fillRect(self.h_grid[i], brush)
                 brush.setColor(self.context.canvas_grid_color1)
             else:
-                painter.fillRect(i, brush)
-            height = height+1
+                painter.fillRect(self.h_grid[i], brush)
+        return len(v_range) + len(h_range)
+
+    def __get_line_range(self, lines, start, interval, low, high):
+
+        """
+        return the range of the indices of the lines between low and high,
+        the lines are interval apart, starting at start
+        (don't use outside of CanvasGrid)
+        """
+
+        border = self.context.box_border_width
+        first = max(0, (low - start - border)//interval)
+        last = min(len(lines), (high - start + border)//interval + 2)
+        return range(first, max(first, last))
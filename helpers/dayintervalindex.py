@@ -0,0 +1,150 @@
+"""
+Module offers a spatial index for the rects of the schedule canvas
+
+All rects of the schedule canvas lie inside one day column, their y
+span is the time they cover. The index keeps the rects of every column
+sorted by their top, so the rects at a point or overlapping a rect are
+found with bisect instead of looking at every rect of the window.
+
+The rects of a column are split into buckets by the bit length of their
+height, a bucket is searched from one bucket height above the queried
+span. A tall rect only widens the search in its own bucket and an empty
+bucket is dropped, so the search stays logarithmic even after tall rects
+were added and removed again.
+"""
+
+from bisect import bisect_left, bisect_right
+
+class DayIntervalIndex():
+
+    """
+    Class represents the rects of a canvas by day column and time span
+
+    No rect in bucket b of a column is higher than 2**b - 1, so only the
+    rects of the bucket whose top lies less than that above a queried span
+    can reach into it, that's the range that is searched.
+    """
+
+    def __init__(self, column_width):
+        self.column_width = column_width
+        # column -> bucket -> sorted tops of its rects
+        self.tops = dict()
+        # column -> bucket -> (bottom, key, rect) in the order of tops
+        self.spans = dict()
+        # key -> (column, bucket, top)
+        self.keys = dict()
+
+        self.queries = 0
+        self.visited = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, rect):
+
+        """add rect with key, a rect with the same key is replaced"""
+
+        self.remove(key)
+
+        column = rect.x() // self.column_width
+        bucket = max(rect.height(), 0).bit_length()
+        top = rect.y()
+        buckets = self.tops.setdefault(column, dict())
+        tops = buckets.get(bucket)
+        if tops is None:
+            tops = list()
+            buckets[bucket] = tops
+            self.spans.setdefault(column, dict())[bucket] = list()
+
+        index = bisect_right(tops, top)
+        tops.insert(index, top)
+        self.spans[column][bucket].insert(index, (top + rect.height(), key, rect))
+        self.keys[key] = (column, bucket, top)
+
+    def remove(self, key):
+
+        """remove the rect with key if there is one"""
+
+        position = self.keys.pop(key, None)
+        if position is None:
+            return
+
+        column, bucket, top = position
+        tops = self.tops[column][bucket]
+        spans = self.spans[column][bucket]
+        index = bisect_left(tops, top)
+        while spans[index][1] != key:
+            index = index + 1
+        del tops[index]
+        del spans[index]
+
+        if not tops:
+            del self.tops[column][bucket]
+            del self.spans[column][bucket]
+            if not self.tops[column]:
+                del self.tops[column]
+                del self.spans[column]
+
+    def clear(self):
+
+        """remove all rects"""
+
+        self.tops.clear()
+        self.spans.clear()
+        self.keys.clear()
+
+    def query(self, rect):
+
+        """return the list of (key, rect) of all rects intersecting rect"""
+
+        self.queries = self.queries + 1
+        result = list()
+        first_column = rect.x() // self.column_width
+        last_column = (rect.x() + rect.width() - 1) // self.column_width
+        top = rect.y()
+        bottom = rect.y() + rect.height()
+
+        for column in range(first_column, last_column + 1):
+            buckets = self.tops.get(column)
+            if buckets is None:
+                continue
+
+            for bucket, tops in buckets.items():
+                spans = self.spans[column][bucket]
+                first = bisect_right(tops, top - (1 << bucket) + 1)
+                last = bisect_left(tops, bottom)
+                self.visited = self.visited + last - first
+                for i in range(first, last):
+                    if spans[i][0] > top and spans[i][2].intersects(rect):
+                        result.append((spans[i][1], spans[i][2]))
+        return result
+
+    def at(self, point):
+
+        """return the list of (key, rect) of all rects containing point"""
+
+        self.queries = self.queries + 1
+        result = list()
+        column = point.x() // self.column_width
+        buckets = self.tops.get(column)
+        if buckets is None:
+            return result
+
+        for bucket, tops in buckets.items():
+            spans = self.spans[column][bucket]
+            first = bisect_right(tops, point.y() - (1 << bucket) + 1)
+            last = bisect_right(tops, point.y())
+            self.visited = self.visited + last - first
+            for i in range(first, last):
+                if spans[i][2].contains(point):
+                    result.append((spans[i][1], spans[i][2]))
+        return result
+
+    def get_stats(self):
+
+        """return dict with the counters of the index"""
+
+        return {\
+            "rects": len(self.keys),\
+                "queries": self.queries,\
+                    "visited": self.visited}
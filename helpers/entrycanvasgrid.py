@@ -3,6 +3,7 @@ Module represents grid of entry canvas and subject canvas
 """
 
 from PyQt6.QtCore import QRect
+from helpers.pixmaplayer import PixmapLayer
 
 class EntryCanvasGrid():
 
@@ -18,6 +19,8 @@ class EntryCanvasGrid():
         self.height = height
         self.start_x = start_x
         self.start_y = start_y
+        self.bounds = QRect()
+        self.layer = PixmapLayer()
 
     def add_horizontal_line(self, y_coord):
 
@@ -29,6 +32,8 @@ class EntryCanvasGrid():
                     self.width,\
                         2*self.context.box_border_width\
                             ))
+        self.bounds = self.bounds.united(self.h_grid[-1])
+        self.layer.invalidate()
 
     def add_vertical_line(self, x_coord):
 
@@ -40,13 +45,24 @@ class EntryCanvasGrid():
                     2*self.context.box_border_width,\
                         self.height\
                             ))
+        self.bounds = self.bounds.united(self.v_grid[-1])
+        self.layer.invalidate()
 
-    def paint(self, painter, brush):
+    def paint(self, painter, brush, exposed=None):
 
-        """paint the grid"""
+        """
+        paint the grid, blits the cached lines,
+        return the number of blitted tiles
+        """
+
+        return self.layer.paint(painter, self.bounds,\
+            lambda layer_painter, area: self.paint_lines(layer_painter, brush, area), exposed)
+
+    def paint_lines(self, painter, brush, area=None):
+
+        """paint the lines of the grid that intersect area (all for None)"""
 
         brush.setColor(self.context.canvas_grid_color1)
-        for i in self.v_grid:
-            painter.fillRect(i, brush)
-        for i in self.h_grid:
-            painter.fillRect(i, brush)
+        for i in self.v_grid + self.h_grid:
+            if area is None or i.intersects(area):
+                painter.fillRect(i, brush)
@@ -0,0 +1,48 @@
+"""
+Module offers counters for the paint events of the canvases
+"""
+
+class PaintCounter():
+
+    """
+    Class counts the items a canvas looked at (visited) and the ones it
+    painted (drawn), for the last paint event and for all of them
+
+    The canvases only look at the items that intersect the exposed area,
+    so visited shouldn't grow with the number of displayed days.
+    """
+
+    def __init__(self):
+        self.paints = 0
+        self.visited = 0
+        self.drawn = 0
+        self.total_visited = 0
+        self.total_drawn = 0
+
+    def begin(self):
+
+        """start counting a new paint event"""
+
+        self.paints = self.paints + 1
+        self.visited = 0
+        self.drawn = 0
+
+    def count(self, visited, drawn):
+
+        """add visited and drawn items to the current paint event"""
+
+        self.visited = self.visited + visited
+        self.drawn = self.drawn + drawn
+        self.total_visited = self.total_visited + visited
+        self.total_drawn = self.total_drawn + drawn
+
+    def get_stats(self):
+
+        """return dict with the counters of the last and of all paint events"""
+
+        return {\
+            "paints": self.paints,\
+                "visited": self.visited,\
+                    "drawn": self.drawn,\
+                        "total_visited": self.total_visited,\
+                            "total_drawn": self.total_drawn}
@@ -0,0 +1,138 @@
+"""
+Module offers a pixmap cache for the static parts of the canvases
+
+The grids, the time boxes and the head bar don't change between two
+paint events, but they were painted line by line every time (the
+schedule grid has 96 rows for every displayed day). A PixmapLayer
+paints them once into pixmaps and then only blits these.
+"""
+
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QRect, QRectF
+from PyQt6.QtGui import QPainter, QPixmap
+
+def get_canvas_rect(painter, device_rect):
+
+    """return device_rect of the device painter paints on in canvas coords"""
+
+    return painter.worldTransform().inverted()[0].mapRect(QRectF(device_rect)).toAlignedRect()
+
+class PixmapLayer():
+
+    """
+    Class represents one static layer of a canvas
+
+    The layer is split into tiles of TILE_SIZE device pixels, only the
+    tiles inside the exposed area are painted and at most max_tiles are
+    kept (least recently used first out), so even the canvas of a whole
+    year doesn't need a pixmap of its full size.
+
+    The tiles are painted again if the scale, the device pixel ratio or
+    the area of the layer changed, or after invalidate.
+    """
+
+    TILE_SIZE = 512
+
+    # switched off by the benchmarks to time the painting itself
+    enabled = True
+
+    def __init__(self, max_tiles=64):
+        self.max_tiles = max_tiles
+        # (column, row) -> QPixmap
+        self.tiles = OrderedDict()
+        # transform, area and pixel ratio the tiles were painted with
+        self.key = None
+
+        self.renders = 0
+        self.blits = 0
+
+    def invalidate(self):
+
+        """paint all tiles again on the next paint"""
+
+        self.tiles.clear()
+
+    def paint(self, painter, bounds, render, exposed=None):
+
+        """
+        blit the layer with painter, bounds is the area of the layer in
+        canvas coords, render(painter, area) paints its content in canvas
+        coords, it only has to paint what intersects area
+        exposed is the area that has to be painted in device coords
+        (event.rect() of the paint event), None for all of it
+        return the number of blitted tiles
+        """
+
+        if not PixmapLayer.enabled:
+            area = bounds
+            if exposed is not None:
+                area = get_canvas_rect(painter, exposed).intersected(bounds)
+            render(painter, area)
+            return 0
+
+        transform = painter.worldTransform()
+        area = transform.mapRect(QRectF(bounds)).toAlignedRect()
+        ratio = painter.device().devicePixelRatioF()
+        key = (transform.m11(), transform.m22(), transform.dx(), transform.dy(),\
+            area.getRect(), ratio)
+        if key != self.key:
+            self.tiles.clear()
+            self.key = key
+
+        if exposed is not None:
+            area = area.intersected(exposed)
+        if area.isEmpty():
+            return 0
+
+        size = PixmapLayer.TILE_SIZE
+        blits = 0
+        painter.save()
+        painter.resetTransform()
+        for row in range(area.top() // size, area.bottom() // size + 1):
+            for column in range(area.left() // size, area.right() // size + 1):
+                tile = self.tiles.get((column, row))
+                if tile is None:
+                    tile = self.__render_tile(column, row, painter, transform, ratio, render)
+                    self.tiles[(column, row)] = tile
+                else:
+                    self.tiles.move_to_end((column, row))
+                painter.drawPixmap(column*size, row*size, tile)
+                blits = blits + 1
+        painter.restore()
+        self.blits = self.blits + blits
+
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+        return blits
+
+    def __render_tile(self, column, row, painter, transform, ratio, render):
+
+        """
+        return a new pixmap with the content of one tile
+        (don't use outside of PixmapLayer)
+        """
+
+        size = PixmapLayer.TILE_SIZE
+        tile = QPixmap(int(size*ratio), int(size*ratio))
+        tile.setDevicePixelRatio(ratio)
+        tile.fill(Qt.GlobalColor.transparent)
+
+        tile_painter = QPainter(tile)
+        tile_painter.setPen(painter.pen())
+        tile_painter.setFont(painter.font())
+        tile_painter.translate(-column*size, -row*size)
+        tile_painter.setWorldTransform(transform, True)
+        render(tile_painter, get_canvas_rect(tile_painter, QRect(0, 0, size, size)))
+        tile_painter.end()
+
+        self.renders = self.renders + 1
+        return tile
+
+    def get_stats(self):
+
+        """return dict with the counters of the layer"""
+
+        return {\
+            "renders": self.renders,\
+                "blits": self.blits,\
+                    "tiles": len(self.tiles)}
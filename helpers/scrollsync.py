@@ -0,0 +1,75 @@
+"""
+Module offers the synchronization of linked scrollbars
+
+The canvases used to copy the value of their scrollbar to the linked ones
+inside their paintEvent and called update() again if it had changed, so
+one scroll step repainted every linked widget several times. ScrollSync
+moves the linked scrollbars when the value changes instead.
+"""
+
+from PyQt6.QtCore import QObject
+
+class ScrollSync(QObject):
+
+    """
+    Class represents groups of scrollbars that always show the same value
+
+    A change of one scrollbar of a group sets all others of the group in
+    the same valueChanged, so all viewports of the group are moved in the
+    same turn of the event loop and Qt only repaints what they expose.
+    The valueChanged of the scrollbars set by the sync itself are ignored,
+    so a change isn't sent back and forth between the linked scrollbars.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # [value, scrollbars] of every group
+        self.groups = list()
+        self.syncing = False
+
+        self.syncs = 0
+        self.moves = 0
+        self.ignored = 0
+
+    def link(self, *scroll_bars):
+
+        """link scroll_bars to one group, they take the value of the first one"""
+
+        group = [scroll_bars[0].value(), list(scroll_bars)]
+        for i in scroll_bars:
+            i.valueChanged.connect(lambda value, group=group: self.sync(group, value))
+            # a scrollbar that was too short for the value of the group gets it
+            # as soon as its range allows it
+            i.rangeChanged.connect(lambda minimum, maximum, group=group:\
+                self.sync(group, group[0]))
+        self.groups.append(group)
+        self.sync(group, group[0])
+
+    def sync(self, group, value):
+
+        """set value on all scrollbars of group"""
+
+        if self.syncing:
+            self.ignored = self.ignored + 1
+            return
+
+        self.syncing = True
+        try:
+            group[0] = value
+            for i in group[1]:
+                if i.value() != value:
+                    i.setValue(value)
+                    self.moves = self.moves + 1
+        finally:
+            self.syncing = False
+        self.syncs = self.syncs + 1
+
+    def get_stats(self):
+
+        """return dict with the counters of the synchronization"""
+
+        return {\
+            "groups": len(self.groups),\
+                "syncs": self.syncs,\
+                    "moves": self.moves,\
+                        "ignored": self.ignored}
@@ -17,13 +17,6 @@ class HorizontalScrollBar(QWidget):
         self.context = context
         self.parent = parent
 
-        # widget that should be updated after a paint event
-        # can be registered here
-        self.widget = None
-
-        self.linked_scrollbars = list()
-        self.linked_vertical_scrollbars = list()
-
         self.communicator.SIGNAL_ENTRY_RESIZED.connect(self.resize_canvas)
         self.communicator.SIGNAL_SCHEDULE_RESIZED.connect(self.resize_canvas)
         self.communicator.SIGNAL_DATES_CHANGED.connect(self.resize_canvas)
@@ -31,18 +24,6 @@ class HorizontalScrollBar(QWidget):
 
         self.resize_canvas()
 
-    def link_scroll_bar(self, scroll_bar):
-
-        """link a scrollbar to the one of this windows parent"""
-
-        self.linked_scrollbars.append(scroll_bar)
-
-    def link_vertical_scroll_bar(self, scroll_bar):
-
-        """link a scrollbar to the one of this windows parent"""
-
-        self.linked_vertical_scrollbars.append(scroll_bar)
-
     def get_width(self):
 
         """return current width of the head bar canvas"""
@@ -51,32 +32,16 @@ class HorizontalScrollBar(QWidget):
             self.context.day_count*self.context.box_width +\
                 2*self.context.scroll_bar_offset
 
-    def paintEvent(self, event): # pylint: disable=invalid-name, unused-argument
-
-        """paint the entry canvas"""
-
-        for i in self.linked_scrollbars:
-            i.setValue(self.parent.horizontalScrollBar().value())
-
-        for i in self.linked_vertical_scrollbars:
-            i.setValue(self.parent.verticalScrollBar().value())
-
-        # update a registered widget if it is not None
-        # use this if the scrollbar was changed by some signal
-        # from somewhere else and after the original scrollbar was changed
-        # the connected widget requires one more update
-        if self.widget is not None:
-            self.widget.update()
-            self.widget = None
-
     @pyqtSlot(int, QWidget)
-    def add_delta(self, delta, widget):
+    def add_delta(self, delta, widget): # pylint: disable=unused-argument
 
-        """set value for scrollbar"""
+        """
+        set value for scrollbar, the linked scrollbars follow right away,
+        so widget doesn't need another update
+        """
 
         scroll_b = self.parent.horizontalScrollBar()
         scroll_b.setValue(scroll_b.value() + delta)
-        self.widget = widget
 
     @pyqtSlot()
     def resize_canvas(self):
@@ -204,12 +204,12 @@ class ItemList(QWidget):
 
         dbwrapper.TodoListItem.reload_from_db(\
             self.context.todo_list_items,\
-                self.context.db_file_name)
+                self.context.db_conn)
 
         temp_list = list(self.context.todo_list_items.values())
         temp_list = sorted(temp_list, key=lambda pos: pos.position)
         for i in temp_list:
-            self.layout.insertWidget(i.position, ListItem(\
+            self.layout.addWidget(ListItem(\
                 self.item_width, self.item_height,\
                     i,\
                         self.communicator, self.context, self))
@@ -285,9 +285,9 @@ class ItemList(QWidget):
 
         """update db item with current task_complete state"""
 
-        dbwrapper.TodoListItem.update_by_db_id(\
-            self.context.todo_list_items[todo_list_item_key],\
-                self.context.db_file_name)
+        self.context.session.update(\
+            dbwrapper.TodoListItem.update_by_db_id,\
+                self.context.todo_list_items[todo_list_item_key])
 
     @pyqtSlot()
     def cleanup_itemlist(self):
@@ -305,22 +305,54 @@ class ItemList(QWidget):
         self.functional_bar.set_listitem_count(self.layout.count())
         self.set_itemlist_height()
 
-        dbwrapper.TodoListItem.delete_all_completed(\
-            self.context.todo_list_items,\
-                self.context.db_file_name)
+        self.context.session.delete(\
+            dbwrapper.TodoListItem.delete_all_completed,\
+                self.context.todo_list_items)
 
-    @pyqtSlot()
-    def refresh_db_position(self):
+    @pyqtSlot(QWidget)
+    def refresh_db_position(self, list_item):
 
-        """update position of items in db"""
+        """update position of the moved item in db"""
 
-        for i in range(0, self.layout.count()):
-            widget = self.layout.itemAt(i).widget()
-            widget.set_position(i)
+        obj = list_item.list_item_obj
+        before, after = self.get_neighbours(self.layout.indexOf(list_item))
+        if (before is None or before.position < obj.position) and\
+            (after is None or obj.position < after.position):
+            # not moved, the position is still in order
+            return
 
-        dbwrapper.TodoListItem.update_all_positions(\
-            self.context.todo_list_items,\
-                self.context.db_file_name)
+        position = dbwrapper.TodoListItem.position_between(before, after)
+        if position is None:
+            # no free position left between the neighbours
+            self.renumber_positions()
+            return
+
+        obj.position = position
+        self.context.session.update(dbwrapper.TodoListItem.update_position, obj)
+
+    def get_neighbours(self, index):
+
+        """return the objects of the items before and after layout index"""
+
+        before = None
+        after = None
+        if index > 0:
+            before = self.layout.itemAt(index-1).widget().list_item_obj
+        if index < self.layout.count()-1:
+            after = self.layout.itemAt(index+1).widget().list_item_obj
+        return (before, after)
+
+    def renumber_positions(self):
+
+        """spread the positions of all items in layout order again"""
+
+        dbwrapper.TodoListItem.renumber([\
+            self.layout.itemAt(i).widget().list_item_obj\
+                for i in range(0, self.layout.count())])
+
+        self.context.session.update(\
+            dbwrapper.TodoListItem.update_all_positions,\
+                self.context.todo_list_items)
 
     @pyqtSlot(str, QDate)
     def add_listitem_slot(self, task_description, deadline_date):
@@ -330,7 +362,11 @@ class ItemList(QWidget):
         deadline = date(\
             deadline_date.year(), deadline_date.month(), deadline_date.day())
 
-        obj = dbwrapper.TodoListItem.new(-1, 0, task_description, deadline)
+        # the new item goes above the first one
+        before, after = self.get_neighbours(-1)
+        obj = dbwrapper.TodoListItem.new(\
+            dbwrapper.TodoListItem.position_between(before, after),\
+                0, task_description, deadline)
         self.layout.insertWidget(0, ListItem(\
             self.item_width, self.item_height,\
                 obj,\
@@ -339,9 +375,7 @@ class ItemList(QWidget):
         self.functional_bar.set_listitem_count(self.layout.count())
         self.set_itemlist_height()
 
-        # make sure, db is up to date
-        dbwrapper.TodoListItem.to_db(\
-            obj, self.context.todo_list_items,\
-                self.context.db_file_name)
-
-        self.communicator.SIGNAL_ITEMLIST_REFRESH_POSITION.emit()
+        # no other row changes
+        self.context.session.add(\
+            dbwrapper.TodoListItem.to_db,\
+                obj, self.context.todo_list_items)
@@ -84,12 +84,6 @@ class ListItem(QWidget):
         self.communicator.SIGNAL_LISTITEM_UPDATE.emit(\
             self.list_item_obj.key())
 
-    def set_position(self, position):
-
-        """reset position of item"""
-
-        self.list_item_obj.position = position
-
     def prepare_move(self):
 
         """prepare list for item swaps"""
@@ -125,7 +119,7 @@ class ListItem(QWidget):
         self.clicked_at = False
         self.reset_move()
 
-        self.communicator.SIGNAL_ITEMLIST_REFRESH_POSITION.emit()
+        self.communicator.SIGNAL_ITEMLIST_REFRESH_POSITION.emit(self)
 
     def mouseMoveEvent(self, event): # pylint: disable=invalid-name
 
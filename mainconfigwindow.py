@@ -19,6 +19,7 @@ import headbar
 import footbar
 import horizontalscrollbar
 from helpers.subjectentrycommunicator import SubjectEntryCommunicator
+from helpers.scrollsync import ScrollSync
 from helpers.verticalspacer import VerticalSpacer
 from helpers.entryworkgradient import EntryWorkGradient
 import random
@@ -53,6 +54,8 @@ class MainConfigWindow(QWidget):
         self.context = context
         self.communicator = communicator
         self.entry_work_gradient = EntryWorkGradient(context)
+        # keeps the scroll areas that show the same rows or days together
+        self.scroll_sync = ScrollSync()
 
         # self.setMinimumSize(self.context.width, self.context.height)
 
@@ -87,8 +90,9 @@ class MainConfigWindow(QWidget):
         schedule_scroll_area.setWidget(schedule_canvas)
         schedule_scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         schedule_scroll_area.setFrameShape(QFrame.Shape.NoFrame)
-        schedule_canvas.link_vertical_scroll_bar(schedule_time_scroll_area.verticalScrollBar())
-        schedule_time_boxes.link_vertical_scroll_bar(schedule_scroll_area.verticalScrollBar())
+        self.scroll_sync.link(\
+            schedule_scroll_area.verticalScrollBar(),\
+                schedule_time_scroll_area.verticalScrollBar())
 
         schedule_layout.addWidget(schedule_time_scroll_area)
         schedule_layout.addWidget(schedule_scroll_area)
@@ -141,13 +145,10 @@ class MainConfigWindow(QWidget):
         entry_scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         entry_scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
 
-        entry_canvas.link_vertical_scroll_bar(subject_scroll_area.verticalScrollBar())
-        subject_canvas.link_vertical_scroll_bar(entry_scroll_area.verticalScrollBar())
-        work_time_summary.link_vertical_scroll_bar(entry_scroll_area.verticalScrollBar())
-        entry_canvas.link_vertical_scroll_bar(work_time_scroll_area.verticalScrollBar())
-        work_time_summary.link_vertical_scroll_bar(subject_scroll_area.verticalScrollBar())
-        subject_canvas.link_vertical_scroll_bar(work_time_scroll_area.verticalScrollBar())
-
+        self.scroll_sync.link(\
+            entry_scroll_area.verticalScrollBar(),\
+                subject_scroll_area.verticalScrollBar(),\
+                    work_time_scroll_area.verticalScrollBar())
 
         entry_layout.addWidget(subject_scroll_area)
         entry_layout.addWidget(entry_scroll_area)
@@ -208,10 +209,12 @@ class MainConfigWindow(QWidget):
                     scroll_bar_area)
         scroll_bar_area.setWidget(scroll_bar)
         scroll_bar_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_bar.link_scroll_bar(schedule_scroll_area.horizontalScrollBar())
-        scroll_bar.link_scroll_bar(head_bar_scroll_area.horizontalScrollBar())
-        scroll_bar.link_scroll_bar(entry_scroll_area.horizontalScrollBar())
-        scroll_bar.link_scroll_bar(foot_bar_scroll_area.horizontalScrollBar())
+        self.scroll_sync.link(\
+            scroll_bar_area.horizontalScrollBar(),\
+                schedule_scroll_area.horizontalScrollBar(),\
+                    head_bar_scroll_area.horizontalScrollBar(),\
+                        entry_scroll_area.horizontalScrollBar(),\
+                            foot_bar_scroll_area.horizontalScrollBar())
 
         # total time summary widget
         total_time_summary = WorkTimeTotalSummary(\
@@ -0,0 +1,138 @@
+"""
+Module contains the background loader of the windows next to the shown one
+"""
+
+import sqlite3
+import threading
+from datetime import timedelta
+import dbobj.dbwrapper as dbwrapper
+
+class WindowPrefetcher():
+
+    """
+    Class loads the previous and the next window of context.start_date,
+    context.end_date into the window cache of the db connection
+
+    The loaders run on a worker thread with its own read-only connection.
+    prefetch() only hands the new windows to the worker and returns, a
+    running prefetch of an older position is cancelled between two loaders.
+    """
+
+    def __init__(self, context):
+        self.context = context
+
+        self.condition = threading.Condition()
+        self.thread = None
+        self.windows = list()
+        # changes with every prefetch() call, older jobs are cancelled
+        self.generation = 0
+        self.busy = False
+        self.stopped = False
+
+        self.loaded = 0
+        self.cancelled = 0
+
+    def prefetch(self):
+
+        """load the windows before and after the current one in the background"""
+
+        day_count = (self.context.end_date - self.context.start_date).days + 1
+        next_window = (self.context.end_date + timedelta(days=1),\
+            self.context.end_date + timedelta(days=day_count))
+        previous_window = (self.context.start_date - timedelta(days=day_count),\
+            self.context.start_date - timedelta(days=1))
+
+        with self.condition:
+            if self.stopped:
+                return
+            self.generation = self.generation + 1
+            self.windows = [next_window, previous_window]
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="WindowPrefetcher",\
+                    daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def cancel(self):
+
+        """drop all windows that are not loaded yet"""
+
+        with self.condition:
+            self.generation = self.generation + 1
+            self.windows = list()
+            self.condition.notify_all()
+
+    def wait(self, timeout=None):
+
+        """wait until all windows are loaded, return False on timeout"""
+
+        with self.condition:
+            return self.condition.wait_for(\
+                lambda: not self.windows and not self.busy, timeout)
+
+    def stop(self):
+
+        """cancel everything and end the worker thread"""
+
+        with self.condition:
+            self.stopped = True
+            self.generation = self.generation + 1
+            self.windows = list()
+            self.condition.notify_all()
+            thread = self.thread
+
+        if thread is not None:
+            thread.join()
+
+    def run(self):
+
+        """worker thread, loads one window after the other"""
+
+        db_conn = self.context.db_conn
+        db_conn.attach_reader()
+        try:
+            while True:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+                    while not self.windows and not self.stopped:
+                        self.condition.wait()
+                    if self.stopped:
+                        return
+                    generation = self.generation
+                    start_date, end_date = self.windows.pop(0)
+                    self.busy = True
+
+                self.load_window(start_date, end_date, generation)
+        finally:
+            db_conn.detach_reader()
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+
+    def load_window(self, start_date, end_date, generation):
+
+        """run all window loaders, stop as soon as the generation changed"""
+
+        db_conn = self.context.db_conn
+        loaders = (\
+            lambda: dbwrapper.ScheduleEntry.reload_from_db(\
+                dict(), start_date, end_date, db_conn),\
+            lambda: dbwrapper.WorkDayTimeUnits.get_time_unit_list(\
+                dict(), start_date, end_date, self.context.date_format, db_conn),\
+            lambda: dbwrapper.SubjectWorkUnit.reload_from_db(\
+                dict(), start_date, end_date, db_conn),\
+            lambda: dbwrapper.WindowStats.get(start_date, end_date, db_conn))
+
+        for load in loaders:
+            if self.generation != generation:
+                self.cancelled = self.cancelled + 1
+                return
+            try:
+                load()
+            except sqlite3.Error:
+                # the loaders already printed the error, the ui loads the
+                # window again if it's shown
+                return
+
+        self.loaded = self.loaded + 1
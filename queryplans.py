@@ -0,0 +1,126 @@
+"""
+Module checks the query plans of all statements registered by dbobj
+
+Usage: python queryplans.py [--db path] [--verbose]
+
+Every registered statement is run with EXPLAIN QUERY PLAN against a
+seeded db. A hot statement fails the check if it scans a whole table or
+needs a temporary b-tree to sort. Only the statements in FULL_LOADS are
+allowed to read their whole (small) table.
+
+If no db is given, a temporary db is seeded with the current db version
+and removed afterwards. The exit code is 1 if any statement failed.
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+
+import version
+import dbobj.dbwrapper as dbwrapper
+from dbobj.statements import Statements
+
+# statements that read their whole table on purpose
+FULL_LOADS = set([\
+    "Config.reload_from_db",\
+        "DBVersion.get_current_version",\
+            "SubjectType.reload_from_db",\
+                "TodoListItem.reload_from_db",\
+                    "TodoListItem.delete_all_completed"])
+
+def bind_params(sql):
+
+    """return dummy parameters for all placeholders of sql"""
+
+    names = re.findall(r":(\w+)", sql)
+    if names:
+        return dict((name, 0) for name in names)
+    return (0,)*sql.count("?")
+
+def common_tables(sql):
+
+    """return the names of all common table expressions of sql"""
+
+    return set(re.findall(r"(?:WITH|WITH RECURSIVE|,)\s+(\w+)\s*(?:\([^)]*\))?\s+AS\s*\(",\
+        sql, re.IGNORECASE))
+
+def query_plan(connection, sql):
+
+    """return the detail column of all query plan rows of sql"""
+
+    cursor = connection.cursor()
+    cursor.execute("EXPLAIN QUERY PLAN " + sql, bind_params(sql))
+    return [row[3] for row in cursor.fetchall()]
+
+def plan_problems(sql, plan):
+
+    """return all full table scans and temporary sorts of one plan"""
+
+    ctes = common_tables(sql)
+    problems = list()
+    for detail in plan:
+        scan = re.match(r"SCAN (\w+)", detail)
+        if scan is not None and scan.group(1) != "CONSTANT" and\
+            scan.group(1) not in ctes:
+            problems.append(detail)
+        elif "TEMP B-TREE" in detail or "AUTOMATIC" in detail:
+            problems.append(detail)
+    return problems
+
+def check(db_conn, verbose):
+
+    """check the plans of all registered statements, return the number of failures"""
+
+    failed = 0
+    with db_conn.reader() as connection:
+        for name in sorted(Statements.registry.keys()):
+            sql = Statements.get(name)
+            plan = query_plan(connection, sql)
+            problems = list()
+            if name not in FULL_LOADS:
+                problems = plan_problems(sql, plan)
+
+            if problems:
+                failed = failed + 1
+                print("FAIL {0}".format(name))
+                for detail in problems:
+                    print("     {0}".format(detail))
+            elif verbose:
+                print("ok   {0}".format(name))
+                for detail in plan:
+                    print("     {0}".format(detail))
+
+    print("{0} statements checked, {1} failed".format(len(Statements.registry), failed))
+    return failed
+
+def main():
+
+    """seed or open the db and check all query plans"""
+
+    parser = argparse.ArgumentParser(description="check query plans of dbobj statements")
+    parser.add_argument("--db", default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    temp_dir = None
+    if args.db is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        db_obj = dbwrapper.DB(os.path.join(temp_dir.name, "queryplans.db"))
+        db_obj.seed(version.VERSION, 0.99)
+        db_obj.init()
+    else:
+        db_obj = dbwrapper.DB(args.db)
+
+    try:
+        failed = check(db_obj.db_conn, args.verbose)
+    finally:
+        db_obj.close()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,14 @@ from PyQt6.QtWidgets import QHBoxLayout, QVBoxLayout, QPushButton
 from PyQt6.QtWidgets import QLineEdit, QLabel, QDateEdit, QTimeEdit
 from PyQt6.QtWidgets import QSpacerItem, QSizePolicy
 from PyQt6.QtGui import QWheelEvent
-from PyQt6.QtGui import QPainter, QBrush, QPalette, QFont
+from PyQt6.QtGui import QPainter, QBrush, QPalette, QFont, QRegion
 from PyQt6.QtCore import Qt, QRect, pyqtSlot, QPoint, QDate, QTime
 import dbobj.dbwrapper as dbwrapper
 from dbobj.helperfunctions import HelperFunctions as HF
 from helpers.canvasgrid import CanvasGrid
+from helpers.dayintervalindex import DayIntervalIndex
+from helpers.paintcounter import PaintCounter
+from helpers.pixmaplayer import get_canvas_rect
 from helpers.verticalspacer import VerticalSpacer
 
 class SelectRect(QRect):
@@ -103,6 +106,14 @@ class WorkUnitRect(QRect):
             self.subject_rect = None
             super().__init__(from_x, from_y, width, height)
 
+    def signature(self):
+
+        """return everything paint depends on, equal signatures paint the same"""
+
+        if self.subject_rect is None:
+            return (self.getRect(), self.color.rgba(), None, None)
+        return (self.getRect(), self.color.rgba(), self.subject_rect.getRect(),\
+            self.context.subjects[self.work_unit.subject_id].color.rgba())
 
     def paint(self, painter, brush):
 
@@ -118,18 +129,46 @@ class WorkUnitRect(QRect):
 class WorkUnitDisplay():
 
     """
-    Class represents one day of consecutive work units
+    Class represents the displayed work units by work_unit_entry_id
     Only displays something if the time is at least one minute
     """
 
-    def __init__(self, work_units, communicator, context):
+    def __init__(self, communicator, context):
         self.communicator = communicator
         self.context = context
-        self.work_day = work_units[0].start_date
-        self.work_unit_rects = list()
+        self.work_unit_rects = dict()
+        self.index = DayIntervalIndex(context.box_width)
 
-        for i in work_units:
-            self.work_unit_rects.append(self.to_rect(i, context))
+    def reconcile(self, work_day_time_units):
+
+        """
+        bring the rects in line with work_day_time_units, only the rects of
+        added, moved or removed work units change, return the list of old
+        and new rects that have to be repainted
+        """
+
+        changed = list()
+        old_rects = self.work_unit_rects
+        self.work_unit_rects = dict()
+
+        for work_units in work_day_time_units.values():
+            for i in work_units:
+                rect = self.to_rect(i, self.context)
+                old_rect = old_rects.pop(i.work_unit_entry_id, None)
+                if old_rect is not None and old_rect.signature() == rect.signature():
+                    rect = old_rect
+                    rect.work_unit = i
+                else:
+                    if old_rect is not None:
+                        changed.append(old_rect)
+                    changed.append(rect)
+                    self.index.add(i.work_unit_entry_id, rect)
+                self.work_unit_rects[i.work_unit_entry_id] = rect
+
+        for key, rect in old_rects.items():
+            self.index.remove(key)
+            changed.append(rect)
+        return changed
 
     def to_rect(self, work_unit, context):
 
@@ -173,12 +212,133 @@ class WorkUnitDisplay():
                     to_x - from_x, (real_over_midnight_offset + to_y - from_y),\
                         context)
 
+    def paint(self, painter, brush, area=None):
+
+        """
+        paints the current work units that intersect area (all for None),
+        return the number of visited and of painted work units
+        """
+
+        if area is None:
+            for i in self.work_unit_rects.values():
+                i.paint(painter, brush)
+            return len(self.work_unit_rects), len(self.work_unit_rects)
+
+        visited = self.index.visited
+        work_unit_rects = self.index.query(area)
+        for _, i in work_unit_rects:
+            i.paint(painter, brush)
+        return self.index.visited - visited, len(work_unit_rects)
+
+class DayTotalRect(QRect):
+
+    """
+    Class represents the recorded time of one unit type on one day
+    """
+
+    def __init__(self, unit_type, from_x, from_y, width, height, context):
+        super().__init__(from_x, from_y, width, height)
+
+        if unit_type == dbwrapper.UnitTypes.WORK_TIME:
+            self.color = context.display_work_unit_color
+        elif unit_type == dbwrapper.UnitTypes.BREAK_TIME:
+            self.color = context.display_break_unit_color
+        elif unit_type == dbwrapper.UnitTypes.COFFEE_TIME:
+            self.color = context.display_coffee_unit_color
+        else:
+            self.color = context.display_school_unit_color
+
+    def signature(self):
+
+        """return everything paint depends on, equal signatures paint the same"""
+
+        return (self.getRect(), self.color.rgba())
+
     def paint(self, painter, brush):
 
-        """paints the current work units"""
+        """paints the bar with the color of its unit type"""
+
+        brush.setColor(self.color)
+        painter.fillRect(self, brush)
+
+class DayTotalsDisplay():
+
+    """
+    Class represents the recorded time of the displayed days as one bar per
+    day and unit type, stacked from the top of the day column
+
+    Used instead of WorkUnitDisplay above context.week_level_day_count
+    displayed days, the bars come from the daily totals of DailyWorkRollup,
+    so their number doesn't grow with the number of recorded work units.
+    """
+
+    # order of the bars from the top of the day column
+    UNIT_TYPES = (\
+        dbwrapper.UnitTypes.WORK_TIME,\
+            dbwrapper.UnitTypes.SCHOOL_TIME,\
+                dbwrapper.UnitTypes.BREAK_TIME,\
+                    dbwrapper.UnitTypes.COFFEE_TIME)
 
-        for i in self.work_unit_rects:
+    def __init__(self, context):
+        self.context = context
+        # (at_date, unit_type) -> DayTotalRect
+        self.day_total_rects = dict()
+        self.index = DayIntervalIndex(context.box_width)
+
+    def reconcile(self, day_totals):
+
+        """
+        bring the bars in line with day_totals (at_date -> {unit_type: seconds}),
+        return the list of old and new bars that have to be repainted
+        """
+
+        changed = list()
+        old_rects = self.day_total_rects
+        self.day_total_rects = dict()
+
+        bottom = self.context.top_offset + 1440*self.context.minute_height
+        for at_date, unit_totals in day_totals.items():
+            from_x = (at_date - self.context.start_date).days*self.context.box_width +\
+                self.context.scheduled_box_width
+            width = self.context.box_width - self.context.box_border_width -\
+                self.context.scheduled_box_width
+            from_y = self.context.top_offset
+            for unit_type in DayTotalsDisplay.UNIT_TYPES:
+                height = min(int(unit_totals.get(unit_type, 0)/60*self.context.minute_height),\
+                    bottom - from_y)
+                if height <= 0:
+                    continue
+
+                key = (at_date, unit_type)
+                rect = DayTotalRect(unit_type, from_x, from_y, width, height, self.context)
+                old_rect = old_rects.pop(key, None)
+                if old_rect is not None and old_rect.signature() == rect.signature():
+                    rect = old_rect
+                else:
+                    if old_rect is not None:
+                        changed.append(old_rect)
+                    changed.append(rect)
+                    self.index.add(key, rect)
+                self.day_total_rects[key] = rect
+                from_y = from_y + height
+
+        for key, rect in old_rects.items():
+            self.index.remove(key)
+            changed.append(rect)
+        return changed
+
+    def paint(self, painter, brush, area):
+
+        """
+        paints the bars that intersect area,
+        return the number of visited and of painted bars
+        """
+
+        visited = self.index.visited
+        day_total_rects = self.index.query(area)
+        for _, i in day_total_rects:
             i.paint(painter, brush)
+        return self.index.visited - visited, len(day_total_rects)
 
 class ScheduleEntryConfig(QDialog):
 
@@ -186,7 +346,7 @@ class ScheduleEntryConfig(QDialog):
     Class represents entry dialog for schedule entry configs
     """
 
-    def __init__(self, schedule_rect, schedule_rect_list, communicator, context, parent):
+    def __init__(self, schedule_rect, communicator, context, parent):
 
         super().__init__(parent=parent)
 
@@ -199,7 +359,6 @@ class ScheduleEntryConfig(QDialog):
         self.context = context
         self.communicator = communicator
         self.schedule_rect = schedule_rect
-        self.schedule_rect_list = schedule_rect_list
         self.work_unit_entry = None
 
         # TODO: change description field for schedule entry to function as a todo list
@@ -613,7 +772,7 @@ class ScheduleEntryConfig(QDialog):
         booking_properties = self.create_booking()
 
         self.work_unit_entry = dbwrapper.WorkUnitEntry.load_entry_from_db(\
-            booking_properties, self.context.db_file_name)
+            booking_properties, self.context.db_conn)
 
         if self.work_unit_entry is None:
             self.work_unit_entry = booking_properties
@@ -705,14 +864,15 @@ class ScheduleEntryConfig(QDialog):
 
         """button deletes booked time"""
 
-        dbwrapper.WorkUnitEntry.delete_by_db_id(\
-            self.work_unit_entry,\
-                self.context.work_day_time_units,\
-                    self.context.date_format,\
-                        self.context.db_file_name)
+        with self.context.session as session:
+            session.delete(\
+                dbwrapper.WorkUnitEntry.delete_by_db_id,\
+                    self.work_unit_entry,\
+                        self.context.work_day_time_units,\
+                            self.context.date_format)
 
-        # if some entries have been modified, redraw the schedule entries
-        self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS.emit()
+            # if some entries have been modified, redraw the schedule entries
+            session.notify(self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS.emit)
 
         # remove select placeholder
         self.communicator.SIGNAL_REMOVE_SELECT_PLACEHOLDER.emit()
@@ -744,26 +904,29 @@ class ScheduleEntryConfig(QDialog):
         from_time = self.from_time.time()
         to_time = self.to_time.time()
 
-        work_unit_entry = self.create_booking()
-        work_unit_entry.state = 2
-        work_unit_entry.start_time = time(from_time.hour(), from_time.minute())
-        work_unit_entry.end_time = time(to_time.hour(), to_time.minute())
-
-        # allow booking of normal work time if the block is planed with a
-        # specific subject but has type FREE_WORK
-        # (allow for planed group work that count's towards the planed mount of
-        # time for a subject)
-        subject_type = self.schedule_rect.subject_type.key()
-        if subject_type == self.context.free_work_subject_type_key:
-            work_unit_entry.unit_type = dbwrapper.UnitTypes.WORK_TIME
-
-        dbwrapper.WorkUnitEntry.to_db(\
-            work_unit_entry,\
-                self.context.work_day_time_units,\
-                    self.context.db_file_name)
-
-        # if some entries have been modified, redraw the schedule entries
-        self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS.emit()
+        with self.context.session as session:
+            work_unit_entry = self.create_booking()
+            work_unit_entry.state = 2
+            work_unit_entry.start_time = time(from_time.hour(), from_time.minute())
+            work_unit_entry.end_time = time(to_time.hour(), to_time.minute())
+
+            # allow booking of normal work time if the block is planed with a
+            # specific subject but has type FREE_WORK
+            # (allow for planed group work that count's towards the planed mount of
+            # time for a subject)
+            subject_type = self.schedule_rect.subject_type.key()
+            if subject_type == self.context.free_work_subject_type_key:
+                work_unit_entry.unit_type = dbwrapper.UnitTypes.WORK_TIME
+
+            # occurrences of virtual series get an id before they're booked
+            session.add(\
+                dbwrapper.WorkUnitEntry.booking_to_db,\
+                    work_unit_entry,\
+                        self.schedule_rect.schedule_entry,\
+                            self.context.work_day_time_units)
+
+            # if some entries have been modified, redraw the schedule entries
+            session.notify(self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS.emit)
 
         # remove select placeholder
         self.communicator.SIGNAL_REMOVE_SELECT_PLACEHOLDER.emit()
@@ -819,54 +982,59 @@ class ScheduleEntryConfig(QDialog):
             from_date = date(q_from_date.year(), q_from_date.month(), q_from_date.day())
             to_date = date(q_to_date.year(), q_to_date.month(), q_to_date.day())
 
-        if sched_rec.is_new == 1:
-            sched_rec.subject = self.subject_combo.currentData()[1]
-            sched_rec.subject_type = self.type_combo.currentData()[1]
-
-            series_obj = dbwrapper.ScheduleSeries.new(\
-                sched_rec.subject_type.subject_type_id,\
-                    sched_rec.subject.subject_id,\
-                        from_date,\
-                            to_date,\
-                                "")
-
-            # use planed date here because it's always the selected date no matter the offset
-            sched_rec.schedule_entry = dbwrapper.ScheduleEntry.new(\
-                series_obj,\
-                    self.context.start_time_offset,\
-                        from_time,\
-                            to_time,\
-                                self.planed_date,\
-                                    self.description.text())
-
-            sched_rec.is_new = 0
-            dbwrapper.ScheduleEntry.series_to_db(\
-                sched_rec.schedule_entry,\
-                    self.context.schedule_entries,\
-                        self.context.db_file_name)
-
-            self.schedule_rect_list.append(sched_rec)
-        else:
-            sched_rec.subject = self.subject_combo.currentData()[1]
-            sched_rec.subject_type = self.type_combo.currentData()[1]
+        # everything is written in one transaction when the block is left
+        with self.context.session as session:
+            if sched_rec.is_new == 1:
+                sched_rec.subject = self.subject_combo.currentData()[1]
+                sched_rec.subject_type = self.type_combo.currentData()[1]
+
+                series_obj = dbwrapper.ScheduleSeries.new(\
+                    sched_rec.subject_type.subject_type_id,\
+                        sched_rec.subject.subject_id,\
+                            from_date,\
+                                to_date,\
+                                    "",\
+                                        int(self.context.virtual_series and from_date != to_date))
+
+                # use planed date here because it's always the selected date no matter the offset
+                sched_rec.schedule_entry = dbwrapper.ScheduleEntry.new(\
+                    series_obj,\
+                        self.context.start_time_offset,\
+                            from_time,\
+                                to_time,\
+                                    self.planed_date,\
+                                        self.description.text())
+
+                sched_rec.is_new = 0
+                session.add(\
+                    dbwrapper.ScheduleEntry.series_to_db,\
+                        sched_rec.schedule_entry,\
+                            self.context.schedule_entries,\
+                                window_start=self.context.start_date,\
+                                    window_end=self.context.end_date)
+            else:
+                sched_rec.subject = self.subject_combo.currentData()[1]
+                sched_rec.subject_type = self.type_combo.currentData()[1]
 
-            sched_rec.schedule_entry.start_offset = self.context.start_time_offset
-            sched_rec.schedule_entry.start_time = from_time
-            sched_rec.schedule_entry.end_time = to_time
-            sched_rec.schedule_entry.description = self.description.text()
+                sched_rec.schedule_entry.start_offset = self.context.start_time_offset
+                sched_rec.schedule_entry.start_time = from_time
+                sched_rec.schedule_entry.end_time = to_time
+                sched_rec.schedule_entry.description = self.description.text()
 
-            sched_rec.schedule_entry.series_obj.type_id = sched_rec.subject_type.subject_type_id
-            sched_rec.schedule_entry.series_obj.subject_id = sched_rec.subject.subject_id
-            sched_rec.schedule_entry.series_obj.start_date = from_date
-            sched_rec.schedule_entry.series_obj.end_date = to_date
+                sched_rec.schedule_entry.series_obj.type_id = sched_rec.subject_type.subject_type_id
+                sched_rec.schedule_entry.series_obj.subject_id = sched_rec.subject.subject_id
+                sched_rec.schedule_entry.series_obj.start_date = from_date
+                sched_rec.schedule_entry.series_obj.end_date = to_date
 
-            dbwrapper.ScheduleEntry.update_series_by_series_id(\
-                sched_rec.schedule_entry,\
-                    self.context.schedule_entries,\
-                        self.context.db_file_name)
+                session.update(\
+                    dbwrapper.ScheduleEntry.update_series_by_series_id,\
+                        sched_rec.schedule_entry,\
+                            self.context.schedule_entries,\
+                                window_start=self.context.start_date,\
+                                    window_end=self.context.end_date)
 
-        # if some entries have been modified, redraw the schedule entries
-        self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS.emit()
+            # if some entries have been modified, redraw the schedule entries
+            session.notify(self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS.emit)
 
         # remove select placeholder
         self.communicator.SIGNAL_REMOVE_SELECT_PLACEHOLDER.emit()
@@ -887,27 +1055,18 @@ class ScheduleEntryConfig(QDialog):
         """delete button pressed"""
 
         # remove entry from db
+        with self.context.session as session:
+            session.delete(\
+                dbwrapper.ScheduleEntry.delete_series_by_db_id,\
+                    self.schedule_rect.schedule_entry,\
+                        self.context.schedule_entries)
 
-        dbwrapper.ScheduleEntry.delete_series_by_db_id(\
-            self.schedule_rect.schedule_entry,\
-                self.context.schedule_entries,\
-                    self.context.db_file_name)
-
-        # # remove entry from current list
-        del_id = self.schedule_rect.schedule_entry.schedule_entry_id
-        del_index = 0
-        for i in self.schedule_rect_list:
-            if i.schedule_entry.schedule_entry_id == del_id:
-                del self.schedule_rect_list[del_index]
-                break
-            del_index = del_index + 1
+            # if some entries have been modified, redraw the schedule entries
+            session.notify(self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS.emit)
 
         # remove select placeholder
         self.communicator.SIGNAL_REMOVE_SELECT_PLACEHOLDER.emit()
 
-        # if some entries have been modified, redraw the schedule entries
-        self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS.emit()
-
         self.close()
 
 class ScheduleTime():
@@ -962,6 +1121,8 @@ class ScheduleEntryRect(QRect):
         self.subject = None # db Subject()
         self.subject_type = None # db SubjectType()
         self.schedule_entry = None # db ScheduleEntry()
+        # what paint depends on, set by ScheduleCanvas.reconcile_schedule_entries
+        self.signature = None
 
     def __del__(self):
         pass
@@ -1044,9 +1205,14 @@ class ScheduleCanvas(QWidget):
         self.context = context
         self.parent = parent
         super().__init__(parent=parent)
-        self.schedule_rects = list()
-        self.time_unit_rects = list()
-        self.linked_vertical_scrollbars = list()
+        # key of the schedule entry -> ScheduleEntryRect
+        self.schedule_rects = dict()
+        self.schedule_index = DayIntervalIndex(context.box_width)
+        self.work_unit_display = WorkUnitDisplay(communicator, context)
+        self.day_totals_display = DayTotalsDisplay(context)
+        # at_date -> {unit_type: seconds}, only loaded above the day level
+        self.day_totals = dict()
+        self.paint_counter = PaintCounter()
         self.schedule_row_count = schedule_row_count
 
         self.move_p = QPoint(0, 0)
@@ -1059,7 +1225,9 @@ class ScheduleCanvas(QWidget):
             self.remove_select_place_holder)
         # TODO: check this one out (redraw schedule without reloading...)
         # self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS.connect(self.redraw_schedule_canvas)
-        self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS.connect(self.update_canvas)
+        # all redraws of one event loop turn are merged into one
+        self.communicator.coalesce(\
+            self.communicator.SIGNAL_REDRAW_SCHEDULE_CANVAS, self.update_canvas, False)
 
         palette = QPalette()
         palette.setColor(QPalette.ColorRole.Window, self.context.canvas_background_color)
@@ -1072,23 +1240,18 @@ class ScheduleCanvas(QWidget):
         self.select_place_holder = None
         self.grid = None
         self.grid_height = 0
-        
+        # parameters the current grid was created with
+        self.grid_key = None
+
         self.parent.setVerticalScrollBarPolicy(context.scrollbar_policy)
 
         self.create_grid()
         self.create_schedule_entries(True)
         self.resize_canvas()
-        self.scroll_value = self.parent.verticalScrollBar().value()
 
     def __del__(self):
         pass
 
-    def link_vertical_scroll_bar(self, scroll_bar):
-
-        """link a scrollbar to the one of this windows parent"""
-
-        self.linked_vertical_scrollbars.append(scroll_bar)
-
     @pyqtSlot()
     def redraw_schedule_canvas(self):
 
@@ -1108,6 +1271,8 @@ class ScheduleCanvas(QWidget):
 
         """slot removes the select placeholder"""
 
+        if self.select_place_holder is not None:
+            self.update_rects([self.select_place_holder])
         self.select_place_holder = None
 
     @pyqtSlot()
@@ -1116,16 +1281,20 @@ class ScheduleCanvas(QWidget):
         """update whole window with new information from context"""
 
         try:
-            self.schedule_rects.clear()
-            self.time_unit_rects.clear()
+            changed = list()
+            if self.select_rect is not None:
+                changed.append(self.select_rect)
             self.select_rect = None
-            self.grid = None
-            self.grid_height = 0
 
-            self.create_grid()
+            # the grid only depends on the size of the window
+            rebuilt = self.check_grid()
             self.resize_canvas()
-            self.create_schedule_entries(True)
-            self.update()
+            changed.extend(self.create_schedule_entries(True))
+
+            if rebuilt:
+                self.update()
+            else:
+                self.update_rects(changed)
         except: # pylint: disable=bare-except
             with open(self.context.output_file_name, "a") as e_file:
                 e_file.write(datetime.today().strftime(self.context.output_date_format) + ": " +\
@@ -1166,6 +1335,11 @@ class ScheduleCanvas(QWidget):
 
         use reload_from_db = True if an entry has only been updated and there is nothing
         new to load
+
+        above the day level only the daily totals of the recorded time are loaded
+        and shown, not every single work unit
+
+        return the list of old and new rects that have to be repainted
         """
 
         if reload_from_db:
@@ -1174,44 +1348,94 @@ class ScheduleCanvas(QWidget):
                 self.context.schedule_entries,\
                     self.context.start_date,\
                         self.context.end_date,\
-                            self.context.db_file_name)
-
-            # load recorded time units
-            dbwrapper.WorkDayTimeUnits.get_time_unit_list(\
-                self.context.work_day_time_units,\
+                            self.context.db_conn)
+
+            if self.context.detail_level() == self.context.DAY_LEVEL:
+                # load recorded time units
+                dbwrapper.WorkDayTimeUnits.get_time_unit_list(\
+                    self.context.work_day_time_units,\
+                        self.context.start_date,\
+                            self.context.end_date,\
+                                self.context.date_format,\
+                                    self.context.db_conn)
+                self.day_totals = dict()
+            else:
+                # load the daily totals of the recorded time units
+                self.context.work_day_time_units.clear()
+                self.day_totals = dbwrapper.DailyWorkRollup.get_day_totals(\
                     self.context.start_date,\
                         self.context.end_date,\
-                            self.context.date_format,\
-                                self.context.db_file_name)
+                            self.context.db_conn)
 
-        for i in self.context.schedule_entries.values():
-            rect = ScheduleEntryRect(0,\
-                self.trans_datetime_2_coords(i.at_date, i.start_time, i.end_time),\
-                    self.communicator,\
-                        self.context,\
-                            self)
+        changed = self.reconcile_schedule_entries()
+        changed.extend(self.work_unit_display.reconcile(self.context.work_day_time_units))
+        changed.extend(self.day_totals_display.reconcile(self.day_totals))
+        return changed
+
+    def reconcile_schedule_entries(self):
 
+        """
+        bring schedule_rects in line with context.schedule_entries, only
+        added, moved or changed entries get a new rect, return the list of
+        old and new rects that have to be repainted
+        """
+
+        changed = list()
+        old_rects = self.schedule_rects
+        self.schedule_rects = dict()
+
+        for key, i in self.context.schedule_entries.items():
             if i.series_obj.subject_id == self.context.study_subject.subject_id:
-                rect.assign_db_objects(\
-                self.context.study_subject,\
-                    self.context.subject_types[i.series_obj.type_id],\
-                        i)
+                subject = self.context.study_subject
             else:
-                rect.assign_db_objects(\
-                    self.context.subjects[i.series_obj.subject_id],\
-                        self.context.subject_types[i.series_obj.type_id],\
-                            i)
-            self.schedule_rects.append(rect)
-
-        for i in self.context.work_day_time_units.values():
-            self.time_unit_rects.append(\
-                WorkUnitDisplay(i, self.communicator, self.context))
+                subject = self.context.subjects[i.series_obj.subject_id]
+            subject_type = self.context.subject_types[i.series_obj.type_id]
+
+            select_rect = self.trans_datetime_2_coords(i.at_date, i.start_time, i.end_time)
+            signature = (select_rect.getRect(), subject.description,\
+                subject.color.rgba(), subject_type.name)
+
+            rect = old_rects.pop(key, None)
+            if rect is None or rect.signature != signature:
+                if rect is not None:
+                    changed.append(rect)
+                rect = ScheduleEntryRect(0,\
+                    select_rect,\
+                        self.communicator,\
+                            self.context,\
+                                self)
+                rect.signature = signature
+                changed.append(rect)
+                self.schedule_index.add(key, rect)
+
+            rect.assign_db_objects(subject, subject_type, i)
+            self.schedule_rects[key] = rect
+
+        for key, rect in old_rects.items():
+            self.schedule_index.remove(key)
+            changed.append(rect)
+        return changed
+
+    def update_rects(self, rects):
+
+        """schedule a repaint of the area covered by rects (canvas coords)"""
+
+        if not rects:
+            return
 
-        self.update()
+        scale = self.context.scale
+        region = QRegion()
+        for i in rects:
+            region = region.united(QRect(\
+                int(i.x()*scale) - 1,\
+                    int(i.y()*scale) - 1,\
+                        int(i.width()*scale) + 3,\
+                            int(i.height()*scale) + 3))
+        self.update(region)
 
     def create_grid(self):
 
-        """create the canvas grid"""
+        """create the canvas grid, above the day level with one row per hour or day"""
 
         width = self.context.day_count*self.context.box_width
         height = self.schedule_row_count*self.context.box_height
@@ -1219,27 +1443,54 @@ class ScheduleCanvas(QWidget):
         starty = self.context.top_offset
         intervalx = self.context.box_width
         intervaly = self.context.box_height
-
-        self.grid = CanvasGrid(width, height, startx, starty, intervalx, intervaly, self.context)
+        major_interval = None
+
+        detail_level = self.context.detail_level()
+        if detail_level == self.context.WEEK_LEVEL:
+            intervaly = self.context.box_height*self.context.hour_interval
+            major_interval = 1
+        elif detail_level == self.context.MONTH_LEVEL:
+            intervaly = height
+            major_interval = 1
+
+        self.grid = CanvasGrid(width, height, startx, starty, intervalx, intervaly, self.context,\
+            major_interval)
         self.grid_height = self.grid.get_height()
+        self.grid_key = self.get_grid_key()
+
+    def get_grid_key(self):
+
+        """return the parameters the grid depends on"""
+
+        return (self.context.day_count, self.schedule_row_count,\
+            self.context.box_width, self.context.box_height, self.context.top_offset,\
+                self.context.detail_level())
+
+    def check_grid(self):
+
+        """create the grid again if its parameters changed, return True if it did"""
 
-    def paintEvent(self, event): # pylint: disable=invalid-name, unused-argument
+        if self.grid is not None and self.grid_key == self.get_grid_key():
+            return False
+
+        self.create_grid()
+        return True
+
+    def paintEvent(self, event): # pylint: disable=invalid-name
 
         """paint the whole main canvas"""
 
         try:
             r = random.randint(0,100)
-            val = self.parent.verticalScrollBar().value()
-            for i in self.linked_vertical_scrollbars:
-                i.setValue(val)
-
             painter = QPainter()
             b = painter.begin(self)
             painter.scale(self.context.scale, self.context.scale)
             painter.setPen(Qt.GlobalColor.black)
             brush = QBrush(Qt.GlobalColor.blue)
 
-            self.grid.paint(painter, brush)
+            self.paint_counter.begin()
+            exposed = get_canvas_rect(painter, event.rect())
+            self.grid.paint(painter, brush, event.rect())
 
             if self.select_rect is not None and self.select_rect.to_repaint():
                 self.select_rect.paint(painter, brush)
@@ -1248,16 +1499,15 @@ class ScheduleCanvas(QWidget):
                 brush.setColor(self.context.select_place_holder_color)
                 painter.fillRect(self.select_place_holder, brush)
 
-            for i in self.schedule_rects:
+            visited = self.schedule_index.visited
+            schedule_rects = self.schedule_index.query(exposed)
+            for _, i in schedule_rects:
                 i.paint(painter, brush)
+            self.paint_counter.count(self.schedule_index.visited - visited, len(schedule_rects))
 
-            for i in self.time_unit_rects:
-                i.paint(painter, brush)
+            self.paint_counter.count(*self.work_unit_display.paint(painter, brush, exposed))
+            self.paint_counter.count(*self.day_totals_display.paint(painter, brush, exposed))
             res = painter.end()
-
-            if self.scroll_value != val:
-                self.update()
-            self.scroll_value = val
         except:
             print("weird exception 2")
 
@@ -1371,9 +1621,11 @@ class ScheduleCanvas(QWidget):
 
         self.move_p = requested_p
 
+        # only the area of the old and the new select rect changes
+        old_rect = QRect(self.select_rect)
         self.select_rect.update(y_coord)
         if self.select_rect.to_repaint():
-            self.update()
+            self.update_rects([old_rect, self.select_rect])
 
     def mouseReleaseEvent(self, event): # pylint: disable=invalid-name, unused-argument
 
@@ -1388,12 +1640,7 @@ class ScheduleCanvas(QWidget):
             return
 
         # see if the mouse was released on a rect that already exists
-        rect = None
-        mouse_point = QPoint(x_coord, y_coord)
-        for i in self.schedule_rects:
-            if i.contains(mouse_point):
-                rect = i
-
+        rect = self.get_selected_rect(x_coord, y_coord)
         if rect is None:
             rect = ScheduleEntryRect(1,\
                 self.select_rect,\
@@ -1402,7 +1649,7 @@ class ScheduleCanvas(QWidget):
                             self)
 
         self.select_place_holder = self.select_rect.adjusted(0, 0, 0, 0)
-        ScheduleEntryConfig(rect, self.schedule_rects,\
+        ScheduleEntryConfig(rect,\
             self.communicator, self.context, self.parent)
 
         del self.select_rect
@@ -1456,4 +1703,30 @@ class ScheduleCanvas(QWidget):
 
     def get_selected_rect(self, x_coord, y_coord):
 
-        """do nothing"""
+        """return the ScheduleEntryRect at (x_coord, y_coord) or None"""
+
+        found = self.schedule_index.at(QPoint(x_coord, y_coord))
+        if not found:
+            return None
+        return found[-1][1]
+
+    def get_overlapping_rects(self, rect):
+
+        """
+        return the lists of ScheduleEntryRects and WorkUnitRects that
+        overlap rect (canvas coords)
+        """
+
+        return ([i[1] for i in self.schedule_index.query(rect)],\
+            [i[1] for i in self.work_unit_display.index.query(rect)])
+
+    def get_rects_at_time(self, at_date, at_time):
+
+        """
+        return the lists of ScheduleEntryRects and WorkUnitRects that
+        cover at_time of at_date
+        """
+
+        coords = self.trans_datetime_2_coords(at_date, at_time, at_time)
+        return self.get_overlapping_rects(\
+            QRect(coords.x(), coords.y(), self.context.box_width, 1))
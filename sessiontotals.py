@@ -0,0 +1,188 @@
+"""
+Module contains the running totals of the work day shown by the timer
+"""
+
+from datetime import datetime, timedelta
+import dbobj.dbwrapper as dbwrapper
+
+class SessionTotals():
+
+    """
+    Class keeps the total seconds of context.current_work_day per
+    (subject_id, unit_type)
+
+    The totals are loaded once per work day. Afterwards every write of the
+    running WorkUnitEntry goes through this class and is added in memory.
+    The totals are only loaded again if the work day changes or if the db
+    was changed by someone else.
+
+    The writes are handed to the writer thread of the db connection, the
+    totals change right away. As long as writes are queued the totals
+    aren't checked against the db, they already contain them. The
+    notification of a write is called once it's written, on the writer
+    thread it's handed to dispatch, which has to call it on the gui thread.
+    The dicts of the gui are changed there too, not on the writer thread.
+    """
+
+    def __init__(self, context, dispatch=None):
+        self.context = context
+        self.dispatch = dispatch
+        self.work_day = None
+        self.totals = dict()
+        self.data_version = None
+
+        # (date, subject_id, unit_type, seconds) of the running entry as
+        # it is stored in the db right now
+        self.entry_part = None
+
+    def entry_part_of(self, obj):
+
+        """return (date, subject_id, unit_type, seconds) as stored by WorkUnitEntry"""
+
+        start_datetime = datetime.combine(obj.start_date, obj.start_time) -\
+            timedelta(hours=obj.start_offset)
+        end_datetime = datetime.combine(obj.end_date, obj.end_time) -\
+            timedelta(hours=obj.start_offset)
+
+        return (start_datetime.date(), obj.subject_id, obj.unit_type,\
+            (end_datetime - start_datetime).seconds)
+
+    def add_part(self, part, sign):
+
+        """add (sign = 1) or remove (sign = -1) one entry part from the totals"""
+
+        if part is None or part[0] != self.work_day:
+            return
+
+        key = (part[1], part[2])
+        self.totals[key] = self.totals.get(key, 0) + sign*part[3]
+
+    def sync(self):
+
+        """load the totals again if the work day or the db changed"""
+
+        if self.work_day == self.context.current_work_day:
+            # the queued writes are in the totals already, don't wait for them
+            if self.context.db_conn.write_behind.pending():
+                return
+            data_version = self.context.db_conn.get_data_version()
+            if self.data_version == data_version:
+                return
+        else:
+            data_version = self.context.db_conn.get_data_version()
+
+        self.work_day = self.context.current_work_day
+        self.totals = dbwrapper.Summary.totals_for_workday(\
+            self.work_day, self.context.db_conn)
+        self.data_version = data_version
+
+    def store(self, obj, obj_dict, notification=None):
+
+        """store the new running entry and add it to the totals"""
+
+        self.sync()
+        # obj_dict belongs to the gui, obj is added once it's written
+        self.write(lambda: self.stored(obj, obj_dict, notification),\
+            dbwrapper.WorkUnitEntry.to_db, obj, dict())
+        self.entry_part = self.entry_part_of(obj)
+        self.add_part(self.entry_part, 1)
+
+    def update(self, obj, notification=None):
+
+        """update the running entry and move its time in the totals"""
+
+        self.sync()
+        self.write(notification, dbwrapper.WorkUnitEntry.update_by_db_id, obj)
+        self.add_part(self.entry_part, -1)
+        self.entry_part = self.entry_part_of(obj)
+        self.add_part(self.entry_part, 1)
+
+    def close(self, obj, notification=None):
+
+        """update the running entry a last time, the next one starts from scratch"""
+
+        self.update(obj, notification)
+        self.entry_part = None
+
+    def delete(self, obj, obj_dict, date_format):
+
+        """delete the running entry and remove it from the totals"""
+
+        self.sync()
+        self.write(lambda: obj_dict.pop(obj.key(), None),\
+            dbwrapper.WorkUnitEntry.delete_by_db_id, obj, dict(), date_format)
+        self.add_part(self.entry_part, -1)
+        self.entry_part = None
+
+    def stored(self, obj, obj_dict, notification):
+
+        """add the written obj to obj_dict (on the gui thread) and call notification"""
+
+        obj_dict[obj.key()] = obj
+        if notification is not None:
+            notification()
+
+    def write(self, notification, function, *args):
+
+        """
+        hand function(*args, db_conn) to the writer thread and return its
+        future, notification (if not None) is called once it's written
+        """
+
+        future = self.context.db_conn.write_behind.submit(self.run, function, *args)
+        future.add_done_callback(lambda done: self.written(done, notification))
+        if future.done():
+            # written right away, raise like the dbobj function would
+            future.result()
+        return future
+
+    def run(self, function, *args):
+
+        """
+        call function(*args, db_conn) (on the writer thread), the data version
+        after it is only taken over if the totals were up to date before and
+        function was the only commit in between, otherwise the totals miss
+        the commit of someone else (like a booking of the schedule) and the
+        next sync loads them again
+        """
+
+        db_conn = self.context.db_conn
+        data_version = db_conn.get_data_version()
+        function(*args, db_conn)
+        new_data_version = db_conn.get_data_version()
+
+        if self.data_version == data_version and\
+            new_data_version[0] == data_version[0] + 1:
+            self.data_version = new_data_version
+
+    def written(self, future, notification):
+
+        """call notification after an own write (called on the writer thread)"""
+
+        if future.exception() is not None:
+            return
+
+        if notification is None:
+            return
+        if self.dispatch is not None and self.context.db_conn.write_behind.is_worker():
+            self.dispatch(notification)
+        else:
+            notification()
+
+    def subject_total(self, subject_id, unit_type):
+
+        """return total seconds of subject_id and unit_type"""
+
+        self.sync()
+        return self.totals.get((subject_id, unit_type), 0)
+
+    def total(self, unit_type):
+
+        """return total seconds of unit_type over all subjects"""
+
+        self.sync()
+        result = 0
+        for key, seconds in self.totals.items():
+            if key[1] == unit_type:
+                result = result + seconds
+        return result
@@ -9,26 +9,39 @@ from PyQt6.QtWidgets import QApplication
 from PyQt6.QtWidgets import QStyleFactory
 
 # put this at the top of all custom imports!
-# at import the current version of the db is
-# checked and if necessary a warning is printed
+# version.open_db checks the current version of
+# the db and migrates it if necessary
 import version
 # ------------------------------------------
 
 import timer
+import prefetcher
 # import mainconfigwindow
 import globalcontext
 import communicator
 import dbobj.dbwrapper as dbwrapper
 # import testdata
 
+# owns the shared db connections for the whole application
+DB_OBJ = version.open_db(version.DB_NAME)
+
 # load basic versioning values
 CONTEXT = globalcontext.GlobalContext()
 CONTEXT.db_file_name = version.DB_NAME
+CONTEXT.db_conn = DB_OBJ.db_conn
 CONTEXT.db_version = version.VERSION
 CONTEXT.db_description = version.DESCRIPTION
 
 COMMUNICATOR = communicator.Communicator()
 
+# the writes of the gui run on the writer thread of the connection, the
+# session hands their notifications back to the gui thread
+CONTEXT.db_conn.write_behind.enabled = True
+CONTEXT.session = dbwrapper.Session(CONTEXT.db_conn, COMMUNICATOR.dispatch)
+# windows loaded while writes were queued are loaded again once they're written
+CONTEXT.db_conn.write_behind.drained =\
+    lambda: COMMUNICATOR.dispatch(COMMUNICATOR.SIGNAL_DATES_CHANGED.emit)
+
 # with open(CONTEXT.output_file_name, "a") as e_file:
     # e_file.write(\
         # datetime.today().strftime(CONTEXT.output_date_format) +\
@@ -40,13 +53,13 @@ COMMUNICATOR = communicator.Communicator()
 # load configs and types from db
 dbwrapper.SubjectType.reload_from_db(\
     CONTEXT.subject_types,\
-        CONTEXT.db_file_name)
+        CONTEXT.db_conn)
 
 dbwrapper.Subject.reload_from_db(\
     CONTEXT.subjects,\
         dbwrapper.SubjectTypes.SUBJECT_TYPE,\
             1,\
-                CONTEXT.db_file_name)
+                CONTEXT.db_conn)
 
 # load study subject
 TEMP = dict()
@@ -54,7 +67,7 @@ dbwrapper.Subject.reload_from_db(\
     TEMP,\
         dbwrapper.SubjectTypes.STUDY_TYPE,\
             1,\
-                CONTEXT.db_file_name)
+                CONTEXT.db_conn)
 
 CONTEXT.study_subject = list(TEMP.values())[0]
 
@@ -66,6 +79,13 @@ for i in CONTEXT.subject_types.items():
 APP = QApplication(sys.argv)
 # APP.setStyle("QPushButton { border-style: outset }")
 MAIN_WIDGET = timer.Timer(COMMUNICATOR, CONTEXT)
+
+# loads the windows next to the shown one in the background, connected
+# after the widgets, so it starts once the shown window is loaded
+PREFETCHER = prefetcher.WindowPrefetcher(CONTEXT)
+COMMUNICATOR.SIGNAL_DATES_CHANGED.connect(PREFETCHER.prefetch)
+if MAIN_WIDGET.show_config_widget:
+    PREFETCHER.prefetch()
 # MAIN_WIDGET.setFont(CONTEXT.font)
 # MAIN_WIDGET.setStyleSheet(CONTEXT.style)
 
@@ -78,6 +98,10 @@ CONTEXT.disable_all = disableAll
 
 APP.exec()
 del MAIN_WIDGET
+PREFETCHER.stop()
+
+# checkpoint the write ahead log and release all db connections
+DB_OBJ.close()
 
 # with open(CONTEXT.output_file_name, "a") as e_file:
     # e_file.write(\
@@ -9,6 +9,9 @@ from PyQt6.QtGui import QPainter, QBrush, QPalette
 from PyQt6.QtCore import Qt, QRect, pyqtSlot
 
 from helpers.entrycanvasgrid import EntryCanvasGrid
+from helpers.dayintervalindex import DayIntervalIndex
+from helpers.paintcounter import PaintCounter
+from helpers.pixmaplayer import get_canvas_rect
 
 import dbobj.dbwrapper as dbwrapper
 
@@ -94,7 +97,8 @@ class SubjectCanvas(QWidget):
         self.communicator.SIGNAL_DATES_CHANGED.connect(self.update_canvas)
 
         self.subject_boxes = list()
-        self.linked_vertical_scrollbars = list()
+        self.subject_box_index = DayIntervalIndex(self.context.time_column_width)
+        self.paint_counter = PaintCounter()
 
         palette = QPalette()
         palette.setColor(QPalette.ColorRole.Window, self.context.canvas_background_color)
@@ -107,13 +111,12 @@ class SubjectCanvas(QWidget):
         self.create_subject_fields()
         self.resize_canvas()
 
-        self.scroll_value = self.parent.verticalScrollBar().value()
-
     def update_canvas(self):
 
         """update canvas"""
 
         self.subject_boxes = list()
+        self.subject_box_index.clear()
         self.grid = None
         self.grid_height = 0
         self.create_subject_fields()
@@ -144,7 +147,7 @@ class SubjectCanvas(QWidget):
             self.context.subjects,\
                 dbwrapper.SubjectTypes.SUBJECT_TYPE,\
                     1,\
-                        self.context.db_file_name)
+                        self.context.db_conn)
 
         width = self.context.time_column_width
         line_height = self.context.box_height
@@ -178,6 +181,7 @@ class SubjectCanvas(QWidget):
             #font_width = self.fontMetrics().width(sub.description)
             box = SubjectBox(sub, x_coord, y_coord, width, line_height, font_width, self.context)
             y_coord = y_coord + box.get_height()
+            self.subject_box_index.add(len(self.subject_boxes), box)
             self.subject_boxes.append(box)
             grid_height = grid_height + box.get_height()
             self.grid.add_horizontal_line(y_coord)
@@ -187,45 +191,30 @@ class SubjectCanvas(QWidget):
         self.subject_entry_communicator.subject_boxes = self.subject_boxes
         self.communicator.SIGNAL_SUBJECT_ENTRY_COMM_UPDATED.emit()
 
-    def paintEvent(self, event): # pylint: disable=invalid-name, unused-argument
+    def paintEvent(self, event): # pylint: disable=invalid-name
 
         """paint event for container widget"""
 
         try:
-            val = self.parent.verticalScrollBar().value()
-            for i in self.linked_vertical_scrollbars:
-                i.setValue(val)
-
             painter = QPainter(self)
             painter.scale(self.context.scale, self.context.scale)
             painter.setPen(Qt.GlobalColor.black)
             brush = QBrush(Qt.GlobalColor.blue)
 
-            y_coord = self.context.top_offset
-            height = 0
-            for i in self.subject_boxes:
-                i.reset_position(y_coord)
+            self.paint_counter.begin()
+            visited = self.subject_box_index.visited
+            subject_boxes = self.subject_box_index.query(get_canvas_rect(painter, event.rect()))
+            for _, i in subject_boxes:
                 i.paint(painter, brush)
-                y_coord = y_coord + i.get_height()
-                height = height + i.get_height()
+            self.paint_counter.count(self.subject_box_index.visited - visited, len(subject_boxes))
 
-            self.grid.paint(painter, brush)
+            blits = self.grid.paint(painter, brush, event.rect())
+            self.paint_counter.count(blits, blits)
 
             res = painter.end()
-
-            if self.scroll_value != val:
-                self.update()
-
-            self.scroll_value = val
         except:
             print("weird exception 3")
 
-    def link_vertical_scroll_bar(self, scroll_bar):
-
-        """link a scrollbar to the one of this windows parent"""
-
-        self.linked_vertical_scrollbars.append(scroll_bar)
-
     @pyqtSlot()
     def resize_canvas(self):
 
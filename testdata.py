@@ -1,16 +1,41 @@
 """
 Contains test data initializations for global context
+
+The data is generated by a seeded random generator, the same seed and the
+same parameters always produce the same db content
 """
 
+import random
 from datetime import date, time, timedelta, datetime
 from PyQt6.QtGui import QColor
-# from dbobj.dbversion import DBVersion
-# from dbobj.config import Config
 from dbobj.subjectworkunit import SubjectWorkUnit
-# from dbobj.workunitentry import WorkUnitEntry
+from dbobj.workunitentry import WorkUnitEntry
+from dbobj.scheduleseries import ScheduleSeries
 from dbobj.scheduleentry import ScheduleEntry
 from dbobj.subjecttype import SubjectType
 from dbobj.subject import Subject
+from dbobj.todolistitem import TodoListItem
+from dbobj.subjecttypes import SubjectTypes
+from dbobj.unittypes import UnitTypes
+
+# (name, description) of the subjects, every semester takes the next few
+SUBJECT_NAMES = [\
+    ("Analysis", "Analysis"),\
+        ("DiskMat", "Discrete Mathematics"),\
+            ("AlgoDat", "Algorithms and Datastructures"),\
+                ("EProg", "Introduction to Programming"),\
+                    ("LinAlg", "Linear Algebra"),\
+                        ("ChFp", "Swiss foreign policy"),\
+                            ("CybSec", "Cyber Security"),\
+                                ("DigiDes", "Digital Design"),\
+                                    ("PProg", "Parallel Programming"),\
+                                        ("Stoch", "Probability and Statistics"),\
+                                            ("DatMod", "Data Modelling and Databases"),\
+                                                ("CompNet", "Computer Networks")]
+
+# weeks of one semester, the lectures only take the first LECTURE_WEEKS
+SEMESTER_WEEKS = 26
+LECTURE_WEEKS = 14
 
 class TestData():
 
@@ -18,324 +43,273 @@ class TestData():
     Initialize some test data for the given context
     """
 
-    def __init__(self, context):
+    def __init__(self, context, seed=1):
 
         self.context = context
+        self.seed = seed
+
+        # first and last day of the generated data
+        self.start_date = None
+        self.end_date = None
+
+    def generate_test_data(self, years=1, start_date=date(2019, 9, 16),\
+        subjects_per_semester=5, pomodoros_per_day=10, virtual_series=False):
+
+        """
+        generate years of test data starting at the monday start_date
+
+        every semester gets its own subjects with a weekly lecture and
+        exercise series and planned work times, every day gets about
+        pomodoros_per_day work units with breaks, every week some todo items
+        """
+
+        db_conn = self.context.db_conn
+        rnd = random.Random(self.seed)
+
+        self.start_date = start_date - timedelta(days=start_date.weekday())
+        # whole weeks, so every year has exactly two semesters
+        self.end_date = self.start_date + timedelta(days=2*7*SEMESTER_WEEKS*years - 1)
+
+        with db_conn.writer():
+            type_ids = self.__subject_types()
 
-    def generate_test_data(self):
-
-        """generate some testdata to work with"""
-
-        db_name = self.context.db_file_name
-
-        # test data for subjects
-        Subject.to_db(Subject.new(\
-            "Analysis2",\
-                "Analysis II",\
-                    QColor(200, 0, 0, 150),\
-                        date(2019, 9, 17),\
-                            date(2019, 12, 20)),\
-                                self.context.subjects,\
-                                    db_name)
-
-        Subject.to_db(Subject.new(\
-            "DiskMat",\
-                "Discrete Mathematics",\
-                    QColor(0, 200, 0, 150),\
-                        date(2019, 9, 17),\
-                            date(2019, 12, 20)),\
-                                self.context.subjects,\
-                                    db_name)
-
-        Subject.to_db(Subject.new(\
-            "AlgoDat",\
-                "Algorithms and Datastructures",\
-                    QColor(0, 0, 200, 150),\
-                        date(2019, 9, 17),\
-                            date(2019, 12, 20)),\
-                                self.context.subjects,\
-                                    db_name)
-
-        Subject.to_db(Subject.new(\
-            "EProg",\
-                "Introduction to Programming",\
-                    QColor(200, 200, 0, 150),\
-                        date(2019, 9, 17),\
-                            date(2019, 12, 20)),\
-                                self.context.subjects,\
-                                    db_name)
-
-        Subject.to_db(Subject.new(\
-            "LinAlg",\
-                "Linear Algebra",\
-                    QColor(0, 200, 200, 150),\
-                        date(2019, 9, 17),\
-                            date(2019, 12, 20)),\
-                                self.context.subjects,\
-                                    db_name)
-
-        Subject.to_db(Subject.new(\
-            "ChFp",\
-                "Swiss foreign policy",\
-                    QColor(50, 10, 200, 150),\
-                        date(2019, 9, 17),\
-                            date(2019, 12, 20)),\
-                                self.context.subjects,\
-                                    db_name)
-
-        Subject.to_db(Subject.new(\
-            "CybSec",\
-                "Cyber Security",\
-                    QColor(50, 200, 50, 150),\
-                        date(2019, 9, 17),\
-                            date(2019, 12, 20)),\
-                                self.context.subjects,\
-                                    db_name)
-
-        Subject.to_db(Subject.new(\
-            "Study",\
-                "Study",\
-                    QColor(180, 180, 180, 150),\
-                        date(2019, 9, 17),\
-                            date(2019, 12, 20)),\
-                                self.context.subjects,\
-                                    db_name)
-
-
-        SubjectType.to_db(SubjectType.new("V", "Lecture"), self.context.subject_types, db_name)
-        SubjectType.to_db(SubjectType.new("U", "Excercise"), self.context.subject_types, db_name)
-        SubjectType.to_db(SubjectType.new("C", "Coffee"), self.context.subject_types, db_name)
-        SubjectType.to_db(SubjectType.new("F", "Free Work"), self.context.subject_types, db_name)
-
-        u_type_id = 0
-        v_type_id = 0
-        for i in self.context.subject_types.items():
-            if i[1].name == "U":
-                u_type_id = i[0]
-            elif i[1].name == "V":
-                v_type_id = i[0]
-
-        algo_subject_id = 0
-        analysis_subject_id = 0
-        for i in self.context.subjects.items():
-            if i[1].name == "AlgoDat":
-                algo_subject_id = i[0]
-            elif i[1].name == "Analysis2":
-                analysis_subject_id = i[0]
-
-        # ScheduleEntry.to_db(\
-        #     ScheduleEntry.new(u_type_id, 0, algo_subject_id, 1, 5,\
-        #         time(hour=8, minute=0), date(2019, 9, 17),\
-        #         time(hour=12, minute=0), date(2020, 2, 1), ""),\
-        #             self.context.schedule_entries,\
-        #                 db_name)
-
-        # ScheduleEntry.to_db(\
-        #     ScheduleEntry.new(u_type_id, 0, analysis_subject_id, 1, 5,\
-        #         time(hour=13, minute=0), date(2019, 9, 17),\
-        #             time(hour=15, minute=0), date(2020, 2, 1), ""),\
-        #             self.context.schedule_entries,\
-        #                 db_name)
-
-        # ScheduleEntry.to_db(\
-        #     ScheduleEntry.new(v_type_id, 4, analysis_subject_id, 1, 5,\
-        #         time(hour=13, minute=0), date(2019, 9, 17),\
-        #         time(hour=15, minute=0), date(2020, 2, 1), ""),\
-        #             self.context.schedule_entries,\
-        #                 db_name)
-
-        # SubjectWorkUnit.to_db(\
-        #     SubjectWorkUnit.new(1, 3, date(2019, 9, 17), date(2019, 10, 5), "test"),\
-        #         self.context.subject_work_units,\
-        #             db_name)
-        # SubjectWorkUnit.to_db(\
-        #     SubjectWorkUnit.new(2, 3, date(2019, 9, 17), date(2019, 10, 5), "test"),\
-        #         self.context.subject_work_units,\
-        #             db_name)
-        # SubjectWorkUnit.to_db(\
-        #     SubjectWorkUnit.new(3, 3, date(2019, 9, 17), date(2019, 10, 5), "test"),\
-        #         self.context.subject_work_units,\
-        #             db_name)
-        # SubjectWorkUnit.to_db(\
-        #     SubjectWorkUnit.new(4, 3, date(2019, 9, 17), date(2019, 10, 5), "test"),\
-        #         self.context.subject_work_units,\
-        #             db_name)
-        # SubjectWorkUnit.to_db(\
-        #     SubjectWorkUnit.new(5, 3, date(2019, 9, 17), date(2019, 10, 5), "test"),\
-        #         self.context.subject_work_units,\
-        #             db_name)
-
-        # SubjectWorkUnit.to_db(\
-        #     SubjectWorkUnit.new(1, 3, date(2019, 9, 17), date(2019, 10, 4), "test"),\
-        #         self.context.subject_work_units,\
-        #             db_name)
-        # SubjectWorkUnit.to_db(\
-        #     SubjectWorkUnit.new(2, 3, date(2019, 9, 17), date(2019, 10, 3), "test"),\
-        #         self.context.subject_work_units,\
-        #             db_name)
-        # SubjectWorkUnit.to_db(\
-        #     SubjectWorkUnit.new(3, 3, date(2019, 9, 17), date(2019, 10, 2), "test"),\
-        #         self.context.subject_work_units,\
-        #             db_name)
-        # SubjectWorkUnit.to_db(\
-        #     SubjectWorkUnit.new(4, 3, date(2019, 9, 17), date(2019, 10, 4), "test"),\
-        #         self.context.subject_work_units,\
-        #             db_name)
-        # SubjectWorkUnit.to_db(\
-        #     SubjectWorkUnit.new(5, 3, date(2019, 9, 17), date(2019, 10, 3), "test"),\
-        #         self.context.subject_work_units,\
-        #             db_name)
+            semesters = list()
+            s_date = self.start_date
+            while s_date <= self.end_date:
+                semesters.append(self.__semester(rnd, len(semesters), s_date,\
+                    subjects_per_semester, type_ids, virtual_series))
+                s_date = s_date + timedelta(days=7*SEMESTER_WEEKS)
+
+            self.__todo_list_items(rnd)
+            self.__work_unit_entries(rnd, semesters, pomodoros_per_day, type_ids["F"])
 
         return True
 
+    def __subject_types(self):
+
+        """
+        load the subject types, insert them if the db wasn't initialized
+        (don't use outside of TestData)
+        """
+
+        db_conn = self.context.db_conn
+        SubjectType.reload_from_db(self.context.subject_types, db_conn)
+        if not self.context.subject_types:
+            SubjectType.to_db(SubjectType.new("V", "Lecture"), self.context.subject_types, db_conn)
+            SubjectType.to_db(SubjectType.new("U", "Exercise"), self.context.subject_types, db_conn)
+            SubjectType.to_db(SubjectType.new("C", "Coffee"), self.context.subject_types, db_conn)
+            SubjectType.to_db(SubjectType.new("F", "Free Work"), self.context.subject_types, db_conn)
+
+        return dict((i.name, i.subject_type_id) for i in self.context.subject_types.values())
+
+    def __semester(self, rnd, index, s_date, subject_count, type_ids, virtual_series):
+
+        """
+        insert the subjects of one semester with their series and plans,
+        return (first date, last date, subject ids)
+        (don't use outside of TestData)
+        """
+
+        db_conn = self.context.db_conn
+        e_date = s_date + timedelta(days=7*SEMESTER_WEEKS - 1)
+        lecture_end = s_date + timedelta(days=7*LECTURE_WEEKS - 1)
+
+        subject_ids = list()
+        for i in range(0, subject_count):
+            name, description = SUBJECT_NAMES[(index*subject_count + i)%len(SUBJECT_NAMES)]
+            subject = Subject.new(\
+                "{0} {1}".format(name, index + 1),\
+                    description,\
+                        QColor(rnd.randint(0, 255), rnd.randint(0, 255), rnd.randint(0, 255), 150),\
+                            s_date,\
+                                e_date,\
+                                    1,\
+                                        SubjectTypes.SUBJECT_TYPE)
+            Subject.to_db(subject, self.context.subjects, db_conn)
+            subject_ids.append(subject.subject_id)
+
+            # one lecture and one exercise per week, both on a working day
+            for type_name, hours in (("V", 2), ("U", rnd.randint(1, 2))):
+                at_date = s_date + timedelta(days=rnd.randint(0, 4))
+                start_hour = rnd.randint(8, 17 - hours)
+                ScheduleEntry.series_to_db(\
+                    ScheduleEntry.new(\
+                        ScheduleSeries.new(type_ids[type_name], subject.subject_id,\
+                            s_date, lecture_end, description, int(virtual_series)),\
+                                self.context.start_time_offset,\
+                                    time(start_hour, 0),\
+                                        time(start_hour + hours, 0),\
+                                            at_date,\
+                                                description),\
+                                                    self.context.schedule_entries,\
+                                                        db_conn)
+
+            # planned work time on two days of every week, the key uses the
+            # days since the start of the data like a window over all of it
+            for week in range(0, SEMESTER_WEEKS):
+                week_start = s_date + timedelta(days=7*week)
+                for weekday in rnd.sample(range(0, 7), 2):
+                    SubjectWorkUnit.to_db(\
+                        SubjectWorkUnit.new(\
+                            subject.subject_id,\
+                                float(rnd.randint(2, 8))/2,\
+                                    self.start_date,\
+                                        week_start + timedelta(days=weekday),\
+                                            ""),\
+                                                self.context.subject_work_units,\
+                                                    db_conn)
+
+        return (s_date, e_date, subject_ids)
+
+    def __todo_list_items(self, rnd):
+
+        """
+        insert three todo items per week, the ones of past weeks are done
+        (don't use outside of TestData)
+        """
+
+        db_conn = self.context.db_conn
+        today = datetime.now().date()
+        position = 0
+        c_date = self.start_date
+        while c_date <= self.end_date:
+            for i in range(0, 3):
+                deadline = c_date + timedelta(days=rnd.randint(1, 14))
+                TodoListItem.to_db(\
+                    TodoListItem.new(\
+                        position*TodoListItem.POSITION_GAP,\
+                            int(deadline < today),\
+                                "task {0}".format(position),\
+                                    deadline),\
+                                        self.context.todo_list_items,\
+                                            db_conn)
+                position = position + 1
+            c_date = c_date + timedelta(days=7)
+
+    def __work_unit_entries(self, rnd, semesters, pomodoros_per_day, free_work_type_id):
+
+        """
+        insert the pomodoros of every day, 25 minutes work followed by a
+        5 minutes break and a coffee after every fourth one
+        (don't use outside of TestData)
+        """
+
+        db_conn = self.context.db_conn
+        offset = self.context.start_time_offset
+        c_date = self.start_date
+        semester = 0
+        while c_date <= self.end_date:
+            while semesters[semester][1] < c_date:
+                semester = semester + 1
+            subject_ids = semesters[semester][2]
+
+            # some days off
+            count = 0
+            if rnd.random() > 0.15:
+                count = rnd.randint(pomodoros_per_day//2, pomodoros_per_day*3//2)
+
+            c_time = datetime.combine(c_date, time(7, 0)) +\
+                timedelta(minutes=5*rnd.randint(0, 24))
+            for i in range(0, count):
+                subject_id = rnd.choice(subject_ids)
+                units = [(UnitTypes.WORK_TIME, 25), (UnitTypes.BREAK_TIME, 5)]
+                if i%4 == 3:
+                    units.append((UnitTypes.COFFEE_TIME, 15))
+                for unit_type, minutes in units:
+                    e_time = c_time + timedelta(minutes=minutes)
+                    WorkUnitEntry.to_db(\
+                        WorkUnitEntry.new(\
+                            free_work_type_id,\
+                                subject_id,\
+                                    0,\
+                                        unit_type,\
+                                            offset,\
+                                                c_time.time(),\
+                                                    c_time.date(),\
+                                                        e_time.time(),\
+                                                            e_time.date(),\
+                                                                0,\
+                                                                    ""),\
+                                                                        self.context.work_unit_entries,\
+                                                                            db_conn)
+                    c_time = e_time
+
+            c_date = c_date + timedelta(days=1)
+
     def reload_data_to_dict(self):
 
         """reload all data into different dictionaries in order to compare"""
 
-        # start_date = date(2019, 9, 17)
-        # end_date = date(2020, 2, 1)
-        # db_name = self.context.db_file_name
-
-        # new_subjects = dict()
-        # Subject.reload_from_db(new_subjects, start_date, end_date, db_name)
-
-        # new_subject_types = dict()
-        # SubjectType.reload_from_db(new_subject_types, db_name)
-
-        # new_schedule_entries = dict()
-        # ScheduleEntry.reload_from_db(new_schedule_entries, start_date, end_date, 1, True, db_name)
-        # ScheduleEntry.reload_from_db(new_schedule_entries, start_date, end_date, 0, False, db_name)
-
-        # new_subject_work_units = dict()
-        # SubjectWorkUnit.reload_from_db(new_subject_work_units, start_date, end_date, db_name)
-
-        # # compare keys first
-        # old_subjects = self.context.subjects
-        # comp_subjects = new_subjects.keys() == old_subjects.keys()
-        # for i in old_subjects.keys():
-        #     comp_subjects = comp_subjects and\
-        #         Subject.compare(new_subjects[i], old_subjects[i])
-
-        # # compare keys first
-        # old_subject_types = self.context.subject_types
-        # comp_subject_types = new_subject_types.keys() == old_subject_types.keys()
-        # for i in old_subject_types.keys():
-        #     comp_subject_types = comp_subject_types and\
-        #         SubjectType.compare(new_subject_types[i], old_subject_types[i])
-
-        # # compare keys first
-        # old_schedule_entries = self.context.schedule_entries
-        # comp_schedule_entries = new_schedule_entries.keys() == old_schedule_entries.keys()
-        # for i in old_schedule_entries.keys():
-        #     comp_schedule_entries = comp_schedule_entries and\
-        #         ScheduleEntry.compare(new_schedule_entries[i], old_schedule_entries[i])
-
-        # # compare keys first
-        # old_subject_work_units = self.context.subject_work_units
-        # comp_subject_work_units = old_subject_work_units.keys() == old_subject_work_units.keys()
-        # for i in old_subject_work_units.keys():
-        #     comp_subject_work_units = comp_subject_work_units and\
-        #         SubjectWorkUnit.compare(new_subject_work_units[i], old_subject_work_units[i])
-
-        # return (comp_subjects,\
-        #     comp_subject_types,\
-        #         comp_schedule_entries,\
-        #             comp_subject_work_units)
+        db_conn = self.context.db_conn
+
+        new_subjects = dict()
+        Subject.reload_from_db(new_subjects, SubjectTypes.SUBJECT_TYPE, 1, db_conn)
+        comp_subjects = TestData.__compare_dicts(\
+            new_subjects, self.context.subjects, Subject.compare)
+
+        new_subject_types = dict()
+        SubjectType.reload_from_db(new_subject_types, db_conn)
+        comp_subject_types = TestData.__compare_dicts(\
+            new_subject_types, self.context.subject_types, SubjectType.compare)
+
+        new_schedule_entries = dict()
+        ScheduleEntry.reload_from_db(new_schedule_entries, self.start_date, self.end_date, db_conn)
+        comp_schedule_entries = TestData.__compare_dicts(\
+            new_schedule_entries, self.context.schedule_entries, ScheduleEntry.compare)
+
+        new_subject_work_units = dict()
+        SubjectWorkUnit.reload_from_db(new_subject_work_units,\
+            self.start_date, self.end_date, db_conn)
+        comp_subject_work_units = TestData.__compare_dicts(\
+            new_subject_work_units, self.context.subject_work_units, SubjectWorkUnit.compare)
+
+        return (comp_subjects, comp_subject_types, comp_schedule_entries, comp_subject_work_units)
 
     def update_data_and_compare(self):
 
-        """pick some datasets, update them and compare the results"""
-
-        # start_date = date(2019, 9, 17)
-        # end_date = date(2020, 2, 1)
-        # db_name = self.context.db_file_name
-
-        # entry = self.context.schedule_entries[1]
-        # entry.type_id = entry.type_id + 1
-        # entry.day_of_week = entry.day_of_week + 1
-        # entry.subject_id = entry.subject_id + 1
-        # entry.is_scheduled = entry.is_scheduled
-        # entry.start_offset = entry.start_offset + 1
-
-        # n_time = datetime.combine(datetime.today(), entry.start_time) + timedelta(hours=1)
-        # entry.start_time = time(n_time.hour, n_time.minute)
-        # entry.start_date = entry.start_date - timedelta(days=1)
-
-        # n_time = datetime.combine(datetime.today(), entry.end_time) + timedelta(hours=1)
-        # entry.end_time = time(n_time.hour, n_time.minute)
-        # entry.end_date = entry.end_date + timedelta(days=1)
-        # entry.description = entry.description + "hello"
-
-        # ScheduleEntry.update_by_db_id(entry, db_name)
-
-        # new_schedule_entries = dict()
-        # ScheduleEntry.reload_from_db(new_schedule_entries, start_date, end_date, 1, True, db_name)
-        # ScheduleEntry.reload_from_db(new_schedule_entries, start_date, end_date, 0, False, db_name)
-
-        # # compare keys first
-        # old_schedule_entries = self.context.schedule_entries
-        # comp_schedule_entries = new_schedule_entries.keys() == old_schedule_entries.keys()
-        # for i in old_schedule_entries.keys():
-        #     comp_schedule_entries = comp_schedule_entries and\
-        #         ScheduleEntry.compare(new_schedule_entries[i], old_schedule_entries[i])
-
-        # subject = self.context.subjects[1]
-        # subject.name = "LOL"
-        # subject.description = "Blub"
-        # subject.color = QColor(1, 1, 1, 255)
-        # subject.start_date = subject.start_date - timedelta(days=1)
-        # subject.end_date = subject.end_date + timedelta(days=1)
-
-        # Subject.update_by_db_id(subject, db_name)
-
-        # new_subjects = dict()
-        # Subject.reload_from_db(new_subjects, start_date, end_date, db_name)
-
-        # # compare keys first
-        # old_subjects = self.context.subjects
-        # comp_subjects = new_subjects.keys() == old_subjects.keys()
-        # for i in old_subjects.keys():
-        #     comp_subjects = comp_subjects and\
-        #         Subject.compare(new_subjects[i], old_subjects[i])
-
-        # subject_type = self.context.subject_types[1]
-        # subject_type.name = "typo"
-        # subject_type.description = "description X"
-
-        # SubjectType.update_by_db_id(subject_type, db_name)
-
-        # new_subject_types = dict()
-        # SubjectType.reload_from_db(new_subject_types, db_name)
-
-        # # compare keys first
-        # old_subject_types = self.context.subject_types
-        # comp_subject_types = new_subject_types.keys() == old_subject_types.keys()
-        # for i in old_subject_types.keys():
-        #     comp_subject_types = comp_subject_types and\
-        #         SubjectType.compare(new_subject_types[i], old_subject_types[i])
-
-        # keys = list(self.context.subject_work_units.keys())
-        # subject_work_unit =\
-        #     self.context.subject_work_units[keys[0]]
-        # # subject_work_unit.subject_id = 2
-        # subject_work_unit.work_time = 5
-        # # subject_work_unit.set_at_date(subject_work_unit.at_date + timedelta(days=1))
-        # subject_work_unit.description = "description X"
-
-        # SubjectWorkUnit.update_by_db_id(subject_work_unit, db_name)
-
-        # new_subject_work_units = dict()
-        # SubjectWorkUnit.reload_from_db(new_subject_work_units, start_date, end_date, db_name)
-
-        # # TODO: this test fails if the subject_id or the at_date
-        # # are changed because the key is the (subject_id, date_index) pair. find some
-        # # testing solution
-
-        # # compare keys first
-        # old_subject_work_units = self.context.subject_work_units
-        # comp_subject_work_units = old_subject_work_units.keys() == old_subject_work_units.keys()
-        # for i in old_subject_work_units.keys():
-        #     comp_subject_work_units = comp_subject_work_units and\
-        #         SubjectWorkUnit.compare(new_subject_work_units[i], old_subject_work_units[i])
-
-        # return (comp_subjects, comp_subject_types, comp_schedule_entries, comp_subject_work_units)
+        """change one object of every kind, store it and compare it with the reloaded data"""
+
+        db_conn = self.context.db_conn
+
+        subject = self.context.subjects[min(self.context.subjects.keys())]
+        subject.name = "LOL"
+        subject.description = "Blub"
+        subject.color = QColor(1, 1, 1, 255)
+        subject.start_date = subject.start_date - timedelta(days=1)
+        subject.end_date = subject.end_date + timedelta(days=1)
+        Subject.update_by_db_id(subject, db_conn)
+
+        subject_type = self.context.subject_types[min(self.context.subject_types.keys())]
+        subject_type.name = "typo"
+        subject_type.description = "description X"
+        SubjectType.update_by_db_id(subject_type, db_conn)
+
+        schedule_entry = self.context.schedule_entries[\
+            sorted(self.context.schedule_entries.keys(), key=repr)[0]]
+        schedule_entry.description = "description X"
+        ScheduleEntry.update_entry_by_db_id(schedule_entry, db_conn)
+
+        # the key is the (subject_id, date_index) pair, so only the values
+        # that are not part of it are changed
+        subject_work_unit = self.context.subject_work_units[\
+            min(self.context.subject_work_units.keys())]
+        subject_work_unit.work_time = 5
+        subject_work_unit.description = "description X"
+        SubjectWorkUnit.update_by_db_id(subject_work_unit, db_conn)
+
+        return self.reload_data_to_dict()
+
+    @staticmethod
+    def __compare_dicts(new_dict, old_dict, compare):
+
+        """
+        compare the keys first and then all objects
+        (don't use outside of TestData)
+        """
+
+        if new_dict.keys() != old_dict.keys():
+            return False
+        for i in old_dict.keys():
+            if not compare(new_dict[i], old_dict[i]):
+                return False
+        return True
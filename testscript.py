@@ -3,7 +3,12 @@
 Test cases for all scheduler components
 """
 
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+import version
 import dbobj.dbwrapper as dbwrapper
 import testdata
 import globalcontext
@@ -16,8 +21,28 @@ class TestDB(unittest.TestCase):
 
         """initiate db and see if it gets seeded properly"""
 
+        if os.path.exists("test_data.db"):
+            os.remove("test_data.db")
         db_obj = dbwrapper.DB(db_name="test_data.db")
-        db_obj.seed()
+        assert db_obj.seed(version.VERSION, 0.99)
+        db_obj.init()
+        assert sorted(db_obj.migration_times.keys())[-1] == "%.2f" % version.VERSION
+        db_obj.close()
+
+    def test_version_import(self):
+
+        """importing version (as the test, benchmark and query plan scripts do) must leave the db alone"""
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_name = os.path.join(temp_dir, "configured.db")
+            with open(os.path.join(temp_dir, "dbconfig.txt"), "w") as e_file:
+                e_file.write(db_name + "\n")
+
+            env = dict(os.environ)
+            env["PYTHONPATH"] = os.path.dirname(os.path.abspath(__file__))
+            subprocess.run([sys.executable, "-c", "import version, benchrunner, queryplans"],\
+                cwd=temp_dir, env=env, check=True)
+            assert not os.path.exists(db_name)
 
     # @unittest.skip("check seeding first")
     def test_insert_test_data(self):
@@ -27,8 +52,12 @@ class TestDB(unittest.TestCase):
         context = globalcontext.GlobalContext()
         context.db_file_name = "test_data.db"
 
+        if os.path.exists(context.db_file_name):
+            os.remove(context.db_file_name)
         db_obj = dbwrapper.DB(db_name=context.db_file_name)
-        db_obj.seed()
+        context.db_conn = db_obj.db_conn
+        db_obj.seed(version.VERSION, 0.99)
+        db_obj.init()
         test = testdata.TestData(context)
 
         gen = test.generate_test_data()
@@ -46,4 +75,6 @@ class TestDB(unittest.TestCase):
         assert update[2]
         assert update[3]
 
+        db_obj.close()
+
 unittest.main()
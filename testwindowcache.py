@@ -0,0 +1,125 @@
+"""
+Test cases for the invalidation of the WindowCache
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+import version
+import dbobj.dbwrapper as dbwrapper
+from dbobj.windowcache import TRACKED_TABLES
+from dbobj.helperfunctions import HelperFunctions as HF
+
+# table -> insert of one row at :date (ignored by the tables without dates)
+INSERTS = {\
+    "WorkUnitEntry": """INSERT INTO WorkUnitEntry (SubjectId, UnitType, StartDate, EndDate, TimeDiff)
+                        VALUES (1, 0, :date, :date, 60)""",\
+        "DailyWorkRollup": """INSERT INTO DailyWorkRollup (Date, SubjectId, UnitType, Seconds, Count)
+                              VALUES (:date, 2, 0, 60, 1)""",\
+            "SubjectWorkUnit": """INSERT INTO SubjectWorkUnit (SubjectId, WorkTime, AtDate)
+                                  VALUES (1, 1.0, :date)""",\
+                "ScheduleEntry": """INSERT INTO ScheduleEntry (ScheduleSeriesId, AtDate)
+                                    VALUES (1, :date)""",\
+                    "ScheduleSeriesException": """INSERT INTO ScheduleSeriesException
+                                                  (ScheduleSeriesId, AtDate, ExceptionType)
+                                                  VALUES (1, :date, 0)""",\
+                        "ScheduleSeries": """INSERT INTO ScheduleSeries (SubjectId, Description)
+                                             VALUES (1, 'test')""",\
+                            "Subject": """INSERT INTO Subject (Name, Active)
+                                          VALUES ('WindowCacheTest', 1)"""}
+
+class TestWindowCache(unittest.TestCase):
+
+    """Test class for WindowCache class"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_obj = dbwrapper.DB(db_name=os.path.join(self.temp_dir.name, "test_data.db"))
+        self.db_obj.seed(version.VERSION, 0.99)
+        self.db_obj.init()
+        self.db_conn = self.db_obj.db_conn
+        self.window_cache = self.db_conn.window_cache
+
+    def tearDown(self):
+        self.db_obj.close()
+        self.temp_dir.cleanup()
+
+    def cache(self, name, tables, start_date, end_date):
+
+        """load window name of tables into the cache, return True if it was loaded"""
+
+        loads = list()
+        self.window_cache.get(name, tables, start_date, end_date, lambda: loads.append(name))
+        return len(loads) == 1
+
+    def cached(self, name, start_date, end_date):
+
+        """true if window name is still cached"""
+
+        return (name, start_date, end_date) in self.window_cache.entries
+
+    def test_tracked_tables(self):
+
+        """a write drops the overlapping windows of its table and keeps all other ones"""
+
+        assert sorted(INSERTS.keys()) == sorted(TRACKED_TABLES.keys())
+
+        for table, columns in TRACKED_TABLES.items():
+            with self.window_cache.lock:
+                self.window_cache.clear()
+            invalidations = self.window_cache.get_stats()["invalidations"]
+
+            assert self.cache("Overlapping", (table,), date(2020, 1, 10), date(2020, 1, 20))
+            assert self.cache("Later", (table,), date(2020, 2, 1), date(2020, 2, 29))
+            assert self.cache("Untracked", ("TodoListItem",), date(2020, 1, 10), date(2020, 1, 20))
+
+            with self.db_conn.writer() as connection:
+                connection.execute(INSERTS[table], {"date": HF.date_2_db(date(2020, 1, 15))})
+
+            assert not self.cached("Overlapping", date(2020, 1, 10), date(2020, 1, 20)), table
+            # a change without dates affects all windows of the table
+            assert self.cached("Later", date(2020, 2, 1), date(2020, 2, 29)) ==\
+                (columns[0] is not None), table
+            assert self.cached("Untracked", date(2020, 1, 10), date(2020, 1, 20)), table
+            assert self.window_cache.get_stats()["invalidations"] ==\
+                invalidations + (1 if columns[0] is not None else 2), table
+
+            # the next get loads it again, the others are hits
+            assert self.cache("Overlapping", (table,), date(2020, 1, 10), date(2020, 1, 20))
+            assert not self.cache("Untracked", ("TodoListItem",), date(2020, 1, 10), date(2020, 1, 20))
+
+    def test_moved_row(self):
+
+        """an update drops the windows of the old and the new date"""
+
+        with self.db_conn.writer() as connection:
+            connection.execute(INSERTS["SubjectWorkUnit"], {"date": HF.date_2_db(date(2020, 1, 15))})
+
+        for month in (1, 2, 3):
+            assert self.cache("Month", ("SubjectWorkUnit",), date(2020, month, 1), date(2020, month, 28))
+
+        with self.db_conn.writer() as connection:
+            connection.execute("UPDATE SubjectWorkUnit SET AtDate = ?",\
+                (HF.date_2_db(date(2020, 3, 15)),))
+
+        assert not self.cached("Month", date(2020, 1, 1), date(2020, 1, 28))
+        assert self.cached("Month", date(2020, 2, 1), date(2020, 2, 28))
+        assert not self.cached("Month", date(2020, 3, 1), date(2020, 3, 28))
+
+    def test_other_process(self):
+
+        """a commit of another connection clears the whole cache"""
+
+        assert self.cache("Untracked", ("TodoListItem",), date(2020, 1, 10), date(2020, 1, 20))
+        assert not self.cache("Untracked", ("TodoListItem",), date(2020, 1, 10), date(2020, 1, 20))
+
+        connection = sqlite3.connect(self.db_conn.db_name)
+        connection.execute(INSERTS["SubjectWorkUnit"], {"date": HF.date_2_db(date(2021, 1, 1))})
+        connection.commit()
+        connection.close()
+
+        assert self.cache("Untracked", ("TodoListItem",), date(2020, 1, 10), date(2020, 1, 20))
+
+unittest.main()
@@ -0,0 +1,285 @@
+"""
+Test cases for the writer thread, the Session and the DBConnection
+"""
+
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import date
+import version
+import dbobj.dbwrapper as dbwrapper
+from dbobj.helperfunctions import HelperFunctions as HF
+
+def insert_unit(at_date, db_conn):
+
+    """insert one SubjectWorkUnit at at_date"""
+
+    with db_conn.writer() as connection:
+        connection.execute("""INSERT INTO SubjectWorkUnit (SubjectId, WorkTime, AtDate, Description)
+                              VALUES (1, 1.0, ?, 'test')""", (HF.date_2_db(at_date),))
+
+def count_units(start_date, end_date, db_conn):
+
+    """return the number of SubjectWorkUnit between start_date and end_date"""
+
+    with db_conn.reader() as connection:
+        return connection.execute("""SELECT count(*) FROM SubjectWorkUnit
+                                     WHERE AtDate BETWEEN ? AND ?""",\
+            (HF.date_2_db(start_date), HF.date_2_db(end_date))).fetchone()[0]
+
+def todo_positions(db_conn):
+
+    """return the positions of all TodoListItem in the order they were inserted"""
+
+    with db_conn.reader() as connection:
+        return [row[0] for row in connection.execute(\
+            "SELECT Position FROM TodoListItem ORDER BY TodoListItemId").fetchall()]
+
+class TestDBBase(unittest.TestCase):
+
+    """Base class that seeds a temporary db with the writer thread enabled"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_obj = dbwrapper.DB(db_name=os.path.join(self.temp_dir.name, "test_data.db"))
+        self.db_obj.seed(version.VERSION, 0.99)
+        self.db_obj.init()
+        self.db_conn = self.db_obj.db_conn
+        self.db_conn.write_behind.enabled = True
+        # the writer thread waits for it in hold
+        self.gate = threading.Event()
+
+    def tearDown(self):
+        self.gate.set()
+        self.db_obj.close()
+        self.temp_dir.cleanup()
+
+    def hold(self):
+
+        """keep the writer thread busy until gate is set"""
+
+        self.db_conn.write_behind.submit(self.gate.wait, 10)
+
+    def release(self):
+
+        """let the writer thread write everything that is queued"""
+
+        self.gate.set()
+        assert self.db_conn.write_behind.wait(10)
+
+class TestDBConnection(TestDBBase):
+
+    """Test class for DBConnection class"""
+
+    def test_nested_writer(self):
+
+        """only the outermost writer block commits, an exception rolls back all of it"""
+
+        generation = self.db_conn.write_generation
+        with self.db_conn.writer():
+            insert_unit(date(2020, 1, 1), self.db_conn)
+            insert_unit(date(2020, 1, 2), self.db_conn)
+        assert self.db_conn.write_generation == generation + 1
+        assert count_units(date(2020, 1, 1), date(2020, 1, 2), self.db_conn) == 2
+
+        try:
+            with self.db_conn.writer():
+                insert_unit(date(2020, 1, 3), self.db_conn)
+                raise ValueError("test")
+        except ValueError:
+            pass
+        assert self.db_conn.write_generation == generation + 1
+        assert count_units(date(2020, 1, 3), date(2020, 1, 3), self.db_conn) == 0
+
+    def test_data_version(self):
+
+        """the data version changes with the own commits and the commits of other connections"""
+
+        data_version = self.db_conn.get_data_version()
+        insert_unit(date(2020, 1, 1), self.db_conn)
+        self.release()
+        own = self.db_conn.get_data_version()
+        assert own != data_version
+
+        connection = sqlite3.connect(self.db_conn.db_name)
+        connection.execute("UPDATE SubjectWorkUnit SET WorkTime = 2.0")
+        connection.commit()
+        connection.close()
+        assert self.db_conn.get_data_version() != own
+
+class TestWriteBehind(TestDBBase):
+
+    """Test class for WriteBehind class"""
+
+    def test_order(self):
+
+        """queued writes and writes of other threads are done in submit order"""
+
+        self.hold()
+        items = dict()
+        for i in range(5):
+            self.db_conn.write_behind.submit(dbwrapper.TodoListItem.to_db,\
+                dbwrapper.TodoListItem.new(i, 0, "queued", date(2020, 1, 1)), items, self.db_conn)
+        assert self.db_conn.write_behind.pending() == 6
+
+        # a write of this thread waits until the queued writes are done
+        threading.Timer(0.2, self.gate.set).start()
+        dbwrapper.TodoListItem.to_db(\
+            dbwrapper.TodoListItem.new(5, 0, "direct", date(2020, 1, 1)), items, self.db_conn)
+        assert self.db_conn.write_behind.pending() == 0
+        assert todo_positions(self.db_conn) == list(range(6))
+
+    def test_read_ahead(self):
+
+        """a read doesn't wait for the queued writes, drained tells when they're written"""
+
+        drained = threading.Event()
+        self.db_conn.write_behind.drained = drained.set
+        assert count_units(date(2020, 1, 1), date(2020, 1, 31), self.db_conn) == 0
+
+        self.hold()
+        self.db_conn.write_behind.submit(insert_unit, date(2020, 1, 1), self.db_conn)
+        # would never return if it waited for the gate
+        assert count_units(date(2020, 1, 1), date(2020, 1, 31), self.db_conn) == 0
+        assert not drained.is_set()
+
+        self.gate.set()
+        assert drained.wait(10)
+        assert count_units(date(2020, 1, 1), date(2020, 1, 31), self.db_conn) == 1
+        assert self.db_conn.write_behind.get_stats()["reads_ahead"] == 1
+
+    def test_failed_write(self):
+
+        """a failing command sets the exception of its future, the next ones still run"""
+
+        def fail():
+            raise sqlite3.OperationalError("test")
+
+        self.hold()
+        failed = self.db_conn.write_behind.submit(fail)
+        written = self.db_conn.write_behind.submit(insert_unit, date(2020, 1, 1), self.db_conn)
+        self.release()
+
+        assert failed.exception() is not None
+        assert written.exception() is None
+        assert count_units(date(2020, 1, 1), date(2020, 1, 1), self.db_conn) == 1
+
+    def test_window_cache_bypass(self):
+
+        """windows aren't cached while writes are queued"""
+
+        loads = list()
+        def load():
+            loads.append(1)
+            return count_units(date(2020, 1, 1), date(2020, 1, 31), self.db_conn)
+        def get():
+            return self.db_conn.window_cache.get("Test.load", ("SubjectWorkUnit",),\
+                date(2020, 1, 1), date(2020, 1, 31), load)
+
+        assert get() == 0
+        assert get() == 0
+        assert len(loads) == 1
+
+        self.hold()
+        self.db_conn.write_behind.submit(insert_unit, date(2020, 1, 15), self.db_conn)
+        stats = self.db_conn.window_cache.get_stats()
+        assert get() == 0
+        assert len(loads) == 2
+        assert self.db_conn.window_cache.get_stats() == stats
+
+        self.release()
+        assert get() == 1
+        assert len(loads) == 3
+        assert get() == 1
+        assert len(loads) == 3
+
+class TestSession(TestDBBase):
+
+    """Test class for Session class"""
+
+    def setUp(self):
+        super().setUp()
+        # stands in for the Communicator, the calls are run by run_dispatched
+        self.dispatched = queue.Queue()
+        self.session = dbwrapper.Session(self.db_conn, self.dispatched.put)
+
+    def run_dispatched(self):
+
+        """run the calls handed to dispatch on this (the gui) thread"""
+
+        while not self.dispatched.empty():
+            self.dispatched.get()()
+
+    def test_queued_flush(self):
+
+        """the dict of the gui changes on the gui thread, right before the notifications"""
+
+        items = dict()
+        seen = list()
+        obj = dbwrapper.TodoListItem.new(0, 0, "queued", date(2020, 1, 1))
+
+        self.hold()
+        with self.session:
+            self.session.add(dbwrapper.TodoListItem.to_db, obj, items)
+            self.session.notify(lambda: seen.append(obj.key() in items))
+        assert not items
+
+        self.release()
+        assert not items
+        assert not seen
+
+        self.run_dispatched()
+        assert list(items.keys()) == [obj.key()]
+        assert items[obj.key()] is obj
+        assert seen == [True]
+        assert not self.session.stages
+
+    def test_chained_flushes(self):
+
+        """a flush sees the changes of the earlier flushes that aren't written yet"""
+
+        items = dict()
+        obj = dbwrapper.TodoListItem.new(0, 1, "completed", date(2020, 1, 1))
+
+        self.hold()
+        self.session.add(dbwrapper.TodoListItem.to_db, obj, items)
+        self.session.delete(dbwrapper.TodoListItem.delete_all_completed, items)
+        assert len(self.session.stages) == 1
+
+        self.release()
+        self.run_dispatched()
+        assert not items
+        assert not todo_positions(self.db_conn)
+        assert not self.session.stages
+
+    def test_failed_flush(self):
+
+        """a failing flush writes nothing, leaves the dict alone and drops its notifications"""
+
+        items = dict()
+        seen = list()
+        def fail(obj, db_conn):
+            with db_conn.writer():
+                raise sqlite3.OperationalError("test")
+
+        self.hold()
+        with self.session:
+            self.session.add(dbwrapper.TodoListItem.to_db,\
+                dbwrapper.TodoListItem.new(0, 0, "dropped", date(2020, 1, 1)), items)
+            self.session.add(fail, None)
+            self.session.notify(seen.append, 1)
+
+        obj = dbwrapper.TodoListItem.new(1, 0, "written", date(2020, 1, 1))
+        self.session.add(dbwrapper.TodoListItem.to_db, obj, items)
+
+        self.release()
+        self.run_dispatched()
+        assert list(items.keys()) == [obj.key()]
+        assert todo_positions(self.db_conn) == [1]
+        assert not seen
+        assert not self.session.stages
+
+unittest.main()
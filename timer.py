@@ -19,6 +19,7 @@ from PyQt6.QtCore import QPoint, pyqtSlot
 from PyQt6.QtGui import QFont
 import dbobj.dbwrapper as dbwrapper
 import mainconfigwindow
+from sessiontotals import SessionTotals
 import random
 from helpers.verticalspacer import VerticalSpacer
 
@@ -276,6 +277,7 @@ class Timer(QWidget):
         self.state = State(context)
         self.communicator = communicator
         self.context = context
+        self.session_totals = SessionTotals(context, communicator.dispatch)
 
         self.state.reset_running_state(self.context.work_time_interval)
         self.timer = QTimer()
@@ -654,33 +656,27 @@ class Timer(QWidget):
         if not self.loaded:
             return
 
+        # the totals are kept in memory and only reloaded if the
+        # work day or the db changed
         self.work_summary_subject_time.setText(self.format_time(\
-            dbwrapper.Summary.total_work_for_subject_and_workday(\
-                self.context.current_work_day,\
-                    self.state.current_subject_id,\
-                        self.context.db_file_name),\
-                            False, False))
+            self.session_totals.subject_total(\
+                self.state.current_subject_id,\
+                    dbwrapper.UnitTypes.WORK_TIME),\
+                        False, False))
         self.break_summary_subject_time.setText(self.format_time(\
-            dbwrapper.Summary.total_break_for_subject_and_workday(\
-                self.context.current_work_day,\
-                    self.state.current_subject_id,\
-                        self.context.db_file_name),\
-                            False, False))
-        self.work_total_summary_time.setText(self.format_time(\
-            dbwrapper.Summary.total_work_for_workday(\
-                self.context.current_work_day,\
-                    self.context.db_file_name),\
+            self.session_totals.subject_total(\
+                self.state.current_subject_id,\
+                    dbwrapper.UnitTypes.BREAK_TIME),\
                         False, False))
+        self.work_total_summary_time.setText(self.format_time(\
+            self.session_totals.total(dbwrapper.UnitTypes.WORK_TIME),\
+                False, False))
         self.break_total_summary_time.setText(self.format_time(\
-            dbwrapper.Summary.total_break_for_workday(\
-                self.context.current_work_day,\
-                    self.context.db_file_name),\
-                        False, False))
+            self.session_totals.total(dbwrapper.UnitTypes.BREAK_TIME),\
+                False, False))
         self.coffee_total_summary_time.setText(self.format_time(\
-            dbwrapper.Summary.total_coffee_for_workday(\
-                self.context.current_work_day,\
-                    self.context.db_file_name),\
-                        False, False))
+            self.session_totals.total(dbwrapper.UnitTypes.COFFEE_TIME),\
+                False, False))
 
     def get_new_work_unit_entry_obj(self):
 
@@ -708,9 +704,8 @@ class Timer(QWidget):
 
         if self.state.current_work_unit_entry is None:
             self.state.current_work_unit_entry = self.get_new_work_unit_entry_obj()
-            dbwrapper.WorkUnitEntry.to_db(self.state.current_work_unit_entry,\
-                self.context.work_unit_entries,\
-                    self.context.db_file_name)
+            self.session_totals.store(self.state.current_work_unit_entry,\
+                self.context.work_unit_entries, self.db_data_written)
         else:
             cur_wue = self.state.current_work_unit_entry
             cur_wue.subject_id = self.state.current_subject_id
@@ -719,16 +714,11 @@ class Timer(QWidget):
             cur_wue.end_date = datetime.now().date()
             cur_wue.state = 1
 
-            dbwrapper.WorkUnitEntry.update_by_db_id(\
-                self.state.current_work_unit_entry,\
-                    self.context.db_file_name)
+            self.session_totals.update(self.state.current_work_unit_entry,\
+                self.db_data_written)
 
         self.update_summary_labels()
 
-        # redraw schedule view if it is open
-        if self.show_config_widget:
-            self.communicator.SIGNAL_DATES_CHANGED.emit()
-
     def close_db_data(self):
 
         """close data set in db"""
@@ -740,12 +730,18 @@ class Timer(QWidget):
         cur_wue.end_date = datetime.now().date()
         cur_wue.state = 2
 
-        dbwrapper.WorkUnitEntry.update_by_db_id(\
-            self.state.current_work_unit_entry,\
-                self.context.db_file_name)
+        self.session_totals.close(self.state.current_work_unit_entry,\
+            self.db_data_written)
 
         self.update_summary_labels()
 
+    def db_data_written(self):
+
+        """
+        called once the running entry is written, the schedule view
+        is only loaded again afterwards, so it doesn't wait for the write
+        """
+
         # redraw schedule view if it is open
         if self.show_config_widget:
             self.communicator.SIGNAL_DATES_CHANGED.emit()
@@ -778,6 +774,9 @@ class Timer(QWidget):
         if self.state.current_work_unit_entry is not None:
             self.close_db_data()
 
+        # the queued writes must not be lost if the application ends now
+        self.context.db_conn.write_behind.wait()
+
     @pyqtSlot()
     def play_signal_bell(self):
 
@@ -938,11 +937,10 @@ class Timer(QWidget):
 
         if self.state.timer_is_running:
             self.timer.stop()
-            dbwrapper.WorkUnitEntry.delete_by_db_id(\
+            self.session_totals.delete(\
                 self.state.current_work_unit_entry,\
                     self.context.work_unit_entries,\
-                        self.context.db_file_name,\
-                            self.context.db_file_name)
+                        self.context.date_format)
             self.state.reset_running_state(self.context.work_time_interval)
             self.reset_q_bar()
             self.state.enable_all()
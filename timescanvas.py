@@ -7,6 +7,9 @@ from PyQt6.QtWidgets import QWidget
 from PyQt6.QtGui import QPainter, QBrush, QPalette
 from PyQt6.QtCore import Qt, QRect, pyqtSlot
 from helpers.canvasgrid import CanvasGrid
+from helpers.pixmaplayer import PixmapLayer
+from helpers.dayintervalindex import DayIntervalIndex
+from helpers.paintcounter import PaintCounter
 
 class TimeBox(QRect):
 
@@ -74,7 +77,7 @@ class TimesCanvas(QWidget):
         self.context = context
         self.communicator = communicator
         self.time_boxes = list()
-        self.linked_vertical_scrollbars = list()
+        self.time_box_index = DayIntervalIndex(self.context.time_column_width)
 
         palette = QPalette()
         palette.setColor(QPalette.ColorRole.Window, self.context.canvas_background_color)
@@ -86,17 +89,15 @@ class TimesCanvas(QWidget):
 
         self.grid = None
         self.grid_height = 0
+        # time boxes and grid lines
+        self.layer = PixmapLayer()
+        self.bounds = QRect()
+        self.paint_counter = PaintCounter()
 
         self.create_time_boxes()
         self.create_grid()
         self.resize_canvas()
 
-    def link_vertical_scroll_bar(self, scroll_bar):
-
-        """link a scrollbar to the one of this windows parent"""
-
-        self.linked_vertical_scrollbars.append(scroll_bar)
-
     def get_interval_count(self):
 
         """return the amount of time boxes to get row count for schedule"""
@@ -141,6 +142,8 @@ class TimesCanvas(QWidget):
                                         self.context\
                                             ))
 
+                # TimeBox hides width() and height() of QRect
+                self.time_box_index.add(row_num, QRect(self.time_boxes[-1]))
                 row_num = row_num + 1
 
     def create_grid(self):
@@ -156,8 +159,12 @@ class TimesCanvas(QWidget):
 
         self.grid = CanvasGrid(width, height, startx, starty, intervalx, intervaly, self.context)
         self.grid_height = self.grid.get_height()
+        self.bounds = self.grid.bounds
+        for i in self.time_boxes:
+            self.bounds = self.bounds.united(i)
+        self.layer.invalidate()
 
-    def paintEvent(self, event): # pylint: disable=invalid-name, unused-argument
+    def paintEvent(self, event): # pylint: disable=invalid-name
 
         """paint event for container widget"""
 
@@ -168,18 +175,29 @@ class TimesCanvas(QWidget):
             painter.setPen(Qt.GlobalColor.black)
             brush = QBrush(Qt.GlobalColor.blue)
 
-            for i in self.time_boxes:
-                i.paint(painter, brush)
-
-            self.grid.paint(painter, brush)
-
-            for i in self.linked_vertical_scrollbars:
-                i.setValue(self.parent.verticalScrollBar().value())
+            self.paint_counter.begin()
+            blits = self.layer.paint(painter, self.bounds,\
+                lambda layer_painter, area: self.paint_layer(layer_painter, brush, area),\
+                    event.rect())
+            self.paint_counter.count(blits, blits)
 
             res = painter.end()
         except:
             print("weird exception 5")
 
+    def paint_layer(self, painter, brush, area):
+
+        """paint the time boxes and the grid lines that intersect area"""
+
+        visited = self.time_box_index.visited
+        time_boxes = self.time_box_index.query(area)
+        for i, _ in time_boxes:
+            self.time_boxes[i].paint(painter, brush)
+
+        lines = self.grid.paint_lines(painter, brush, area)
+        self.paint_counter.count(self.time_box_index.visited - visited + lines,\
+            len(time_boxes) + lines)
+
     @pyqtSlot()
     def resize_canvas(self):
 
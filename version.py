@@ -16,7 +16,7 @@ DESCRIPTION = "loaded from db"
 # DBVersion.Value
 # If it's not, the db version doesn't fit to the
 # current code!
-VERSION = 1.06
+VERSION = 1.09
 
 # name of db file
 DB_NAME = "-load-from-dbconfig.txt-"
@@ -37,44 +37,62 @@ def special_migration(db_name):
     # this migration doesn't work if version is not hardcoded
     # to 1.0 because it was added later on!!!
     print("Special migration ...")
-    connection = sqlite3.connect(db_name)
-    dbwrapper.DBVersion.seed(connection)
-    dbwrapper.DBVersion.create_new_version("Added Config", 1.01, db_name)
+    db_obj = dbwrapper.DB(db_name)
+    with db_obj.db_conn.writer() as connection:
+        dbwrapper.DBVersion.seed(connection)
+        dbwrapper.DBVersion.create_new_version("Added Config", 1.01, db_obj.db_conn)
+    db_obj.close()
     print("...OK")
 
-if __name__ == "__main__":
-    special_migration("data.db")
-else:
-    DB_VERSION = 0
+def open_db(db_name):
+
+    """
+    open the shared db connections of the whole application, seed or
+    migrate the db to VERSION and return the db object
+    (only start.py calls this, importing this module doesn't touch the db)
+    """
+
+    db_obj = dbwrapper.DB(db_name)
+
+    db_version = 0
     try:
-        DB_VERSION = dbwrapper.DBVersion.get_current_version(DB_NAME).value
+        db_version = dbwrapper.DBVersion.get_current_version(db_obj.db_conn).value
     except sqlite3.Error:
         # no db there yet, do initial seed
-        DB_VERSION = 0.99
+        db_version = 0.99
         print("initial seed required...")
 
     # try to migrate as long as possible
-    if DB_VERSION < VERSION:
-        DB_OBJ = dbwrapper.DB(DB_NAME)
-        DB_OBJ.seed(VERSION, DB_VERSION)
-        DB_OBJ.init()
+    if db_version < VERSION:
+        initial_seed = db_version == 0.99
+        db_obj.seed(VERSION, db_version)
+
+        # initial data only goes into a new db, not into migrated ones
+        if initial_seed:
+            db_obj.init()
 
         # now if there is no db version, there is something weird
-        DB_VERSION = dbwrapper.DBVersion.get_current_version(DB_NAME).value
+        db_version = dbwrapper.DBVersion.get_current_version(db_obj.db_conn).value
 
-    if DB_VERSION != VERSION:
-        ERROR_MSG =\
+    if db_version != VERSION:
+        error_msg =\
         """
         ############################################\n
         # DB version error: code version is: {0}\n
         #                   db version is:   {1}\n
         ############################################\n
-        """.format(str(VERSION), str(DB_VERSION))
+        """.format(str(VERSION), str(db_version))
 
         with open("./DB_VERSION_ERROR.TXT", "w") as e_file:
-            e_file.write(ERROR_MSG)
+            e_file.write(error_msg)
 
-        raise Exception(ERROR_MSG)
+        db_obj.close()
+        raise Exception(error_msg)
     else:
         if os.path.isfile("./DB_VERSION_ERROR.TXT"):
             os.remove("./DB_VERSION_ERROR.TXT")
+
+    return db_obj
+
+if __name__ == "__main__":
+    special_migration("data.db")
@@ -23,7 +23,6 @@ class WorkTimeSummary(QWidget):
         self.parent = parent
         self.entry_work_gradient = entry_work_gradient
         self.subject_entry_communicator = subject_entry_communicator
-        self.linked_scroll_bars = list()
         self.width = width
         self.height =\
             subject_entry_communicator.grid_height +\
@@ -39,14 +38,18 @@ class WorkTimeSummary(QWidget):
         self.communicator.SIGNAL_SCHEDULE_RESIZED.connect(self.resize_canvas)
         self.communicator.SIGNAL_DATES_CHANGED.connect(self.update_canvas)
 
-        self.communicator.SIGNAL_SUBJECT_WORK_PLAN_CHANGED.connect(\
-            self.update_subject_work_plan)
+        # merged per subject id
+        self.communicator.coalesce(\
+            self.communicator.SIGNAL_SUBJECT_WORK_PLAN_CHANGED,\
+                self.update_subject_work_plan)
 
-        self.communicator.SIGNAL_SUBJECT_WORK_TIME_CHANGED.connect(\
-            self.update_subject_work_time)
+        self.communicator.coalesce(\
+            self.communicator.SIGNAL_SUBJECT_WORK_TIME_CHANGED,\
+                self.update_subject_work_time)
 
-        self.communicator.SIGNAL_SUBJECT_TOTAL_WORK_CHANGED.connect(\
-            self.update_subject_total)
+        self.communicator.coalesce(\
+            self.communicator.SIGNAL_SUBJECT_TOTAL_WORK_CHANGED,\
+                self.update_subject_total)
 
         palette = QPalette()
         palette.setColor(QPalette.ColorRole.Window, self.context.canvas_background_color)
@@ -57,12 +60,6 @@ class WorkTimeSummary(QWidget):
         self.update_canvas_data()
         self.resize_canvas()
 
-    def link_vertical_scroll_bar(self, scroll_bar):
-
-        """link vertical scroll bar to own vertical scroll bar"""
-
-        self.linked_scroll_bars.append(scroll_bar)
-
     def paintEvent(self, event): # pylint: disable=invalid-name, unused-argument
 
         """paint event for this widget"""
@@ -75,21 +72,18 @@ class WorkTimeSummary(QWidget):
         for i in self.subject_render_list:
             i.paint(painter, brush)
 
-        for i in self.linked_scroll_bars:
-            i.setValue(self.parent.verticalScrollBar().value())
-
     def load_data(self):
 
         """load data from db"""
 
         # load total work times
         self.total = dbwrapper.WorkTotalTimePercentage.get_work_total_time_percentage(\
-            self.context.start_date, self.context.end_date, self.context.db_file_name)
+            self.context.start_date, self.context.end_date, self.context.db_conn)
 
         # load per subject work time
         self.subjects = dbwrapper.WorkSubjectTimePercentage.get_work_subject_time_percentage(\
             self.context.start_date, self.context.end_date,\
-                self.context.db_file_name)
+                self.context.db_conn)
 
     @pyqtSlot(int, float, float)
     def update_subject_work_plan(self, subject_id, old_value, new_value):
@@ -36,14 +36,18 @@ class WorkTimeTotalSummary(QWidget):
         self.communicator.SIGNAL_SCHEDULE_RESIZED.connect(self.resize_canvas)
         self.communicator.SIGNAL_DATES_CHANGED.connect(self.update_canvas)
 
-        self.communicator.SIGNAL_WORK_PLAN_CHANGED.connect(\
-            self.update_work_plan)
+        # the changes of all subjects are merged into one
+        self.communicator.coalesce(\
+            self.communicator.SIGNAL_WORK_PLAN_CHANGED,\
+                self.update_work_plan, False)
 
-        self.communicator.SIGNAL_WORK_TIME_CHANGED.connect(\
-            self.update_work_time)
+        self.communicator.coalesce(\
+            self.communicator.SIGNAL_WORK_TIME_CHANGED,\
+                self.update_work_time, False)
 
-        self.communicator.SIGNAL_TOTAL_WORK_CHANGED.connect(\
-            self.update_total)
+        self.communicator.coalesce(\
+            self.communicator.SIGNAL_TOTAL_WORK_CHANGED,\
+                self.update_total, False)
 
         palette = QPalette()
         palette.setColor(QPalette.ColorRole.Window, self.context.canvas_background_color)
@@ -71,12 +75,12 @@ class WorkTimeTotalSummary(QWidget):
 
         # load total work times
         self.total = dbwrapper.WorkTotalTimePercentage.get_work_total_time_percentage(\
-            self.context.start_date, self.context.end_date, self.context.db_file_name)
+            self.context.start_date, self.context.end_date, self.context.db_conn)
 
         # load per subject work time
         self.subjects = dbwrapper.WorkSubjectTimePercentage.get_work_subject_time_percentage(\
             self.context.start_date, self.context.end_date,\
-                self.context.db_file_name)
+                self.context.db_conn)
 
     # pylint: disable=unused-argument
     @pyqtSlot(float, float)